@@ -0,0 +1,108 @@
+"""Compares updating voices one by one with `voices.update_many()` at several concurrency levels.
+
+Runs against a local stand-in for the voice API that answers every request after `--latency`
+seconds, like a round-trip to the real API would take. Reports the time taken and the rate of
+updates for a serial loop and for the batch methods of the sync and async clients.
+
+Usage: python benchmarks/bench_batch.py [--voices N] [--latency SECONDS] [--concurrency N ...]
+"""
+
+from __future__ import annotations
+
+import json
+import time
+import asyncio
+import argparse
+import functools
+import threading
+from typing import Any, Dict, Callable
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing_extensions import override
+
+from lmnt import Lmnt, AsyncLmnt
+from lmnt.types import VoiceUpdateParams
+
+
+def serve(latency: float) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_PUT(self) -> None:
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            time.sleep(latency)
+            voice_id = self.path.rsplit("/", 1)[-1]
+            body = json.dumps(
+                {"voice": {"id": voice_id, "name": voice_id, "owner": "me", "state": "ready", "tags": ["migrated"]}}
+            ).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        @override
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    class Server(ThreadingHTTPServer):
+        daemon_threads = True
+        # room for every connection of the highest concurrency
+        request_queue_size = 256
+
+    server = Server(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def report(label: str, voices: int, fn: Callable[[], object]) -> None:
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<32} {elapsed:>7.2f} s  {voices / elapsed:>8.1f} updates/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--voices", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[4, 16, 64])
+    args = parser.parse_args()
+
+    server = serve(args.latency)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    ids = [f"voice-{i}" for i in range(args.voices)]
+    updates: Dict[str, VoiceUpdateParams] = {voice_id: {"tags": ["migrated"]} for voice_id in ids}
+    print(f"{args.voices} voice updates, {args.latency * 1000:.0f} ms per request\n")
+
+    client = Lmnt(base_url=base_url, api_key="benchmark", max_retries=0)
+
+    def serial() -> None:
+        for voice_id in ids:
+            client.voices.update(voice_id, tags=["migrated"])
+
+    report("serial loop", args.voices, serial)
+
+    def batch(concurrency: int) -> None:
+        results = client.voices.update_many(updates, concurrency=concurrency)
+        failed = [result for result in results if not result.ok]
+        assert not failed, failed[0].error
+
+    async def async_batch(concurrency: int) -> None:
+        async with AsyncLmnt(base_url=base_url, api_key="benchmark", max_retries=0) as async_client:
+            await async_client.voices.update_many(updates, concurrency=concurrency)
+
+    for concurrency in args.concurrency:
+        report(f"update_many(concurrency={concurrency})", args.voices, functools.partial(batch, concurrency))
+    for concurrency in args.concurrency:
+        report(
+            f"async update_many(concurrency={concurrency})",
+            args.voices,
+            functools.partial(asyncio.run, async_batch(concurrency)),
+        )
+
+    client.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Benchmarks the decoded-audio accessors of `DecodedDetailedSpeech`.
+
+Simulates the response for a 5000 character clip (~5.5 minutes of 96kbps audio with one
+timestamp per word and per space) and compares:
+
+- decoding `audio` with `base64.b64decode()` on every access vs the cached `audio_bytes`
+- a list of `Timestamp` start/duration floats vs the `timestamps_array` columns
+
+Usage: python benchmarks/bench_detailed_audio.py [--accesses N]
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+import base64
+import argparse
+import tracemalloc
+from typing import Any, Dict, List, Callable
+
+from lmnt import DecodedDetailedSpeech
+from lmnt.types import SpeechGenerateDetailedResponse
+from lmnt._models import construct_type
+
+TEXT_LENGTH = 5000
+AUDIO_SECONDS = 330
+AUDIO_BITRATE = 96_000
+
+
+def make_response() -> SpeechGenerateDetailedResponse:
+    audio = os.urandom(AUDIO_SECONDS * AUDIO_BITRATE // 8)
+    words = TEXT_LENGTH // 6
+    step = AUDIO_SECONDS / (words * 2)
+    timestamps: List[Dict[str, Any]] = []
+    for i in range(words * 2):
+        timestamps.append({"text": "word" if i % 2 == 0 else " ", "start": i * step, "duration": step})
+
+    return construct_type(
+        type_=SpeechGenerateDetailedResponse,
+        value={"audio": base64.b64encode(audio).decode(), "timestamps": timestamps},
+    )  # type: ignore[return-value]
+
+
+def measure(label: str, fn: Callable[[], object]) -> None:
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+
+    print(f"{label:<48} {elapsed * 1000:>9.2f} ms  peak {peak / 1024 / 1024:>7.2f} MiB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--accesses", type=int, default=5, help="how many times the audio is read per response")
+    args = parser.parse_args()
+    accesses: int = args.accesses
+
+    response = make_response()
+    print(f"audio: {len(response.audio) / 1024 / 1024:.2f} MiB base64, {len(response.timestamps or [])} timestamps")
+    print(f"accessing the audio {accesses} times\n")
+
+    def decode_every_time() -> object:
+        return [base64.b64decode(response.audio) for _ in range(accesses)]
+
+    def cached_accessor() -> object:
+        speech = DecodedDetailedSpeech(response)
+        return [speech.audio_bytes for _ in range(accesses)]
+
+    def timestamps_lists() -> object:
+        timestamps = response.timestamps or []
+        return [t.start for t in timestamps], [t.duration for t in timestamps]
+
+    def timestamps_columns() -> object:
+        return DecodedDetailedSpeech(response).timestamps_array
+
+    measure("base64.b64decode(response.audio) per access", decode_every_time)
+    measure("DecodedDetailedSpeech(response).audio_bytes", cached_accessor)
+    measure("[t.start ...], [t.duration ...]", timestamps_lists)
+    measure("DecodedDetailedSpeech(response).timestamps_array", timestamps_columns)
+
+    starts, durations = DecodedDetailedSpeech(response).timestamps_array
+    list_size = sum(sys.getsizeof(column) + len(column) * sys.getsizeof(0.0) for column in ([*starts], [*durations]))
+    array_size = sys.getsizeof(starts) + sys.getsizeof(durations)
+    print(f"\ntimestamp columns retained: lists {list_size / 1024:.1f} KiB, arrays {array_size / 1024:.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Compares the default HTTP/1.1 connection pool with HTTP/2 for highly concurrent streamed synthesis.
+
+Runs `--concurrency` concurrent `speech.with_streaming_response.generate()` calls against a local
+stand-in server (see `tests/h2_server.py`) that waits `--ttfb` seconds and then streams the audio
+back in chunks. Reports the number of TCP connections the server accepted and the latency
+percentiles for each transport.
+
+The stand-in is cleartext, so HTTP/2 is negotiated with prior knowledge (`http1=False`) rather than
+through TLS ALPN as it is against the real API; the connection limits are the ones used by `http2=True`.
+
+Usage: python benchmarks/bench_http2.py [--concurrency N] [--rounds N] [--ttfb SECONDS]
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+import statistics
+from typing import List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from lmnt import AsyncLmnt, DefaultAsyncHttpxClient
+from tests.h2_server import LocalAudioServer
+
+
+async def run(*, protocol: str, concurrency: int, rounds: int, ttfb: float) -> None:
+    http2 = protocol == "h2"
+    with LocalAudioServer(protocol="h2" if http2 else "http/1.1", ttfb=ttfb, chunks=16, repeat=200) as server:
+        http_client = DefaultAsyncHttpxClient(base_url=server.base_url, http1=not http2, http2=http2)
+        client = AsyncLmnt(base_url=server.base_url, api_key="benchmark", http_client=http_client, max_retries=0)
+        latencies: List[float] = []
+
+        async def generate(i: int) -> None:
+            start = time.perf_counter()
+            async with client.speech.with_streaming_response.generate(text=f"request {i}", voice="leah") as response:
+                async for _ in response.iter_bytes():
+                    pass
+            latencies.append(time.perf_counter() - start)
+
+        started = time.perf_counter()
+        for _ in range(rounds):
+            await asyncio.gather(*[generate(i) for i in range(concurrency)])
+        elapsed = time.perf_counter() - started
+        await client.close()
+
+    latencies.sort()
+    p50 = statistics.median(latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(
+        f"{'HTTP/2' if http2 else 'HTTP/1.1':<9} connections {server.connections:>4}  "
+        f"p50 {p50 * 1000:>8.1f} ms  p95 {p95 * 1000:>8.1f} ms  total {elapsed:>6.2f} s"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, default=300)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--ttfb", type=float, default=0.1)
+    args = parser.parse_args()
+
+    print(
+        f"{args.concurrency} concurrent streams x {args.rounds} rounds, {args.ttfb * 1000:.0f} ms time-to-first-byte\n"
+    )
+    for protocol in ("http/1.1", "h2"):
+        asyncio.run(run(protocol=protocol, concurrency=args.concurrency, rounds=args.rounds, ttfb=args.ttfb))
+
+
+if __name__ == "__main__":
+    main()
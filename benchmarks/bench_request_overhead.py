@@ -0,0 +1,91 @@
+"""Measures the client-side CPU cost of a request, with the network taken out of the picture.
+
+Every request is answered by an in-process `httpx.MockTransport`, so the time per call is the
+SDK's own overhead (building the options, transforming the params, headers, URL, response
+parsing) plus httpx's. The bare `httpx.Client` row sends an equivalent request directly and is
+the floor that the SDK can't go below.
+
+Usage: python benchmarks/bench_request_overhead.py [--requests N] [--profile]
+"""
+
+from __future__ import annotations
+
+import time
+import argparse
+import cProfile
+from typing import Callable
+
+import httpx
+
+from lmnt import Lmnt
+
+AUDIO = b"\xff\xfb" * 512
+VOICES = b'[{"id":"leah","name":"Leah","owner":"system","state":"ready","starred":true,"type":"professional"}]'
+ACCOUNT = b'{"plan":{"character_limit":10000,"commercial_use_allowed":true,"instant_voice_limit":null,"professional_voice_limit":null,"type":"pro"},"usage":{"characters":0,"instant_voices":0,"professional_voices":0}}'
+
+
+def handler(request: httpx.Request) -> httpx.Response:
+    if request.url.path.endswith("/speech/bytes"):
+        return httpx.Response(200, content=AUDIO, headers={"content-type": "audio/mpeg"})
+    if request.url.path.endswith("/voice/list"):
+        return httpx.Response(200, content=VOICES, headers={"content-type": "application/json"})
+    return httpx.Response(200, content=ACCOUNT, headers={"content-type": "application/json"})
+
+
+def measure(label: str, requests: int, fn: Callable[[], object], *, rounds: int = 5) -> float:
+    for _ in range(min(requests, 200)):
+        fn()
+
+    # the best round is the least disturbed by the rest of the machine
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(requests):
+            fn()
+        best = min(best, (time.perf_counter() - start) / requests)
+    print(f"{label:<40} {best * 1e6:>8.1f} us/request")
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--profile", action="store_true", help="print a profile of the `speech.generate()` calls")
+    args = parser.parse_args()
+    requests: int = args.requests
+
+    transport = httpx.MockTransport(handler)
+    client = Lmnt(api_key="benchmark", base_url="https://api.lmnt.com", http_client=httpx.Client(transport=transport))
+    http_client = httpx.Client(transport=transport, base_url="https://api.lmnt.com")
+
+    def bare() -> object:
+        return http_client.post(
+            "/v1/ai/speech/bytes", json={"text": "Hello world.", "voice": "leah"}, headers={"X-API-Key": "benchmark"}
+        ).content
+
+    def generate() -> object:
+        return client.speech.generate(text="Hello world.", voice="leah", format="mp3", sample_rate=24000)
+
+    def list_voices() -> object:
+        return client.voices.list(owner="system")
+
+    def retrieve_account() -> object:
+        return client.accounts.retrieve()
+
+    floor = measure("httpx.Client.post (floor)", requests, bare)
+    total = measure("client.speech.generate()", requests, generate)
+    measure("client.voices.list()", requests, list_voices)
+    measure("client.accounts.retrieve()", requests, retrieve_account)
+    print(f"\nSDK overhead on top of httpx for speech.generate(): {(total - floor) * 1e6:.1f} us/request")
+
+    if args.profile:
+        profiler = cProfile.Profile()
+        profiler.enable()
+        for _ in range(requests):
+            generate()
+        profiler.disable()
+        profiler.print_stats("cumulative")
+
+
+if __name__ == "__main__":
+    main()
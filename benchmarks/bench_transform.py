@@ -0,0 +1,106 @@
+"""Microbenchmarks `maybe_transform()` / `async_maybe_transform()` for every params type in `lmnt.types`.
+
+Each params type is transformed with representative arguments, in the same way that the
+resource methods do before sending a request. The first call for a type compiles its
+transformation, which is reported separately from the steady-state cost per call.
+
+Usage: python benchmarks/bench_transform.py [--calls N]
+"""
+
+from __future__ import annotations
+
+import io
+import time
+import asyncio
+import argparse
+from typing import Any, Dict, Callable
+
+from lmnt import types, not_given
+from lmnt._utils import maybe_transform, async_maybe_transform
+from lmnt._utils._transform import clear_compiled_typeddicts
+
+SAMPLES: Dict[str, Dict[str, Any]] = {
+    "SpeechGenerateParams": {
+        "text": "Hello world, this is a short prompt.",
+        "voice": "leah",
+        "debug": not_given,
+        "format": "mp3",
+        "language": "en",
+        "model": "blizzard",
+        "sample_rate": 24000,
+        "temperature": 1.0,
+        "top_p": not_given,
+    },
+    "SpeechGenerateDetailedParams": {
+        "text": "Hello world, this is a short prompt.",
+        "voice": "leah",
+        "debug": not_given,
+        "format": "mp3",
+        "language": "en",
+        "model": "blizzard",
+        "return_timestamps": True,
+        "sample_rate": 24000,
+        "temperature": not_given,
+        "top_p": not_given,
+    },
+    "VoiceCreateParams": {
+        "file": io.BytesIO(b"RIFF"),
+        "name": "My voice",
+        "description": "A warm narration voice",
+        "gender": not_given,
+        "tags": ["narration", "warm"],
+    },
+    "VoiceListParams": {"owner": "system", "starred": not_given},
+    "VoiceUpdateParams": {
+        "description": not_given,
+        "gender": not_given,
+        "name": "Renamed voice",
+        "starred": True,
+        "tags": ["narration"],
+    },
+}
+
+
+def per_call(calls: int, fn: Callable[[], object]) -> float:
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        best = min(best, (time.perf_counter() - start) / calls)
+    return best
+
+
+async def async_per_call(calls: int, fn: Callable[[], Any]) -> float:
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(calls):
+            await fn()
+        best = min(best, (time.perf_counter() - start) / calls)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=20_000)
+    args = parser.parse_args()
+    calls: int = args.calls
+
+    print(f"{'params type':<30} {'first call':>12} {'sync':>12} {'async':>12}")
+    for name, sample in SAMPLES.items():
+        params_type = getattr(types, name)
+
+        clear_compiled_typeddicts()
+        start = time.perf_counter()
+        maybe_transform(sample, params_type)
+        first = time.perf_counter() - start
+
+        sync = per_call(calls, lambda: maybe_transform(sample, params_type))  # noqa: B023
+        async_ = asyncio.run(async_per_call(calls, lambda: async_maybe_transform(sample, params_type)))  # noqa: B023
+
+        print(f"{name:<30} {first * 1e6:>9.1f} us {sync * 1e6:>9.2f} us {async_ * 1e6:>9.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,13 +7,22 @@ __path__ = extend_path(__path__, __name__)
 import typing as _t
 
 from . import types
+from ._batch import BatchResult, BatchProgress
+from ._hooks import HookEvent, HookRegistry, RequestEvent
 from ._types import NOT_GIVEN, Omit, NoneType, NotGiven, Transport, ProxiesTypes, omit, not_given
+from ._usage import UsageTracker
 from ._utils import file_from_path
 from ._client import Lmnt, Client, Stream, Timeout, AsyncLmnt, Transport, AsyncClient, AsyncStream, RequestOptions
 from ._models import BaseModel
+from ._timing import RequestTiming, TransferMetrics
+from ._upload import UploadProgress
+from ._warmup import WarmupResult
+from ._metrics import Counter, Metrics, Histogram, HistogramSample
 from ._version import __title__, __version__
+from ._previews import PreviewCache, VoicePreview
 from ._response import APIResponse as APIResponse, AsyncAPIResponse as AsyncAPIResponse
 from ._constants import DEFAULT_TIMEOUT, DEFAULT_MAX_RETRIES, DEFAULT_CONNECTION_LIMITS
+from ._endpoints import Endpoint, EndpointPool
 from ._exceptions import (
   APIError,
   LmntError,
@@ -23,15 +32,26 @@ from ._exceptions import (
   RateLimitError,
   APITimeoutError,
   BadRequestError,
+  CircuitOpenError,
   APIConnectionError,
+  QuotaExceededError,
+  UploadStalledError,
+  VoiceNotReadyError,
   AuthenticationError,
   InternalServerError,
   PermissionDeniedError,
   UnprocessableEntityError,
   APIResponseValidationError,
 )
+from ._preprocess import PreprocessedAudio, AudioPreprocessing, preprocess_audio
+from ._rate_limit import RateLimiter
 from ._base_client import DefaultHttpxClient, DefaultAioHttpClient, DefaultAsyncHttpxClient
 from ._utils._logs import setup_logging as _setup_logging
+from ._voice_cache import VoiceCache
+from ._voice_index import VoiceIndex
+from ._retry_budget import RetryBudget
+from ._speech_stream import DecodedDetailedSpeech
+from ._circuit_breaker import CircuitState, CircuitBreaker
 
 __all__ = [
   "types",
@@ -50,6 +70,10 @@ __all__ = [
   "APIStatusError",
   "APITimeoutError",
   "APIConnectionError",
+  "CircuitOpenError",
+  "UploadStalledError",
+  "VoiceNotReadyError",
+  "QuotaExceededError",
   "APIResponseValidationError",
   "BadRequestError",
   "AuthenticationError",
@@ -69,6 +93,34 @@ __all__ = [
   "AsyncLmnt",
   "file_from_path",
   "BaseModel",
+  "TransferMetrics",
+  "RateLimiter",
+  "UsageTracker",
+  "CircuitBreaker",
+  "CircuitState",
+  "RetryBudget",
+  "Endpoint",
+  "EndpointPool",
+  "HookEvent",
+  "HookRegistry",
+  "RequestEvent",
+  "RequestTiming",
+  "Metrics",
+  "Counter",
+  "Histogram",
+  "HistogramSample",
+  "UploadProgress",
+  "AudioPreprocessing",
+  "PreprocessedAudio",
+  "preprocess_audio",
+  "VoiceCache",
+  "VoiceIndex",
+  "BatchResult",
+  "BatchProgress",
+  "PreviewCache",
+  "VoicePreview",
+  "WarmupResult",
+  "DecodedDetailedSpeech",
   "DEFAULT_TIMEOUT",
   "DEFAULT_MAX_RETRIES",
   "DEFAULT_CONNECTION_LIMITS",
@@ -0,0 +1,362 @@
+from __future__ import annotations
+
+import struct
+from typing import List, Mapping, Iterable, Iterator, Optional, AsyncIterable, AsyncIterator, cast
+from typing_extensions import Literal, override
+
+__all__ = [
+    "AudioFormat",
+    "AudioAligner",
+    "make_audio_aligner",
+    "iter_aligned_audio",
+    "aiter_aligned_audio",
+    "audio_params_from_body",
+]
+
+AudioFormat = Literal["aac", "mp3", "ulaw", "wav", "webm", "pcm_s16le", "pcm_f32le"]
+
+# the API's defaults when the request doesn't specify a `format` / `sample_rate`
+DEFAULT_AUDIO_FORMAT: AudioFormat = "mp3"
+DEFAULT_SAMPLE_RATE = 24000
+DEFAULT_ULAW_SAMPLE_RATE = 8000
+
+_PCM_SAMPLE_WIDTHS: Mapping[str, int] = {"pcm_s16le": 2, "pcm_f32le": 4}
+
+
+class AudioAligner:
+    """Re-chunks a stream of encoded audio bytes so that every emitted chunk is independently decodable.
+
+    Data is pushed in with `feed()` as it arrives from the network and aligned chunks are returned
+    as soon as they are complete. Once the stream has ended, `flush()` returns whatever is left over.
+    """
+
+    def feed(self, data: bytes) -> List[bytes]:
+        raise NotImplementedError()
+
+    def flush(self) -> List[bytes]:
+        raise NotImplementedError()
+
+
+class PCMAligner(AudioAligner):
+    """Aligns raw PCM audio to whole samples, or to a fixed number of samples per chunk."""
+
+    def __init__(self, *, sample_width: int, samples_per_chunk: int | None = None) -> None:
+        self._buffer = bytearray()
+        self._sample_width = sample_width
+        self._chunk_bytes = sample_width * samples_per_chunk if samples_per_chunk else None
+
+    @override
+    def feed(self, data: bytes) -> List[bytes]:
+        self._buffer += data
+
+        if self._chunk_bytes is None:
+            aligned = len(self._buffer) - len(self._buffer) % self._sample_width
+            if not aligned:
+                return []
+            chunk = bytes(self._buffer[:aligned])
+            del self._buffer[:aligned]
+            return [chunk]
+
+        chunks: List[bytes] = []
+        view = memoryview(self._buffer)
+        offset = 0
+        while len(self._buffer) - offset >= self._chunk_bytes:
+            chunks.append(bytes(view[offset : offset + self._chunk_bytes]))
+            offset += self._chunk_bytes
+        view.release()
+        del self._buffer[:offset]
+        return chunks
+
+    @override
+    def flush(self) -> List[bytes]:
+        # a trailing partial sample can't be decoded, so it is dropped
+        aligned = len(self._buffer) - len(self._buffer) % self._sample_width
+        chunk = bytes(self._buffer[:aligned])
+        self._buffer.clear()
+        return [chunk] if chunk else []
+
+
+class WAVAligner(AudioAligner):
+    """Emits the RIFF header as its own chunk and then aligns the sample data using the header's block size."""
+
+    def __init__(self, *, duration: float | None = None) -> None:
+        self._buffer = bytearray()
+        self._duration = duration
+        self._data: Optional[PCMAligner] = None
+
+    @override
+    def feed(self, data: bytes) -> List[bytes]:
+        if self._data is not None:
+            return self._data.feed(data)
+
+        self._buffer += data
+        parsed = _parse_wav_header(self._buffer)
+        if parsed is None:
+            return []
+
+        header_size, block_align, sample_rate = parsed
+        samples = round(sample_rate * self._duration) if self._duration else None
+        self._data = PCMAligner(sample_width=block_align, samples_per_chunk=samples)
+
+        header = bytes(self._buffer[:header_size])
+        rest = bytes(self._buffer[header_size:])
+        self._buffer.clear()
+        return [header, *self._data.feed(rest)]
+
+    @override
+    def flush(self) -> List[bytes]:
+        if self._data is not None:
+            return self._data.flush()
+
+        # the stream ended before a complete header was received
+        chunk = bytes(self._buffer)
+        self._buffer.clear()
+        return [chunk] if chunk else []
+
+
+class MP3Aligner(AudioAligner):
+    """Splits an MPEG audio stream on frame boundaries by parsing each frame header.
+
+    A leading ID3v2 tag is emitted as its own chunk. Any bytes that can't be parsed as a frame
+    are passed through attached to the following frame rather than dropped.
+    """
+
+    def __init__(self, *, duration: float | None = None) -> None:
+        self._buffer = bytearray()
+        self._duration = duration
+        self._checked_id3 = False
+        self._pending: List[bytes] = []
+        self._pending_seconds = 0.0
+
+    @override
+    def feed(self, data: bytes) -> List[bytes]:
+        self._buffer += data
+        chunks: List[bytes] = []
+
+        if not self._checked_id3:
+            if len(self._buffer) < 10:
+                return chunks
+
+            tag_size = _id3v2_size(self._buffer)
+            if tag_size is not None:
+                if len(self._buffer) < tag_size:
+                    return chunks
+                chunks.append(bytes(self._buffer[:tag_size]))
+                del self._buffer[:tag_size]
+            self._checked_id3 = True
+
+        offset = 0
+        skipped_from: Optional[int] = None
+        while len(self._buffer) - offset >= 4:
+            frame = _parse_mpeg_frame_header(self._buffer, offset)
+            if frame is None:
+                if skipped_from is None:
+                    skipped_from = offset
+                offset += 1
+                continue
+
+            frame_length, seconds = frame
+            if len(self._buffer) - offset < frame_length:
+                break
+
+            start = skipped_from if skipped_from is not None else offset
+            skipped_from = None
+            offset += frame_length
+            chunks.extend(self._add_frame(bytes(self._buffer[start:offset]), seconds))
+
+        if skipped_from is not None:
+            offset = skipped_from
+        del self._buffer[:offset]
+        return chunks
+
+    def _add_frame(self, frame: bytes, seconds: float) -> List[bytes]:
+        if not self._duration:
+            return [frame]
+
+        self._pending.append(frame)
+        self._pending_seconds += seconds
+        if self._pending_seconds + 1e-9 < self._duration:
+            return []
+
+        chunk = b"".join(self._pending)
+        self._pending.clear()
+        self._pending_seconds = 0.0
+        return [chunk]
+
+    @override
+    def flush(self) -> List[bytes]:
+        chunks: List[bytes] = []
+        if self._pending:
+            chunks.append(b"".join(self._pending))
+            self._pending.clear()
+            self._pending_seconds = 0.0
+
+        if self._buffer:
+            # a truncated final frame; pass it through so no data is lost
+            chunks.append(bytes(self._buffer))
+            self._buffer.clear()
+        return chunks
+
+
+def make_audio_aligner(
+    *,
+    format: str,
+    sample_rate: int | None = None,
+    duration: float | None = None,
+) -> AudioAligner:
+    """Returns an `AudioAligner` for the given output format.
+
+    Args:
+      format: The `format` the audio was requested in.
+
+      sample_rate: The `sample_rate` the audio was requested in; only used for raw PCM formats
+          as the other formats carry their sample rate in their headers.
+
+      duration: If given, each chunk will contain this many seconds of audio (rounded to whole
+          samples, or whole frames for `mp3`). Otherwise chunks are only aligned to sample or
+          frame boundaries.
+    """
+    if duration is not None and duration <= 0:
+        raise ValueError(f"Expected `duration` to be a positive number of seconds but received {duration!r}")
+
+    sample_width = _PCM_SAMPLE_WIDTHS.get(format)
+    if sample_width is not None:
+        rate = sample_rate or DEFAULT_SAMPLE_RATE
+        samples = round(rate * duration) if duration else None
+        return PCMAligner(sample_width=sample_width, samples_per_chunk=samples)
+
+    if format == "wav" or format == "ulaw":
+        return WAVAligner(duration=duration)
+
+    if format == "mp3":
+        return MP3Aligner(duration=duration)
+
+    raise ValueError(f"Aligned audio iteration is not supported for the `{format}` format")
+
+
+def audio_params_from_body(body: object) -> tuple[str, int | None]:
+    """Extracts the `format` and `sample_rate` that were sent in a speech request body."""
+    format: str = DEFAULT_AUDIO_FORMAT
+    sample_rate: int | None = None
+
+    if isinstance(body, Mapping):
+        mapping = cast("Mapping[str, object]", body)
+        requested_format = mapping.get("format")
+        if isinstance(requested_format, str):
+            format = requested_format
+
+        requested_rate = mapping.get("sample_rate")
+        if isinstance(requested_rate, int):
+            sample_rate = requested_rate
+
+    if sample_rate is None and format == "ulaw":
+        sample_rate = DEFAULT_ULAW_SAMPLE_RATE
+    return format, sample_rate
+
+
+def iter_aligned_audio(chunks: Iterable[bytes], aligner: AudioAligner) -> Iterator[bytes]:
+    for data in chunks:
+        yield from aligner.feed(data)
+    yield from aligner.flush()
+
+
+async def aiter_aligned_audio(chunks: AsyncIterable[bytes], aligner: AudioAligner) -> AsyncIterator[bytes]:
+    async for data in chunks:
+        for chunk in aligner.feed(data):
+            yield chunk
+    for chunk in aligner.flush():
+        yield chunk
+
+
+def _parse_wav_header(buffer: bytearray) -> tuple[int, int, int] | None:
+    """Returns `(header_size, block_align, sample_rate)` once the full header up to the `data` chunk is buffered."""
+    if len(buffer) < 12:
+        return None
+    if bytes(buffer[:4]) != b"RIFF" or bytes(buffer[8:12]) != b"WAVE":
+        raise ValueError("Expected the audio stream to start with a RIFF/WAVE header")
+
+    offset = 12
+    block_align: int | None = None
+    sample_rate: int | None = None
+    while len(buffer) >= offset + 8:
+        chunk_id = bytes(buffer[offset : offset + 4])
+        (chunk_size,) = struct.unpack_from("<I", buffer, offset + 4)
+
+        if chunk_id == b"data":
+            if block_align is None or sample_rate is None:
+                raise ValueError("Expected a `fmt ` chunk before the `data` chunk in the WAV header")
+            return offset + 8, block_align, sample_rate
+
+        if chunk_id == b"fmt ":
+            if len(buffer) < offset + 8 + 16:
+                return None
+            _, _, sample_rate, _, block_align = struct.unpack_from("<HHIIH", buffer, offset + 8)
+
+        # chunks are padded to an even number of bytes
+        offset += 8 + chunk_size + (chunk_size & 1)
+
+    return None
+
+
+def _id3v2_size(buffer: bytearray) -> int | None:
+    if bytes(buffer[:3]) != b"ID3":
+        return None
+
+    # the tag size is a 28-bit "synchsafe" integer, excluding the 10 byte header (and optional footer)
+    size = (buffer[6] << 21) | (buffer[7] << 14) | (buffer[8] << 7) | buffer[9]
+    has_footer = bool(buffer[5] & 0x10)
+    return 10 + size + (10 if has_footer else 0)
+
+
+# kbps, indexed by [version is MPEG-1][layer][bitrate index]
+_MPEG1_BITRATES = {
+    1: (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    2: (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    3: (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+}
+_MPEG2_BITRATES = {
+    1: (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    2: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    3: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+# Hz, indexed by the 2-bit version id: 0 = MPEG-2.5, 2 = MPEG-2, 3 = MPEG-1
+_MPEG_SAMPLE_RATES = {
+    0: (11025, 12000, 8000),
+    2: (22050, 24000, 16000),
+    3: (44100, 48000, 32000),
+}
+
+
+def _parse_mpeg_frame_header(buffer: bytearray, offset: int) -> tuple[int, float] | None:
+    """Returns `(frame_length, frame_duration_seconds)` for a valid MPEG audio frame header at `offset`."""
+    b0, b1, b2 = buffer[offset], buffer[offset + 1], buffer[offset + 2]
+    if b0 != 0xFF or (b1 & 0xE0) != 0xE0:
+        return None
+
+    version_id = (b1 >> 3) & 0b11
+    layer_bits = (b1 >> 1) & 0b11
+    bitrate_index = (b2 >> 4) & 0b1111
+    sample_rate_index = (b2 >> 2) & 0b11
+    padding = (b2 >> 1) & 0b1
+
+    if version_id == 1 or layer_bits == 0 or bitrate_index in (0, 0b1111) or sample_rate_index == 0b11:
+        # reserved values, or free-format bitrate which we can't derive a frame length from
+        return None
+
+    layer = 4 - layer_bits
+    is_mpeg1 = version_id == 3
+    bitrate = (_MPEG1_BITRATES if is_mpeg1 else _MPEG2_BITRATES)[layer][bitrate_index] * 1000
+    sample_rate = _MPEG_SAMPLE_RATES[version_id][sample_rate_index]
+
+    if layer == 1:
+        samples = 384
+        length = (12 * bitrate // sample_rate + padding) * 4
+    elif layer == 2 or is_mpeg1:
+        samples = 1152
+        length = 144 * bitrate // sample_rate + padding
+    else:
+        # MPEG-2 / MPEG-2.5 Layer III frames carry half as many samples
+        samples = 576
+        length = 72 * bitrate // sample_rate + padding
+
+    return length, samples / sample_rate
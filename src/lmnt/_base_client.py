@@ -16,6 +16,7 @@ from typing import (
     TYPE_CHECKING,
     Any,
     Dict,
+    List,
     Type,
     Union,
     Generic,
@@ -40,7 +41,8 @@ from pydantic import PrivateAttr
 
 from . import _exceptions
 from ._qs import Querystring
-from ._files import to_httpx_files, async_to_httpx_files
+from ._files import to_httpx_files, async_to_httpx_files, has_unrewindable_file
+from ._hooks import HookRegistry
 from ._types import (
     Body,
     Omit,
@@ -58,9 +60,13 @@ from ._types import (
     ModelBuilderProtocol,
     not_given,
 )
+from ._usage import UsageTracker
 from ._utils import is_dict, is_list, asyncify, is_given, lru_cache, is_mapping
 from ._compat import PYDANTIC_V1, model_copy, model_dump
 from ._models import BaseModel, GenericModel, FinalRequestOptions, validate_type, construct_type
+from ._timing import TransferMetrics, TransferMetricsHook
+from ._upload import SpooledBody, UploadProgressHook, monitor_upload
+from ._metrics import Metrics
 from ._response import (
     APIResponse,
     BaseAPIResponse,
@@ -75,14 +81,21 @@ from ._constants import (
     RAW_RESPONSE_HEADER,
     OVERRIDE_CAST_TO_HEADER,
     DEFAULT_CONNECTION_LIMITS,
+    DEFAULT_HTTP2_CONNECTION_LIMITS,
 )
+from ._endpoints import Endpoint, EndpointPool
 from ._streaming import Stream, SSEDecoder, AsyncStream, SSEBytesDecoder
 from ._exceptions import (
     APIStatusError,
     APITimeoutError,
+    CircuitOpenError,
     APIConnectionError,
+    UploadStalledError,
     APIResponseValidationError,
 )
+from ._rate_limit import RateLimiter, request_characters
+from ._retry_budget import RetryBudget
+from ._circuit_breaker import CircuitBreaker
 
 log: logging.Logger = logging.getLogger(__name__)
 
@@ -102,6 +115,8 @@ if TYPE_CHECKING:
         DEFAULT_TIMEOUT_CONFIG,  # pyright: ignore[reportPrivateImportUsage]
     )
 
+    from .types.account_retrieve_response import AccountRetrieveResponse
+
     HTTPX_DEFAULT_TIMEOUT = DEFAULT_TIMEOUT_CONFIG
 else:
     try:
@@ -110,6 +125,12 @@ else:
         # taken from https://github.com/encode/httpx/blob/3ba5fe0d7ac70222590e759c31442b1cab263791/httpx/_config.py#L366
         HTTPX_DEFAULT_TIMEOUT = Timeout(5.0)
 
+# the maximum number of merged URLs / headers that a client keeps around for re-use
+_MAX_PREPARED_CACHE_SIZE = 128
+
+# responses that suggest an endpoint of an `EndpointPool` can't reach the API
+_GATEWAY_ERROR_CODES = frozenset({502, 503, 504})
+
 
 class PageInfo:
     """Stores the necessary information to build the request to retrieve the next page.
@@ -362,6 +383,7 @@ class BaseClient(Generic[_HttpxClientT, _DefaultStreamT]):
     _base_url: URL
     max_retries: int
     timeout: Union[float, Timeout, None]
+    deadline: Union[float, None]
     _strict_response_validation: bool
     _idempotency_header: str | None
     _default_stream_cls: type[_DefaultStreamT] | None = None
@@ -374,18 +396,40 @@ class BaseClient(Generic[_HttpxClientT, _DefaultStreamT]):
         _strict_response_validation: bool,
         max_retries: int = DEFAULT_MAX_RETRIES,
         timeout: float | Timeout | None = DEFAULT_TIMEOUT,
+        deadline: float | None = None,
         custom_headers: Mapping[str, str] | None = None,
         custom_query: Mapping[str, object] | None = None,
+        on_transfer_metrics: TransferMetricsHook | None = None,
+        rate_limiter: RateLimiter | None = None,
+        usage_tracker: UsageTracker | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        retry_budget: RetryBudget | None = None,
+        endpoint_pool: EndpointPool | None = None,
+        hooks: HookRegistry | None = None,
+        metrics: Metrics | None = None,
     ) -> None:
         self._version = version
         self._base_url = self._enforce_trailing_slash(URL(base_url))
         self.max_retries = max_retries
         self.timeout = timeout
+        self.deadline = deadline
         self._custom_headers = custom_headers or {}
         self._custom_query = custom_query or {}
         self._strict_response_validation = _strict_response_validation
         self._idempotency_header = None
         self._platform: Platform | None = None
+        self._on_transfer_metrics = on_transfer_metrics
+        self._rate_limiter = rate_limiter
+        self._usage_tracker = usage_tracker
+        self._circuit_breaker = circuit_breaker
+        self._retry_budget = retry_budget
+        self._endpoint_pool = endpoint_pool
+        self.hooks = hooks if hooks is not None else HookRegistry()
+        self._metrics = metrics
+        if metrics is not None:
+            metrics._instrument(self.hooks)
+        self._prepared_urls: dict[str, URL] = {}
+        self._prepared_headers: dict[tuple[tuple[str, str], ...], httpx.Headers] = {}
 
         if max_retries is None:  # pyright: ignore[reportUnnecessaryComparison]
             raise TypeError(
@@ -434,7 +478,7 @@ class BaseClient(Generic[_HttpxClientT, _DefaultStreamT]):
         self._validate_headers(headers_dict, custom_headers)
 
         # headers are case-insensitive while dictionaries are not.
-        headers = httpx.Headers(headers_dict)
+        headers = self._make_headers(headers_dict)
 
         idempotency_header = self._idempotency_header
         if idempotency_header and options.idempotency_key and idempotency_header not in headers:
@@ -454,17 +498,112 @@ class BaseClient(Generic[_HttpxClientT, _DefaultStreamT]):
 
         return headers
 
-    def _prepare_url(self, url: str) -> URL:
+    def _record_circuit_attempt(
+        self,
+        endpoint: str | None,
+        *,
+        failed: bool,
+        started_at: float,
+        finished_at: float | None = None,
+    ) -> None:
+        if self._circuit_breaker is None or endpoint is None:
+            return
+
+        # latency is measured up to the response headers, so that large response bodies don't count as slow
+        duration = (finished_at if finished_at is not None else time.monotonic()) - started_at
+        self._circuit_breaker.record(endpoint, failed=failed, duration=duration)
+
+    def _finish_upstream(
+        self,
+        upstream: Endpoint | None,
+        failed_upstreams: List[Endpoint],
+        *,
+        failed: bool,
+        started_at: float,
+        finished_at: float | None = None,
+    ) -> bool:
+        """Records the outcome of an attempt with the endpoint pool, returning whether the request can fail over."""
+        if upstream is None or self._endpoint_pool is None:
+            return False
+
+        latency = None if failed else (finished_at if finished_at is not None else time.monotonic()) - started_at
+        self._endpoint_pool.finish(upstream, failed=failed, latency=latency)
+        if not failed:
+            return False
+
+        failed_upstreams.append(upstream)
+        return self._endpoint_pool.has_healthy(exclude=failed_upstreams)
+
+    def _apply_deadline(self, request: httpx.Request, deadline_at: float | None) -> None:
+        if deadline_at is None:
+            return
+
+        remaining = deadline_at - time.monotonic()
+        if remaining <= 0:
+            log.debug("Raising timeout error as the request's deadline has passed")
+            raise APITimeoutError(request=request)
+
+        # every operation of the attempt, e.g. waiting for the next chunk of the response, has to finish in time
+        timeout = request.extensions.get("timeout", {})
+        request.extensions["timeout"] = {
+            key: remaining if value is None else min(value, remaining) for key, value in timeout.items()
+        }
+
+    def _acquire_retry(self, deadline_at: float | None, response_headers: Optional[httpx.Headers] = None) -> bool:
+        if deadline_at is not None:
+            remaining = deadline_at - time.monotonic()
+            if remaining <= 0:
+                log.debug("Not retrying as the request's deadline has passed")
+                return False
+
+            retry_after = self._parse_retry_after_header(response_headers)
+            if retry_after is not None and retry_after > remaining:
+                log.debug("Not retrying as the API asked to wait %f seconds, past the request's deadline", retry_after)
+                return False
+
+        if self._retry_budget is None or self._retry_budget.try_acquire_retry():
+            return True
+
+        log.debug("Not retrying as the retry budget is exhausted")
+        return False
+
+    def _make_headers(self, headers_dict: dict[str, str]) -> httpx.Headers:
+        # Normalising the headers is relatively expensive and the merged headers only vary by
+        # endpoint between requests, so the result is cached and a copy is handed out each time.
+        key = tuple(headers_dict.items())
+        headers = self._prepared_headers.get(key)
+        if headers is None:
+            if len(self._prepared_headers) >= _MAX_PREPARED_CACHE_SIZE:
+                self._prepared_headers.clear()
+            headers = self._prepared_headers[key] = httpx.Headers(headers_dict)
+        return headers.copy()
+
+    def _prepare_url(self, url: str, base_url: URL | None = None) -> URL:
         """
         Merge a URL argument together with any 'base_url' on the client,
         to create the URL used for the outgoing request.
         """
+        if base_url is not None and base_url != self.base_url:
+            # only the URLs for the client's own `base_url` are cached
+            return self._merge_url(base_url, url)
+
+        prepared_url = self._prepared_urls.get(url)
+        if prepared_url is not None:
+            return prepared_url
+
+        merge_url = self._merge_url(self.base_url, url)
+
+        if len(self._prepared_urls) >= _MAX_PREPARED_CACHE_SIZE:
+            self._prepared_urls.clear()
+        self._prepared_urls[url] = merge_url
+        return merge_url
+
+    def _merge_url(self, base_url: URL, url: str) -> URL:
         # Copied from httpx's `_merge_url` method.
         merge_url = URL(url)
         if merge_url.is_relative_url:
-            merge_raw_path = self.base_url.raw_path + merge_url.raw_path.lstrip(b"/")
-            return self.base_url.copy_with(raw_path=merge_raw_path)
-
+            merge_raw_path = base_url.raw_path + merge_url.raw_path.lstrip(b"/")
+            merge_url = base_url.copy_with(raw_path=merge_raw_path)
         return merge_url
 
     def _make_sse_decoder(self) -> SSEDecoder | SSEBytesDecoder:
@@ -475,6 +614,8 @@ class BaseClient(Generic[_HttpxClientT, _DefaultStreamT]):
         options: FinalRequestOptions,
         *,
         retries_taken: int = 0,
+        base_url: URL | None = None,
+        spool: SpooledBody | None = None,
     ) -> httpx.Request:
         if log.isEnabledFor(logging.DEBUG):
             log.debug("Request options: %s", model_dump(options, exclude_unset=True))
@@ -524,7 +665,7 @@ class BaseClient(Generic[_HttpxClientT, _DefaultStreamT]):
             if not files:
                 files = cast(HttpxRequestFiles, ForceMultipartDict())
 
-        prepared_url = self._prepare_url(options.url)
+        prepared_url = self._prepare_url(options.url, base_url)
         if "_" in prepared_url.host:
             # work around https://github.com/encode/httpx/discussions/2880
             kwargs["extensions"] = {"sni_hostname": prepared_url.host.replace("_", "-")}
@@ -542,7 +683,7 @@ class BaseClient(Generic[_HttpxClientT, _DefaultStreamT]):
             kwargs.pop("data", None)
 
         # TODO: report this error to httpx
-        return self._client.build_request(  # pyright: ignore[reportUnknownMemberType]
+        request = self._client.build_request(  # pyright: ignore[reportUnknownMemberType]
             headers=headers,
             timeout=self.timeout if isinstance(options.timeout, NotGiven) else options.timeout,
             method=options.method,
@@ -554,6 +695,29 @@ class BaseClient(Generic[_HttpxClientT, _DefaultStreamT]):
             params=self.qs.stringify(cast(Mapping[str, Any], params)) if params else None,
             **kwargs,
         )
+        if spool is not None:
+            spool.apply(request)
+        if is_body_allowed and (options.on_upload_progress is not None or options.min_upload_rate is not None):
+            monitor_upload(
+                request,
+                on_progress=options.on_upload_progress,
+                min_rate=options.min_upload_rate,
+                retries_taken=retries_taken,
+            )
+        return request
+
+    def _should_spool(self, options: FinalRequestOptions, max_retries: int) -> bool:
+        if options.spool_upload is not None:
+            return options.spool_upload
+        # a body that can't be read again has to be spooled for the request to be retried
+        return max_retries > 0 and has_unrewindable_file(options.files)
+
+    def _build_spool_request(self, options: FinalRequestOptions) -> httpx.Request:
+        # progress is reported for sending the body of each attempt, not for spooling it
+        options = model_copy(options)
+        options.on_upload_progress = None
+        options.min_upload_rate = None
+        return self._build_request(options)
 
     def _serialize_multipartform(self, data: Mapping[object, object]) -> dict[str, object]:
         items = self.qs.stringify_items(
@@ -692,6 +856,7 @@ class BaseClient(Generic[_HttpxClientT, _DefaultStreamT]):
     @base_url.setter
     def base_url(self, url: URL | str) -> None:
         self._base_url = self._enforce_trailing_slash(url if isinstance(url, URL) else URL(url))
+        self._prepared_urls.clear()
 
     def platform_headers(self) -> Dict[str, str]:
         # the actual implementation is in a separate `lru_cache` decorated
@@ -738,23 +903,31 @@ class BaseClient(Generic[_HttpxClientT, _DefaultStreamT]):
         remaining_retries: int,
         options: FinalRequestOptions,
         response_headers: Optional[httpx.Headers] = None,
+        *,
+        deadline_at: float | None = None,
     ) -> float:
         max_retries = options.get_max_retries(self.max_retries)
 
         # If the API asks us to wait a certain amount of time (and it's a reasonable amount), just do what it says.
         retry_after = self._parse_retry_after_header(response_headers)
         if retry_after is not None and 0 < retry_after <= 60:
-            return retry_after
+            timeout = retry_after
+        else:
+            # Also cap retry count to 1000 to avoid any potential overflows with `pow`
+            nb_retries = min(max_retries - remaining_retries, 1000)
 
-        # Also cap retry count to 1000 to avoid any potential overflows with `pow`
-        nb_retries = min(max_retries - remaining_retries, 1000)
+            # Apply exponential backoff, but not more than the max.
+            sleep_seconds = min(INITIAL_RETRY_DELAY * pow(2.0, nb_retries), MAX_RETRY_DELAY)
 
-        # Apply exponential backoff, but not more than the max.
-        sleep_seconds = min(INITIAL_RETRY_DELAY * pow(2.0, nb_retries), MAX_RETRY_DELAY)
+            # Apply some jitter, plus-or-minus half a second.
+            jitter = 1 - 0.25 * random()
+            timeout = sleep_seconds * jitter
+
+            if deadline_at is not None:
+                # Don't back off for more than half of the time that is left so that the retry has a chance to complete.
+                # A `Retry-After` past the deadline isn't retried at all, see `_acquire_retry()`.
+                timeout = min(timeout, (deadline_at - time.monotonic()) / 2)
 
-        # Apply some jitter, plus-or-minus half a second.
-        jitter = 1 - 0.25 * random()
-        timeout = sleep_seconds * jitter
         return timeout if timeout >= 0 else 0
 
     def _should_retry(self, response: httpx.Response) -> bool:
@@ -796,10 +969,23 @@ class BaseClient(Generic[_HttpxClientT, _DefaultStreamT]):
         return f"stainless-python-retry-{uuid.uuid4()}"
 
 
+def _ensure_http2_support() -> None:
+    try:
+        import h2  # noqa: F401  # pyright: ignore[reportUnusedImport]
+    except ImportError:
+        raise RuntimeError(
+            "To use HTTP/2 you must have installed the package with the `http2` extra, e.g. `pip install lmnt[http2]`"
+        ) from None
+
+
 class _DefaultHttpxClient(httpx.Client):
     def __init__(self, **kwargs: Any) -> None:
         kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
-        kwargs.setdefault("limits", DEFAULT_CONNECTION_LIMITS)
+        if kwargs.get("http2"):
+            _ensure_http2_support()
+            kwargs.setdefault("limits", DEFAULT_HTTP2_CONNECTION_LIMITS)
+        else:
+            kwargs.setdefault("limits", DEFAULT_CONNECTION_LIMITS)
         kwargs.setdefault("follow_redirects", True)
         super().__init__(**kwargs)
 
@@ -838,9 +1024,19 @@ class SyncAPIClient(BaseClient[httpx.Client, Stream[Any]]):
         base_url: str | URL,
         max_retries: int = DEFAULT_MAX_RETRIES,
         timeout: float | Timeout | None | NotGiven = not_given,
+        deadline: float | None = None,
         http_client: httpx.Client | None = None,
+        http2: bool = False,
         custom_headers: Mapping[str, str] | None = None,
         custom_query: Mapping[str, object] | None = None,
+        on_transfer_metrics: TransferMetricsHook | None = None,
+        rate_limiter: RateLimiter | None = None,
+        usage_tracker: UsageTracker | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        retry_budget: RetryBudget | None = None,
+        endpoint_pool: EndpointPool | None = None,
+        hooks: HookRegistry | None = None,
+        metrics: Metrics | None = None,
         _strict_response_validation: bool,
     ) -> None:
         if not is_given(timeout):
@@ -865,21 +1061,40 @@ class SyncAPIClient(BaseClient[httpx.Client, Stream[Any]]):
             version=version,
             # cast to a valid type because mypy doesn't understand our type narrowing
             timeout=cast(Timeout, timeout),
+            deadline=deadline,
             base_url=base_url,
             max_retries=max_retries,
             custom_query=custom_query,
             custom_headers=custom_headers,
+            on_transfer_metrics=on_transfer_metrics,
+            rate_limiter=rate_limiter,
+            usage_tracker=usage_tracker,
+            circuit_breaker=circuit_breaker,
+            retry_budget=retry_budget,
+            endpoint_pool=endpoint_pool,
+            hooks=hooks,
+            metrics=metrics,
             _strict_response_validation=_strict_response_validation,
         )
+        if http2 and http_client is None:
+            # checked up front so that a half-constructed client wrapper isn't left to be garbage collected
+            _ensure_http2_support()
+
+        self._http2 = http2
         self._client = http_client or SyncHttpxClientWrapper(
             base_url=base_url,
             # cast to a valid type because mypy doesn't understand our type narrowing
             timeout=cast(Timeout, timeout),
+            http2=http2,
         )
 
     def is_closed(self) -> bool:
         return self._client.is_closed
 
+    def _retrieve_account(self) -> AccountRetrieveResponse:
+        """Returns the plan and usage of the account, for reconciling the `usage_tracker`."""
+        raise NotImplementedError()
+
     def close(self) -> None:
         """Close the underlying HTTPX client.
 
@@ -968,107 +1183,286 @@ class SyncAPIClient(BaseClient[httpx.Client, Stream[Any]]):
 
         response: httpx.Response | None = None
         max_retries = input_options.get_max_retries(self.max_retries)
+        deadline = input_options.get_deadline(self.deadline)
+        deadline_at = time.monotonic() + deadline if deadline is not None else None
+        # the body is only metered if something reads the measurements
+        transfer_metrics = (
+            TransferMetrics(
+                method=input_options.method,
+                url=input_options.url,
+                on_complete=self._on_transfer_metrics,
+            )
+            if self._on_transfer_metrics is not None or self.hooks.active
+            else None
+        )
+        # the circuit breaker and the endpoint pool measure the latency of attempts up to the response headers
+        time_headers = (
+            transfer_metrics is not None or self._circuit_breaker is not None or self._endpoint_pool is not None
+        )
+        call_hooks = (
+            self.hooks._start_call(
+                method=input_options.method,
+                url=input_options.url,
+                metrics=transfer_metrics,
+                json_data=input_options.json_data,
+            )
+            if transfer_metrics is not None and self.hooks.active
+            else None
+        )
+        characters = (
+            request_characters(input_options.json_data)
+            if self._rate_limiter is not None or self._usage_tracker is not None
+            else 0
+        )
+        if self._retry_budget is not None:
+            self._retry_budget.record_request()
 
-        retries_taken = 0
-        for retries_taken in range(max_retries + 1):
-            options = model_copy(input_options)
-            options = self._prepare_options(options)
-
-            remaining_retries = max_retries - retries_taken
-            request = self._build_request(options, retries_taken=retries_taken)
-            self._prepare_request(request)
-
-            kwargs: HttpxSendArgs = {}
-            if self.custom_auth is not None:
-                kwargs["auth"] = self.custom_auth
+        # the options only need to be copied for every attempt if a subclass can mutate them
+        copy_options = type(self)._prepare_options is not SyncAPIClient._prepare_options
 
-            if options.follow_redirects is not None:
-                kwargs["follow_redirects"] = options.follow_redirects
+        # the endpoints of the pool that this request failed on, which the following attempts avoid
+        failed_upstreams: List[Endpoint] = []
 
-            log.debug("Sending HTTP Request: %s %s", request.method, request.url)
+        # the request body, encoded once and re-sent by every attempt, if it is spooled
+        spool: SpooledBody | None = None
+        should_spool = self._should_spool(input_options, max_retries)
 
-            response = None
-            try:
-                response = self._client.send(
-                    request,
-                    stream=stream or self._should_stream_response_body(request=request),
-                    **kwargs,
+        # the tracker that counted the characters of the request, until they are either committed or released
+        usage: UsageTracker | None = None
+        try:
+            retries_taken = 0
+            for retries_taken in range(max_retries + 1):
+                options = model_copy(input_options) if copy_options else input_options
+                options = self._prepare_options(options)
+                if should_spool and spool is None:
+                    spool = SpooledBody.from_request(self._build_spool_request(options))
+
+                remaining_retries = max_retries - retries_taken
+                upstream = (
+                    self._endpoint_pool.pick(exclude=failed_upstreams) if self._endpoint_pool is not None else None
                 )
-            except httpx.TimeoutException as err:
-                log.debug("Encountered httpx.TimeoutException", exc_info=True)
-
-                if remaining_retries > 0:
-                    self._sleep_for_retry(
-                        retries_taken=retries_taken,
-                        max_retries=max_retries,
-                        options=input_options,
-                        response=None,
-                    )
-                    continue
-
-                log.debug("Raising timeout error")
-                raise APITimeoutError(request=request) from err
-            except Exception as err:
-                log.debug("Encountered Exception", exc_info=True)
-
-                if remaining_retries > 0:
-                    self._sleep_for_retry(
-                        retries_taken=retries_taken,
-                        max_retries=max_retries,
-                        options=input_options,
-                        response=None,
+                request = self._build_request(
+                    options,
+                    retries_taken=retries_taken,
+                    base_url=upstream.url if upstream is not None else None,
+                    spool=spool,
+                )
+                self._prepare_request(request)
+
+                # the characters are only counted once, by the first attempt, as the retries don't use more of them
+                if self._usage_tracker is not None and characters and usage is None:
+                    if not self._usage_tracker.acquire(
+                        characters, fetch=self._retrieve_account, deadline_at=deadline_at
+                    ):
+                        log.debug("Raising timeout error as the usage tracker wouldn't let the request through in time")
+                        raise APITimeoutError(request=request)
+                    usage = self._usage_tracker
+
+                kwargs: HttpxSendArgs = {}
+                if self.custom_auth is not None:
+                    kwargs["auth"] = self.custom_auth
+
+                if options.follow_redirects is not None:
+                    kwargs["follow_redirects"] = options.follow_redirects
+
+                log.debug("Sending HTTP Request: %s %s", request.method, request.url)
+
+                endpoint: str | None = None
+                if self._circuit_breaker is not None:
+                    endpoint = self._circuit_breaker.endpoint(request.method, request.url.path)
+                    open_for = self._circuit_breaker.acquire(endpoint)
+                    if open_for is not None:
+                        log.debug("Circuit breaker for %s is open, failing fast", endpoint)
+                        raise CircuitOpenError(endpoint=endpoint, retry_after=open_for, request=request)
+
+                if self._rate_limiter is not None and not self._rate_limiter.acquire(
+                    characters=characters, deadline_at=deadline_at
+                ):
+                    log.debug("Raising timeout error as the rate limiter wouldn't let the request through in time")
+                    raise APITimeoutError(request=request)
+
+                self._apply_deadline(request, deadline_at)
+
+                if upstream is not None and self._endpoint_pool is not None:
+                    self._endpoint_pool.start(upstream)
+
+                response = None
+                headers_received_at: float | None = None
+                if transfer_metrics is not None:
+                    transfer_metrics._start_attempt()
+                attempt_started_at = time.monotonic()
+                if call_hooks is not None:
+                    call_hooks.attempt(request)
+                try:
+                    # If the body is metered as it arrives, or the time until the headers is needed, we ask
+                    # httpx for a streamed response and then read it ourselves if the caller didn't ask for one.
+                    should_stream = stream or self._should_stream_response_body(request=request)
+                    response = self._client.send(request, stream=should_stream or time_headers, **kwargs)
+                    headers_received_at = time.monotonic()
+                    if transfer_metrics is not None:
+                        transfer_metrics._record_headers(response)
+                    if call_hooks is not None:
+                        call_hooks.response(response)
+                    if time_headers and not should_stream:
+                        try:
+                            response.read()
+                        except BaseException:
+                            if transfer_metrics is not None:
+                                transfer_metrics._abandon_attempt()
+                            response.close()
+                            raise
+                except httpx.TimeoutException as err:
+                    log.debug("Encountered httpx.TimeoutException", exc_info=True)
+                    self._record_circuit_attempt(endpoint, failed=True, started_at=attempt_started_at)
+                    failed_over = self._finish_upstream(
+                        upstream,
+                        failed_upstreams,
+                        failed=isinstance(err, httpx.ConnectTimeout),
+                        started_at=attempt_started_at,
                     )
-                    continue
-
-                log.debug("Raising connection error")
-                raise APIConnectionError(request=request) from err
-
-            log.debug(
-                'HTTP Response: %s %s "%i %s" %s',
-                request.method,
-                request.url,
-                response.status_code,
-                response.reason_phrase,
-                response.headers,
-            )
 
-            try:
-                response.raise_for_status()
-            except httpx.HTTPStatusError as err:  # thrown on 4xx and 5xx status code
-                log.debug("Encountered httpx.HTTPStatusError", exc_info=True)
-
-                if remaining_retries > 0 and self._should_retry(err.response):
-                    err.response.close()
-                    self._sleep_for_retry(
-                        retries_taken=retries_taken,
-                        max_retries=max_retries,
-                        options=input_options,
-                        response=response,
+                    if remaining_retries > 0 and self._acquire_retry(deadline_at):
+                        if call_hooks is not None:
+                            call_hooks.retry(err)
+                        if failed_over:
+                            log.debug("Failing over to another endpoint")
+                            continue
+
+                        self._sleep_for_retry(
+                            retries_taken=retries_taken,
+                            max_retries=max_retries,
+                            options=input_options,
+                            deadline_at=deadline_at,
+                            response=None,
+                        )
+                        continue
+
+                    log.debug("Raising timeout error")
+                    raise APITimeoutError(request=request) from err
+                except Exception as err:
+                    log.debug("Encountered Exception", exc_info=True)
+                    self._record_circuit_attempt(endpoint, failed=True, started_at=attempt_started_at)
+                    failed_over = self._finish_upstream(
+                        upstream,
+                        failed_upstreams,
+                        failed=isinstance(err, httpx.ConnectError),
+                        started_at=attempt_started_at,
                     )
-                    continue
-
-                # If the response is streamed then we need to explicitly read the response
-                # to completion before attempting to access the response text.
-                if not err.response.is_closed:
-                    err.response.read()
 
-                log.debug("Re-raising status error")
-                raise self._make_status_error_from_response(err.response) from None
+                    if remaining_retries > 0 and self._acquire_retry(deadline_at):
+                        if call_hooks is not None:
+                            call_hooks.retry(err)
+                        if failed_over:
+                            log.debug("Failing over to another endpoint")
+                            continue
+
+                        self._sleep_for_retry(
+                            retries_taken=retries_taken,
+                            max_retries=max_retries,
+                            options=input_options,
+                            deadline_at=deadline_at,
+                            response=None,
+                        )
+                        continue
+
+                    log.debug("Raising connection error")
+                    if isinstance(err, UploadStalledError):
+                        raise
+                    raise APIConnectionError(request=request) from err
+
+                log.debug(
+                    'HTTP Response: %s %s "%i %s" %s',
+                    request.method,
+                    request.url,
+                    response.status_code,
+                    response.reason_phrase,
+                    response.headers,
+                )
 
-            break
+                if self._rate_limiter is not None:
+                    self._rate_limiter.record_response(
+                        response.status_code, retry_after=self._parse_retry_after_header(response.headers)
+                    )
+                self._record_circuit_attempt(
+                    endpoint,
+                    failed=response.status_code >= 500,
+                    started_at=attempt_started_at,
+                    finished_at=headers_received_at,
+                )
+                self._finish_upstream(
+                    upstream,
+                    failed_upstreams,
+                    failed=response.status_code in _GATEWAY_ERROR_CODES,
+                    started_at=attempt_started_at,
+                    finished_at=headers_received_at,
+                )
 
-        assert response is not None, "could not resolve response (should never happen)"
-        return self._process_response(
-            cast_to=cast_to,
-            options=options,
-            response=response,
-            stream=stream,
-            stream_cls=stream_cls,
-            retries_taken=retries_taken,
-        )
+                try:
+                    response.raise_for_status()
+                except httpx.HTTPStatusError as err:  # thrown on 4xx and 5xx status code
+                    log.debug("Encountered httpx.HTTPStatusError", exc_info=True)
+
+                    if (
+                        remaining_retries > 0
+                        and self._should_retry(err.response)
+                        and self._acquire_retry(deadline_at, err.response.headers)
+                    ):
+                        if call_hooks is not None:
+                            call_hooks.retry(err)
+                        if transfer_metrics is not None:
+                            transfer_metrics._abandon_attempt()
+                        err.response.close()
+                        self._sleep_for_retry(
+                            retries_taken=retries_taken,
+                            max_retries=max_retries,
+                            options=input_options,
+                            deadline_at=deadline_at,
+                            response=response,
+                        )
+                        continue
+
+                    # If the response is streamed then we need to explicitly read the response
+                    # to completion before attempting to access the response text.
+                    if not err.response.is_closed:
+                        err.response.read()
+
+                    log.debug("Re-raising status error")
+                    raise self._make_status_error_from_response(err.response) from None
+
+                break
+
+            assert response is not None, "could not resolve response (should never happen)"
+            result = self._process_response(
+                cast_to=cast_to,
+                options=options,
+                response=response,
+                stream=stream,
+                stream_cls=stream_cls,
+                retries_taken=retries_taken,
+                transfer_metrics=transfer_metrics,
+            )
+            if usage is not None:
+                usage.commit(characters)
+                usage = None
+            return result
+        except Exception as err:
+            if call_hooks is not None:
+                call_hooks.error(err)
+            raise
+        finally:
+            if spool is not None:
+                spool.close()
+            if usage is not None:
+                usage.release(characters)
 
     def _sleep_for_retry(
-        self, *, retries_taken: int, max_retries: int, options: FinalRequestOptions, response: httpx.Response | None
+        self,
+        *,
+        retries_taken: int,
+        max_retries: int,
+        options: FinalRequestOptions,
+        response: httpx.Response | None,
+        deadline_at: float | None = None,
     ) -> None:
         remaining_retries = max_retries - retries_taken
         if remaining_retries == 1:
@@ -1076,7 +1470,9 @@ class SyncAPIClient(BaseClient[httpx.Client, Stream[Any]]):
         else:
             log.debug("%i retries left", remaining_retries)
 
-        timeout = self._calculate_retry_timeout(remaining_retries, options, response.headers if response else None)
+        timeout = self._calculate_retry_timeout(
+            remaining_retries, options, response.headers if response else None, deadline_at=deadline_at
+        )
         log.info("Retrying request to %s in %f seconds", options.url, timeout)
 
         time.sleep(timeout)
@@ -1090,6 +1486,7 @@ class SyncAPIClient(BaseClient[httpx.Client, Stream[Any]]):
         stream: bool,
         stream_cls: type[Stream[Any]] | type[AsyncStream[Any]] | None,
         retries_taken: int = 0,
+        transfer_metrics: TransferMetrics | None = None,
     ) -> ResponseT:
         origin = get_origin(cast_to) or cast_to
 
@@ -1115,6 +1512,7 @@ class SyncAPIClient(BaseClient[httpx.Client, Stream[Any]]):
                     stream_cls=stream_cls,
                     options=options,
                     retries_taken=retries_taken,
+                    transfer_metrics=transfer_metrics,
                 ),
             )
 
@@ -1129,6 +1527,7 @@ class SyncAPIClient(BaseClient[httpx.Client, Stream[Any]]):
             stream_cls=stream_cls,
             options=options,
             retries_taken=retries_taken,
+            transfer_metrics=transfer_metrics,
         )
         if bool(response.request.headers.get(RAW_RESPONSE_HEADER)):
             return cast(ResponseT, api_response)
@@ -1306,7 +1705,11 @@ class SyncAPIClient(BaseClient[httpx.Client, Stream[Any]]):
 class _DefaultAsyncHttpxClient(httpx.AsyncClient):
     def __init__(self, **kwargs: Any) -> None:
         kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
-        kwargs.setdefault("limits", DEFAULT_CONNECTION_LIMITS)
+        if kwargs.get("http2"):
+            _ensure_http2_support()
+            kwargs.setdefault("limits", DEFAULT_HTTP2_CONNECTION_LIMITS)
+        else:
+            kwargs.setdefault("limits", DEFAULT_CONNECTION_LIMITS)
         kwargs.setdefault("follow_redirects", True)
         super().__init__(**kwargs)
 
@@ -1369,9 +1772,19 @@ class AsyncAPIClient(BaseClient[httpx.AsyncClient, AsyncStream[Any]]):
         _strict_response_validation: bool,
         max_retries: int = DEFAULT_MAX_RETRIES,
         timeout: float | Timeout | None | NotGiven = not_given,
+        deadline: float | None = None,
         http_client: httpx.AsyncClient | None = None,
+        http2: bool = False,
         custom_headers: Mapping[str, str] | None = None,
         custom_query: Mapping[str, object] | None = None,
+        on_transfer_metrics: TransferMetricsHook | None = None,
+        rate_limiter: RateLimiter | None = None,
+        usage_tracker: UsageTracker | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        retry_budget: RetryBudget | None = None,
+        endpoint_pool: EndpointPool | None = None,
+        hooks: HookRegistry | None = None,
+        metrics: Metrics | None = None,
     ) -> None:
         if not is_given(timeout):
             # if the user passed in a custom http client with a non-default
@@ -1396,20 +1809,39 @@ class AsyncAPIClient(BaseClient[httpx.AsyncClient, AsyncStream[Any]]):
             base_url=base_url,
             # cast to a valid type because mypy doesn't understand our type narrowing
             timeout=cast(Timeout, timeout),
+            deadline=deadline,
             max_retries=max_retries,
             custom_query=custom_query,
             custom_headers=custom_headers,
+            on_transfer_metrics=on_transfer_metrics,
+            rate_limiter=rate_limiter,
+            usage_tracker=usage_tracker,
+            circuit_breaker=circuit_breaker,
+            retry_budget=retry_budget,
+            endpoint_pool=endpoint_pool,
+            hooks=hooks,
+            metrics=metrics,
             _strict_response_validation=_strict_response_validation,
         )
+        if http2 and http_client is None:
+            # checked up front so that a half-constructed client wrapper isn't left to be garbage collected
+            _ensure_http2_support()
+
+        self._http2 = http2
         self._client = http_client or AsyncHttpxClientWrapper(
             base_url=base_url,
             # cast to a valid type because mypy doesn't understand our type narrowing
             timeout=cast(Timeout, timeout),
+            http2=http2,
         )
 
     def is_closed(self) -> bool:
         return self._client.is_closed
 
+    async def _retrieve_account(self) -> AccountRetrieveResponse:
+        """Returns the plan and usage of the account, for reconciling the `usage_tracker`."""
+        raise NotImplementedError()
+
     async def close(self) -> None:
         """Close the underlying HTTPX client.
 
@@ -1500,107 +1932,286 @@ class AsyncAPIClient(BaseClient[httpx.AsyncClient, AsyncStream[Any]]):
 
         response: httpx.Response | None = None
         max_retries = input_options.get_max_retries(self.max_retries)
+        deadline = input_options.get_deadline(self.deadline)
+        deadline_at = time.monotonic() + deadline if deadline is not None else None
+        # the body is only metered if something reads the measurements
+        transfer_metrics = (
+            TransferMetrics(
+                method=input_options.method,
+                url=input_options.url,
+                on_complete=self._on_transfer_metrics,
+            )
+            if self._on_transfer_metrics is not None or self.hooks.active
+            else None
+        )
+        # the circuit breaker and the endpoint pool measure the latency of attempts up to the response headers
+        time_headers = (
+            transfer_metrics is not None or self._circuit_breaker is not None or self._endpoint_pool is not None
+        )
+        call_hooks = (
+            self.hooks._start_call(
+                method=input_options.method,
+                url=input_options.url,
+                metrics=transfer_metrics,
+                json_data=input_options.json_data,
+            )
+            if transfer_metrics is not None and self.hooks.active
+            else None
+        )
+        characters = (
+            request_characters(input_options.json_data)
+            if self._rate_limiter is not None or self._usage_tracker is not None
+            else 0
+        )
+        if self._retry_budget is not None:
+            self._retry_budget.record_request()
 
-        retries_taken = 0
-        for retries_taken in range(max_retries + 1):
-            options = model_copy(input_options)
-            options = await self._prepare_options(options)
-
-            remaining_retries = max_retries - retries_taken
-            request = self._build_request(options, retries_taken=retries_taken)
-            await self._prepare_request(request)
-
-            kwargs: HttpxSendArgs = {}
-            if self.custom_auth is not None:
-                kwargs["auth"] = self.custom_auth
+        # the options only need to be copied for every attempt if a subclass can mutate them
+        copy_options = type(self)._prepare_options is not AsyncAPIClient._prepare_options
 
-            if options.follow_redirects is not None:
-                kwargs["follow_redirects"] = options.follow_redirects
+        # the endpoints of the pool that this request failed on, which the following attempts avoid
+        failed_upstreams: List[Endpoint] = []
 
-            log.debug("Sending HTTP Request: %s %s", request.method, request.url)
+        # the request body, encoded once and re-sent by every attempt, if it is spooled
+        spool: SpooledBody | None = None
+        should_spool = self._should_spool(input_options, max_retries)
 
-            response = None
-            try:
-                response = await self._client.send(
-                    request,
-                    stream=stream or self._should_stream_response_body(request=request),
-                    **kwargs,
+        # the tracker that counted the characters of the request, until they are either committed or released
+        usage: UsageTracker | None = None
+        try:
+            retries_taken = 0
+            for retries_taken in range(max_retries + 1):
+                options = model_copy(input_options) if copy_options else input_options
+                options = await self._prepare_options(options)
+                if should_spool and spool is None:
+                    spool = await asyncify(SpooledBody.from_request)(self._build_spool_request(options))
+
+                remaining_retries = max_retries - retries_taken
+                upstream = (
+                    self._endpoint_pool.pick(exclude=failed_upstreams) if self._endpoint_pool is not None else None
                 )
-            except httpx.TimeoutException as err:
-                log.debug("Encountered httpx.TimeoutException", exc_info=True)
-
-                if remaining_retries > 0:
-                    await self._sleep_for_retry(
-                        retries_taken=retries_taken,
-                        max_retries=max_retries,
-                        options=input_options,
-                        response=None,
-                    )
-                    continue
-
-                log.debug("Raising timeout error")
-                raise APITimeoutError(request=request) from err
-            except Exception as err:
-                log.debug("Encountered Exception", exc_info=True)
-
-                if remaining_retries > 0:
-                    await self._sleep_for_retry(
-                        retries_taken=retries_taken,
-                        max_retries=max_retries,
-                        options=input_options,
-                        response=None,
+                request = self._build_request(
+                    options,
+                    retries_taken=retries_taken,
+                    base_url=upstream.url if upstream is not None else None,
+                    spool=spool,
+                )
+                await self._prepare_request(request)
+
+                # the characters are only counted once, by the first attempt, as the retries don't use more of them
+                if self._usage_tracker is not None and characters and usage is None:
+                    if not await self._usage_tracker.async_acquire(
+                        characters, fetch=self._retrieve_account, deadline_at=deadline_at
+                    ):
+                        log.debug("Raising timeout error as the usage tracker wouldn't let the request through in time")
+                        raise APITimeoutError(request=request)
+                    usage = self._usage_tracker
+
+                kwargs: HttpxSendArgs = {}
+                if self.custom_auth is not None:
+                    kwargs["auth"] = self.custom_auth
+
+                if options.follow_redirects is not None:
+                    kwargs["follow_redirects"] = options.follow_redirects
+
+                log.debug("Sending HTTP Request: %s %s", request.method, request.url)
+
+                endpoint: str | None = None
+                if self._circuit_breaker is not None:
+                    endpoint = self._circuit_breaker.endpoint(request.method, request.url.path)
+                    open_for = self._circuit_breaker.acquire(endpoint)
+                    if open_for is not None:
+                        log.debug("Circuit breaker for %s is open, failing fast", endpoint)
+                        raise CircuitOpenError(endpoint=endpoint, retry_after=open_for, request=request)
+
+                if self._rate_limiter is not None and not await self._rate_limiter.async_acquire(
+                    characters=characters, deadline_at=deadline_at
+                ):
+                    log.debug("Raising timeout error as the rate limiter wouldn't let the request through in time")
+                    raise APITimeoutError(request=request)
+
+                self._apply_deadline(request, deadline_at)
+
+                if upstream is not None and self._endpoint_pool is not None:
+                    self._endpoint_pool.start(upstream)
+
+                response = None
+                headers_received_at: float | None = None
+                if transfer_metrics is not None:
+                    transfer_metrics._start_attempt()
+                attempt_started_at = time.monotonic()
+                if call_hooks is not None:
+                    call_hooks.attempt(request, is_async=True)
+                try:
+                    # If the body is metered as it arrives, or the time until the headers is needed, we ask
+                    # httpx for a streamed response and then read it ourselves if the caller didn't ask for one.
+                    should_stream = stream or self._should_stream_response_body(request=request)
+                    response = await self._client.send(request, stream=should_stream or time_headers, **kwargs)
+                    headers_received_at = time.monotonic()
+                    if transfer_metrics is not None:
+                        transfer_metrics._record_headers(response)
+                    if call_hooks is not None:
+                        call_hooks.response(response)
+                    if time_headers and not should_stream:
+                        try:
+                            await response.aread()
+                        except BaseException:
+                            if transfer_metrics is not None:
+                                transfer_metrics._abandon_attempt()
+                            await response.aclose()
+                            raise
+                except httpx.TimeoutException as err:
+                    log.debug("Encountered httpx.TimeoutException", exc_info=True)
+                    self._record_circuit_attempt(endpoint, failed=True, started_at=attempt_started_at)
+                    failed_over = self._finish_upstream(
+                        upstream,
+                        failed_upstreams,
+                        failed=isinstance(err, httpx.ConnectTimeout),
+                        started_at=attempt_started_at,
                     )
-                    continue
-
-                log.debug("Raising connection error")
-                raise APIConnectionError(request=request) from err
-
-            log.debug(
-                'HTTP Response: %s %s "%i %s" %s',
-                request.method,
-                request.url,
-                response.status_code,
-                response.reason_phrase,
-                response.headers,
-            )
 
-            try:
-                response.raise_for_status()
-            except httpx.HTTPStatusError as err:  # thrown on 4xx and 5xx status code
-                log.debug("Encountered httpx.HTTPStatusError", exc_info=True)
-
-                if remaining_retries > 0 and self._should_retry(err.response):
-                    await err.response.aclose()
-                    await self._sleep_for_retry(
-                        retries_taken=retries_taken,
-                        max_retries=max_retries,
-                        options=input_options,
-                        response=response,
+                    if remaining_retries > 0 and self._acquire_retry(deadline_at):
+                        if call_hooks is not None:
+                            call_hooks.retry(err)
+                        if failed_over:
+                            log.debug("Failing over to another endpoint")
+                            continue
+
+                        await self._sleep_for_retry(
+                            retries_taken=retries_taken,
+                            max_retries=max_retries,
+                            options=input_options,
+                            deadline_at=deadline_at,
+                            response=None,
+                        )
+                        continue
+
+                    log.debug("Raising timeout error")
+                    raise APITimeoutError(request=request) from err
+                except Exception as err:
+                    log.debug("Encountered Exception", exc_info=True)
+                    self._record_circuit_attempt(endpoint, failed=True, started_at=attempt_started_at)
+                    failed_over = self._finish_upstream(
+                        upstream,
+                        failed_upstreams,
+                        failed=isinstance(err, httpx.ConnectError),
+                        started_at=attempt_started_at,
                     )
-                    continue
-
-                # If the response is streamed then we need to explicitly read the response
-                # to completion before attempting to access the response text.
-                if not err.response.is_closed:
-                    await err.response.aread()
 
-                log.debug("Re-raising status error")
-                raise self._make_status_error_from_response(err.response) from None
+                    if remaining_retries > 0 and self._acquire_retry(deadline_at):
+                        if call_hooks is not None:
+                            call_hooks.retry(err)
+                        if failed_over:
+                            log.debug("Failing over to another endpoint")
+                            continue
+
+                        await self._sleep_for_retry(
+                            retries_taken=retries_taken,
+                            max_retries=max_retries,
+                            options=input_options,
+                            deadline_at=deadline_at,
+                            response=None,
+                        )
+                        continue
+
+                    log.debug("Raising connection error")
+                    if isinstance(err, UploadStalledError):
+                        raise
+                    raise APIConnectionError(request=request) from err
+
+                log.debug(
+                    'HTTP Response: %s %s "%i %s" %s',
+                    request.method,
+                    request.url,
+                    response.status_code,
+                    response.reason_phrase,
+                    response.headers,
+                )
 
-            break
+                if self._rate_limiter is not None:
+                    self._rate_limiter.record_response(
+                        response.status_code, retry_after=self._parse_retry_after_header(response.headers)
+                    )
+                self._record_circuit_attempt(
+                    endpoint,
+                    failed=response.status_code >= 500,
+                    started_at=attempt_started_at,
+                    finished_at=headers_received_at,
+                )
+                self._finish_upstream(
+                    upstream,
+                    failed_upstreams,
+                    failed=response.status_code in _GATEWAY_ERROR_CODES,
+                    started_at=attempt_started_at,
+                    finished_at=headers_received_at,
+                )
 
-        assert response is not None, "could not resolve response (should never happen)"
-        return await self._process_response(
-            cast_to=cast_to,
-            options=options,
-            response=response,
-            stream=stream,
-            stream_cls=stream_cls,
-            retries_taken=retries_taken,
-        )
+                try:
+                    response.raise_for_status()
+                except httpx.HTTPStatusError as err:  # thrown on 4xx and 5xx status code
+                    log.debug("Encountered httpx.HTTPStatusError", exc_info=True)
+
+                    if (
+                        remaining_retries > 0
+                        and self._should_retry(err.response)
+                        and self._acquire_retry(deadline_at, err.response.headers)
+                    ):
+                        if call_hooks is not None:
+                            call_hooks.retry(err)
+                        if transfer_metrics is not None:
+                            transfer_metrics._abandon_attempt()
+                        await err.response.aclose()
+                        await self._sleep_for_retry(
+                            retries_taken=retries_taken,
+                            max_retries=max_retries,
+                            options=input_options,
+                            deadline_at=deadline_at,
+                            response=response,
+                        )
+                        continue
+
+                    # If the response is streamed then we need to explicitly read the response
+                    # to completion before attempting to access the response text.
+                    if not err.response.is_closed:
+                        await err.response.aread()
+
+                    log.debug("Re-raising status error")
+                    raise self._make_status_error_from_response(err.response) from None
+
+                break
+
+            assert response is not None, "could not resolve response (should never happen)"
+            result = await self._process_response(
+                cast_to=cast_to,
+                options=options,
+                response=response,
+                stream=stream,
+                stream_cls=stream_cls,
+                retries_taken=retries_taken,
+                transfer_metrics=transfer_metrics,
+            )
+            if usage is not None:
+                usage.commit(characters)
+                usage = None
+            return result
+        except Exception as err:
+            if call_hooks is not None:
+                call_hooks.error(err)
+            raise
+        finally:
+            if spool is not None:
+                spool.close()
+            if usage is not None:
+                usage.release(characters)
 
     async def _sleep_for_retry(
-        self, *, retries_taken: int, max_retries: int, options: FinalRequestOptions, response: httpx.Response | None
+        self,
+        *,
+        retries_taken: int,
+        max_retries: int,
+        options: FinalRequestOptions,
+        response: httpx.Response | None,
+        deadline_at: float | None = None,
     ) -> None:
         remaining_retries = max_retries - retries_taken
         if remaining_retries == 1:
@@ -1608,7 +2219,9 @@ class AsyncAPIClient(BaseClient[httpx.AsyncClient, AsyncStream[Any]]):
         else:
             log.debug("%i retries left", remaining_retries)
 
-        timeout = self._calculate_retry_timeout(remaining_retries, options, response.headers if response else None)
+        timeout = self._calculate_retry_timeout(
+            remaining_retries, options, response.headers if response else None, deadline_at=deadline_at
+        )
         log.info("Retrying request to %s in %f seconds", options.url, timeout)
 
         await anyio.sleep(timeout)
@@ -1622,6 +2235,7 @@ class AsyncAPIClient(BaseClient[httpx.AsyncClient, AsyncStream[Any]]):
         stream: bool,
         stream_cls: type[Stream[Any]] | type[AsyncStream[Any]] | None,
         retries_taken: int = 0,
+        transfer_metrics: TransferMetrics | None = None,
     ) -> ResponseT:
         origin = get_origin(cast_to) or cast_to
 
@@ -1647,6 +2261,7 @@ class AsyncAPIClient(BaseClient[httpx.AsyncClient, AsyncStream[Any]]):
                     stream_cls=stream_cls,
                     options=options,
                     retries_taken=retries_taken,
+                    transfer_metrics=transfer_metrics,
                 ),
             )
 
@@ -1661,6 +2276,7 @@ class AsyncAPIClient(BaseClient[httpx.AsyncClient, AsyncStream[Any]]):
             stream_cls=stream_cls,
             options=options,
             retries_taken=retries_taken,
+            transfer_metrics=transfer_metrics,
         )
         if bool(response.request.headers.get(RAW_RESPONSE_HEADER)):
             return cast(ResponseT, api_response)
@@ -1831,6 +2447,10 @@ def make_request_options(
     extra_body: Body | None = None,
     idempotency_key: str | None = None,
     timeout: float | httpx.Timeout | None | NotGiven = not_given,
+    deadline: float | None | NotGiven = not_given,
+    on_upload_progress: UploadProgressHook | None = None,
+    min_upload_rate: float | None = None,
+    spool_upload: bool | None = None,
     post_parser: PostParser | NotGiven = not_given,
 ) -> RequestOptions:
     """Create a dict of type RequestOptions without keys of NotGiven values."""
@@ -1850,6 +2470,18 @@ def make_request_options(
     if not isinstance(timeout, NotGiven):
         options["timeout"] = timeout
 
+    if not isinstance(deadline, NotGiven):
+        options["deadline"] = deadline
+
+    if on_upload_progress is not None:
+        options["on_upload_progress"] = on_upload_progress
+
+    if min_upload_rate is not None:
+        options["min_upload_rate"] = min_upload_rate
+
+    if spool_upload is not None:
+        options["spool_upload"] = spool_upload
+
     if idempotency_key is not None:
         options["idempotency_key"] = idempotency_key
 
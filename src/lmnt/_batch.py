@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+import time
+import logging
+import threading
+from typing import Any, List, Generic, Mapping, TypeVar, Callable, Iterable, Optional, Awaitable
+from typing_extensions import override
+from concurrent.futures import ThreadPoolExecutor
+
+import anyio
+
+__all__ = ["BatchResult", "BatchProgress", "BatchProgressHook"]
+
+log: logging.Logger = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+
+DEFAULT_BATCH_CONCURRENCY = 8
+
+
+class BatchResult(Generic[_T]):
+    """The outcome of one item of a batch operation, e.g. `voices.update_many()`."""
+
+    id: str
+    """The ID of the voice that the item is for."""
+
+    value: Optional[_T]
+    """The response for the item, or `None` if it failed."""
+
+    error: Optional[Exception]
+    """The error raised for the item, e.g. an `APIStatusError`, or `None` if it succeeded."""
+
+    def __init__(self, id: str, *, value: Optional[_T] = None, error: Optional[Exception] = None) -> None:
+        self.id = id
+        self.value = value
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @override
+    def __repr__(self) -> str:
+        outcome = f"value={self.value!r}" if self.error is None else f"error={self.error!r}"
+        return f"BatchResult(id={self.id!r}, {outcome})"
+
+
+class BatchProgress:
+    """The progress of a batch operation, passed to its `on_progress` callback after every item."""
+
+    completed: int
+    """The number of items that finished, successfully or not."""
+
+    failed: int
+    """The number of the completed items that failed."""
+
+    total: int
+    elapsed: float
+    """The number of seconds since the batch started."""
+
+    def __init__(self, *, completed: int, failed: int, total: int, elapsed: float) -> None:
+        self.completed = completed
+        self.failed = failed
+        self.total = total
+        self.elapsed = elapsed
+
+    @property
+    def succeeded(self) -> int:
+        return self.completed - self.failed
+
+    @property
+    def fraction(self) -> float:
+        return self.completed / self.total if self.total else 1.0
+
+    @override
+    def __repr__(self) -> str:
+        return (
+            f"BatchProgress(completed={self.completed}, failed={self.failed}, total={self.total}, "
+            f"elapsed={self.elapsed:.3f})"
+        )
+
+
+BatchProgressHook = Callable[[BatchProgress], None]
+
+
+class _Tracker:
+    def __init__(self, total: int, on_progress: Optional[BatchProgressHook]) -> None:
+        self._total = total
+        self._on_progress = on_progress
+        self._lock = threading.Lock()
+        self._completed = 0
+        self._failed = 0
+        self._started_at = time.monotonic()
+
+    def finished(self, *, failed: bool) -> None:
+        with self._lock:
+            self._completed += 1
+            self._failed += failed
+            progress = BatchProgress(
+                completed=self._completed,
+                failed=self._failed,
+                total=self._total,
+                elapsed=time.monotonic() - self._started_at,
+            )
+            if self._on_progress is None:
+                return
+            # called while holding the lock so that the callback sees the progress in order
+            try:
+                self._on_progress(progress)
+            except Exception:
+                log.warning("Exception raised in `on_progress` callback", exc_info=True)
+
+
+def run_batch(
+    items: Iterable[_T],
+    operation: Callable[[_T], _R],
+    *,
+    key: Callable[[_T], str],
+    concurrency: int,
+    on_progress: Optional[BatchProgressHook],
+) -> List[BatchResult[_R]]:
+    """Applies the operation to every item on a pool of `concurrency` threads, returning the results in order."""
+    items = list(items)
+    _check_concurrency(concurrency)
+    tracker = _Tracker(len(items), on_progress)
+
+    def run(item: _T) -> BatchResult[_R]:
+        try:
+            result = BatchResult(key(item), value=operation(item))
+        except Exception as err:
+            log.debug("Batch item %s failed", key(item), exc_info=True)
+            result = BatchResult[_R](key(item), error=err)
+        tracker.finished(failed=not result.ok)
+        return result
+
+    if not items:
+        return []
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(items)), thread_name_prefix="lmnt-batch") as executor:
+        return list(executor.map(run, items))
+
+
+async def async_run_batch(
+    items: Iterable[_T],
+    operation: Callable[[_T], Awaitable[_R]],
+    *,
+    key: Callable[[_T], str],
+    concurrency: int,
+    on_progress: Optional[BatchProgressHook],
+) -> List[BatchResult[_R]]:
+    """Applies the operation to every item, at most `concurrency` at a time, returning the results in order."""
+    items = list(items)
+    _check_concurrency(concurrency)
+    tracker = _Tracker(len(items), on_progress)
+    semaphore = anyio.Semaphore(concurrency)
+    results: List[Any] = [None] * len(items)
+
+    async def run(index: int, item: _T) -> None:
+        async with semaphore:
+            try:
+                result = BatchResult(key(item), value=await operation(item))
+            except Exception as err:
+                log.debug("Batch item %s failed", key(item), exc_info=True)
+                result = BatchResult[_R](key(item), error=err)
+        results[index] = result
+        tracker.finished(failed=not result.ok)
+
+    async with anyio.create_task_group() as tg:
+        for index, item in enumerate(items):
+            tg.start_soon(run, index, item)
+    return results
+
+
+def run_batch_by_id(
+    method: Callable[..., _R],
+    ids: Iterable[str],
+    *,
+    concurrency: int,
+    on_progress: Optional[BatchProgressHook],
+    **kwargs: Any,
+) -> List[BatchResult[_R]]:
+    """Calls the resource method for every ID with the given keyword arguments, as a batch keyed by the IDs."""
+    return run_batch(
+        ids,
+        lambda id: method(id, **kwargs),
+        key=lambda id: id,
+        concurrency=concurrency,
+        on_progress=on_progress,
+    )
+
+
+def run_batch_by_id_with_params(
+    method: Callable[..., _R],
+    params: Mapping[str, Mapping[str, Any]],
+    *,
+    concurrency: int,
+    on_progress: Optional[BatchProgressHook],
+    **kwargs: Any,
+) -> List[BatchResult[_R]]:
+    """Calls the resource method for every ID with its own parameters and the given keyword arguments, as a batch
+    keyed by the IDs."""
+    return run_batch(
+        params.items(),
+        lambda item: method(item[0], **item[1], **kwargs),
+        key=lambda item: item[0],
+        concurrency=concurrency,
+        on_progress=on_progress,
+    )
+
+
+async def async_run_batch_by_id(
+    method: Callable[..., Awaitable[_R]],
+    ids: Iterable[str],
+    *,
+    concurrency: int,
+    on_progress: Optional[BatchProgressHook],
+    **kwargs: Any,
+) -> List[BatchResult[_R]]:
+    """Calls the resource method for every ID with the given keyword arguments, as a batch keyed by the IDs."""
+    return await async_run_batch(
+        ids,
+        lambda id: method(id, **kwargs),
+        key=lambda id: id,
+        concurrency=concurrency,
+        on_progress=on_progress,
+    )
+
+
+async def async_run_batch_by_id_with_params(
+    method: Callable[..., Awaitable[_R]],
+    params: Mapping[str, Mapping[str, Any]],
+    *,
+    concurrency: int,
+    on_progress: Optional[BatchProgressHook],
+    **kwargs: Any,
+) -> List[BatchResult[_R]]:
+    """Calls the resource method for every ID with its own parameters and the given keyword arguments, as a batch
+    keyed by the IDs."""
+    return await async_run_batch(
+        params.items(),
+        lambda item: method(item[0], **item[1], **kwargs),
+        key=lambda item: item[0],
+        concurrency=concurrency,
+        on_progress=on_progress,
+    )
+
+
+def _check_concurrency(concurrency: int) -> None:
+    if concurrency < 1:
+        raise ValueError(f"`concurrency` must be at least 1 but received {concurrency}")
@@ -0,0 +1,305 @@
+from __future__ import annotations
+
+import re
+import time
+import logging
+import threading
+from typing import Dict, List, Tuple, Callable, Optional
+from collections import deque
+from typing_extensions import Literal
+
+__all__ = ["CircuitBreaker", "CircuitState", "CircuitStateChangeHook"]
+
+log: logging.Logger = logging.getLogger(__name__)
+
+CircuitState = Literal["closed", "open", "half_open"]
+
+CircuitStateChangeHook = Callable[[str, CircuitState, CircuitState], None]
+"""Called with the endpoint, the previous state and the new state whenever a circuit changes state."""
+
+# the paths of the API's endpoints, with the segments that identify a resource in braces;
+# matched in order, so the fixed paths come before the templated ones that would also match them
+_ROUTES = (
+    "/v1/account",
+    "/v1/ai/speech",
+    "/v1/ai/speech/bytes",
+    "/v1/ai/voice",
+    "/v1/ai/voice/list",
+    "/v1/ai/voice/{id}",
+)
+
+
+def _compile_route(route: str) -> re.Pattern[str]:
+    # anything before the route, e.g. the path of a proxy's base URL, is kept as is
+    pattern = re.sub(r"\\\{\w+\\\}", "[^/]+", re.escape(route))
+    return re.compile(rf"^(?P<prefix>.*?){pattern}/?$")
+
+
+_ROUTE_PATTERNS = [(_compile_route(route), route) for route in _ROUTES]
+
+# the number of endpoints whose state is tracked before closed circuits are forgotten
+_MAX_CIRCUITS = 256
+
+
+def endpoint_key(method: str, url: str) -> str:
+    """Returns the endpoint a request is made to, e.g. `DELETE /v1/ai/voice/{id}`.
+
+    The path is matched against the API's routes, so that every request to the same endpoint
+    shares one circuit, regardless of the resource it is made for. Paths that aren't one of the
+    API's routes are used as they are.
+    """
+    path = url.split("?", 1)[0]
+    for pattern, route in _ROUTE_PATTERNS:
+        match = pattern.match(path)
+        if match is not None:
+            path = match.group("prefix") + route
+            break
+    return f"{method.upper()} {path}"
+
+
+class _Circuit:
+    def __init__(self) -> None:
+        self.state: CircuitState = "closed"
+        # (finished at, failed, slow) for the calls within the window
+        self.calls: deque[Tuple[float, bool, bool]] = deque()
+        self.opened_at = 0.0
+        # when each in-flight trial call of a half-open circuit was let through
+        self.trials: List[float] = []
+        self.trial_successes = 0
+
+
+class CircuitBreaker:
+    """Fails requests fast while an endpoint of the API is degraded, instead of retrying them.
+
+    Every endpoint has its own circuit. While it is `closed` the outcome of each attempt is
+    recorded, and once at least `minimum_calls` attempts were made within `window` seconds the
+    circuit opens if either the share of failures (connection errors, timeouts and `5xx`
+    responses) or of slow calls reaches its threshold.
+
+    While a circuit is `open` requests to the endpoint immediately raise `CircuitOpenError`,
+    without being sent or retried. After `open_duration` seconds it becomes `half_open` and
+    lets `half_open_max_calls` trial requests through: if they all succeed the circuit closes
+    again, and if any of them fails it re-opens.
+
+    ```py
+    from lmnt import Lmnt, CircuitBreaker
+
+    breaker = CircuitBreaker(
+        failure_rate_threshold=0.5,
+        slow_call_duration=5.0,
+        on_state_change=lambda endpoint, old, new: metrics.gauge(f"lmnt.circuit.{endpoint}", new),
+    )
+    client = Lmnt(circuit_breaker=breaker)
+    ```
+    """
+
+    def __init__(
+        self,
+        *,
+        failure_rate_threshold: float = 0.5,
+        slow_call_duration: float | None = None,
+        slow_call_rate_threshold: float = 0.5,
+        minimum_calls: int = 10,
+        window: float = 30.0,
+        open_duration: float = 30.0,
+        half_open_max_calls: int = 1,
+        on_state_change: CircuitStateChangeHook | None = None,
+        endpoint_key: Callable[[str, str], str] | None = None,
+    ) -> None:
+        """
+        Args:
+          failure_rate_threshold: The share of failed calls, between 0 and 1, at which a circuit opens.
+
+          slow_call_duration: How long an attempt can take to receive the response headers, in
+              seconds, before it counts as slow. Latency isn't taken into account if this isn't given.
+
+          slow_call_rate_threshold: The share of slow calls, between 0 and 1, at which a circuit opens.
+
+          minimum_calls: How many calls have to be made within the `window` before a circuit can open.
+
+          window: The number of seconds of recent calls that the rates are calculated over.
+
+          open_duration: How long a circuit stays open before trial requests are let through.
+
+          half_open_max_calls: How many trial requests have to succeed before a circuit closes again.
+
+          on_state_change: Called with the endpoint, the previous and the new state whenever a
+              circuit changes state, e.g. to export them as metrics.
+
+          endpoint_key: Maps a request's method and URL path to the endpoint whose circuit it uses.
+        """
+        if not 0 < failure_rate_threshold <= 1:
+            raise ValueError(f"`failure_rate_threshold` must be between 0 and 1 but received {failure_rate_threshold}")
+        if not 0 < slow_call_rate_threshold <= 1:
+            raise ValueError(
+                f"`slow_call_rate_threshold` must be between 0 and 1 but received {slow_call_rate_threshold}"
+            )
+        if minimum_calls < 1:
+            raise ValueError(f"`minimum_calls` must be at least 1 but received {minimum_calls}")
+        if half_open_max_calls < 1:
+            raise ValueError(f"`half_open_max_calls` must be at least 1 but received {half_open_max_calls}")
+
+        self._failure_rate_threshold = failure_rate_threshold
+        self._slow_call_duration = slow_call_duration
+        self._slow_call_rate_threshold = slow_call_rate_threshold
+        self._minimum_calls = minimum_calls
+        self._window = window
+        self._open_duration = open_duration
+        self._half_open_max_calls = half_open_max_calls
+        self._on_state_change = on_state_change
+        self._endpoint_key = endpoint_key
+        self._lock = threading.Lock()
+        self._circuits: Dict[str, _Circuit] = {}
+
+    def endpoint(self, method: str, url: str) -> str:
+        """Returns the endpoint whose circuit a request with the given method and URL path uses."""
+        if self._endpoint_key is not None:
+            return self._endpoint_key(method, url)
+        return endpoint_key(method, url)
+
+    def state(self, endpoint: str) -> CircuitState:
+        """The current state of the given endpoint's circuit."""
+        changes: List[Tuple[str, CircuitState, CircuitState]] = []
+        with self._lock:
+            circuit = self._circuits.get(endpoint)
+            state = self._current_state(endpoint, circuit, time.monotonic(), changes) if circuit else "closed"
+        self._notify(changes)
+        return state
+
+    def states(self) -> Dict[str, CircuitState]:
+        """The current state of every endpoint that requests have been made to."""
+        changes: List[Tuple[str, CircuitState, CircuitState]] = []
+        with self._lock:
+            now = time.monotonic()
+            states: Dict[str, CircuitState] = {
+                endpoint: self._current_state(endpoint, circuit, now, changes)
+                for endpoint, circuit in self._circuits.items()
+            }
+        self._notify(changes)
+        return states
+
+    def acquire(self, endpoint: str) -> Optional[float]:
+        """Lets a request to the endpoint through, or returns how many seconds remain until its circuit half-opens."""
+        changes: List[Tuple[str, CircuitState, CircuitState]] = []
+        with self._lock:
+            now = time.monotonic()
+            circuit = self._get_circuit(endpoint)
+            state = self._current_state(endpoint, circuit, now, changes)
+
+            retry_after: Optional[float] = None
+            if state == "open":
+                retry_after = circuit.opened_at + self._open_duration - now
+            elif state == "half_open":
+                # trials that never reported back, e.g. because they were cancelled, don't hold up the circuit
+                circuit.trials = [t for t in circuit.trials if now - t < self._open_duration]
+                if len(circuit.trials) + circuit.trial_successes >= self._half_open_max_calls:
+                    retry_after = self._open_duration - (now - min(circuit.trials, default=now))
+                else:
+                    circuit.trials.append(now)
+
+        self._notify(changes)
+        return retry_after
+
+    def record(self, endpoint: str, *, failed: bool, duration: float) -> None:
+        """Records the outcome of an attempt that was let through by `acquire()`."""
+        changes: List[Tuple[str, CircuitState, CircuitState]] = []
+        with self._lock:
+            now = time.monotonic()
+            circuit = self._get_circuit(endpoint)
+            state = self._current_state(endpoint, circuit, now, changes)
+            slow = self._slow_call_duration is not None and duration >= self._slow_call_duration
+
+            if state == "half_open":
+                if circuit.trials:
+                    circuit.trials.pop(0)
+                if failed or slow:
+                    self._open(endpoint, circuit, now, changes)
+                else:
+                    circuit.trial_successes += 1
+                    if circuit.trial_successes >= self._half_open_max_calls:
+                        self._set_state(endpoint, circuit, "closed", changes)
+            elif state == "closed":
+                circuit.calls.append((now, failed, slow))
+                while circuit.calls and now - circuit.calls[0][0] > self._window:
+                    circuit.calls.popleft()
+
+                total = len(circuit.calls)
+                if total >= self._minimum_calls:
+                    failures = sum(1 for _, call_failed, _ in circuit.calls if call_failed)
+                    slow_calls = sum(1 for _, _, call_slow in circuit.calls if call_slow)
+                    if (
+                        failures / total >= self._failure_rate_threshold
+                        or slow_calls / total >= self._slow_call_rate_threshold
+                    ):
+                        self._open(endpoint, circuit, now, changes)
+            # attempts that were already in flight when the circuit opened don't change anything
+
+        self._notify(changes)
+
+    def reset(self) -> None:
+        """Closes every circuit and forgets all recorded calls."""
+        changes: List[Tuple[str, CircuitState, CircuitState]] = []
+        with self._lock:
+            for endpoint, circuit in self._circuits.items():
+                if circuit.state != "closed":
+                    changes.append((endpoint, circuit.state, "closed"))
+            self._circuits.clear()
+        self._notify(changes)
+
+    def _get_circuit(self, endpoint: str) -> _Circuit:
+        circuit = self._circuits.get(endpoint)
+        if circuit is None:
+            if len(self._circuits) >= _MAX_CIRCUITS:
+                # forget about closed circuits rather than growing without bound
+                for key in [key for key, c in self._circuits.items() if c.state == "closed"]:
+                    del self._circuits[key]
+            circuit = self._circuits[endpoint] = _Circuit()
+        return circuit
+
+    def _current_state(
+        self,
+        endpoint: str,
+        circuit: _Circuit,
+        now: float,
+        changes: List[Tuple[str, CircuitState, CircuitState]],
+    ) -> CircuitState:
+        if circuit.state == "open" and now - circuit.opened_at >= self._open_duration:
+            self._set_state(endpoint, circuit, "half_open", changes)
+        return circuit.state
+
+    def _open(
+        self,
+        endpoint: str,
+        circuit: _Circuit,
+        now: float,
+        changes: List[Tuple[str, CircuitState, CircuitState]],
+    ) -> None:
+        circuit.opened_at = now
+        self._set_state(endpoint, circuit, "open", changes)
+
+    def _set_state(
+        self,
+        endpoint: str,
+        circuit: _Circuit,
+        state: CircuitState,
+        changes: List[Tuple[str, CircuitState, CircuitState]],
+    ) -> None:
+        previous = circuit.state
+        circuit.state = state
+        circuit.calls.clear()
+        circuit.trials = []
+        circuit.trial_successes = 0
+        if previous != state:
+            log.debug("Circuit for %s changed from %s to %s", endpoint, previous, state)
+            changes.append((endpoint, previous, state))
+
+    def _notify(self, changes: List[Tuple[str, CircuitState, CircuitState]]) -> None:
+        # called outside of the lock so that the hook can inspect the breaker
+        if self._on_state_change is None:
+            return
+
+        for endpoint, previous, state in changes:
+            try:
+                self._on_state_change(endpoint, previous, state)
+            except Exception:
+                log.exception("Error in the circuit breaker `on_state_change` hook")
@@ -3,13 +3,15 @@
 from __future__ import annotations
 
 import os
-from typing import Any, Mapping
+import weakref
+from typing import Any, List, Mapping
 from typing_extensions import Self, override
 
 import httpx
 
 from . import _exceptions
 from ._qs import Querystring
+from ._hooks import HookRegistry
 from ._types import (
   Omit,
   Timeout,
@@ -19,17 +21,29 @@ from ._types import (
   RequestOptions,
   not_given,
 )
+from ._usage import UsageTracker
 from ._utils import is_given, get_async_library
+from ._timing import TransferMetricsHook
+from ._warmup import WarmupResult, WebSocketPool, warmup_connections, async_warmup_connections
+from ._metrics import Metrics
 from ._version import __version__
 from .resources import speech, voices, accounts
+from ._endpoints import EndpointPool
 from ._streaming import Stream as Stream, AsyncStream as AsyncStream
 from ._exceptions import LmntError, APIStatusError
+from ._rate_limit import RateLimiter
 from ._api_version import LMNT_API_VERSION
 from ._base_client import (
   DEFAULT_MAX_RETRIES,
   SyncAPIClient,
   AsyncAPIClient,
 )
+from ._voice_cache import VoiceCache
+from ._voice_index import VoiceIndex
+from ._retry_budget import RetryBudget
+from ._circuit_breaker import CircuitBreaker
+from .resources.sessions import _ws_url_from_base
+from .types.account_retrieve_response import AccountRetrieveResponse
 
 __all__ = ["Timeout", "Transport", "ProxiesTypes", "RequestOptions", "Lmnt", "AsyncLmnt", "Client", "AsyncClient"]
 
@@ -51,12 +65,46 @@ class Lmnt(SyncAPIClient):
     base_url: str | httpx.URL | None = None,
     timeout: float | Timeout | None | NotGiven = not_given,
     max_retries: int = DEFAULT_MAX_RETRIES,
+    # The total time a request may take, in seconds, including every retry and the backoff between them.
+    # Unlike `timeout`, which applies to each attempt, no retry is made once the deadline has passed.
+    deadline: float | None = None,
     default_headers: Mapping[str, str] | None = None,
     default_query: Mapping[str, object] | None = None,
+    # Called with the `TransferMetrics` of every request once its response body has been received.
+    on_transfer_metrics: TransferMetricsHook | None = None,
+    # Throttle requests locally, adapting to the API's rate limit responses. The limiter is shared with
+    # clients created through `.copy()` / `.with_options()`.
+    rate_limiter: RateLimiter | None = None,
+    # Count the characters sent for synthesis and reconcile them with the account's usage, optionally throttling
+    # or rejecting requests before the plan's characters run out, see `UsageTracker`. Shared with clients created
+    # through `.copy()` / `.with_options()`.
+    usage_tracker: UsageTracker | None = None,
+    # Fail requests fast while an endpoint of the API is degraded instead of retrying them. The breaker
+    # is shared with clients created through `.copy()` / `.with_options()`.
+    circuit_breaker: CircuitBreaker | None = None,
+    # Limit the extra traffic caused by retrying failed requests, e.g. to 10% of all requests. The budget
+    # is shared with clients created through `.copy()` / `.with_options()`.
+    retry_budget: RetryBudget | None = None,
+    # Spread requests, and the connections of speech sessions, across several base URLs with failover
+    # between them. Defaults `base_url` to the pool's first URL. The pool is shared with clients created
+    # through `.copy()` / `.with_options()`.
+    endpoint_pool: EndpointPool | None = None,
+    # The registry of hooks called as requests progress, available as `client.hooks`. A new one is created
+    # if not given, which is shared with clients created through `.copy()` / `.with_options()`.
+    hooks: HookRegistry | None = None,
+    # Record counters and histograms of the requests and speech sessions made through the client, see `Metrics`.
+    # Shared with clients created through `.copy()` / `.with_options()`.
+    metrics: Metrics | None = None,
+    # Serve `voices.list()` and `voices.retrieve()` from a cache that is refreshed in the background, see
+    # `VoiceCache`. Shared with clients created through `.copy()` / `.with_options()`.
+    voice_cache: VoiceCache | None = None,
     # Configure a custom httpx client.
     # We provide a `DefaultHttpxClient` class that you can pass to retain the default values we use for `limits`, `timeout` & `follow_redirects`.
     # See the [httpx documentation](https://www.python-httpx.org/api/#client) for more details.
     http_client: httpx.Client | None = None,
+    # Use HTTP/2 so that concurrent requests are multiplexed over a small number of connections.
+    # Requires the `http2` extra, i.e. `pip install lmnt[http2]`. Ignored if `http_client` is given.
+    http2: bool = False,
     # Enable or disable schema validation for data returned by the API.
     # When enabled an error APIResponseValidationError is raised
     # if the API responds with invalid data for the expected schema.
@@ -79,6 +127,8 @@ class Lmnt(SyncAPIClient):
       )
     self.api_key = api_key
 
+    if base_url is None and endpoint_pool is not None:
+      base_url = endpoint_pool.endpoints[0].url
     if base_url is None:
       base_url = os.environ.get("LMNT_BASE_URL")
     if base_url is None:
@@ -89,12 +139,26 @@ class Lmnt(SyncAPIClient):
       base_url=base_url,
       max_retries=max_retries,
       timeout=timeout,
+      deadline=deadline,
       http_client=http_client,
+      http2=http2,
       custom_headers=default_headers,
       custom_query=default_query,
+      on_transfer_metrics=on_transfer_metrics,
+      rate_limiter=rate_limiter,
+      usage_tracker=usage_tracker,
+      circuit_breaker=circuit_breaker,
+      retry_budget=retry_budget,
+      endpoint_pool=endpoint_pool,
+      hooks=hooks,
+      metrics=metrics,
       _strict_response_validation=_strict_response_validation,
     )
 
+    self._voice_cache = voice_cache
+    # the indexes kept up to date with the voices changed through the client, see `VoiceIndex.watch()`
+    self._voice_indexes: weakref.WeakSet[VoiceIndex] = weakref.WeakSet()
+
     self.speech = speech.SpeechResource(self)
     self.voices = voices.VoicesResource(self)
     self.accounts = accounts.AccountsResource(self)
@@ -122,6 +186,26 @@ class Lmnt(SyncAPIClient):
       **self._custom_headers,
     }
 
+  def warmup(self, *, connections: int = 1, timeout: float = 10.0) -> WarmupResult:
+    """Open `connections` connections to the `base_url`, or to each endpoint of the
+    `endpoint_pool`, and keep them in the connection pool.
+
+    This moves the cost of DNS resolution and the TCP + TLS handshakes out of the first real
+    requests, e.g. when a new instance of your service starts up.
+
+    Args:
+      connections: How many connections to open concurrently. Anything beyond the pool's
+          `max_keepalive_connections` limit will be closed again.
+
+      timeout: The maximum time to spend opening each connection, in seconds.
+    """
+    return warmup_connections(self._client, self._warmup_urls(), connections=connections, timeout=timeout)
+
+  def _warmup_urls(self) -> List[httpx.URL]:
+    if self._endpoint_pool is None:
+      return [self.base_url]
+    return [endpoint.url for endpoint in self._endpoint_pool.endpoints]
+
   def copy(
     self,
     *,
@@ -129,11 +213,22 @@ class Lmnt(SyncAPIClient):
     base_url: str | httpx.URL | None = None,
     timeout: float | Timeout | None | NotGiven = not_given,
     http_client: httpx.Client | None = None,
+    http2: bool | None = None,
     max_retries: int | NotGiven = not_given,
+    deadline: float | None | NotGiven = not_given,
     default_headers: Mapping[str, str] | None = None,
     set_default_headers: Mapping[str, str] | None = None,
     default_query: Mapping[str, object] | None = None,
     set_default_query: Mapping[str, object] | None = None,
+    on_transfer_metrics: TransferMetricsHook | None = None,
+    rate_limiter: RateLimiter | None = None,
+    usage_tracker: UsageTracker | None = None,
+    circuit_breaker: CircuitBreaker | None = None,
+    retry_budget: RetryBudget | None = None,
+    endpoint_pool: EndpointPool | None = None,
+    hooks: HookRegistry | None = None,
+    metrics: Metrics | None = None,
+    voice_cache: VoiceCache | None = None,
     _extra_kwargs: Mapping[str, Any] = {},
   ) -> Self:
     """
@@ -157,22 +252,43 @@ class Lmnt(SyncAPIClient):
     elif set_default_query is not None:
       params = set_default_query
 
-    http_client = http_client or self._client
-    return self.__class__(
+    if http2 is None:
+      http2 = self._http2
+    if http_client is None and http2 == self._http2:
+      # only re-use the existing connection pool if it speaks the requested protocol
+      http_client = self._client
+    client = self.__class__(
       api_key=api_key or self.api_key,
       base_url=base_url or self.base_url,
       timeout=self.timeout if isinstance(timeout, NotGiven) else timeout,
       http_client=http_client,
+      http2=http2,
       max_retries=max_retries if is_given(max_retries) else self.max_retries,
+      deadline=self.deadline if isinstance(deadline, NotGiven) else deadline,
       default_headers=headers,
       default_query=params,
+      on_transfer_metrics=on_transfer_metrics or self._on_transfer_metrics,
+      rate_limiter=rate_limiter or self._rate_limiter,
+      usage_tracker=usage_tracker or self._usage_tracker,
+      circuit_breaker=circuit_breaker or self._circuit_breaker,
+      retry_budget=retry_budget or self._retry_budget,
+      endpoint_pool=endpoint_pool or self._endpoint_pool,
+      hooks=hooks if hooks is not None else self.hooks,
+      metrics=metrics or self._metrics,
+      voice_cache=voice_cache or self._voice_cache,
       **_extra_kwargs,
     )
+    client._voice_indexes = self._voice_indexes
+    return client
 
   # Alias for `copy` for nicer inline usage, e.g.
   # client.with_options(timeout=10).foo.create(...)
   with_options = copy
 
+  @override
+  def _retrieve_account(self) -> AccountRetrieveResponse:
+    return self.accounts.retrieve()
+
   @override
   def _make_status_error(
     self,
@@ -224,12 +340,46 @@ class AsyncLmnt(AsyncAPIClient):
     base_url: str | httpx.URL | None = None,
     timeout: float | Timeout | None | NotGiven = not_given,
     max_retries: int = DEFAULT_MAX_RETRIES,
+    # The total time a request may take, in seconds, including every retry and the backoff between them.
+    # Unlike `timeout`, which applies to each attempt, no retry is made once the deadline has passed.
+    deadline: float | None = None,
     default_headers: Mapping[str, str] | None = None,
     default_query: Mapping[str, object] | None = None,
+    # Called with the `TransferMetrics` of every request once its response body has been received.
+    on_transfer_metrics: TransferMetricsHook | None = None,
+    # Throttle requests locally, adapting to the API's rate limit responses. The limiter is shared with
+    # clients created through `.copy()` / `.with_options()`.
+    rate_limiter: RateLimiter | None = None,
+    # Count the characters sent for synthesis and reconcile them with the account's usage, optionally throttling
+    # or rejecting requests before the plan's characters run out, see `UsageTracker`. Shared with clients created
+    # through `.copy()` / `.with_options()`.
+    usage_tracker: UsageTracker | None = None,
+    # Fail requests fast while an endpoint of the API is degraded instead of retrying them. The breaker
+    # is shared with clients created through `.copy()` / `.with_options()`.
+    circuit_breaker: CircuitBreaker | None = None,
+    # Limit the extra traffic caused by retrying failed requests, e.g. to 10% of all requests. The budget
+    # is shared with clients created through `.copy()` / `.with_options()`.
+    retry_budget: RetryBudget | None = None,
+    # Spread requests, and the connections of speech sessions, across several base URLs with failover
+    # between them. Defaults `base_url` to the pool's first URL. The pool is shared with clients created
+    # through `.copy()` / `.with_options()`.
+    endpoint_pool: EndpointPool | None = None,
+    # The registry of hooks called as requests progress, available as `client.hooks`. A new one is created
+    # if not given, which is shared with clients created through `.copy()` / `.with_options()`.
+    hooks: HookRegistry | None = None,
+    # Record counters and histograms of the requests and speech sessions made through the client, see `Metrics`.
+    # Shared with clients created through `.copy()` / `.with_options()`.
+    metrics: Metrics | None = None,
+    # Serve `voices.list()` and `voices.retrieve()` from a cache that is refreshed in the background, see
+    # `VoiceCache`. Shared with clients created through `.copy()` / `.with_options()`.
+    voice_cache: VoiceCache | None = None,
     # Configure a custom httpx client.
     # We provide a `DefaultAsyncHttpxClient` class that you can pass to retain the default values we use for `limits`, `timeout` & `follow_redirects`.
     # See the [httpx documentation](https://www.python-httpx.org/api/#asyncclient) for more details.
     http_client: httpx.AsyncClient | None = None,
+    # Use HTTP/2 so that concurrent requests are multiplexed over a small number of connections.
+    # Requires the `http2` extra, i.e. `pip install lmnt[http2]`. Ignored if `http_client` is given.
+    http2: bool = False,
     # Enable or disable schema validation for data returned by the API.
     # When enabled an error APIResponseValidationError is raised
     # if the API responds with invalid data for the expected schema.
@@ -252,6 +402,8 @@ class AsyncLmnt(AsyncAPIClient):
       )
     self.api_key = api_key
 
+    if base_url is None and endpoint_pool is not None:
+      base_url = endpoint_pool.endpoints[0].url
     if base_url is None:
       base_url = os.environ.get("LMNT_BASE_URL")
     if base_url is None:
@@ -262,12 +414,28 @@ class AsyncLmnt(AsyncAPIClient):
       base_url=base_url,
       max_retries=max_retries,
       timeout=timeout,
+      deadline=deadline,
       http_client=http_client,
+      http2=http2,
       custom_headers=default_headers,
       custom_query=default_query,
+      on_transfer_metrics=on_transfer_metrics,
+      rate_limiter=rate_limiter,
+      usage_tracker=usage_tracker,
+      circuit_breaker=circuit_breaker,
+      retry_budget=retry_budget,
+      endpoint_pool=endpoint_pool,
+      hooks=hooks,
+      metrics=metrics,
       _strict_response_validation=_strict_response_validation,
     )
 
+    self._voice_cache = voice_cache
+    # the indexes kept up to date with the voices changed through the client, see `VoiceIndex.watch()`
+    self._voice_indexes: weakref.WeakSet[VoiceIndex] = weakref.WeakSet()
+
+    self._websocket_pool = WebSocketPool()
+
     self.speech = speech.AsyncSpeechResource(self)
     self.voices = voices.AsyncVoicesResource(self)
     self.accounts = accounts.AsyncAccountsResource(self)
@@ -295,6 +463,44 @@ class AsyncLmnt(AsyncAPIClient):
       **self._custom_headers,
     }
 
+  async def warmup(self, *, connections: int = 1, websockets: int = 0, timeout: float = 10.0) -> WarmupResult:
+    """Open `connections` connections to the `base_url`, or to each endpoint of the
+    `endpoint_pool`, and keep them in the connection pool.
+
+    This moves the cost of DNS resolution and the TCP + TLS handshakes out of the first real
+    requests, e.g. when a new instance of your service starts up.
+
+    Args:
+      connections: How many connections to open concurrently. Anything beyond the pool's
+          `max_keepalive_connections` limit will be closed again.
+
+      websockets: How many streaming WebSockets to pre-open, to each endpoint of the
+          `endpoint_pool` if there is one. Each one is used by a later
+          `client.speech.sessions.create()` call instead of it connecting on its own.
+
+      timeout: The maximum time to spend opening each connection, in seconds.
+    """
+    urls = self._warmup_urls()
+    return await async_warmup_connections(
+      self._client,
+      urls,
+      connections=connections,
+      timeout=timeout,
+      websocket_pool=self._websocket_pool,
+      websocket_urls=[_ws_url_from_base(url) for url in urls],
+      websockets=websockets,
+    )
+
+  def _warmup_urls(self) -> List[httpx.URL]:
+    if self._endpoint_pool is None:
+      return [self.base_url]
+    return [endpoint.url for endpoint in self._endpoint_pool.endpoints]
+
+  @override
+  async def close(self) -> None:
+    await self._websocket_pool.close()
+    await super().close()
+
   def copy(
     self,
     *,
@@ -302,11 +508,22 @@ class AsyncLmnt(AsyncAPIClient):
     base_url: str | httpx.URL | None = None,
     timeout: float | Timeout | None | NotGiven = not_given,
     http_client: httpx.AsyncClient | None = None,
+    http2: bool | None = None,
     max_retries: int | NotGiven = not_given,
+    deadline: float | None | NotGiven = not_given,
     default_headers: Mapping[str, str] | None = None,
     set_default_headers: Mapping[str, str] | None = None,
     default_query: Mapping[str, object] | None = None,
     set_default_query: Mapping[str, object] | None = None,
+    on_transfer_metrics: TransferMetricsHook | None = None,
+    rate_limiter: RateLimiter | None = None,
+    usage_tracker: UsageTracker | None = None,
+    circuit_breaker: CircuitBreaker | None = None,
+    retry_budget: RetryBudget | None = None,
+    endpoint_pool: EndpointPool | None = None,
+    hooks: HookRegistry | None = None,
+    metrics: Metrics | None = None,
+    voice_cache: VoiceCache | None = None,
     _extra_kwargs: Mapping[str, Any] = {},
   ) -> Self:
     """
@@ -330,22 +547,45 @@ class AsyncLmnt(AsyncAPIClient):
     elif set_default_query is not None:
       params = set_default_query
 
-    http_client = http_client or self._client
-    return self.__class__(
+    if http2 is None:
+      http2 = self._http2
+    if http_client is None and http2 == self._http2:
+      # only re-use the existing connection pool if it speaks the requested protocol
+      http_client = self._client
+    client = self.__class__(
       api_key=api_key or self.api_key,
       base_url=base_url or self.base_url,
       timeout=self.timeout if isinstance(timeout, NotGiven) else timeout,
       http_client=http_client,
+      http2=http2,
       max_retries=max_retries if is_given(max_retries) else self.max_retries,
+      deadline=self.deadline if isinstance(deadline, NotGiven) else deadline,
       default_headers=headers,
       default_query=params,
+      on_transfer_metrics=on_transfer_metrics or self._on_transfer_metrics,
+      rate_limiter=rate_limiter or self._rate_limiter,
+      usage_tracker=usage_tracker or self._usage_tracker,
+      circuit_breaker=circuit_breaker or self._circuit_breaker,
+      retry_budget=retry_budget or self._retry_budget,
+      endpoint_pool=endpoint_pool or self._endpoint_pool,
+      hooks=hooks if hooks is not None else self.hooks,
+      metrics=metrics or self._metrics,
+      voice_cache=voice_cache or self._voice_cache,
       **_extra_kwargs,
     )
+    # pre-opened WebSockets are keyed by URL and aren't tied to the API key, so they can be shared
+    client._websocket_pool = self._websocket_pool
+    client._voice_indexes = self._voice_indexes
+    return client
 
   # Alias for `copy` for nicer inline usage, e.g.
   # client.with_options(timeout=10).foo.create(...)
   with_options = copy
 
+  @override
+  async def _retrieve_account(self) -> AccountRetrieveResponse:
+    return await self.accounts.retrieve()
+
   @override
   def _make_status_error(
     self,
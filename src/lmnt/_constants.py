@@ -9,6 +9,10 @@ OVERRIDE_CAST_TO_HEADER = "____stainless_override_cast_to"
 DEFAULT_TIMEOUT = httpx.Timeout(timeout=60, connect=5.0)
 DEFAULT_MAX_RETRIES = 2
 DEFAULT_CONNECTION_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+# With HTTP/2 each connection multiplexes up to the server's advertised `SETTINGS_MAX_CONCURRENT_STREAMS`
+# (typically 100+) requests, and a new connection is only opened once every existing one is saturated,
+# so far fewer connections are needed. They're also kept alive for longer as they're expensive to replace.
+DEFAULT_HTTP2_CONNECTION_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=20, keepalive_expiry=60.0)
 
 INITIAL_RETRY_DELAY = 0.5
 MAX_RETRY_DELAY = 8.0
@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import time
+import random
+import logging
+import threading
+from typing import List, Tuple, Union, Sequence, Collection
+from typing_extensions import Literal, override
+
+from httpx import URL
+
+__all__ = ["Endpoint", "EndpointPool", "LoadBalancingStrategy"]
+
+log: logging.Logger = logging.getLogger(__name__)
+
+LoadBalancingStrategy = Literal["ewma", "least_outstanding"]
+
+
+class Endpoint:
+    """One of the base URLs of an `EndpointPool`, along with what has been observed about it."""
+
+    url: URL
+    """The base URL that requests are made to."""
+
+    outstanding: int
+    """The number of requests to the endpoint that are currently in flight."""
+
+    latency: float | None
+    """The moving average of the time until the response headers are received, in seconds."""
+
+    consecutive_failures: int
+    """The number of attempts in a row that failed to connect or received a gateway error."""
+
+    ejected_until: float
+    """The `time.monotonic()` until which the endpoint is considered unhealthy."""
+
+    def __init__(self, url: URL) -> None:
+        self.url = url
+        self.outstanding = 0
+        self.latency = None
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0
+
+    @property
+    def healthy(self) -> bool:
+        return time.monotonic() >= self.ejected_until
+
+    @override
+    def __repr__(self) -> str:
+        return (
+            f"Endpoint(url={str(self.url)!r}, healthy={self.healthy}, outstanding={self.outstanding}, "
+            f"latency={self.latency}, consecutive_failures={self.consecutive_failures})"
+        )
+
+
+class EndpointPool:
+    """Spreads requests across several base URLs, e.g. regional gateways or proxies for the API.
+
+    Every attempt, including retries and the connection of a `SpeechSession`, goes to the healthy
+    endpoint with the lowest cost. With the default `"ewma"` strategy the cost is the moving
+    average of the endpoint's latency multiplied by its number of outstanding requests plus one, so
+    that a slow endpoint only gets requests once the faster ones are loaded. With
+    `"least_outstanding"` it is the number of outstanding requests alone.
+
+    Health is tracked passively: an endpoint that can't be connected to, or that responds with a
+    `502`, `503` or `504` gateway error, is ejected for `ejection_duration` seconds, doubling for
+    each consecutive failure up to `max_ejection_duration`. A request that fails to connect is
+    retried on another endpoint straight away, without backing off. If every endpoint is ejected,
+    requests go to the one that is due to recover first.
+
+    ```py
+    from lmnt import Lmnt, EndpointPool
+
+    client = Lmnt(
+        endpoint_pool=EndpointPool(["https://eu.gateway.example.com", "https://us.gateway.example.com"]),
+    )
+    ```
+    """
+
+    def __init__(
+        self,
+        base_urls: Sequence[Union[str, URL]],
+        *,
+        strategy: LoadBalancingStrategy = "ewma",
+        latency_smoothing: float = 0.3,
+        ejection_duration: float = 10.0,
+        max_ejection_duration: float = 300.0,
+    ) -> None:
+        """
+        Args:
+          base_urls: The base URLs to spread requests across, in order of preference.
+
+          strategy: How to choose between the healthy endpoints, `"ewma"` or `"least_outstanding"`.
+
+          latency_smoothing: The weight of each new latency sample in the moving average, between 0 and 1.
+
+          ejection_duration: How long an endpoint is skipped after it first fails, in seconds.
+
+          max_ejection_duration: The longest an endpoint is skipped after failing repeatedly, in seconds.
+        """
+        if not base_urls:
+            raise ValueError("At least one base URL is required")
+        if strategy not in ("ewma", "least_outstanding"):
+            raise ValueError(f"`strategy` must be 'ewma' or 'least_outstanding' but received {strategy!r}")
+        if not 0 < latency_smoothing <= 1:
+            raise ValueError(f"`latency_smoothing` must be between 0 and 1 but received {latency_smoothing}")
+
+        self._endpoints = [Endpoint(_enforce_trailing_slash(URL(url))) for url in base_urls]
+        self._strategy = strategy
+        self._latency_smoothing = latency_smoothing
+        self._ejection_duration = ejection_duration
+        self._max_ejection_duration = max_ejection_duration
+        self._lock = threading.Lock()
+
+    @property
+    def endpoints(self) -> List[Endpoint]:
+        """Every endpoint of the pool, e.g. to export their health and latency as metrics."""
+        return list(self._endpoints)
+
+    def pick(self, exclude: Collection[Endpoint] = ()) -> Endpoint:
+        """Returns the endpoint that the next attempt should be sent to.
+
+        Endpoints in `exclude`, e.g. those that a request already failed to connect to, are only
+        returned if there is no other choice.
+        """
+        with self._lock:
+            now = time.monotonic()
+            candidates = [endpoint for endpoint in self._endpoints if endpoint not in exclude] or self._endpoints
+
+            healthy = [endpoint for endpoint in candidates if endpoint.ejected_until <= now]
+            if not healthy:
+                return min(candidates, key=lambda endpoint: endpoint.ejected_until)
+
+            costs = {endpoint: self._cost(endpoint) for endpoint in healthy}
+            lowest = min(costs.values())
+            # spread requests between equally good endpoints rather than always using the first one
+            return random.choice([endpoint for endpoint, cost in costs.items() if cost == lowest])
+
+    def has_healthy(self, exclude: Collection[Endpoint] = ()) -> bool:
+        """Whether any endpoint that isn't in `exclude` is currently healthy."""
+        with self._lock:
+            now = time.monotonic()
+            return any(endpoint.ejected_until <= now for endpoint in self._endpoints if endpoint not in exclude)
+
+    def start(self, endpoint: Endpoint) -> None:
+        """Records that an attempt is being sent to the endpoint."""
+        with self._lock:
+            endpoint.outstanding += 1
+
+    def finish(self, endpoint: Endpoint, *, failed: bool, latency: float | None = None) -> None:
+        """Records the outcome of an attempt that was `start()`ed.
+
+        Args:
+          failed: Whether the attempt failed in a way that suggests the endpoint is unhealthy,
+              i.e. it couldn't be connected to or responded with a gateway error.
+
+          latency: How long the attempt took to receive the response headers, if it got that far.
+              An attempt that neither failed nor has a latency, e.g. because it was cancelled,
+              doesn't change the endpoint's health.
+        """
+        with self._lock:
+            endpoint.outstanding = max(0, endpoint.outstanding - 1)
+
+            if latency is not None:
+                if endpoint.latency is None:
+                    endpoint.latency = latency
+                else:
+                    endpoint.latency += self._latency_smoothing * (latency - endpoint.latency)
+
+            if failed:
+                endpoint.consecutive_failures += 1
+                duration = min(
+                    self._ejection_duration * 2 ** min(endpoint.consecutive_failures - 1, 32),
+                    self._max_ejection_duration,
+                )
+                endpoint.ejected_until = time.monotonic() + duration
+                log.debug("Ejecting endpoint %s for %.1f seconds", endpoint.url, duration)
+            elif latency is not None:
+                endpoint.consecutive_failures = 0
+                endpoint.ejected_until = 0.0
+
+    def _cost(self, endpoint: Endpoint) -> Tuple[float, int]:
+        if self._strategy == "least_outstanding":
+            return (endpoint.outstanding, 0)
+        # endpoints without a latency sample yet are tried first, the least loaded of them first
+        return ((endpoint.latency or 0.0) * (endpoint.outstanding + 1), endpoint.outstanding)
+
+
+def _enforce_trailing_slash(url: URL) -> URL:
+    if url.raw_path.endswith(b"/"):
+        return url
+    return url.copy_with(raw_path=url.raw_path + b"/")
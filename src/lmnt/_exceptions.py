@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import cast
+from typing import Dict, Optional, cast
 from typing_extensions import Literal
 
 import httpx
@@ -88,6 +88,76 @@ class APITimeoutError(APIConnectionError):
     super().__init__(message="Request timed out.", request=request)
 
 
+class CircuitOpenError(APIConnectionError):
+  """Raised instead of sending a request while the circuit breaker for its endpoint is open."""
+
+  endpoint: str
+  retry_after: float
+  """The number of seconds until trial requests to the endpoint are let through again."""
+
+  def __init__(self, *, endpoint: str, retry_after: float, request: httpx.Request) -> None:
+    super().__init__(
+      message=f"The circuit breaker for `{endpoint}` is open, requests will be let through again in {retry_after:.1f}s.",
+      request=request,
+    )
+    self.endpoint = endpoint
+    self.retry_after = retry_after
+
+
+class UploadStalledError(APIConnectionError):
+  """Raised when a request body is sent slower than the `min_upload_rate` it was made with.
+
+  Like other connection errors, stalled uploads are retried.
+  """
+
+  rate: float
+  """The upload rate over the stall window, in bytes per second."""
+
+  min_rate: float
+  bytes_sent: int
+
+  def __init__(self, *, rate: float, min_rate: float, bytes_sent: int, request: httpx.Request) -> None:
+    super().__init__(
+      message=f"The upload stalled at {rate:.0f} bytes/s, below the minimum of {min_rate:.0f} bytes/s, after sending {bytes_sent} bytes.",
+      request=request,
+    )
+    self.rate = rate
+    self.min_rate = min_rate
+    self.bytes_sent = bytes_sent
+
+
+class VoiceNotReadyError(LmntError, TimeoutError):
+  """Raised by `voices.wait_until_ready()` when some of the voices aren't ready before its timeout."""
+
+  states: Dict[str, Optional[str]]
+  """The last seen state of every voice that isn't ready, by its ID, or `None` if it wasn't seen yet."""
+
+  def __init__(self, *, states: Dict[str, Optional[str]], timeout: float) -> None:
+    pending = ", ".join(f"{voice_id} ({state or 'unknown'})" for voice_id, state in states.items())
+    super().__init__(f"{len(states)} voice(s) weren't ready after {timeout:g}s: {pending}")
+    self.states = states
+
+
+class QuotaExceededError(LmntError):
+  """Raised instead of sending text for synthesis that would use more of the plan's characters than the `UsageTracker` allows."""
+
+  characters: int
+  """The number of characters that would have been sent."""
+
+  characters_remaining: int
+  """The number of characters remaining in the billing period, as estimated by the `UsageTracker`."""
+
+  character_limit: int
+
+  def __init__(self, *, characters: int, characters_remaining: int, character_limit: int) -> None:
+    super().__init__(
+      f"Sending {characters} characters would go over the usage limit, {characters_remaining} of the plan's {character_limit} characters remain."
+    )
+    self.characters = characters
+    self.characters_remaining = characters_remaining
+    self.character_limit = character_limit
+
+
 class BadRequestError(APIStatusError):
   status_code: Literal[400] = 400  # pyright: ignore[reportIncompatibleVariableOverride]
 
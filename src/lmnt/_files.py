@@ -3,8 +3,8 @@ from __future__ import annotations
 import io
 import os
 import pathlib
-from typing import overload
-from typing_extensions import TypeGuard
+from typing import IO, Any, Optional, cast, overload
+from typing_extensions import TypeGuard, override
 
 import anyio
 
@@ -64,7 +64,7 @@ def _transform_file(file: FileTypes) -> HttpxFileTypes:
     if is_file_content(file):
         if isinstance(file, os.PathLike):
             path = pathlib.Path(file)
-            return (path.name, path.read_bytes())
+            return (path.name, open_path_file(path))
 
         return file
 
@@ -74,9 +74,27 @@ def _transform_file(file: FileTypes) -> HttpxFileTypes:
     raise TypeError(f"Expected file types input to be a FileContent type or to be a tuple")
 
 
+def has_unrewindable_file(files: HttpxRequestFiles | None) -> bool:
+    """Whether any of the files can't be read again from the start, e.g. because it is a pipe."""
+    if not files:
+        return False
+
+    values = files.values() if is_mapping_t(files) else [file for _, file in files]
+    for file in values:
+        content = file[1] if isinstance(file, tuple) else file
+        if isinstance(content, bytes):
+            continue
+
+        seekable = getattr(content, "seekable", None)
+        if seekable is None or not seekable():
+            return True
+
+    return False
+
+
 def read_file_content(file: FileContent) -> HttpxFileContent:
     if isinstance(file, os.PathLike):
-        return pathlib.Path(file).read_bytes()
+        return open_path_file(file)
     return file
 
 
@@ -106,7 +124,7 @@ async def _async_transform_file(file: FileTypes) -> HttpxFileTypes:
     if is_file_content(file):
         if isinstance(file, os.PathLike):
             path = anyio.Path(file)
-            return (path.name, await path.read_bytes())
+            return (path.name, open_path_file(path))
 
         return file
 
@@ -118,6 +136,82 @@ async def _async_transform_file(file: FileTypes) -> HttpxFileTypes:
 
 async def async_read_file_content(file: FileContent) -> HttpxFileContent:
     if isinstance(file, os.PathLike):
-        return await anyio.Path(file).read_bytes()
+        return open_path_file(file)
 
     return file
+
+
+def open_path_file(path: os.PathLike[str]) -> IO[bytes]:
+    return cast("IO[bytes]", PathFile(path))
+
+
+class PathFile(io.RawIOBase):
+    """A read-only binary file that is only opened while it is being read.
+
+    Paths given for file uploads are wrapped in this rather than read into memory, so that
+    the multipart body is streamed from disk in chunks whatever the size of the file. Its
+    size is taken from the file system without opening it, so the request still gets a
+    `Content-Length`, and it is re-opened whenever it is read again, e.g. when the request
+    is retried. The file is closed as soon as it has been read to the end.
+    """
+
+    def __init__(self, path: os.PathLike[str]) -> None:
+        super().__init__()
+        self.name = os.fspath(path)
+        self._file: Optional[io.BufferedReader] = None
+        self._position = 0
+
+    @override
+    def readable(self) -> bool:
+        return True
+
+    @override
+    def seekable(self) -> bool:
+        return True
+
+    @override
+    def readinto(self, buffer: Any) -> int:
+        file = self._file
+        if file is None:
+            file = self._file = open(self.name, "rb")
+            file.seek(self._position)
+
+        nbytes = file.readinto(buffer)
+        if not nbytes:
+            self._release()
+        return nbytes
+
+    @override
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        if self._file is not None:
+            self._position = self._file.seek(offset, whence)
+        elif whence == os.SEEK_SET:
+            self._position = offset
+        elif whence == os.SEEK_CUR:
+            self._position += offset
+        elif whence == os.SEEK_END:
+            self._position = os.stat(self.name).st_size + offset
+        else:
+            raise ValueError(f"Invalid whence ({whence})")
+        return self._position
+
+    @override
+    def tell(self) -> int:
+        if self._file is not None:
+            return self._file.tell()
+        return self._position
+
+    @override
+    def close(self) -> None:
+        self._release()
+        super().close()
+
+    def _release(self) -> None:
+        if self._file is not None:
+            self._position = self._file.tell()
+            self._file.close()
+            self._file = None
+
+    @override
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.name!r})"
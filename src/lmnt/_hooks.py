@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Dict, Tuple, Callable, Optional
+from typing_extensions import Literal, get_args, override
+
+import httpx
+
+from ._timing import RequestTiming, TransferMetrics
+
+__all__ = ["HookEvent", "RequestEvent", "RequestHook", "HookRegistry"]
+
+log: logging.Logger = logging.getLogger(__name__)
+
+HookEvent = Literal["request", "attempt", "retry", "response", "complete", "error"]
+
+_HOOK_EVENTS: Tuple[HookEvent, ...] = get_args(HookEvent)
+
+
+class RequestEvent:
+    """What is passed to a request hook when the event it was registered for happens."""
+
+    event: HookEvent
+    """
+    - `request`: the call was made, before anything was sent.
+    - `attempt`: an attempt is about to be sent, which happens once more for every retry.
+    - `retry`: an attempt failed and the call is about to be retried.
+    - `response`: the response headers of an attempt were received.
+    - `complete`: the response body of an attempt was received, or its response was closed.
+    - `error`: the call raised an error.
+    """
+
+    method: str
+    url: str
+    """The URL of the call, relative to the client's `base_url` unless an absolute URL was requested."""
+
+    timing: RequestTiming
+
+    json_data: object
+    """The JSON body of the call before it was serialized, e.g. to read the `voice` it is for, or `None`."""
+
+    request: Optional[httpx.Request]
+    """The request of the current attempt, or `None` for the `request` event."""
+
+    response: Optional[httpx.Response]
+    """The response of the current attempt, once its headers were received."""
+
+    error: Optional[BaseException]
+    """The error that caused a `retry` or an `error` event."""
+
+    def __init__(
+        self,
+        event: HookEvent,
+        *,
+        method: str,
+        url: str,
+        timing: RequestTiming,
+        json_data: object = None,
+        request: Optional[httpx.Request] = None,
+        response: Optional[httpx.Response] = None,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        self.event = event
+        self.method = method
+        self.url = url
+        self.timing = timing
+        self.json_data = json_data
+        self.request = request
+        self.response = response
+        self.error = error
+
+    @property
+    def retries_taken(self) -> int:
+        return self.timing.retries_taken
+
+    @override
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self.event} {self.method} {self.url} attempts={self.timing.attempts}>"
+
+
+RequestHook = Callable[[RequestEvent], None]
+
+
+class HookRegistry:
+    """The hooks that are called as the requests of a client progress.
+
+    Every client has one, which is shared with the clients created through `.copy()` /
+    `.with_options()`. Hooks are called synchronously, in the order they were registered, and
+    exceptions raised by them are logged rather than propagated. When no hooks are registered
+    the client doesn't trace requests at all.
+
+    ```py
+    from lmnt import Lmnt
+
+    client = Lmnt()
+
+
+    def log_timing(event):
+        timing = event.timing
+        print(event.method, event.url, timing.connect_time, timing.tls_time, timing.total_time)
+
+
+    client.hooks.on("complete", log_timing)
+    ```
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # replaced rather than mutated so that they can be read without holding the lock
+        self._hooks: Dict[HookEvent, Tuple[RequestHook, ...]] = {}
+
+    @property
+    def active(self) -> bool:
+        """Whether any hooks are registered."""
+        return bool(self._hooks)
+
+    def on(self, event: HookEvent, hook: RequestHook) -> RequestHook:
+        """Registers a hook to be called whenever the given event happens, returning the hook."""
+        if event not in _HOOK_EVENTS:
+            raise ValueError(f"Unknown hook event {event!r}, expected one of {', '.join(_HOOK_EVENTS)}")
+
+        with self._lock:
+            self._hooks = {**self._hooks, event: (*self._hooks.get(event, ()), hook)}
+        return hook
+
+    def off(self, event: HookEvent, hook: RequestHook) -> None:
+        """Unregisters a hook, it is not an error if it wasn't registered."""
+        with self._lock:
+            remaining = tuple(h for h in self._hooks.get(event, ()) if h is not hook)
+            hooks: Dict[HookEvent, Tuple[RequestHook, ...]] = {**self._hooks, event: remaining}
+            if not remaining:
+                del hooks[event]
+            self._hooks = hooks
+
+    def clear(self) -> None:
+        """Unregisters every hook."""
+        with self._lock:
+            self._hooks = {}
+
+    def _start_call(self, *, method: str, url: str, metrics: TransferMetrics, json_data: object = None) -> _CallHooks:
+        return _CallHooks(self, method=method, url=url, metrics=metrics, json_data=json_data)
+
+    def _fire(self, event: RequestEvent) -> None:
+        for hook in self._hooks.get(event.event, ()):
+            try:
+                hook(event)
+            except Exception:
+                log.warning("Exception raised in %r request hook", event.event, exc_info=True)
+
+
+class _CallHooks:
+    """Traces a single API call and fires the hooks of a registry for it."""
+
+    def __init__(
+        self, registry: HookRegistry, *, method: str, url: str, metrics: TransferMetrics, json_data: object = None
+    ) -> None:
+        self.registry = registry
+        self.method = method
+        self.url = url
+        self.json_data = json_data
+        self.timing = RequestTiming(metrics)
+        self._request: Optional[httpx.Request] = None
+        self._response: Optional[httpx.Response] = None
+        metrics._on_body_complete = self.complete
+        self._fire("request")
+
+    def attempt(self, request: httpx.Request, *, is_async: bool = False) -> None:
+        self._request = request
+        self._response = None
+        self.timing._start_attempt()
+        request.extensions["trace"] = self.timing._async_trace if is_async else self.timing._trace
+        self._fire("attempt")
+
+    def response(self, response: httpx.Response) -> None:
+        self._response = response
+        if self.timing.headers_received_at is None:
+            # e.g. with a transport that doesn't emit trace events
+            self.timing.headers_received_at = self.timing._metrics.headers_received_at
+        self._fire("response")
+
+    def retry(self, error: Optional[BaseException] = None) -> None:
+        self._fire("retry", error=error)
+
+    def complete(self) -> None:
+        self._fire("complete")
+
+    def error(self, error: BaseException) -> None:
+        self._fire("error", error=error)
+
+    def _fire(self, event: HookEvent, *, error: Optional[BaseException] = None) -> None:
+        if event not in self.registry._hooks:
+            return
+
+        self.registry._fire(
+            RequestEvent(
+                event,
+                method=self.method,
+                url=self.url,
+                timing=self.timing,
+                json_data=self.json_data,
+                request=self._request,
+                response=self._response,
+                error=error,
+            )
+        )
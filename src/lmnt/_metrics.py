@@ -0,0 +1,448 @@
+from __future__ import annotations
+
+import time
+import bisect
+import weakref
+import threading
+from typing import TYPE_CHECKING, Any, Dict, List, Tuple, Union, Mapping, Callable, Iterator, Sequence, cast
+from typing_extensions import override
+
+from ._hooks import HookRegistry, RequestEvent
+from ._rate_limit import request_characters
+from ._circuit_breaker import endpoint_key
+
+if TYPE_CHECKING:
+    from prometheus_client.registry import CollectorRegistry
+
+__all__ = ["Counter", "Histogram", "HistogramSample", "Metrics"]
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+SESSION_ENDPOINT = "WEBSOCKET /v1/ai/speech/stream"
+"""The `endpoint` label of the metrics recorded for a `SpeechSession`."""
+
+LabelValues = Tuple[str, ...]
+
+# called with the value and the labels of every observation, e.g. to forward it to an OpenTelemetry instrument
+_Listener = Callable[[float, Dict[str, str]], None]
+
+
+class _Metric:
+    kind: str
+
+    name: str
+    description: str
+    unit: str
+    label_names: Tuple[str, ...]
+
+    def __init__(self, name: str, description: str, label_names: Sequence[str], *, unit: str = "") -> None:
+        self.name = name
+        self.description = description
+        self.unit = unit
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+        self._listeners: Tuple[_Listener, ...] = ()
+
+    def _label_values(self, labels: Dict[str, str]) -> LabelValues:
+        unknown = labels.keys() - set(self.label_names)
+        if unknown:
+            raise ValueError(f"Unknown labels for {self.name}: {', '.join(sorted(unknown))}")
+        return tuple(labels.get(name, "") for name in self.label_names)
+
+    def _notify(self, value: float, labels: Dict[str, str]) -> None:
+        for listener in self._listeners:
+            listener(value, labels)
+
+    def _add_listener(self, listener: _Listener) -> None:
+        with self._lock:
+            self._listeners = (*self._listeners, listener)
+
+    @override
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.name!r}, labels={list(self.label_names)})"
+
+
+class Counter(_Metric):
+    """A monotonically increasing total, kept separately for every combination of label values."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, description: str, label_names: Sequence[str], *, unit: str = "") -> None:
+        super().__init__(name, description, label_names, unit=unit)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, /, **labels: str) -> None:
+        """Adds `amount` to the total for the given labels, labels that aren't given are empty."""
+        if amount < 0:
+            raise ValueError(f"Counters can only be increased but received {amount}")
+
+        key = self._label_values(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+        self._notify(amount, labels)
+
+    def value(self, **labels: str) -> float:
+        """Returns the total for the given labels."""
+        key = self._label_values(labels)
+        with self._lock:
+            return self._values.get(key, 0.0)
+
+    def samples(self) -> Dict[LabelValues, float]:
+        """Returns a snapshot of the total for every combination of label values seen so far."""
+        with self._lock:
+            return dict(self._values)
+
+
+class HistogramSample:
+    """A snapshot of the observations of a `Histogram` for one combination of label values."""
+
+    bucket_counts: List[int]
+    """The number of observations that fell into each bucket, not cumulative, with the last one for `+Inf`."""
+
+    sum: float
+    count: int
+
+    def __init__(self, bucket_counts: List[int], sum: float, count: int) -> None:
+        self.bucket_counts = bucket_counts
+        self.sum = sum
+        self.count = count
+
+    def _copy(self) -> HistogramSample:
+        return HistogramSample(list(self.bucket_counts), self.sum, self.count)
+
+    @override
+    def __repr__(self) -> str:
+        return f"HistogramSample(count={self.count}, sum={self.sum})"
+
+
+class Histogram(_Metric):
+    """Observations, e.g. latencies, counted into buckets along with their count and sum."""
+
+    kind = "histogram"
+
+    buckets: Tuple[float, ...]
+    """The upper bounds of the buckets, in ascending order, not including the implicit `+Inf`."""
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        label_names: Sequence[str],
+        *,
+        unit: str = "",
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, description, label_names, unit=unit)
+        if list(buckets) != sorted(buckets):
+            raise ValueError("Histogram buckets must be in ascending order")
+        self.buckets = tuple(buckets)
+        self._samples: Dict[LabelValues, HistogramSample] = {}
+
+    def observe(self, value: float, /, **labels: str) -> None:
+        """Records an observation for the given labels, labels that aren't given are empty."""
+        key = self._label_values(labels)
+        with self._lock:
+            sample = self._samples.get(key)
+            if sample is None:
+                sample = self._samples[key] = HistogramSample([0] * (len(self.buckets) + 1), 0.0, 0)
+            sample.bucket_counts[bisect.bisect_left(self.buckets, value)] += 1
+            sample.sum += value
+            sample.count += 1
+        self._notify(value, labels)
+
+    def sample(self, **labels: str) -> HistogramSample:
+        """Returns a snapshot of the observations for the given labels."""
+        key = self._label_values(labels)
+        with self._lock:
+            sample = self._samples.get(key)
+            if sample is None:
+                return HistogramSample([0] * (len(self.buckets) + 1), 0.0, 0)
+            return sample._copy()
+
+    def samples(self) -> Dict[LabelValues, HistogramSample]:
+        """Returns a snapshot of the observations for every combination of label values seen so far."""
+        with self._lock:
+            return {key: sample._copy() for key, sample in self._samples.items()}
+
+
+class Metrics:
+    """Counters and histograms for the API calls and speech sessions of a client.
+
+    The metrics are kept in process and are labelled by the `endpoint` that was called, e.g.
+    `POST /v1/ai/speech/bytes`, and the `voice` that was used, if any. They can be read directly,
+    rendered in the Prometheus text format, registered with a `prometheus_client` registry or
+    forwarded to OpenTelemetry instruments.
+
+    ```py
+    from lmnt import Lmnt, Metrics
+
+    metrics = Metrics()
+    client = Lmnt(metrics=metrics)
+
+    client.speech.generate(text="hello", voice="leah")
+    print(metrics.characters.value(endpoint="POST /v1/ai/speech/bytes", voice="leah"))
+    print(metrics.to_prometheus())
+    ```
+
+    One `Metrics` can be shared by several clients. The metrics are recorded through the
+    client's `hooks`, which are shared with the clients created through `.copy()` /
+    `.with_options()`, so those are measured too.
+    """
+
+    requests: Counter
+    """API calls made, counted once however many times they were retried."""
+
+    responses: Counter
+    """Responses received, including those of attempts that were retried, by status code."""
+
+    retries: Counter
+    errors: Counter
+    """API calls that raised an error, by the type of the error."""
+
+    request_duration: Histogram
+    """How long successful API calls took until their response body was received, or failed ones until they raised."""
+
+    time_to_first_byte: Histogram
+    """How long successful attempts took until the first byte of their response body was received."""
+
+    bytes_received: Counter
+    characters: Counter
+    """Characters of text sent for synthesis."""
+
+    sessions: Counter
+    """Speech sessions connected."""
+
+    session_connect_duration: Histogram
+    session_time_to_first_audio: Histogram
+    """How long speech sessions took from sending text until the first audio for it was received."""
+
+    def __init__(self, *, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        """
+        Args:
+          buckets: The upper bounds of the buckets of the latency histograms, in seconds.
+        """
+        labels = ("endpoint", "voice")
+        self.requests = Counter("lmnt_requests_total", "API calls made.", labels)
+        self.responses = Counter(
+            "lmnt_responses_total", "Responses received, by status code.", (*labels, "status_code")
+        )
+        self.retries = Counter("lmnt_retries_total", "Attempts that were retried.", labels)
+        self.errors = Counter("lmnt_errors_total", "API calls that raised an error.", (*labels, "error"))
+        self.request_duration = Histogram(
+            "lmnt_request_duration_seconds", "Duration of API calls.", labels, unit="s", buckets=buckets
+        )
+        self.time_to_first_byte = Histogram(
+            "lmnt_time_to_first_byte_seconds",
+            "Time until the first byte of a response body.",
+            labels,
+            unit="s",
+            buckets=buckets,
+        )
+        self.bytes_received = Counter("lmnt_received_bytes_total", "Response bytes received.", labels, unit="By")
+        self.characters = Counter("lmnt_characters_total", "Characters sent for synthesis.", labels)
+        self.sessions = Counter("lmnt_sessions_total", "Speech sessions connected.", ("voice",))
+        self.session_connect_duration = Histogram(
+            "lmnt_session_connect_seconds", "Time to connect a speech session.", ("voice",), unit="s", buckets=buckets
+        )
+        self.session_time_to_first_audio = Histogram(
+            "lmnt_session_time_to_first_audio_seconds",
+            "Time from sending text on a speech session until its first audio.",
+            ("voice",),
+            unit="s",
+            buckets=buckets,
+        )
+        self._instrumented: weakref.WeakSet[HookRegistry] = weakref.WeakSet()
+        self._lock = threading.Lock()
+
+    def __iter__(self) -> Iterator[Union[Counter, Histogram]]:
+        """Iterates over every metric."""
+        for value in vars(self).values():
+            if isinstance(value, (Counter, Histogram)):
+                yield value
+
+    def to_prometheus(self) -> str:
+        """Renders every metric in the Prometheus text exposition format, e.g. to serve on a `/metrics` endpoint."""
+        lines: List[str] = []
+        for metric in self:
+            lines.append(f"# HELP {metric.name} {_escape_help(metric.description)}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            if isinstance(metric, Counter):
+                for values, total in sorted(metric.samples().items()):
+                    lines.append(f"{metric.name}{_format_labels(metric.label_names, values)} {_format_value(total)}")
+                continue
+
+            for values, sample in sorted(metric.samples().items()):
+                for bound, cumulative in _cumulative_buckets(metric, sample):
+                    labels = _format_labels((*metric.label_names, "le"), (*values, bound))
+                    lines.append(f"{metric.name}_bucket{labels} {cumulative}")
+                labels = _format_labels(metric.label_names, values)
+                lines.append(f"{metric.name}_sum{labels} {_format_value(sample.sum)}")
+                lines.append(f"{metric.name}_count{labels} {sample.count}")
+        return "\n".join(lines) + "\n"
+
+    def register_prometheus(self, registry: CollectorRegistry | None = None) -> None:
+        """Registers the metrics with a `prometheus_client` registry, the default one unless given.
+
+        Requires the `prometheus_client` package, e.g. `pip install lmnt[prometheus]`.
+        """
+        try:
+            from prometheus_client import REGISTRY
+        except ImportError:
+            raise RuntimeError(
+                "To export metrics to `prometheus_client` you must have installed the package with the `prometheus` extra, e.g. `pip install lmnt[prometheus]`"
+            ) from None
+
+        (registry if registry is not None else REGISTRY).register(_PrometheusCollector(self))
+
+    def bind_opentelemetry(self, meter: Any) -> None:
+        """Forwards every observation made from now on to instruments created from an OpenTelemetry `Meter`.
+
+        ```py
+        from opentelemetry import metrics as otel_metrics
+
+        metrics.bind_opentelemetry(otel_metrics.get_meter("lmnt"))
+        ```
+        """
+        for metric in self:
+            if isinstance(metric, Counter):
+                counter = meter.create_counter(metric.name, unit=metric.unit, description=metric.description)
+                metric._add_listener(_forward_to(counter.add))
+            else:
+                histogram = meter.create_histogram(metric.name, unit=metric.unit, description=metric.description)
+                metric._add_listener(_forward_to(histogram.record))
+
+    def _instrument(self, hooks: HookRegistry) -> None:
+        with self._lock:
+            if hooks in self._instrumented:
+                return
+            self._instrumented.add(hooks)
+
+        hooks.on("request", self._on_request)
+        hooks.on("response", self._on_response)
+        hooks.on("retry", self._on_retry)
+        hooks.on("complete", self._on_complete)
+        hooks.on("error", self._on_error)
+
+    def _on_request(self, event: RequestEvent) -> None:
+        labels = _labels(event)
+        self.requests.inc(**labels)
+        characters = request_characters(event.json_data)
+        if characters:
+            self.characters.inc(characters, **labels)
+
+    def _on_response(self, event: RequestEvent) -> None:
+        if event.response is not None:
+            self.responses.inc(**_labels(event), status_code=str(event.response.status_code))
+
+    def _on_retry(self, event: RequestEvent) -> None:
+        self.retries.inc(**_labels(event))
+
+    def _on_complete(self, event: RequestEvent) -> None:
+        labels = _labels(event)
+        timing = event.timing
+        if timing.bytes_received:
+            self.bytes_received.inc(timing.bytes_received, **labels)
+        if event.response is None or event.response.is_error:
+            # failed attempts are either retried or end in an error, which is recorded then
+            return
+
+        if timing.total_time is not None:
+            self.request_duration.observe(timing.total_time, **labels)
+        if timing.time_to_first_byte is not None:
+            self.time_to_first_byte.observe(timing.time_to_first_byte, **labels)
+
+    def _on_error(self, event: RequestEvent) -> None:
+        labels = _labels(event)
+        self.errors.inc(**labels, error=type(event.error).__name__)
+        self.request_duration.observe(time.monotonic() - event.timing.started_at, **labels)
+
+    def _record_session_connect(self, voice: str, duration: float) -> None:
+        self.sessions.inc(voice=voice)
+        self.session_connect_duration.observe(duration, voice=voice)
+
+    def _record_session_text(self, voice: str, text: str) -> None:
+        self.characters.inc(len(text), endpoint=SESSION_ENDPOINT, voice=voice)
+
+    def _record_session_audio(self, voice: str, nbytes: int, time_to_first_audio: float | None) -> None:
+        self.bytes_received.inc(nbytes, endpoint=SESSION_ENDPOINT, voice=voice)
+        if time_to_first_audio is not None:
+            self.session_time_to_first_audio.observe(time_to_first_audio, voice=voice)
+
+
+def _forward_to(record: Callable[..., object]) -> _Listener:
+    """Returns a listener that passes every observation on to an OpenTelemetry instrument's `add()` or `record()`."""
+
+    def listener(value: float, labels: Dict[str, str]) -> None:
+        record(value, attributes=labels)
+
+    return listener
+
+
+def _labels(event: RequestEvent) -> Dict[str, str]:
+    json_data = event.json_data
+    voice = cast("Mapping[str, object]", json_data).get("voice") if isinstance(json_data, Mapping) else None
+    return {
+        "endpoint": endpoint_key(event.method, event.url),
+        "voice": voice if isinstance(voice, str) else "",
+    }
+
+
+def _cumulative_buckets(histogram: Histogram, sample: HistogramSample) -> List[Tuple[str, int]]:
+    """Returns the formatted upper bound of every bucket along with the number of observations up to it."""
+    bounds = (*histogram.buckets, float("inf"))
+    buckets: List[Tuple[str, int]] = []
+    cumulative = 0
+    for index, count in enumerate(sample.bucket_counts):
+        cumulative += count
+        buckets.append((_format_value(bounds[index]), cumulative))
+    return buckets
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape_label(values[index])}"' for index, name in enumerate(names))
+    return "{" + pairs + "}"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _escape_help(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+class _PrometheusCollector:
+    """Exposes a `Metrics` to `prometheus_client`, reading it whenever the registry is scraped."""
+
+    def __init__(self, metrics: Metrics) -> None:
+        self._metrics = metrics
+
+    def describe(self) -> List[Any]:
+        # registering shouldn't read the metrics, which `prometheus_client` does when there is no `describe()`
+        return []
+
+    def collect(self) -> Iterator[Any]:
+        from prometheus_client.core import CounterMetricFamily, HistogramMetricFamily
+
+        for metric in self._metrics:
+            label_names = list(metric.label_names)
+            if isinstance(metric, Counter):
+                name = metric.name[: -len("_total")] if metric.name.endswith("_total") else metric.name
+                counter = CounterMetricFamily(name, metric.description, labels=label_names)
+                for values, total in metric.samples().items():
+                    counter.add_metric(list(values), total)
+                yield counter
+                continue
+
+            histogram = HistogramMetricFamily(metric.name, metric.description, labels=label_names)
+            for values, sample in metric.samples().items():
+                histogram.add_metric(list(values), _cumulative_buckets(metric, sample), sample.sum)
+            yield histogram
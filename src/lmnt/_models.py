@@ -62,6 +62,7 @@ from ._compat import (
     get_model_fields,
     field_get_default,
 )
+from ._upload import UploadProgressHook
 from ._constants import RAW_RESPONSE_HEADER
 
 if TYPE_CHECKING:
@@ -786,6 +787,10 @@ class FinalRequestOptionsInput(TypedDict, total=False):
     headers: Headers
     max_retries: int
     timeout: float | Timeout | None
+    deadline: float | None
+    on_upload_progress: UploadProgressHook
+    min_upload_rate: float
+    spool_upload: bool
     files: HttpxRequestFiles | None
     idempotency_key: str
     json_data: Body
@@ -801,6 +806,10 @@ class FinalRequestOptions(pydantic.BaseModel):
     headers: Union[Headers, NotGiven] = NotGiven()
     max_retries: Union[int, NotGiven] = NotGiven()
     timeout: Union[float, Timeout, None, NotGiven] = NotGiven()
+    deadline: Union[float, None, NotGiven] = NotGiven()
+    on_upload_progress: Union[UploadProgressHook, None] = None
+    min_upload_rate: Union[float, None] = None
+    spool_upload: Union[bool, None] = None
     files: Union[HttpxRequestFiles, None] = None
     idempotency_key: Union[str, None] = None
     post_parser: Union[Callable[[Any], Any], NotGiven] = NotGiven()
@@ -823,6 +832,11 @@ class FinalRequestOptions(pydantic.BaseModel):
             return max_retries
         return self.max_retries
 
+    def get_deadline(self, deadline: float | None) -> float | None:
+        if isinstance(self.deadline, NotGiven):
+            return deadline
+        return self.deadline
+
     def _strip_raw_response_header(self) -> None:
         if not is_given(self.headers):
             return
@@ -0,0 +1,721 @@
+from __future__ import annotations
+
+import io
+import os
+import sys
+import math
+import array
+import struct
+import logging
+import pathlib
+import tempfile
+import functools
+import contextlib
+from typing import (
+    IO,
+    Any,
+    List,
+    Tuple,
+    TypeVar,
+    Callable,
+    Iterator,
+    Optional,
+    Sequence,
+    Awaitable,
+    Generator,
+    AsyncIterator,
+    cast,
+)
+from typing_extensions import ParamSpec, override
+
+from ._types import FileTypes, FileContent
+from ._utils import asyncify
+from ._upload import SPOOL_MAX_MEMORY
+
+__all__ = ["AudioPreprocessing", "PreprocessedAudio", "preprocess_audio"]
+
+log: logging.Logger = logging.getLogger(__name__)
+
+_P = ParamSpec("_P")
+_R = TypeVar("_R")
+
+_WAVE_FORMAT_PCM = 0x0001
+_WAVE_FORMAT_IEEE_FLOAT = 0x0003
+_WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+# the number of input frames that are decoded and processed at a time, which bounds the memory used
+_BLOCK_FRAMES = 64 * 1024
+
+# silence is detected in frames of 10ms
+_SILENCE_FRAMES_PER_SECOND = 100
+
+# the number of samples of a pause that are held in memory, until it is known whether sound follows it
+_MAX_PENDING_SAMPLES = _BLOCK_FRAMES
+
+
+class AudioPreprocessing:
+    """How WAV audio is shrunk before it is uploaded by `voices.create(preprocess=...)`.
+
+    The audio is mixed down to mono, resampled to `sample_rate`, stripped of leading and
+    trailing silence and cut off after `max_duration` seconds, then uploaded as 16-bit PCM
+    WAV. Audio that isn't PCM WAV, e.g. MP3, is uploaded unchanged.
+
+    The audio is processed in blocks, so the memory used doesn't depend on its length. It is
+    vectorized with NumPy when that is installed, e.g. with `pip install lmnt[audio]`, and
+    falls back to pure Python, which is much slower, otherwise.
+    """
+
+    def __init__(
+        self,
+        *,
+        sample_rate: int = 24000,
+        trim_silence: bool = True,
+        silence_threshold: float = -45.0,
+        silence_padding: float = 0.1,
+        max_duration: Optional[float] = None,
+    ) -> None:
+        """
+        Args:
+          sample_rate: The sample rate to resample the audio to, audio at a lower rate isn't upsampled.
+
+          trim_silence: Whether to remove the silence at the start and the end of the audio.
+
+          silence_threshold: The level below which audio is considered silent, in dBFS.
+
+          silence_padding: The seconds of silence to keep before and after the trimmed audio.
+
+          max_duration: The number of seconds after which the audio is cut off, after trimming silence.
+        """
+        if sample_rate <= 0:
+            raise ValueError(f"`sample_rate` must be positive but received {sample_rate}")
+        if max_duration is not None and max_duration <= 0:
+            raise ValueError(f"`max_duration` must be positive but received {max_duration}")
+
+        self.sample_rate = sample_rate
+        self.trim_silence = trim_silence
+        self.silence_threshold = silence_threshold
+        self.silence_padding = silence_padding
+        self.max_duration = max_duration
+
+
+class PreprocessedAudio:
+    """The result of `preprocess_audio()`, with the processed WAV file and how much it shrunk."""
+
+    file: IO[bytes]
+    """The processed 16-bit mono PCM WAV audio, spooled to a temporary file if it is large."""
+
+    original_size: int
+    """The size of the audio before it was processed, in bytes."""
+
+    size: int
+    """The size of the processed audio, in bytes."""
+
+    sample_rate: int
+    duration: float
+    """The duration of the processed audio, in seconds."""
+
+    def __init__(self, file: IO[bytes], *, original_size: int, size: int, sample_rate: int, duration: float) -> None:
+        self.file = file
+        self.original_size = original_size
+        self.size = size
+        self.sample_rate = sample_rate
+        self.duration = duration
+
+    @property
+    def compression_ratio(self) -> float:
+        """How many times smaller the processed audio is than the original."""
+        return self.original_size / self.size if self.size else math.inf
+
+    @override
+    def __repr__(self) -> str:
+        return (
+            f"PreprocessedAudio(original_size={self.original_size}, size={self.size}, "
+            f"sample_rate={self.sample_rate}, duration={self.duration:.2f})"
+        )
+
+
+class _WavFormat:
+    def __init__(self, *, format_tag: int, channels: int, sample_rate: int, bits_per_sample: int) -> None:
+        self.format_tag = format_tag
+        self.channels = channels
+        self.sample_rate = sample_rate
+        self.bits_per_sample = bits_per_sample
+
+    @property
+    def block_align(self) -> int:
+        return self.channels * self.bits_per_sample // 8
+
+
+def preprocess_audio(file: FileContent, options: AudioPreprocessing | None = None) -> PreprocessedAudio:
+    """Downmixes, resamples and trims WAV audio, raising a `ValueError` if it isn't PCM WAV.
+
+    ```py
+    from lmnt import preprocess_audio
+
+    audio = preprocess_audio(Path("voice.wav"))
+    print(f"{audio.original_size} -> {audio.size} bytes")
+    ```
+    """
+    options = options or AudioPreprocessing()
+    source, close = _open(file)
+    try:
+        start = source.tell() if source.seekable() else 0
+        wav_format, header_size, data_size = _read_wav_header(source)
+        # the size of a pipe is only known from its header
+        original_size = _remaining_size(source, start) if source.seekable() else header_size + data_size
+        return _process(source, wav_format, data_size, options, original_size=original_size)
+    finally:
+        if close:
+            source.close()
+
+
+@contextlib.contextmanager
+def preprocessed_file(file: FileTypes, preprocess: AudioPreprocessing | bool) -> Iterator[FileTypes]:
+    """Yields the file to upload in place of `file`, and removes the processed audio afterwards."""
+    if not preprocess:
+        yield file
+        return
+
+    processed = _maybe_preprocess_file(file, AudioPreprocessing() if preprocess is True else preprocess)
+    try:
+        yield processed
+    finally:
+        if processed is not file:
+            _close_file(processed)
+
+
+@contextlib.asynccontextmanager
+async def async_preprocessed_file(file: FileTypes, preprocess: AudioPreprocessing | bool) -> AsyncIterator[FileTypes]:
+    """Like `preprocessed_file()`, but processes the audio in a worker thread."""
+    if not preprocess:
+        yield file
+        return
+
+    options = AudioPreprocessing() if preprocess is True else preprocess
+    processed = await asyncify(_maybe_preprocess_file)(file, options)
+    try:
+        yield processed
+    finally:
+        if processed is not file:
+            _close_file(processed)
+
+
+def with_preprocessed_file(func: Callable[_P, _R]) -> Callable[_P, _R]:
+    """Wraps a resource method to call it with its `file` argument preprocessed as its `preprocess` argument
+    says, removing the processed audio once it returns."""
+
+    @functools.wraps(func)
+    def wrapped(*args: _P.args, **kwargs: _P.kwargs) -> _R:
+        with preprocessed_file(cast(FileTypes, kwargs["file"]), cast(Any, kwargs.get("preprocess", False))) as file:
+            kwargs["file"] = file
+            return func(*args, **kwargs)
+
+    return wrapped
+
+
+def async_with_preprocessed_file(func: Callable[_P, Awaitable[_R]]) -> Callable[_P, Awaitable[_R]]:
+    """Like `with_preprocessed_file()`, but for the methods of async resources."""
+
+    @functools.wraps(func)
+    async def wrapped(*args: _P.args, **kwargs: _P.kwargs) -> _R:
+        async with async_preprocessed_file(
+            cast(FileTypes, kwargs["file"]), cast(Any, kwargs.get("preprocess", False))
+        ) as file:
+            kwargs["file"] = file
+            return await func(*args, **kwargs)
+
+    return wrapped
+
+
+def _close_file(file: FileTypes) -> None:
+    content = file[1] if isinstance(file, tuple) else file
+    if hasattr(content, "close"):
+        cast(IO[bytes], content).close()
+
+
+def _maybe_preprocess_file(file: FileTypes, options: AudioPreprocessing) -> FileTypes:
+    """Returns the file with its audio preprocessed, or unchanged if it isn't PCM WAV."""
+    if isinstance(file, tuple):
+        filename, content = file[0], file[1]
+        processed = _maybe_preprocess_content(content, options)
+        if processed is content:
+            return file
+        if len(file) > 2:
+            # keep any custom headers, but the content type has changed
+            return cast(FileTypes, (_wav_filename(filename), processed, "audio/wav", *file[3:]))
+        return (_wav_filename(filename), processed)
+
+    processed = _maybe_preprocess_content(file, options)
+    if processed is file:
+        return file
+
+    name = pathlib.Path(os.fspath(file)).name if isinstance(file, os.PathLike) else getattr(file, "name", None)
+    return (_wav_filename(name if isinstance(name, str) else None), processed)
+
+
+def _maybe_preprocess_content(content: FileContent, options: AudioPreprocessing) -> FileContent:
+    if not _is_wav(content):
+        log.debug("Not preprocessing the voice audio as it isn't WAV")
+        return content
+
+    position = None if isinstance(content, (bytes, os.PathLike)) else content.tell()
+    try:
+        audio = preprocess_audio(content, options)
+    except ValueError as err:
+        log.debug("Not preprocessing the voice audio: %s", err)
+        if position is not None:
+            # upload the file from where it was, rather than from after its header
+            cast(IO[bytes], content).seek(position)
+        return content
+
+    log.info(
+        "Preprocessed the voice audio from %d to %d bytes (%.1fx smaller)",
+        audio.original_size,
+        audio.size,
+        audio.compression_ratio,
+    )
+    return audio.file
+
+
+def _wav_filename(filename: str | None) -> str | None:
+    if filename is None:
+        return None
+    return str(pathlib.PurePath(filename).with_suffix(".wav"))
+
+
+def _open(file: FileContent) -> Tuple[IO[bytes], bool]:
+    """Returns a binary file to read the content from, and whether it should be closed afterwards."""
+    if isinstance(file, bytes):
+        return io.BytesIO(file), True
+    if isinstance(file, os.PathLike):
+        return open(os.fspath(file), "rb"), True
+    return file, False
+
+
+def _is_wav(file: FileContent) -> bool:
+    if isinstance(file, bytes):
+        return file[:4] == b"RIFF" and file[8:12] == b"WAVE"
+    if isinstance(file, os.PathLike):
+        with open(os.fspath(file), "rb") as f:
+            header = f.read(12)
+    else:
+        if not file.seekable():
+            return False
+        position = file.tell()
+        header = file.read(12)
+        file.seek(position)
+    return header[:4] == b"RIFF" and header[8:12] == b"WAVE"
+
+
+def _remaining_size(file: IO[bytes], start: int) -> int:
+    position = file.tell()
+    end = file.seek(0, os.SEEK_END)
+    file.seek(position)
+    return end - start
+
+
+def _read_wav_header(file: IO[bytes]) -> Tuple[_WavFormat, int, int]:
+    """Reads up to the start of the `data` chunk, returning the format of the audio, the size of the header and the size of the data."""
+    header = file.read(12)
+    if len(header) < 12 or header[:4] != b"RIFF" or header[8:12] != b"WAVE":
+        raise ValueError("Expected the audio to start with a RIFF/WAVE header")
+
+    header_size = 12
+    wav_format: _WavFormat | None = None
+    while True:
+        chunk_header = file.read(8)
+        if len(chunk_header) < 8:
+            raise ValueError("Expected a `data` chunk in the WAV file")
+        header_size += 8
+        chunk_id = chunk_header[:4]
+        (chunk_size,) = struct.unpack("<I", chunk_header[4:])
+
+        if chunk_id == b"data":
+            if wav_format is None:
+                raise ValueError("Expected a `fmt ` chunk before the `data` chunk in the WAV file")
+            return wav_format, header_size, chunk_size
+
+        chunk = file.read(chunk_size + (chunk_size & 1))
+        header_size += len(chunk)
+        if chunk_id == b"fmt ":
+            wav_format = _parse_fmt_chunk(chunk)
+
+
+def _parse_fmt_chunk(chunk: bytes) -> _WavFormat:
+    if len(chunk) < 16:
+        raise ValueError("The `fmt ` chunk of the WAV file is truncated")
+
+    format_tag, channels, sample_rate, _, _, bits_per_sample = struct.unpack_from("<HHIIHH", chunk)
+    if format_tag == _WAVE_FORMAT_EXTENSIBLE and len(chunk) >= 26:
+        # the format is in the first two bytes of the sub-format GUID
+        (format_tag,) = struct.unpack_from("<H", chunk, 24)
+
+    supported = (format_tag == _WAVE_FORMAT_PCM and bits_per_sample in (8, 16, 24, 32)) or (
+        format_tag == _WAVE_FORMAT_IEEE_FLOAT and bits_per_sample in (32, 64)
+    )
+    if not supported or channels < 1 or sample_rate < 1:
+        raise ValueError(f"Unsupported WAV format {format_tag:#x} with {bits_per_sample} bits per sample")
+
+    return _WavFormat(
+        format_tag=format_tag, channels=channels, sample_rate=sample_rate, bits_per_sample=bits_per_sample
+    )
+
+
+def _process(
+    source: IO[bytes], wav_format: _WavFormat, data_size: int, options: AudioPreprocessing, *, original_size: int
+) -> PreprocessedAudio:
+    np = _load_numpy()
+    sample_rate = min(options.sample_rate, wav_format.sample_rate)
+    resampler = _Resampler(np, wav_format.sample_rate, sample_rate)
+    trimmer = _SilenceTrimmer(np, sample_rate, options) if options.trim_silence else None
+    max_samples = round(options.max_duration * sample_rate) if options.max_duration is not None else None
+
+    output = cast("IO[bytes]", tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY))
+    output.write(_wav_header(sample_rate, 0))
+    written = 0
+
+    def write(samples: Any) -> bool:
+        """Writes samples up to the duration cap, returning whether the cap was reached."""
+        nonlocal written
+        if max_samples is not None:
+            samples = samples[: max_samples - written]
+        output.write(_encode_pcm16(np, samples))
+        written += len(samples)
+        return max_samples is not None and written >= max_samples
+
+    remaining = data_size
+    done = False
+    try:
+        while remaining > 0 and not done:
+            data = source.read(min(remaining, _BLOCK_FRAMES * wav_format.block_align))
+            if not data:
+                # the size in the header is often wrong for audio that was streamed to a file
+                break
+            remaining -= len(data)
+            # drop a partial frame at the end of a truncated file
+            data = data[: len(data) - len(data) % wav_format.block_align]
+
+            samples = resampler.process(_decode(np, data, wav_format))
+            for block in trimmer.process(samples) if trimmer is not None else [samples]:
+                done = write(block)
+                if done:
+                    break
+
+        if trimmer is not None and not done:
+            write(trimmer.flush())
+    finally:
+        if trimmer is not None:
+            trimmer.close()
+
+    output.seek(0)
+    output.write(_wav_header(sample_rate, written * 2))
+    output.seek(0, os.SEEK_END)
+    size = output.tell()
+    output.seek(0)
+    return PreprocessedAudio(
+        output,
+        original_size=original_size,
+        size=size,
+        sample_rate=sample_rate,
+        duration=written / sample_rate,
+    )
+
+
+def _wav_header(sample_rate: int, data_size: int) -> bytes:
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF",
+        36 + data_size,
+        b"WAVE",
+        b"fmt ",
+        16,
+        _WAVE_FORMAT_PCM,
+        1,
+        sample_rate,
+        sample_rate * 2,
+        2,
+        16,
+        b"data",
+        data_size,
+    )
+
+
+def _load_numpy() -> Any:
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _decode(np: Any, data: bytes, wav_format: _WavFormat) -> Any:
+    """Decodes interleaved samples into mono samples between -1 and 1."""
+    channels = wav_format.channels
+    bits = wav_format.bits_per_sample
+    is_float = wav_format.format_tag == _WAVE_FORMAT_IEEE_FLOAT
+
+    if np is not None:
+        if is_float:
+            samples = np.frombuffer(data, dtype="<f4" if bits == 32 else "<f8").astype(np.float32)
+        elif bits == 8:
+            samples = (np.frombuffer(data, dtype=np.uint8).astype(np.float32) - 128) / 128
+        elif bits == 24:
+            raw = np.frombuffer(data, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+            values = raw[:, 0] | (raw[:, 1] << 8) | (raw[:, 2] << 16)
+            samples = (np.where(values >= 1 << 23, values - (1 << 24), values) / float(1 << 23)).astype(np.float32)
+        else:
+            dtype = "<i2" if bits == 16 else "<i4"
+            samples = np.frombuffer(data, dtype=dtype).astype(np.float32) / float(1 << (bits - 1))
+        if channels > 1:
+            samples = samples.reshape(-1, channels).mean(axis=1, dtype=np.float32)
+        return samples
+
+    decoded: Sequence[float]
+    if bits == 24:
+        scale = float(1 << 23)
+        decoded = [int.from_bytes(data[i : i + 3], "little", signed=True) / scale for i in range(0, len(data), 3)]
+    else:
+        typecode = {8: "B", 16: "h", 32: "f" if is_float else "i", 64: "d"}[bits]
+        raw_values = array.array(typecode, data)
+        if sys.byteorder == "big" and bits > 8:
+            raw_values.byteswap()
+        if bits == 8:
+            decoded = [(value - 128) / 128 for value in raw_values]
+        elif not is_float:
+            scale = float(1 << (bits - 1))
+            decoded = [value / scale for value in raw_values]
+        else:
+            decoded = raw_values
+
+    if channels == 1:
+        return list(decoded)
+    return [sum(decoded[i : i + channels]) / channels for i in range(0, len(decoded), channels)]
+
+
+def _encode_pcm16(np: Any, samples: Any) -> bytes:
+    if np is not None:
+        return cast(bytes, (np.clip(samples, -1.0, 1.0) * 32767).round().astype("<i2").tobytes())
+
+    encoded = array.array("h", [round(max(-1.0, min(1.0, sample)) * 32767) for sample in samples])
+    if sys.byteorder == "big":
+        encoded.byteswap()
+    return encoded.tobytes()
+
+
+def _to_bytes(np: Any, samples: Any) -> bytes:
+    """Encodes samples losslessly, unlike `_encode_pcm16()`."""
+    if np is not None:
+        return cast(bytes, np.asarray(samples, dtype=np.float32).tobytes())
+    return array.array("d", samples).tobytes()
+
+
+def _from_bytes(np: Any, data: bytes) -> Any:
+    if np is not None:
+        return np.frombuffer(data, dtype=np.float32)
+    return array.array("d", data).tolist()
+
+
+def _sample_size(np: Any) -> int:
+    """The number of bytes that `_to_bytes()` encodes every sample into."""
+    return 4 if np is not None else 8
+
+
+def _concat(np: Any, first: Any, second: Any) -> Any:
+    if np is not None:
+        return np.concatenate((first, second))
+    return [*first, *second]
+
+
+def _empty(np: Any) -> Any:
+    return np.zeros(0, dtype=np.float32) if np is not None else []
+
+
+class _Resampler:
+    """Resamples a stream of blocks by linear interpolation, after a moving average that stops aliasing."""
+
+    def __init__(self, np: Any, from_rate: int, to_rate: int) -> None:
+        self._np = np
+        self._step = from_rate / to_rate
+        self._passthrough = from_rate == to_rate
+        self._window = max(1, round(self._step))
+        # the unfiltered samples at the end of the previous block, for the moving average
+        self._history: Any = _empty(np)
+        # the filtered samples, from the input sample at `_offset` on, that are still needed for interpolation
+        self._buffer: Any = _empty(np)
+        self._offset = 0
+        # the position of the next output sample, in input samples
+        self._position = 0.0
+
+    def process(self, samples: Any) -> Any:
+        if self._passthrough:
+            return samples
+
+        np = self._np
+        buffer = _concat(np, self._buffer, self._smooth(samples))
+        last = self._offset + len(buffer) - 1
+        if self._position > last:
+            self._buffer = buffer
+            return _empty(np)
+
+        count = math.floor((last - self._position) / self._step) + 1
+        highest = max(len(buffer) - 2, 0)
+        if np is not None:
+            positions = self._position - self._offset + self._step * np.arange(count)
+            index = np.minimum(positions.astype(np.int64), highest)
+            fraction = (positions - index).astype(np.float32)
+            upper = np.minimum(index + 1, len(buffer) - 1)
+            output = buffer[index] * (1 - fraction) + buffer[upper] * fraction
+        else:
+            interpolated: List[float] = []
+            for k in range(count):
+                position = self._position - self._offset + self._step * k
+                index = min(int(position), highest)
+                fraction = position - index
+                upper = min(index + 1, len(buffer) - 1)
+                interpolated.append(buffer[index] * (1 - fraction) + buffer[upper] * fraction)
+            output = interpolated
+
+        self._position += self._step * count
+        # keep the samples from the one that the next output sample is interpolated from
+        keep_from = min(int(self._position) - self._offset, len(buffer) - 1)
+        self._buffer = buffer[keep_from:]
+        self._offset += keep_from
+        return output
+
+    def _smooth(self, samples: Any) -> Any:
+        """Returns the moving average of the samples over `_window` samples, continuing from the previous block."""
+        window = self._window
+        if window == 1:
+            return samples
+
+        np = self._np
+        padded = _concat(np, self._history, samples)
+        start = len(padded) - len(samples)
+        self._history = padded[max(len(padded) - (window - 1), 0) :]
+
+        if np is not None:
+            sums = np.concatenate((np.zeros(1), np.cumsum(padded, dtype=np.float64)))
+            ends = np.arange(start + 1, len(padded) + 1)
+            begins = np.maximum(ends - window, 0)
+            return ((sums[ends] - sums[begins]) / (ends - begins)).astype(np.float32)
+
+        # at the very start of the audio, average over the samples that there are
+        filtered: List[float] = []
+        total = sum(padded[:start])
+        for end in range(start + 1, len(padded) + 1):
+            total += padded[end - 1]
+            if end > window:
+                total -= padded[end - 1 - window]
+            filtered.append(total / min(end, window))
+        return filtered
+
+
+class _SilenceTrimmer:
+    """Drops the silent 10ms frames at the start and the end of a stream of blocks, keeping some padding."""
+
+    def __init__(self, np: Any, sample_rate: int, options: AudioPreprocessing) -> None:
+        self._np = np
+        self._frame = max(1, sample_rate // _SILENCE_FRAMES_PER_SECOND)
+        self._threshold = 10 ** (options.silence_threshold / 20)
+        self._padding = round(options.silence_padding * sample_rate)
+        self._started = False
+        # samples that don't make up a whole frame yet
+        self._partial: Any = _empty(np)
+        # the silence since the last sound, which is only written if more sound follows it. Once more than
+        # `_MAX_PENDING_SAMPLES` of it are held, they are moved to `_spilled`, which is older than `_pending`.
+        self._pending: List[Any] = []
+        self._pending_samples = 0
+        self._spilled: Optional[IO[bytes]] = None
+
+    def process(self, samples: Any) -> Iterator[Any]:
+        """Yields the blocks of audio that are known to be kept once `samples` were added."""
+        np = self._np
+        samples = _concat(np, self._partial, samples)
+        whole = len(samples) - len(samples) % self._frame
+        self._partial = samples[whole:]
+        samples = samples[:whole]
+
+        loud = self._loud_frames(samples)
+        if not loud:
+            self._hold(samples)
+            return
+
+        first, last = loud[0] * self._frame, (loud[-1] + 1) * self._frame
+        if self._started:
+            yield from self._take_pending()
+            yield samples[:last]
+        else:
+            # nothing is spilled before the first sound, as only the padding before it is held
+            lead_in = _concat(np, _concat_all(np, self._pending), samples[:first])
+            self._pending, self._pending_samples = [], 0
+            yield _concat(np, lead_in[max(len(lead_in) - self._padding, 0) :], samples[first:last])
+            self._started = True
+        self._hold(samples[last:])
+
+    def flush(self) -> Any:
+        """Returns the padding after the last sound, once the whole stream was processed."""
+        np = self._np
+        padding = _empty(np)
+        if not self._started:
+            return padding
+        self._hold(self._partial)
+        with contextlib.closing(self._take_pending()) as blocks:
+            for block in blocks:
+                padding = _concat(np, padding, block[: self._padding - len(padding)])
+                if len(padding) >= self._padding:
+                    break
+        return padding
+
+    def close(self) -> None:
+        """Removes the spilled silence, if any."""
+        if self._spilled is not None:
+            self._spilled.close()
+            self._spilled = None
+
+    def _loud_frames(self, samples: Any) -> List[int]:
+        np = self._np
+        if np is not None:
+            frames = samples.reshape(-1, self._frame).astype(np.float64)
+            rms = np.sqrt(np.mean(frames * frames, axis=1))
+            return cast(List[int], np.flatnonzero(rms >= self._threshold).tolist())
+
+        loud: List[int] = []
+        for index in range(len(samples) // self._frame):
+            frame = samples[index * self._frame : (index + 1) * self._frame]
+            if math.sqrt(sum(sample * sample for sample in frame) / len(frame)) >= self._threshold:
+                loud.append(index)
+        return loud
+
+    def _hold(self, samples: Any) -> None:
+        if not len(samples):
+            return
+        self._pending.append(samples)
+        self._pending_samples += len(samples)
+        if not self._started:
+            # only the padding right before the first sound is ever written
+            pending = _concat_all(self._np, self._pending)
+            self._pending = [pending[max(len(pending) - self._padding, 0) :]]
+            self._pending_samples = len(self._pending[0])
+        elif self._pending_samples > _MAX_PENDING_SAMPLES:
+            if self._spilled is None:
+                self._spilled = tempfile.TemporaryFile()
+            for pending in self._pending:
+                self._spilled.write(_to_bytes(self._np, pending))
+            self._pending, self._pending_samples = [], 0
+
+    def _take_pending(self) -> Generator[Any, None, None]:
+        """Yields the held silence, oldest first, in blocks of at most `_BLOCK_FRAMES` samples from the spill."""
+        spilled, self._spilled = self._spilled, None
+        pending, self._pending, self._pending_samples = self._pending, [], 0
+        if spilled is not None:
+            with spilled:
+                spilled.seek(0)
+                while data := spilled.read(_BLOCK_FRAMES * _sample_size(self._np)):
+                    yield _from_bytes(self._np, data)
+        yield from pending
+
+
+def _concat_all(np: Any, blocks: List[Any]) -> Any:
+    if np is not None:
+        return np.concatenate(blocks) if blocks else _empty(np)
+    return [sample for samples in blocks for sample in samples]
@@ -0,0 +1,444 @@
+from __future__ import annotations
+
+import os
+import time
+import hashlib
+import logging
+import tempfile
+import posixpath
+import threading
+from typing import TYPE_CHECKING, List, Tuple, Union, Iterable, Optional
+from pathlib import Path
+from collections import Counter, OrderedDict
+from typing_extensions import override
+
+import anyio
+import httpx
+
+from ._batch import BatchResult, BatchProgressHook, run_batch, async_run_batch
+from ._types import NotGiven
+from ._exceptions import APITimeoutError, APIConnectionError
+from .types.voice import Voice
+
+if TYPE_CHECKING:
+    from ._client import Lmnt, AsyncLmnt
+
+__all__ = ["PreviewCache", "VoicePreview"]
+
+log: logging.Logger = logging.getLogger(__name__)
+
+DEFAULT_PREVIEW_CACHE_BYTES = 256 * 1024 * 1024
+
+_CHUNK_SIZE = 64 * 1024
+_TEMP_PREFIX = ".tmp-"
+
+# never sent to the hosts that serve the previews, even if they were set on a custom `http_client`
+_CREDENTIAL_HEADERS = ("X-API-Key", "Authorization")
+
+
+class VoicePreview:
+    """A preview clip of a voice, fetched by `voices.fetch_previews()`."""
+
+    voice_id: str
+    url: str
+
+    path: Optional[Path]
+    """Where the preview is stored in the `PreviewCache`, or `None` if it was fetched without a cache.
+
+    Also `None` if the preview had to be evicted once the `voices.fetch_previews()` call that fetched
+    it finished, because its previews didn't all fit in the cache, in which case it is kept in memory.
+    """
+
+    cached: bool
+    """Whether the preview was already in the cache, so that it wasn't downloaded again."""
+
+    def __init__(
+        self, voice_id: str, url: str, *, path: Optional[Path] = None, content: Optional[bytes] = None, cached: bool
+    ) -> None:
+        self.voice_id = voice_id
+        self.url = url
+        self.path = path
+        self.cached = cached
+        self._content = content
+
+    def read(self) -> bytes:
+        """Returns the audio of the preview."""
+        if self._content is not None:
+            return self._content
+        assert self.path is not None
+        return self.path.read_bytes()
+
+    @override
+    def __repr__(self) -> str:
+        return f"VoicePreview(voice_id={self.voice_id!r}, path={self.path!r}, cached={self.cached})"
+
+
+class PreviewCache:
+    """A bounded on-disk cache of voice previews, for `voices.fetch_previews()`.
+
+    Every preview is stored in its own file, named after a hash of the voice ID and the preview
+    URL, so that a voice whose preview changes is fetched again. Files are written to a temporary
+    name and renamed into place once they are complete, so a file in the cache is never partial,
+    even if the download failed or the process was killed.
+
+    Once the files take up more than `max_bytes`, the least recently used are deleted. The previews
+    returned by a `voices.fetch_previews()` call aren't deleted while it is running, and those that
+    are deleted once it finishes are read into memory first, so they can still be `read()`. Several
+    processes may share a directory, but each one only bounds the files that it knows about.
+
+    ```py
+    from lmnt import Lmnt, PreviewCache
+
+    client = Lmnt()
+    cache = PreviewCache("~/.cache/lmnt/previews", max_bytes=100 * 1024 * 1024)
+    results = client.voices.fetch_previews(client.voices.list(owner="all"), cache=cache)
+    ```
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, "os.PathLike[str]"],
+        *,
+        max_bytes: int = DEFAULT_PREVIEW_CACHE_BYTES,
+        max_age: Optional[float] = None,
+    ) -> None:
+        """
+        Args:
+          directory: The directory to store the previews in, which is created if it doesn't exist.
+
+          max_bytes: The total size of the previews to keep. A single preview larger than this is still
+            kept, on its own.
+
+          max_age: The number of seconds after which a cached preview is fetched again, or `None` to keep
+            using it for as long as its URL doesn't change.
+        """
+        if max_bytes < 1:
+            raise ValueError(f"`max_bytes` must be at least 1 but received {max_bytes}")
+        if max_age is not None and max_age < 0:
+            raise ValueError(f"`max_age` must not be negative but received {max_age}")
+
+        self.directory = Path(directory).expanduser()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        # the size of every cached file by its name, least recently used first
+        self._entries: OrderedDict[str, int] = OrderedDict()
+        self._size = 0
+        # the previews handed out by `voices.fetch_previews()` calls that are still running, which aren't evicted
+        self._held: Counter[str] = Counter()
+
+        # (modification time, name, size) of the files already in the directory
+        files: List[Tuple[float, str, int]] = []
+        for path in self.directory.iterdir():
+            if path.name.startswith(_TEMP_PREFIX) or not path.is_file():
+                continue
+            stat = path.stat()
+            files.append((stat.st_mtime, path.name, stat.st_size))
+        for _, name, size in sorted(files):
+            self._entries[name] = size
+            self._size += size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size(self) -> int:
+        """The total size of the cached previews, in bytes."""
+        return self._size
+
+    def path_for(self, voice_id: str, url: str) -> Path:
+        """Returns where the preview of the voice at the URL is, or would be, stored."""
+        digest = hashlib.sha256(f"{voice_id}\n{url}".encode()).hexdigest()
+        # keep the extension, so that the files can be opened by audio players
+        extension = posixpath.splitext(httpx.URL(url).path)[1]
+        if not (1 < len(extension) <= 6 and extension[1:].isalnum()):
+            extension = ""
+        return self.directory.joinpath(digest + extension)
+
+    def get(self, voice_id: str, url: str) -> Optional[Path]:
+        """Returns the path of the cached preview of the voice at the URL, or `None` if it isn't cached or is too old."""
+        return self._get(voice_id, url, hold=False)
+
+    def clear(self) -> None:
+        """Deletes every cached preview."""
+        with self._lock:
+            names = list(self._entries)
+            self._entries.clear()
+            self._size = 0
+        for name in names:
+            _unlink(self.directory.joinpath(name))
+
+    def _get(self, voice_id: str, url: str, *, hold: bool) -> Optional[Path]:
+        path = self.path_for(voice_id, url)
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            self._forget(path.name)
+            return None
+
+        if self.max_age is not None and time.time() - stat.st_mtime >= self.max_age:
+            return None
+        with self._lock:
+            if path.name not in self._entries:
+                # written by another process that shares the directory
+                self._size += stat.st_size
+            self._entries[path.name] = stat.st_size
+            self._entries.move_to_end(path.name)
+            if hold:
+                self._held[path.name] += 1
+        return path
+
+    def _temporary_file(self) -> Tuple[int, Path]:
+        fd, name = tempfile.mkstemp(dir=self.directory, prefix=_TEMP_PREFIX)
+        return fd, Path(name)
+
+    def _commit(self, temporary: Path, path: Path, *, hold: bool) -> None:
+        """Moves a completely written preview into place, and deletes the least recently used previews over the limit."""
+        size = temporary.stat().st_size
+        os.replace(temporary, path)
+
+        with self._lock:
+            self._size += size - self._entries.pop(path.name, 0)
+            self._entries[path.name] = size
+            if hold:
+                self._held[path.name] += 1
+            evicted = self._evict()
+        self._delete(evicted)
+
+    def _release(self, previews: Iterable[VoicePreview]) -> None:
+        """Lets the previews held by a finished batch be evicted, reading those that are into memory first."""
+        previews = [preview for preview in previews if preview.path is not None]
+        with self._lock:
+            for preview in previews:
+                assert preview.path is not None
+                self._held[preview.path.name] -= 1
+            # drops the previews that are no longer held by any batch
+            self._held = +self._held
+            evicted = set(self._evict())
+
+        for preview in previews:
+            if preview.path is not None and preview.path.name in evicted:
+                try:
+                    preview._content = preview.path.read_bytes()
+                except FileNotFoundError:
+                    # deleted by another process that shares the directory
+                    continue
+                preview.path = None
+        self._delete(evicted)
+
+    def _evict(self) -> List[str]:
+        """Removes the least recently used previews that aren't held from the cache, until it is within the limit."""
+        evicted: List[str] = []
+        for name in list(self._entries):
+            if self._size <= self.max_bytes or len(self._entries) <= 1:
+                break
+            if self._held[name]:
+                continue
+            self._size -= self._entries.pop(name)
+            evicted.append(name)
+        return evicted
+
+    def _delete(self, names: Iterable[str]) -> None:
+        count = 0
+        for name in names:
+            _unlink(self.directory.joinpath(name))
+            count += 1
+        if count:
+            log.debug("Evicted %d voice preview(s) from the cache", count)
+
+    def _forget(self, name: str) -> None:
+        with self._lock:
+            size = self._entries.pop(name, None)
+            if size is not None:
+                self._size -= size
+
+
+def fetch_previews(
+    client: Lmnt,
+    voices: Iterable[Voice],
+    *,
+    cache: Optional[PreviewCache],
+    concurrency: int,
+    on_progress: Optional[BatchProgressHook],
+    timeout: float | httpx.Timeout | None | NotGiven,
+) -> List[BatchResult[VoicePreview]]:
+    """Fetches the previews of the voices as a batch, keeping the cached ones from being evicted until it is done."""
+    held: List[VoicePreview] = []
+    try:
+        return run_batch(
+            voices,
+            lambda voice: fetch_preview(client, voice, cache=cache, held=held, timeout=timeout),
+            key=lambda voice: voice.id,
+            concurrency=concurrency,
+            on_progress=on_progress,
+        )
+    finally:
+        if cache is not None:
+            cache._release(held)
+
+
+async def async_fetch_previews(
+    client: AsyncLmnt,
+    voices: Iterable[Voice],
+    *,
+    cache: Optional[PreviewCache],
+    concurrency: int,
+    on_progress: Optional[BatchProgressHook],
+    timeout: float | httpx.Timeout | None | NotGiven,
+) -> List[BatchResult[VoicePreview]]:
+    """Fetches the previews of the voices as a batch, keeping the cached ones from being evicted until it is done."""
+    held: List[VoicePreview] = []
+    try:
+        return await async_run_batch(
+            voices,
+            lambda voice: async_fetch_preview(client, voice, cache=cache, held=held, timeout=timeout),
+            key=lambda voice: voice.id,
+            concurrency=concurrency,
+            on_progress=on_progress,
+        )
+    finally:
+        if cache is not None:
+            cache._release(held)
+
+
+def fetch_preview(
+    client: Lmnt,
+    voice: Voice,
+    *,
+    cache: Optional[PreviewCache],
+    held: Optional[List[VoicePreview]] = None,
+    timeout: float | httpx.Timeout | None | NotGiven,
+) -> VoicePreview:
+    """Fetches the preview of the voice, through the cache if given.
+
+    With `held`, the preview is kept from being evicted until it is passed to `cache._release()`.
+    """
+    url = _preview_url(voice)
+    if cache is not None:
+        cached = cache._get(voice.id, url, hold=held is not None)
+        if cached is not None:
+            return _hand_out(VoicePreview(voice.id, url, path=cached, cached=True), held)
+
+    request = _build_request(client._client, url, timeout=_timeout(client, timeout))
+    try:
+        response = client._client.send(request, stream=True)
+    except httpx.TimeoutException as err:
+        raise APITimeoutError(request=request) from err
+    except httpx.HTTPError as err:
+        raise APIConnectionError(request=request) from err
+
+    try:
+        if not response.is_success:
+            response.read()
+            raise client._make_status_error_from_response(response)
+
+        try:
+            if cache is None:
+                return VoicePreview(voice.id, url, content=response.read(), cached=False)
+
+            path = cache.path_for(voice.id, url)
+            fd, temporary = cache._temporary_file()
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    for chunk in response.iter_bytes(_CHUNK_SIZE):
+                        f.write(chunk)
+                cache._commit(temporary, path, hold=held is not None)
+            finally:
+                _unlink(temporary)
+        except httpx.TimeoutException as err:
+            raise APITimeoutError(request=request) from err
+        except httpx.HTTPError as err:
+            raise APIConnectionError(request=request) from err
+    finally:
+        response.close()
+
+    return _hand_out(VoicePreview(voice.id, url, path=path, cached=False), held)
+
+
+async def async_fetch_preview(
+    client: AsyncLmnt,
+    voice: Voice,
+    *,
+    cache: Optional[PreviewCache],
+    held: Optional[List[VoicePreview]] = None,
+    timeout: float | httpx.Timeout | None | NotGiven,
+) -> VoicePreview:
+    """Fetches the preview of the voice, through the cache if given.
+
+    With `held`, the preview is kept from being evicted until it is passed to `cache._release()`.
+    """
+    url = _preview_url(voice)
+    if cache is not None:
+        cached = cache._get(voice.id, url, hold=held is not None)
+        if cached is not None:
+            return _hand_out(VoicePreview(voice.id, url, path=cached, cached=True), held)
+
+    request = _build_request(client._client, url, timeout=_timeout(client, timeout))
+    try:
+        response = await client._client.send(request, stream=True)
+    except httpx.TimeoutException as err:
+        raise APITimeoutError(request=request) from err
+    except httpx.HTTPError as err:
+        raise APIConnectionError(request=request) from err
+
+    try:
+        if not response.is_success:
+            await response.aread()
+            raise client._make_status_error_from_response(response)
+
+        try:
+            if cache is None:
+                return VoicePreview(voice.id, url, content=await response.aread(), cached=False)
+
+            path = cache.path_for(voice.id, url)
+            fd, temporary = cache._temporary_file()
+            try:
+                async with await anyio.open_file(fd, "wb") as f:
+                    async for chunk in response.aiter_bytes(_CHUNK_SIZE):
+                        await f.write(chunk)
+                cache._commit(temporary, path, hold=held is not None)
+            finally:
+                _unlink(temporary)
+        except httpx.TimeoutException as err:
+            raise APITimeoutError(request=request) from err
+        except httpx.HTTPError as err:
+            raise APIConnectionError(request=request) from err
+    finally:
+        await response.aclose()
+
+    return _hand_out(VoicePreview(voice.id, url, path=path, cached=False), held)
+
+
+def _hand_out(preview: VoicePreview, held: Optional[List[VoicePreview]]) -> VoicePreview:
+    if held is not None:
+        held.append(preview)
+    return preview
+
+
+def _preview_url(voice: Voice) -> str:
+    if not voice.preview_url:
+        raise ValueError(f"Voice {voice.id!r} has no `preview_url`")
+    return voice.preview_url
+
+
+def _timeout(client: Union[Lmnt, AsyncLmnt], timeout: float | httpx.Timeout | None | NotGiven) -> httpx.Timeout:
+    return httpx.Timeout(client.timeout if isinstance(timeout, NotGiven) else timeout)
+
+
+def _build_request(
+    http_client: Union[httpx.Client, httpx.AsyncClient], url: str, *, timeout: httpx.Timeout
+) -> httpx.Request:
+    # sent through the client's connection pool, but not through the API's request pipeline,
+    # so the previews don't count against the rate limiter, retry budget or circuit breakers
+    request = http_client.build_request("GET", url, timeout=timeout)
+    for header in _CREDENTIAL_HEADERS:
+        request.headers.pop(header, None)
+    return request
+
+
+def _unlink(path: Path) -> None:
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import time
+import logging
+import threading
+from typing import Any, Mapping, Optional, cast
+
+import anyio
+
+__all__ = ["RateLimiter", "request_characters"]
+
+log: logging.Logger = logging.getLogger(__name__)
+
+
+class _TokenBucket:
+    """A token bucket whose fill rate can be adjusted while it is in use.
+
+    Callers reserve tokens up front, which may take the balance negative; the returned
+    delay is how long the caller has to wait until its reservation is covered. This
+    means waiters are served in the order they arrived and each only sleeps once.
+    """
+
+    def __init__(self, *, rate: float, capacity: float, now: float) -> None:
+        self.max_rate = rate
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = now
+
+    def _refill(self, now: float) -> None:
+        # `now` can be earlier than the last update if a reservation was made for the end of a pause
+        elapsed = now - self.updated_at
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated_at = now
+
+    def reserve(self, amount: float, now: float) -> float:
+        self._refill(now)
+        self.tokens -= amount
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.rate
+
+    def release(self, amount: float) -> None:
+        """Gives back the tokens of a reservation that is no longer needed."""
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+    def set_rate(self, rate: float, now: float) -> None:
+        # settle the tokens accrued at the old rate before switching
+        self._refill(now)
+        self.rate = rate
+
+
+class RateLimiter:
+    """A client-side rate limiter shared by every request made through a client.
+
+    Requests are throttled by a token bucket for the number of requests and, optionally,
+    a second one for the number of characters sent for synthesis. Instead of failing,
+    requests wait locally until the buckets allow them through.
+
+    The limiter adapts to the API's feedback: a `429` response multiplicatively reduces
+    both rates and honours any `Retry-After` by pausing all requests, and each successful
+    response then additively restores the rates back towards their configured maximum.
+    The rates are reduced at most once per `decrease_cooldown`, since the `429`s of
+    requests that were already in flight are all caused by the same burst.
+
+    ```py
+    from lmnt import Lmnt, RateLimiter
+
+    client = Lmnt(rate_limiter=RateLimiter(requests_per_second=20, characters_per_second=5_000))
+    ```
+    """
+
+    def __init__(
+        self,
+        *,
+        requests_per_second: float = 10.0,
+        request_burst: float | None = None,
+        characters_per_second: float | None = None,
+        character_burst: float | None = None,
+        decrease_factor: float = 0.5,
+        increase_fraction: float = 0.05,
+        min_rate_fraction: float = 0.05,
+        decrease_cooldown: float = 1.0,
+    ) -> None:
+        """
+        Args:
+          requests_per_second: The maximum sustained request rate.
+
+          request_burst: How many requests can be sent at once after a quiet period.
+              Defaults to `requests_per_second`.
+
+          characters_per_second: The maximum sustained rate of `text` characters sent
+              for synthesis. Character throttling is disabled if this isn't given.
+
+          character_burst: How many characters can be sent at once after a quiet period.
+              Defaults to `characters_per_second`.
+
+          decrease_factor: The multiplier applied to the current rates on a `429` response.
+
+          increase_fraction: The fraction of the maximum rate added back to the current
+              rates for every successful response.
+
+          min_rate_fraction: The rates are never reduced below this fraction of their maximum.
+
+          decrease_cooldown: The number of seconds after the rates are reduced during which further
+              `429` responses don't reduce them again, extended to the end of the pause if the
+              response had a longer `Retry-After`.
+        """
+        if requests_per_second <= 0:
+            raise ValueError(f"`requests_per_second` must be positive but received {requests_per_second}")
+        if characters_per_second is not None and characters_per_second <= 0:
+            raise ValueError(f"`characters_per_second` must be positive but received {characters_per_second}")
+        if not 0 < decrease_factor < 1:
+            raise ValueError(f"`decrease_factor` must be between 0 and 1 but received {decrease_factor}")
+        if decrease_cooldown < 0:
+            raise ValueError(f"`decrease_cooldown` must not be negative but received {decrease_cooldown}")
+
+        now = time.monotonic()
+        self._lock = threading.Lock()
+        self._decrease_factor = decrease_factor
+        self._increase_fraction = increase_fraction
+        self._min_rate_fraction = min_rate_fraction
+        self._decrease_cooldown = decrease_cooldown
+        self._paused_until = 0.0
+        self._decreased_until = 0.0
+
+        self._requests = _TokenBucket(
+            rate=requests_per_second,
+            capacity=request_burst if request_burst is not None else max(requests_per_second, 1.0),
+            now=now,
+        )
+        self._characters: Optional[_TokenBucket] = None
+        if characters_per_second is not None:
+            self._characters = _TokenBucket(
+                rate=characters_per_second,
+                capacity=character_burst if character_burst is not None else characters_per_second,
+                now=now,
+            )
+
+    @property
+    def requests_per_second(self) -> float:
+        """The current, possibly reduced, request rate."""
+        return self._requests.rate
+
+    @property
+    def characters_per_second(self) -> float | None:
+        """The current, possibly reduced, character rate."""
+        return self._characters.rate if self._characters is not None else None
+
+    def acquire(self, *, characters: int = 0, deadline_at: float | None = None) -> bool:
+        """Blocks until a request sending the given number of characters is allowed through.
+
+        Returns `False` straight away, without using up any of the rate, if the request wouldn't
+        be allowed through before `deadline_at`, a `time.monotonic()` timestamp.
+        """
+        delay = self._reserve(characters, deadline_at)
+        if delay is None:
+            return False
+        if delay > 0:
+            log.debug("Rate limiter delaying request by %f seconds", delay)
+            time.sleep(delay)
+        return True
+
+    async def async_acquire(self, *, characters: int = 0, deadline_at: float | None = None) -> bool:
+        """Waits until a request sending the given number of characters is allowed through.
+
+        Returns `False` straight away, without using up any of the rate, if the request wouldn't
+        be allowed through before `deadline_at`, a `time.monotonic()` timestamp.
+        """
+        delay = self._reserve(characters, deadline_at)
+        if delay is None:
+            return False
+        if delay > 0:
+            log.debug("Rate limiter delaying request by %f seconds", delay)
+            await anyio.sleep(delay)
+        return True
+
+    def record_response(self, status_code: int, *, retry_after: float | None = None) -> None:
+        """Feeds the outcome of a request back into the limiter so that it can adapt its rates."""
+        with self._lock:
+            now = time.monotonic()
+            if status_code == 429:
+                if retry_after is not None and retry_after > 0:
+                    self._paused_until = max(self._paused_until, now + retry_after)
+                if now < self._decreased_until:
+                    # most likely a request sent before the rates were reduced
+                    return
+                self._decreased_until = max(now + self._decrease_cooldown, self._paused_until)
+                for bucket in self._buckets():
+                    floor = bucket.max_rate * self._min_rate_fraction
+                    bucket.set_rate(max(bucket.rate * self._decrease_factor, floor), now)
+                log.debug("Rate limited by the API, reducing request rate to %f/s", self._requests.rate)
+            elif status_code < 400:
+                for bucket in self._buckets():
+                    if bucket.rate < bucket.max_rate:
+                        step = bucket.max_rate * self._increase_fraction
+                        bucket.set_rate(min(bucket.rate + step, bucket.max_rate), now)
+
+    def _buckets(self) -> list[_TokenBucket]:
+        if self._characters is None:
+            return [self._requests]
+        return [self._requests, self._characters]
+
+    def _reserve(self, characters: int, deadline_at: float | None = None) -> float | None:
+        """Returns how long a request has to wait, or `None` if it wouldn't be let through before the deadline."""
+        with self._lock:
+            now = time.monotonic()
+
+            # while paused by a `Retry-After`, reservations are made as of the end of the pause
+            start = max(now, self._paused_until)
+            character_bucket = self._characters if characters > 0 else None
+            delay = self._requests.reserve(1, start)
+            if character_bucket is not None:
+                delay = max(delay, character_bucket.reserve(characters, start))
+
+            if deadline_at is not None and start + delay > deadline_at:
+                self._requests.release(1)
+                if character_bucket is not None:
+                    character_bucket.release(characters)
+                return None
+            return start - now + delay
+
+
+def request_characters(json_data: object) -> int:
+    """Returns the number of synthesis characters in a request body, i.e. the length of its `text`."""
+    if not isinstance(json_data, Mapping):
+        return 0
+
+    text = cast("Mapping[str, Any]", json_data).get("text")
+    return len(text) if isinstance(text, str) else 0
@@ -24,9 +24,18 @@ import anyio
 import httpx
 import pydantic
 
+from ._audio import (
+    AudioFormat,
+    AudioAligner,
+    iter_aligned_audio,
+    make_audio_aligner,
+    aiter_aligned_audio,
+    audio_params_from_body,
+)
 from ._types import NoneType
 from ._utils import is_given, extract_type_arg, is_annotated_type, is_type_alias_type, extract_type_var_from_base
 from ._models import BaseModel, is_basemodel
+from ._timing import TransferMetrics
 from ._constants import RAW_RESPONSE_HEADER, OVERRIDE_CAST_TO_HEADER
 from ._streaming import Stream, AsyncStream, is_stream_class_type, extract_stream_chunk_type
 from ._exceptions import LmntError, APIResponseValidationError
@@ -58,6 +67,13 @@ class BaseAPIResponse(Generic[R]):
     retries_taken: int
     """The number of retries made. If no retries happened this will be `0`"""
 
+    transfer_metrics: TransferMetrics | None
+    """Time-to-first-byte, transfer size and throughput measurements for this request, across all retries.
+
+    Only recorded if the client has an `on_transfer_metrics` callback or any request hooks, e.g. those
+    of its `metrics`, otherwise `None`.
+    """
+
     def __init__(
         self,
         *,
@@ -68,6 +84,7 @@ class BaseAPIResponse(Generic[R]):
         stream_cls: type[Stream[Any]] | type[AsyncStream[Any]] | None,
         options: FinalRequestOptions,
         retries_taken: int = 0,
+        transfer_metrics: TransferMetrics | None = None,
     ) -> None:
         self._cast_to = cast_to
         self._client = client
@@ -77,6 +94,7 @@ class BaseAPIResponse(Generic[R]):
         self._options = options
         self.http_response = raw
         self.retries_taken = retries_taken
+        self.transfer_metrics = transfer_metrics
 
     @property
     def headers(self) -> httpx.Headers:
@@ -356,7 +374,10 @@ class APIResponse(BaseAPIResponse[R]):
 
         This automatically handles gzip, deflate and brotli encoded responses.
         """
+        metrics = self.transfer_metrics
         for chunk in self.http_response.iter_bytes(chunk_size):
+            if metrics is not None:
+                metrics._record_first_chunk()
             yield chunk
 
     def iter_text(self, chunk_size: int | None = None) -> Iterator[str]:
@@ -460,7 +481,10 @@ class AsyncAPIResponse(BaseAPIResponse[R]):
 
         This automatically handles gzip, deflate and brotli encoded responses.
         """
+        metrics = self.transfer_metrics
         async for chunk in self.http_response.aiter_bytes(chunk_size):
+            if metrics is not None:
+                metrics._record_first_chunk()
             yield chunk
 
     async def iter_text(self, chunk_size: int | None = None) -> AsyncIterator[str]:
@@ -501,6 +525,24 @@ class BinaryAPIResponse(APIResponse[bytes]):
             for data in self.iter_bytes():
                 f.write(data)
 
+    def iter_audio(
+        self,
+        *,
+        duration: float | None = None,
+        format: AudioFormat | None = None,
+        sample_rate: int | None = None,
+    ) -> Iterator[bytes]:
+        """Iterates over the audio with every chunk aligned to whole samples, or to complete MP3 frames.
+
+        If `duration` is given, each chunk holds that many seconds of audio instead. For `wav` and
+        `ulaw` the header is yielded as its own first chunk.
+
+        The `format` and `sample_rate` default to the ones sent in the request.
+        """
+        yield from iter_aligned_audio(
+            self.iter_bytes(), _make_audio_aligner(self, duration=duration, format=format, sample_rate=sample_rate)
+        )
+
 
 class AsyncBinaryAPIResponse(AsyncAPIResponse[bytes]):
     """Subclass of APIResponse providing helpers for dealing with binary data.
@@ -527,6 +569,24 @@ class AsyncBinaryAPIResponse(AsyncAPIResponse[bytes]):
             async for data in self.iter_bytes():
                 await f.write(data)
 
+    async def iter_audio(
+        self,
+        *,
+        duration: float | None = None,
+        format: AudioFormat | None = None,
+        sample_rate: int | None = None,
+    ) -> AsyncIterator[bytes]:
+        """Iterates over the audio with every chunk aligned to whole samples, or to complete MP3 frames.
+
+        If `duration` is given, each chunk holds that many seconds of audio instead. For `wav` and
+        `ulaw` the header is yielded as its own first chunk.
+
+        The `format` and `sample_rate` default to the ones sent in the request.
+        """
+        aligner = _make_audio_aligner(self, duration=duration, format=format, sample_rate=sample_rate)
+        async for chunk in aiter_aligned_audio(self.iter_bytes(), aligner):
+            yield chunk
+
 
 class StreamedBinaryAPIResponse(APIResponse[bytes]):
     def stream_to_file(
@@ -543,6 +603,24 @@ class StreamedBinaryAPIResponse(APIResponse[bytes]):
             for data in self.iter_bytes(chunk_size):
                 f.write(data)
 
+    def iter_audio(
+        self,
+        *,
+        duration: float | None = None,
+        format: AudioFormat | None = None,
+        sample_rate: int | None = None,
+    ) -> Iterator[bytes]:
+        """Iterates over the audio with every chunk aligned to whole samples, or to complete MP3 frames.
+
+        If `duration` is given, each chunk holds that many seconds of audio instead. For `wav` and
+        `ulaw` the header is yielded as its own first chunk.
+
+        The `format` and `sample_rate` default to the ones sent in the request.
+        """
+        yield from iter_aligned_audio(
+            self.iter_bytes(), _make_audio_aligner(self, duration=duration, format=format, sample_rate=sample_rate)
+        )
+
 
 class AsyncStreamedBinaryAPIResponse(AsyncAPIResponse[bytes]):
     async def stream_to_file(
@@ -560,6 +638,39 @@ class AsyncStreamedBinaryAPIResponse(AsyncAPIResponse[bytes]):
             async for data in self.iter_bytes(chunk_size):
                 await f.write(data)
 
+    async def iter_audio(
+        self,
+        *,
+        duration: float | None = None,
+        format: AudioFormat | None = None,
+        sample_rate: int | None = None,
+    ) -> AsyncIterator[bytes]:
+        """Iterates over the audio with every chunk aligned to whole samples, or to complete MP3 frames.
+
+        If `duration` is given, each chunk holds that many seconds of audio instead. For `wav` and
+        `ulaw` the header is yielded as its own first chunk.
+
+        The `format` and `sample_rate` default to the ones sent in the request.
+        """
+        aligner = _make_audio_aligner(self, duration=duration, format=format, sample_rate=sample_rate)
+        async for chunk in aiter_aligned_audio(self.iter_bytes(), aligner):
+            yield chunk
+
+
+def _make_audio_aligner(
+    response: BaseAPIResponse[Any],
+    *,
+    duration: float | None,
+    format: str | None,
+    sample_rate: int | None,
+) -> AudioAligner:
+    requested_format, requested_sample_rate = audio_params_from_body(response._options.json_data)
+    return make_audio_aligner(
+        format=format or requested_format,
+        sample_rate=sample_rate or requested_sample_rate,
+        duration=duration,
+    )
+
 
 class MissingStreamClassError(TypeError):
     def __init__(self) -> None:
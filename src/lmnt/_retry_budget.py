@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import time
+import threading
+
+__all__ = ["RetryBudget"]
+
+
+class RetryBudget:
+    """Caps the share of extra traffic that retries can add across every request made through a client.
+
+    Each request deposits `ratio` tokens into the budget when it is first sent and every retry
+    withdraws a whole token, so with the default `ratio=0.1` retries add at most 10% to the
+    number of requests. Tokens also accrue at `min_retries_per_second` so that a client making
+    few requests can still retry the odd failure, and the balance is capped at `max_tokens` so
+    that a long healthy period can't be followed by a burst of retries.
+
+    Once the budget is exhausted requests fail after their first attempt, as if `max_retries`
+    was `0`, until enough new requests have been made.
+
+    ```py
+    from lmnt import Lmnt, RetryBudget
+
+    budget = RetryBudget(ratio=0.1)
+    client = Lmnt(retry_budget=budget)
+
+    metrics.gauge("lmnt.retry_budget.remaining", budget.remaining)
+    ```
+    """
+
+    retries_allowed: int
+    """The number of retries the budget has allowed."""
+
+    retries_rejected: int
+    """The number of retries that weren't made because the budget was exhausted."""
+
+    def __init__(
+        self,
+        *,
+        ratio: float = 0.1,
+        min_retries_per_second: float = 1.0,
+        max_tokens: float = 10.0,
+    ) -> None:
+        """
+        Args:
+          ratio: The number of retries each request adds to the budget, i.e. the maximum
+              share of extra traffic caused by retries.
+
+          min_retries_per_second: The rate at which retries are allowed regardless of traffic.
+
+          max_tokens: The most retries that can be saved up, which is also the starting balance.
+        """
+        if ratio < 0:
+            raise ValueError(f"`ratio` must not be negative but received {ratio}")
+        if min_retries_per_second < 0:
+            raise ValueError(f"`min_retries_per_second` must not be negative but received {min_retries_per_second}")
+        if max_tokens < 1:
+            raise ValueError(f"`max_tokens` must be at least 1 but received {max_tokens}")
+
+        self._ratio = ratio
+        self._min_retries_per_second = min_retries_per_second
+        self._max_tokens = max_tokens
+        self._tokens = max_tokens
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+        self.retries_allowed = 0
+        self.retries_rejected = 0
+
+    @property
+    def remaining(self) -> float:
+        """The number of retries that the budget currently allows, which may be fractional."""
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+    def record_request(self) -> None:
+        """Deposits the share of a retry that a newly sent request earns."""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._max_tokens, self._tokens + self._ratio)
+
+    def try_acquire_retry(self) -> bool:
+        """Withdraws a retry from the budget, returning `False` if it is exhausted."""
+        with self._lock:
+            self._refill()
+            # allow for rounding errors, e.g. ten deposits of `0.1` add up to slightly less than a retry
+            if self._tokens < 1 - 1e-9:
+                self.retries_rejected += 1
+                return False
+
+            self._tokens = max(0.0, self._tokens - 1)
+            self.retries_allowed += 1
+            return True
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._updated_at
+        if elapsed > 0:
+            self._tokens = min(self._max_tokens, self._tokens + elapsed * self._min_retries_per_second)
+            self._updated_at = now
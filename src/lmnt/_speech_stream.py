@@ -0,0 +1,431 @@
+from __future__ import annotations
+
+import os
+import json
+import binascii
+from array import array
+from typing import Any, List, Tuple, Union, Iterator, Optional, AsyncIterator, cast
+from typing_extensions import TypeAlias
+
+import anyio
+
+from ._compat import cached_property
+from ._models import construct_type
+from ._response import APIResponse, AsyncAPIResponse
+from .types.speech_generate_detailed_response import Timestamp, SpeechGenerateDetailedResponse
+
+__all__ = [
+    "DecodedDetailedSpeech",
+    "DetailedSpeechEvent",
+    "DetailedSpeechDecoder",
+    "StreamedDetailedSpeechResponse",
+    "AsyncStreamedDetailedSpeechResponse",
+]
+
+DetailedSpeechEvent: TypeAlias = Union[bytes, Timestamp]
+"""Either a chunk of decoded audio or a single timestamp, in the order they appear in the response body."""
+
+_WHITESPACE = b" \t\r\n"
+
+# JSON escapes that can appear in a base64 string; `\/` is the only one that maps to an alphabet character
+_BASE64_ESCAPES = {ord("/"): b"/", ord("n"): b"", ord("r"): b"", ord("t"): b"", ord("\\"): b""}
+
+
+class _Base64Decoder:
+    """Decodes base64 text that arrives in arbitrarily sized pieces."""
+
+    def __init__(self) -> None:
+        self._pending = b""
+
+    def feed(self, data: bytes) -> bytes:
+        data = self._pending + data
+        usable = len(data) - len(data) % 4
+        self._pending = data[usable:]
+        if not usable:
+            return b""
+        return binascii.a2b_base64(data[:usable])
+
+    def flush(self) -> bytes:
+        data, self._pending = self._pending, b""
+        if not data:
+            return b""
+        # tolerate missing padding
+        return binascii.a2b_base64(data + b"=" * (-len(data) % 4))
+
+
+class _ValueScanner:
+    """Finds the end of a single JSON value, optionally capturing its raw bytes."""
+
+    def __init__(self, *, capture: bool) -> None:
+        self._capture: Optional[bytearray] = bytearray() if capture else None
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._started = False
+
+    @property
+    def captured(self) -> bytes:
+        assert self._capture is not None
+        return bytes(self._capture)
+
+    def scan(self, buffer: bytearray, pos: int) -> Optional[int]:
+        """Scans from `pos` and returns the index just past the end of the value, or `None` if more data is needed."""
+        start = pos
+        end = len(buffer)
+        while pos < end:
+            char = buffer[pos]
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == 0x5C:  # backslash
+                    self._escaped = True
+                elif char == 0x22:  # quote
+                    self._in_string = False
+                    if self._depth == 0:
+                        return self._done(buffer, start, pos + 1)
+                pos += 1
+                continue
+
+            if char == 0x22:
+                self._in_string = True
+            elif char in b"[{":
+                self._depth += 1
+            elif char in b"]}":
+                if self._depth == 0:
+                    # the end of the enclosing container, i.e. a scalar value just ended
+                    return self._done(buffer, start, pos)
+                self._depth -= 1
+                if self._depth == 0:
+                    return self._done(buffer, start, pos + 1)
+            elif char == 0x2C and self._depth == 0:  # comma
+                return self._done(buffer, start, pos)
+            elif char in _WHITESPACE and self._depth == 0 and self._started:
+                return self._done(buffer, start, pos)
+
+            if char not in _WHITESPACE:
+                self._started = True
+            pos += 1
+
+        if self._capture is not None:
+            self._capture += buffer[start:end]
+        return None
+
+    def _done(self, buffer: bytearray, start: int, end: int) -> int:
+        if self._capture is not None:
+            self._capture += buffer[start:end]
+        return end
+
+
+class DetailedSpeechDecoder:
+    """An incremental parser for the `generate_detailed` response body.
+
+    The base64 `audio` field is decoded as it arrives and each entry in `timestamps` is
+    emitted as soon as it has been fully received, regardless of which field comes first.
+    Only the unparsed tail of the body is buffered, so memory use doesn't grow with the
+    length of the audio.
+    """
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+        self._state = "start"
+        self._key: Optional[str] = None
+        self._scanner: Optional[_ValueScanner] = None
+        self._base64 = _Base64Decoder()
+
+    def feed(self, data: bytes) -> List[DetailedSpeechEvent]:
+        self._buffer += data
+        events: List[DetailedSpeechEvent] = []
+        pos = self._parse(events)
+        del self._buffer[:pos]
+        return events
+
+    def close(self) -> None:
+        """Asserts that the complete body has been received."""
+        if self._state != "done":
+            raise ValueError("The speech response body ended unexpectedly")
+
+    def _parse(self, events: List[DetailedSpeechEvent]) -> int:
+        buffer = self._buffer
+        pos = 0
+        while True:
+            state = self._state
+            if state == "audio":
+                pos = self._parse_audio(pos, events)
+                if self._state == "audio":
+                    return pos
+                continue
+
+            if state == "skip_value" or state == "timestamp":
+                assert self._scanner is not None
+                end = self._scanner.scan(buffer, pos)
+                if end is None:
+                    return len(buffer)
+                pos = end
+                if state == "timestamp":
+                    events.append(self._build_timestamp(self._scanner.captured))
+                    self._state = "timestamps"
+                else:
+                    self._state = "members"
+                self._scanner = None
+                continue
+
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos >= len(buffer):
+                return pos
+
+            char = buffer[pos]
+            if state == "start":
+                self._expect(char, b"{")
+                self._state = "key"
+                pos += 1
+            elif state == "key":
+                if char == 0x7D:  # }
+                    self._state = "done"
+                    return pos + 1
+                self._expect(char, b'"')
+                end = self._find_string_end(pos + 1)
+                if end is None:
+                    return pos
+                self._key = json.loads(bytes(buffer[pos : end + 1]))
+                self._state = "colon"
+                pos = end + 1
+            elif state == "colon":
+                self._expect(char, b":")
+                self._state = "value"
+                pos += 1
+            elif state == "value":
+                if self._key == "audio" and char == 0x22:
+                    self._state = "audio"
+                    pos += 1
+                elif self._key == "timestamps" and char == 0x5B:  # [
+                    self._state = "timestamps"
+                    pos += 1
+                else:
+                    # any other field, or an unexpected `null`, is skipped without being buffered
+                    self._state = "skip_value"
+                    self._scanner = _ValueScanner(capture=False)
+            elif state == "timestamps":
+                if char == 0x5D:  # ]
+                    self._state = "members"
+                    pos += 1
+                elif char == 0x2C:
+                    pos += 1
+                else:
+                    self._state = "timestamp"
+                    self._scanner = _ValueScanner(capture=True)
+            elif state == "members":
+                if char == 0x7D:
+                    self._state = "done"
+                    return pos + 1
+                self._expect(char, b",")
+                self._state = "key"
+                pos += 1
+            else:
+                raise ValueError(f"Unexpected data after the end of the speech response body at {char!r}")
+
+    def _parse_audio(self, pos: int, events: List[DetailedSpeechEvent]) -> int:
+        buffer = self._buffer
+        decoded: List[bytes] = []
+        while pos < len(buffer):
+            quote = buffer.find(b'"', pos)
+            backslash = buffer.find(b"\\", pos, quote if quote != -1 else len(buffer))
+
+            if backslash != -1:
+                decoded.append(self._base64.feed(bytes(buffer[pos:backslash])))
+                if backslash + 1 >= len(buffer):
+                    pos = backslash
+                    break
+
+                escape = buffer[backslash + 1]
+                if escape == ord("u"):
+                    if backslash + 6 > len(buffer):
+                        pos = backslash
+                        break
+                    char = chr(int(buffer[backslash + 2 : backslash + 6], 16))
+                    decoded.append(self._base64.feed(char.encode("ascii", errors="ignore").strip()))
+                    pos = backslash + 6
+                elif escape in _BASE64_ESCAPES:
+                    decoded.append(self._base64.feed(_BASE64_ESCAPES[escape]))
+                    pos = backslash + 2
+                else:
+                    raise ValueError(f"Unexpected escape sequence in the audio field: \\{chr(escape)}")
+                continue
+
+            if quote == -1:
+                decoded.append(self._base64.feed(bytes(buffer[pos:])))
+                pos = len(buffer)
+                break
+
+            decoded.append(self._base64.feed(bytes(buffer[pos:quote])))
+            decoded.append(self._base64.flush())
+            self._state = "members"
+            pos = quote + 1
+            break
+
+        audio = b"".join(decoded)
+        if audio:
+            events.append(audio)
+        return pos
+
+    def _find_string_end(self, pos: int) -> Optional[int]:
+        buffer = self._buffer
+        while pos < len(buffer):
+            char = buffer[pos]
+            if char == 0x5C:
+                pos += 2
+                continue
+            if char == 0x22:
+                return pos
+            pos += 1
+        return None
+
+    def _expect(self, char: int, expected: bytes) -> None:
+        if char != expected[0]:
+            raise ValueError(f"Expected {expected!r} in the speech response body but received {bytes([char])!r}")
+
+    def _build_timestamp(self, raw: bytes) -> Timestamp:
+        return cast(Timestamp, construct_type(type_=Timestamp, value=json.loads(raw)))
+
+
+class DecodedDetailedSpeech:
+    """The audio of a `generate_detailed` response, decoded on first access, and its timestamps.
+
+    Only the base64 `audio` string of the response is kept until the audio is decoded, and only
+    the decoded audio after that, so a long clip isn't held in memory twice once the response
+    itself is dropped.
+
+    ```py
+    from lmnt import DecodedDetailedSpeech
+
+    speech = DecodedDetailedSpeech(client.speech.generate_detailed(text="hello", voice="leah"))
+    speech.audio_bytes  # decoded once, on first access
+    starts, durations = speech.timestamps_array
+    ```
+    """
+
+    timestamps: List[Timestamp]
+
+    def __init__(self, response: SpeechGenerateDetailedResponse) -> None:
+        self._encoded: Optional[str] = response.audio
+        self._decoded: Optional[bytes] = None
+        self.timestamps = response.timestamps or []
+
+    @property
+    def audio_bytes(self) -> bytes:
+        """The decoded audio."""
+        if self._decoded is None:
+            assert self._encoded is not None
+            # `a2b_base64` accepts the ASCII `str` directly, which avoids an intermediate encoded copy
+            self._decoded = binascii.a2b_base64(self._encoded)
+            self._encoded = None
+        return self._decoded
+
+    @property
+    def audio_view(self) -> memoryview:
+        """A read-only, zero-copy view over `audio_bytes`; slicing it doesn't copy the audio."""
+        return memoryview(self.audio_bytes)
+
+    @cached_property
+    def timestamps_array(self) -> Tuple[array[float], array[float]]:
+        """The `start` and `duration` of each timestamp, as two compact `array('d')` columns."""
+        starts: array[float] = array("d")
+        durations: array[float] = array("d")
+        for timestamp in self.timestamps:
+            starts.append(timestamp.start)
+            durations.append(timestamp.duration)
+        return starts, durations
+
+
+class StreamedDetailedSpeechResponse(APIResponse[SpeechGenerateDetailedResponse]):
+    """A streamed `generate_detailed` response that decodes the audio as it is received.
+
+    The audio is never held in memory in full, unlike with `.parse()` which reads the entire
+    response body and returns the audio as a single base64 string.
+    """
+
+    timestamps: List[Timestamp]
+    """The timestamps that have been received so far."""
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.timestamps = []
+
+    def iter_events(self, chunk_size: int | None = None) -> Iterator[DetailedSpeechEvent]:
+        """Yields decoded audio chunks as `bytes` and each `Timestamp` as soon as it is parsed."""
+        decoder = DetailedSpeechDecoder()
+        for data in self.iter_bytes(chunk_size):
+            for event in decoder.feed(data):
+                if isinstance(event, Timestamp):
+                    self.timestamps.append(event)
+                yield event
+        decoder.close()
+
+    def iter_audio(self, chunk_size: int | None = None) -> Iterator[bytes]:
+        """Yields the decoded audio, collecting the timestamps into `.timestamps` as they are parsed."""
+        for event in self.iter_events(chunk_size):
+            if isinstance(event, bytes):
+                yield event
+
+    def stream_to_file(
+        self,
+        file: str | os.PathLike[str],
+        *,
+        chunk_size: int | None = None,
+    ) -> List[Timestamp]:
+        """Streams the decoded audio to the given file and returns the timestamps.
+
+        Accepts a filename or any path-like object, e.g. pathlib.Path
+        """
+        with open(file, mode="wb") as f:
+            for data in self.iter_audio(chunk_size):
+                f.write(data)
+        return self.timestamps
+
+
+class AsyncStreamedDetailedSpeechResponse(AsyncAPIResponse[SpeechGenerateDetailedResponse]):
+    """A streamed `generate_detailed` response that decodes the audio as it is received.
+
+    The audio is never held in memory in full, unlike with `.parse()` which reads the entire
+    response body and returns the audio as a single base64 string.
+    """
+
+    timestamps: List[Timestamp]
+    """The timestamps that have been received so far."""
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.timestamps = []
+
+    async def iter_events(self, chunk_size: int | None = None) -> AsyncIterator[DetailedSpeechEvent]:
+        """Yields decoded audio chunks as `bytes` and each `Timestamp` as soon as it is parsed."""
+        decoder = DetailedSpeechDecoder()
+        async for data in self.iter_bytes(chunk_size):
+            for event in decoder.feed(data):
+                if isinstance(event, Timestamp):
+                    self.timestamps.append(event)
+                yield event
+        decoder.close()
+
+    async def iter_audio(self, chunk_size: int | None = None) -> AsyncIterator[bytes]:
+        """Yields the decoded audio, collecting the timestamps into `.timestamps` as they are parsed."""
+        async for event in self.iter_events(chunk_size):
+            if isinstance(event, bytes):
+                yield event
+
+    async def stream_to_file(
+        self,
+        file: str | os.PathLike[str],
+        *,
+        chunk_size: int | None = None,
+    ) -> List[Timestamp]:
+        """Streams the decoded audio to the given file and returns the timestamps.
+
+        Accepts a filename or any path-like object, e.g. pathlib.Path
+        """
+        path = anyio.Path(file)
+        async with await path.open(mode="wb") as f:
+            async for data in self.iter_audio(chunk_size):
+                await f.write(data)
+        return self.timestamps
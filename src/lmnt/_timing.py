@@ -0,0 +1,348 @@
+from __future__ import annotations
+
+import time
+import logging
+from typing import Any, Dict, Callable, Iterator, Optional, AsyncIterator
+from typing_extensions import override
+
+import httpx
+
+__all__ = ["TransferMetrics", "TransferMetricsHook", "RequestTiming"]
+
+log: logging.Logger = logging.getLogger(__name__)
+
+
+class TransferMetrics:
+    """Timing and throughput measurements for a single API call.
+
+    All timestamps are taken from `time.monotonic()` and all durations are in seconds,
+    measured from the moment the request was first issued, i.e. they include the time
+    spent on any retries and the backoff sleeps between them.
+    """
+
+    method: str
+    url: str
+
+    started_at: float
+    """When the request was first issued, before the first attempt was sent."""
+
+    attempts: int
+    """The number of attempts made, including the final one."""
+
+    status_code: Optional[int]
+
+    headers_received_at: Optional[float]
+    """When the response headers of the final attempt were received."""
+
+    first_byte_at: Optional[float]
+    """When the first byte of the response body was received from the network."""
+
+    first_chunk_at: Optional[float]
+    """When the first chunk was handed to the caller through `.iter_bytes()`."""
+
+    completed_at: Optional[float]
+    """When the response body was fully received, or the response was closed."""
+
+    bytes_received: int
+    """The number of body bytes received, as sent over the wire (i.e. before decompression)."""
+
+    def __init__(
+        self,
+        *,
+        method: str,
+        url: str,
+        on_complete: TransferMetricsHook | None = None,
+    ) -> None:
+        self.method = method
+        self.url = url
+        self.started_at = time.monotonic()
+        self.attempts = 0
+        self.status_code = None
+        self.headers_received_at = None
+        self.first_byte_at = None
+        self.first_chunk_at = None
+        self.completed_at = None
+        self.bytes_received = 0
+        self._on_complete = on_complete
+        # called once the body is complete, after `on_complete`, by the client's request hooks
+        self._on_body_complete: Optional[Callable[[], None]] = None
+        self._generation = 0
+
+    @property
+    def retries_taken(self) -> int:
+        return max(self.attempts - 1, 0)
+
+    @property
+    def time_to_headers(self) -> float | None:
+        return self._since_start(self.headers_received_at)
+
+    @property
+    def time_to_first_byte(self) -> float | None:
+        return self._since_start(self.first_byte_at)
+
+    @property
+    def time_to_first_chunk(self) -> float | None:
+        return self._since_start(self.first_chunk_at)
+
+    @property
+    def total_time(self) -> float | None:
+        return self._since_start(self.completed_at)
+
+    @property
+    def transfer_rate(self) -> float | None:
+        """The body transfer rate in bytes per second, measured from the first byte received.
+
+        While the body is still being received this is the rate so far.
+        """
+        if self.first_byte_at is None:
+            return None
+
+        end = self.completed_at if self.completed_at is not None else time.monotonic()
+        duration = end - self.first_byte_at
+        if duration <= 0:
+            return None
+        return self.bytes_received / duration
+
+    @property
+    def is_complete(self) -> bool:
+        return self.completed_at is not None
+
+    def _since_start(self, timestamp: float | None) -> float | None:
+        if timestamp is None:
+            return None
+        return timestamp - self.started_at
+
+    def _start_attempt(self) -> None:
+        self._generation += 1
+        self.attempts += 1
+        self.status_code = None
+        self.headers_received_at = None
+        self.first_byte_at = None
+        self.first_chunk_at = None
+        self.completed_at = None
+        self.bytes_received = 0
+
+    def _abandon_attempt(self) -> None:
+        """Stop recording the body of the current attempt, e.g. because it is about to be retried."""
+        self._generation += 1
+
+    def _record_headers(self, response: httpx.Response) -> None:
+        self.headers_received_at = time.monotonic()
+        self.status_code = response.status_code
+
+        stream = response.stream
+        if isinstance(stream, httpx.SyncByteStream):
+            response.stream = _MeteredSyncByteStream(stream, self)
+        elif isinstance(stream, httpx.AsyncByteStream):  # pyright: ignore[reportUnnecessaryIsInstance]
+            response.stream = _MeteredAsyncByteStream(stream, self)
+
+    def _record_bytes(self, nbytes: int) -> None:
+        if self.first_byte_at is None:
+            self.first_byte_at = time.monotonic()
+        self.bytes_received += nbytes
+
+    def _record_first_chunk(self) -> None:
+        if self.first_chunk_at is None:
+            self.first_chunk_at = time.monotonic()
+
+    def _complete(self) -> None:
+        if self.completed_at is not None:
+            return
+
+        self.completed_at = time.monotonic()
+        if self._on_complete is not None:
+            try:
+                self._on_complete(self)
+            except Exception:
+                log.warning("Exception raised in `on_transfer_metrics` hook", exc_info=True)
+
+        if self._on_body_complete is not None:
+            self._on_body_complete()
+
+    @override
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__name__} {self.method} {self.url} attempts={self.attempts} "
+            f"ttfb={self.time_to_first_byte} bytes={self.bytes_received} total={self.total_time}>"
+        )
+
+
+TransferMetricsHook = Callable[[TransferMetrics], None]
+
+
+# httpcore trace events and the `RequestTiming` attribute that records when they happened, the
+# `http11.` / `http2.` prefix of the request and response events is stripped before the lookup
+_TRACE_EVENTS: Dict[str, str] = {
+    "connection.connect_tcp.started": "connect_started_at",
+    "connection.connect_tcp.complete": "connect_completed_at",
+    "connection.connect_unix_socket.started": "connect_started_at",
+    "connection.connect_unix_socket.complete": "connect_completed_at",
+    "connection.start_tls.started": "tls_started_at",
+    "connection.start_tls.complete": "tls_completed_at",
+    "send_request_headers.started": "request_started_at",
+    "send_request_body.complete": "request_sent_at",
+    "receive_response_headers.complete": "headers_received_at",
+}
+
+
+class RequestTiming:
+    """The phase timings of an API call, built from the trace events of the underlying HTTP transport.
+
+    The phase timestamps describe the most recent attempt, and are `None` for phases that didn't
+    happen, e.g. connecting when a pooled connection was re-used, or that the transport doesn't
+    report, e.g. with a custom transport. Name resolution isn't traced separately by httpcore, so
+    `connect_time` includes the DNS lookup.
+
+    All timestamps are taken from `time.monotonic()` and all durations are in seconds.
+    """
+
+    started_at: float
+    """When the call was made, before the first attempt was sent."""
+
+    attempts: int
+    """The number of attempts made so far, including the current one."""
+
+    attempt_started_at: Optional[float]
+    connect_started_at: Optional[float]
+    connect_completed_at: Optional[float]
+    tls_started_at: Optional[float]
+    tls_completed_at: Optional[float]
+    request_started_at: Optional[float]
+    request_sent_at: Optional[float]
+    headers_received_at: Optional[float]
+
+    def __init__(self, metrics: TransferMetrics) -> None:
+        self.started_at = metrics.started_at
+        self.attempts = 0
+        self._metrics = metrics
+        self._reset()
+
+    @property
+    def retries_taken(self) -> int:
+        return max(self.attempts - 1, 0)
+
+    @property
+    def connection_reused(self) -> bool:
+        """Whether the attempt was sent on a connection that was already open."""
+        return self.request_started_at is not None and self.connect_started_at is None
+
+    @property
+    def connect_time(self) -> float | None:
+        """How long it took to resolve the host name and open the TCP connection."""
+        return _duration(self.connect_started_at, self.connect_completed_at)
+
+    @property
+    def tls_time(self) -> float | None:
+        """How long the TLS handshake took."""
+        return _duration(self.tls_started_at, self.tls_completed_at)
+
+    @property
+    def time_to_headers(self) -> float | None:
+        """How long it took from sending the attempt until its response headers were received."""
+        return _duration(self.attempt_started_at, self.headers_received_at)
+
+    @property
+    def time_to_first_byte(self) -> float | None:
+        """How long it took from sending the attempt until the first byte of its response body was received."""
+        return _duration(self.attempt_started_at, self._metrics.first_byte_at)
+
+    @property
+    def bytes_received(self) -> int:
+        """The number of bytes of the attempt's response body that were received so far."""
+        return self._metrics.bytes_received
+
+    @property
+    def total_time(self) -> float | None:
+        """How long the whole call took, including every retry, once the response body was received."""
+        return _duration(self.started_at, self._metrics.completed_at)
+
+    def _reset(self) -> None:
+        self.attempt_started_at = None
+        self.connect_started_at = None
+        self.connect_completed_at = None
+        self.tls_started_at = None
+        self.tls_completed_at = None
+        self.request_started_at = None
+        self.request_sent_at = None
+        self.headers_received_at = None
+
+    def _start_attempt(self) -> None:
+        self._reset()
+        self.attempts += 1
+        self.attempt_started_at = time.monotonic()
+
+    def _trace(self, event_name: str, _info: Dict[str, Any]) -> None:
+        # passed to httpcore as the `trace` request extension
+        attribute = _TRACE_EVENTS.get(event_name)
+        if attribute is None:
+            attribute = _TRACE_EVENTS.get(event_name.partition(".")[2])
+            if attribute is None:
+                return
+        if getattr(self, attribute) is None:
+            setattr(self, attribute, time.monotonic())
+
+    async def _async_trace(self, event_name: str, info: Dict[str, Any]) -> None:
+        self._trace(event_name, info)
+
+    @override
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__name__} attempts={self.attempts} connect={self.connect_time} tls={self.tls_time} "
+            f"headers={self.time_to_headers} ttfb={self.time_to_first_byte} total={self.total_time}>"
+        )
+
+
+def _duration(start: float | None, end: float | None) -> float | None:
+    if start is None or end is None:
+        return None
+    return end - start
+
+
+class _MeteredStream:
+    def __init__(self, metrics: TransferMetrics) -> None:
+        self._metrics = metrics
+        self._generation = metrics._generation
+
+    def _record_bytes(self, nbytes: int) -> None:
+        if self._generation == self._metrics._generation:
+            self._metrics._record_bytes(nbytes)
+
+    def _complete(self) -> None:
+        if self._generation == self._metrics._generation:
+            self._metrics._complete()
+
+
+class _MeteredSyncByteStream(_MeteredStream, httpx.SyncByteStream):
+    def __init__(self, stream: httpx.SyncByteStream, metrics: TransferMetrics) -> None:
+        super().__init__(metrics)
+        self._stream = stream
+
+    @override
+    def __iter__(self) -> Iterator[bytes]:
+        for chunk in self._stream:
+            self._record_bytes(len(chunk))
+            yield chunk
+        self._complete()
+
+    @override
+    def close(self) -> None:
+        self._stream.close()
+        self._complete()
+
+
+class _MeteredAsyncByteStream(_MeteredStream, httpx.AsyncByteStream):
+    def __init__(self, stream: httpx.AsyncByteStream, metrics: TransferMetrics) -> None:
+        super().__init__(metrics)
+        self._stream = stream
+
+    @override
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            self._record_bytes(len(chunk))
+            yield chunk
+        self._complete()
+
+    @override
+    async def aclose(self) -> None:
+        await self._stream.aclose()
+        self._complete()
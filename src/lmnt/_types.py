@@ -19,6 +19,7 @@ from typing import (
 )
 from typing_extensions import (
     Set,
+    Self,
     Literal,
     Protocol,
     TypeAlias,
@@ -35,6 +36,7 @@ from httpx import URL, Proxy, Timeout, Response, BaseTransport, AsyncBaseTranspo
 
 if TYPE_CHECKING:
     from ._models import BaseModel
+    from ._upload import UploadProgressHook
     from ._response import APIResponse, AsyncAPIResponse
 
 Transport = BaseTransport
@@ -104,6 +106,10 @@ class RequestOptions(TypedDict, total=False):
     headers: Headers
     max_retries: int
     timeout: float | Timeout | None
+    deadline: float | None
+    on_upload_progress: UploadProgressHook
+    min_upload_rate: float
+    spool_upload: bool
     params: Query
     extra_json: AnyMapping
     idempotency_key: str
@@ -138,6 +144,14 @@ class NotGiven:
     def __repr__(self) -> str:
         return "NOT_GIVEN"
 
+    # the sentinel is immutable so copies can share it, this also avoids a `deepcopy()`
+    # of every `NotGiven` default whenever the request options are constructed
+    def __copy__(self) -> Self:
+        return self
+
+    def __deepcopy__(self, _memo: Any) -> Self:
+        return self
+
 
 not_given = NotGiven()
 # for backwards compatibility:
@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+import time
+import logging
+import tempfile
+from typing import IO, Deque, Tuple, Callable, Iterator, Optional, AsyncIterator, cast
+from collections import deque
+from typing_extensions import override
+
+import httpx
+
+from ._exceptions import UploadStalledError
+
+__all__ = ["UploadProgress", "UploadProgressHook", "SpooledBody"]
+
+log: logging.Logger = logging.getLogger(__name__)
+
+UPLOAD_THROUGHPUT_WINDOW = 1.0
+"""The number of seconds over which `UploadProgress.throughput` is measured."""
+
+UPLOAD_STALL_WINDOW = 5.0
+"""The number of seconds over which the upload rate is compared to `min_upload_rate`."""
+
+SPOOL_MAX_MEMORY = 1024 * 1024
+"""The size up to which a spooled request body is kept in memory rather than in a temporary file."""
+
+_CHUNK_SIZE = 64 * 1024
+
+
+class UploadProgress:
+    """The progress of the request body of an attempt, passed to an `on_progress` callback."""
+
+    bytes_sent: int
+    """The number of bytes of the request body that were handed to the connection so far."""
+
+    total_bytes: Optional[int]
+    """The size of the request body, or `None` if it isn't known up front."""
+
+    elapsed: float
+    """The number of seconds since the attempt started sending its body."""
+
+    throughput: Optional[float]
+    """The recent upload rate in bytes per second, or `None` until there is enough data to measure it."""
+
+    retries_taken: int
+    """The number of times the request was retried before this attempt, which sends the body from the start."""
+
+    def __init__(
+        self,
+        *,
+        bytes_sent: int,
+        total_bytes: Optional[int],
+        elapsed: float,
+        throughput: Optional[float],
+        retries_taken: int,
+    ) -> None:
+        self.bytes_sent = bytes_sent
+        self.total_bytes = total_bytes
+        self.elapsed = elapsed
+        self.throughput = throughput
+        self.retries_taken = retries_taken
+
+    @property
+    def fraction(self) -> Optional[float]:
+        """The share of the request body that was sent, between 0 and 1, if its size is known."""
+        if not self.total_bytes:
+            return None
+        return min(self.bytes_sent / self.total_bytes, 1.0)
+
+    @override
+    def __repr__(self) -> str:
+        return (
+            f"UploadProgress(bytes_sent={self.bytes_sent}, total_bytes={self.total_bytes}, "
+            f"elapsed={self.elapsed:.3f}, throughput={self.throughput})"
+        )
+
+
+UploadProgressHook = Callable[[UploadProgress], None]
+
+
+def monitor_upload(
+    request: httpx.Request,
+    *,
+    on_progress: UploadProgressHook | None,
+    min_rate: float | None,
+    retries_taken: int,
+) -> None:
+    """Replaces the body of the request with one that reports its progress and raises if it stalls."""
+    content_length = request.headers.get("Content-Length")
+    monitor = _UploadMonitor(
+        request,
+        total_bytes=int(content_length) if content_length is not None else None,
+        on_progress=on_progress,
+        min_rate=min_rate,
+        retries_taken=retries_taken,
+    )
+    request.stream = _MonitoredByteStream(request.stream, monitor)
+
+
+class _UploadMonitor:
+    def __init__(
+        self,
+        request: httpx.Request,
+        *,
+        total_bytes: Optional[int],
+        on_progress: UploadProgressHook | None,
+        min_rate: float | None,
+        retries_taken: int,
+    ) -> None:
+        self._request = request
+        self._total_bytes = total_bytes
+        self._on_progress = on_progress
+        self._min_rate = min_rate
+        self._retries_taken = retries_taken
+        self._bytes_sent = 0
+        self._started_at: Optional[float] = None
+        # (timestamp, bytes sent) samples covering the stall window
+        self._samples: Deque[Tuple[float, int]] = deque()
+
+    def start(self) -> None:
+        # the body may be iterated more than once, e.g. if httpx re-sends it after a redirect
+        self._bytes_sent = 0
+        self._started_at = time.monotonic()
+        self._samples.clear()
+        self._samples.append((self._started_at, 0))
+
+    def advance(self, nbytes: int) -> None:
+        now = time.monotonic()
+        self._bytes_sent += nbytes
+        self._samples.append((now, self._bytes_sent))
+        window = max(UPLOAD_STALL_WINDOW, UPLOAD_THROUGHPUT_WINDOW)
+        # keep the newest sample that is older than the window so that the whole window is covered
+        while len(self._samples) > 2 and self._samples[1][0] <= now - window:
+            self._samples.popleft()
+
+        if self._on_progress is not None:
+            assert self._started_at is not None
+            progress = UploadProgress(
+                bytes_sent=self._bytes_sent,
+                total_bytes=self._total_bytes,
+                elapsed=now - self._started_at,
+                throughput=self._rate(now, UPLOAD_THROUGHPUT_WINDOW),
+                retries_taken=self._retries_taken,
+            )
+            try:
+                self._on_progress(progress)
+            except Exception:
+                log.warning("Exception raised in `on_progress` callback", exc_info=True)
+
+        if self._min_rate is not None and now - self._samples[0][0] >= UPLOAD_STALL_WINDOW:
+            rate = self._rate(now, UPLOAD_STALL_WINDOW)
+            if rate is not None and rate < self._min_rate:
+                raise UploadStalledError(
+                    rate=rate, min_rate=self._min_rate, bytes_sent=self._bytes_sent, request=self._request
+                )
+
+    def _rate(self, now: float, window: float) -> Optional[float]:
+        """Returns the average rate since the newest sample that is at least `window` seconds old."""
+        start_time, start_bytes = self._samples[0]
+        for sample_time, sample_bytes in self._samples:
+            if sample_time > now - window:
+                break
+            start_time, start_bytes = sample_time, sample_bytes
+
+        if now <= start_time:
+            return None
+        return (self._bytes_sent - start_bytes) / (now - start_time)
+
+
+class _MonitoredByteStream(httpx.SyncByteStream, httpx.AsyncByteStream):
+    """Reports the chunks of a request body as the transport consumes them.
+
+    A chunk is counted once the transport asks for the next one, i.e. once it has been
+    written to the connection. A write that blocks outright isn't seen here, that is left
+    to the `write` timeout.
+    """
+
+    def __init__(self, stream: httpx.SyncByteStream | httpx.AsyncByteStream, monitor: _UploadMonitor) -> None:
+        self._stream = stream
+        self._monitor = monitor
+
+    @override
+    def __iter__(self) -> Iterator[bytes]:
+        if not isinstance(self._stream, httpx.SyncByteStream):
+            raise RuntimeError("Attempted to send an async request body with a sync client")
+
+        self._monitor.start()
+        for chunk in self._stream:
+            yield chunk
+            self._monitor.advance(len(chunk))
+
+    @override
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        if not isinstance(self._stream, httpx.AsyncByteStream):
+            raise RuntimeError("Attempted to send a sync request body with an async client")
+
+        self._monitor.start()
+        async for chunk in self._stream:
+            yield chunk
+            self._monitor.advance(len(chunk))
+
+    @override
+    def close(self) -> None:
+        if isinstance(self._stream, httpx.SyncByteStream):
+            self._stream.close()
+
+    @override
+    async def aclose(self) -> None:
+        if isinstance(self._stream, httpx.AsyncByteStream):
+            await self._stream.aclose()
+
+
+class SpooledBody:
+    """A request body that was encoded once, into memory or a temporary file, so that every attempt sends the same bytes.
+
+    This is what makes retries possible for uploads that can't be read a second time, e.g.
+    from a pipe, and avoids reading and encoding the files again for every attempt.
+    """
+
+    def __init__(self, file: IO[bytes], *, content_type: str | None, content_length: int) -> None:
+        self._file = file
+        self._content_type = content_type
+        self._content_length = content_length
+
+    @classmethod
+    def from_request(cls, request: httpx.Request) -> SpooledBody:
+        """Encodes the body of the request, which blocks while the files that it contains are read."""
+        if not isinstance(request.stream, httpx.SyncByteStream):
+            raise TypeError(f"Expected a request body that can be read synchronously, got {type(request.stream)}")
+
+        file = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY)
+        try:
+            for chunk in request.stream:
+                file.write(chunk)
+        except BaseException:
+            file.close()
+            raise
+
+        return cls(
+            cast("IO[bytes]", file),
+            content_type=request.headers.get("Content-Type"),
+            content_length=file.tell(),
+        )
+
+    @property
+    def content_length(self) -> int:
+        return self._content_length
+
+    def apply(self, request: httpx.Request) -> None:
+        """Replaces the body of a request that was built from the same options with the spooled one."""
+        if self._content_type is not None:
+            request.headers["Content-Type"] = self._content_type
+        request.headers.pop("Transfer-Encoding", None)
+        request.headers["Content-Length"] = str(self._content_length)
+        request.stream = _SpooledByteStream(self._file)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class _SpooledByteStream(httpx.SyncByteStream, httpx.AsyncByteStream):
+    def __init__(self, file: IO[bytes]) -> None:
+        self._file = file
+
+    @override
+    def __iter__(self) -> Iterator[bytes]:
+        self._file.seek(0)
+        while chunk := self._file.read(_CHUNK_SIZE):
+            yield chunk
+
+    @override
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        # like the multipart bodies of httpx, which are read synchronously for async clients too
+        for chunk in self:
+            yield chunk
@@ -0,0 +1,339 @@
+from __future__ import annotations
+
+import time
+import asyncio
+import logging
+import threading
+from typing import TYPE_CHECKING, Any, Set, Deque, Tuple, Callable, Optional, Awaitable
+from collections import deque
+
+import anyio
+
+from ._utils import get_async_library
+from ._exceptions import QuotaExceededError
+from ._rate_limit import _TokenBucket
+
+if TYPE_CHECKING:
+    from ._client import Lmnt, AsyncLmnt
+    from .types.account_retrieve_response import AccountRetrieveResponse
+
+__all__ = ["UsageTracker"]
+
+log: logging.Logger = logging.getLogger(__name__)
+
+_Fetch = Callable[[], "AccountRetrieveResponse"]
+_AsyncFetch = Callable[[], Awaitable["AccountRetrieveResponse"]]
+
+
+class UsageTracker:
+    """Keeps a local account of the characters sent for synthesis, so that running out of them can be seen coming.
+
+    The characters of every `speech.generate()` and `speech.generate_detailed()` request, and of
+    the text sent through `SpeechSession.send_text()`, are counted as they are sent. Every
+    `reconcile_interval` seconds the count is reconciled in the background with the plan's
+    character limit and the characters remaining, as returned by `accounts.retrieve()`.
+
+    Optionally, once a fraction of the plan's characters have been used, requests can be slowed
+    down to `throttle_characters_per_second`, or rejected with a `QuotaExceededError` before they
+    are sent, instead of failing at the API.
+
+    ```py
+    from lmnt import Lmnt, UsageTracker
+
+    usage = UsageTracker(throttle_at=0.9, reject_at=0.99)
+    client = Lmnt(usage_tracker=usage)
+    ...
+    print(usage.characters_remaining, usage.exhausted_in)
+    ```
+
+    The tracker is thread-safe and is shared with clients created through `.copy()` /
+    `.with_options()`, which should all be for the same account.
+    """
+
+    def __init__(
+        self,
+        *,
+        reconcile_interval: float = 300.0,
+        throttle_at: Optional[float] = None,
+        throttle_characters_per_second: float = 100.0,
+        reject_at: Optional[float] = None,
+        rate_window: float = 3600.0,
+    ) -> None:
+        """
+        Args:
+          reconcile_interval: The number of seconds between the reconciliations with `accounts.retrieve()`.
+
+          throttle_at: The fraction of the plan's character limit after which requests are slowed down,
+              e.g. `0.9`. Requests aren't throttled if this isn't given.
+
+          throttle_characters_per_second: The rate at which characters are let through once throttled.
+
+          reject_at: The fraction of the plan's character limit that requests may not go over, e.g. `1.0`.
+              Requests that would are rejected with a `QuotaExceededError`. Requests aren't rejected if
+              this isn't given.
+
+          rate_window: The number of seconds of usage over which the rate of usage is measured, for
+              projecting when the characters will run out.
+        """
+        if reconcile_interval <= 0:
+            raise ValueError(f"`reconcile_interval` must be positive but received {reconcile_interval}")
+        if throttle_characters_per_second <= 0:
+            raise ValueError(
+                f"`throttle_characters_per_second` must be positive but received {throttle_characters_per_second}"
+            )
+        for name, fraction in (("throttle_at", throttle_at), ("reject_at", reject_at)):
+            if fraction is not None and fraction <= 0:
+                raise ValueError(f"`{name}` must be positive but received {fraction}")
+
+        now = time.monotonic()
+        self.reconcile_interval = reconcile_interval
+        self.throttle_at = throttle_at
+        self.reject_at = reject_at
+        self.rate_window = rate_window
+        self._lock = threading.Lock()
+        self._started_at = now
+        self._throttle = _TokenBucket(
+            rate=throttle_characters_per_second, capacity=throttle_characters_per_second, now=now
+        )
+
+        # as of the last reconciliation
+        self._character_limit: Optional[int] = None
+        self._remaining_at_reconcile: Optional[int] = None
+        # the characters sent since the last reconciliation, which it may not have counted yet
+        self._used_since_reconcile = 0
+        # the characters of requests that are in flight
+        self._reserved = 0
+        self._used = 0
+        # (timestamp, characters) of the usage within the rate window
+        self._samples: Deque[Tuple[float, int]] = deque()
+        self._samples_total = 0
+
+        self._next_reconcile_at = now
+        self._reconciling = False
+        self._throttled = False
+        # references to the background reconciliations of async clients, so that they aren't garbage collected
+        self._tasks: Set[asyncio.Task[Any]] = set()
+
+    @property
+    def character_limit(self) -> Optional[int]:
+        """The maximum number of characters per billing period of the plan, or `None` if it isn't known yet."""
+        return self._character_limit
+
+    @property
+    def characters_remaining(self) -> Optional[int]:
+        """The estimated number of characters remaining in the billing period, or `None` if it isn't known yet."""
+        with self._lock:
+            remaining = self._remaining()
+        return max(remaining, 0) if remaining is not None else None
+
+    @property
+    def characters_used(self) -> int:
+        """The number of characters counted by the tracker since it was created."""
+        return self._used
+
+    @property
+    def characters_per_second(self) -> float:
+        """The rate at which characters were used over the last `rate_window` seconds."""
+        now = time.monotonic()
+        with self._lock:
+            self._prune(now)
+            return self._samples_total / max(min(now - self._started_at, self.rate_window), 1.0)
+
+    @property
+    def exhausted_in(self) -> Optional[float]:
+        """The projected number of seconds until the characters run out at the current rate of usage.
+
+        `None` if the characters remaining aren't known yet, or none are being used.
+        """
+        remaining = self.characters_remaining
+        rate = self.characters_per_second
+        if remaining is None or rate <= 0:
+            return None
+        return remaining / rate
+
+    def reconcile(self, client: Lmnt) -> None:
+        """Replaces the estimated usage with the account's usage, as returned by `accounts.retrieve()`."""
+        self._reconcile(client.accounts.retrieve)
+
+    async def async_reconcile(self, client: AsyncLmnt) -> None:
+        """Replaces the estimated usage with the account's usage, as returned by `accounts.retrieve()`."""
+        await self._async_reconcile(client.accounts.retrieve)
+
+    def acquire(self, characters: int, *, fetch: Optional[_Fetch] = None, deadline_at: Optional[float] = None) -> bool:
+        """Counts the characters of a request that is about to be sent, blocking while it is throttled.
+
+        Must be followed by a call to `commit()` once the characters were sent, or `release()` if they weren't.
+        The usage is reconciled through `fetch` when it is due, if given. Returns `False` straight away,
+        without counting the characters, if the request would still be throttled at `deadline_at`, a
+        `time.monotonic()` timestamp.
+        """
+        blocking = self._start_reconcile() if fetch is not None else None
+        if blocking:
+            assert fetch is not None
+            self._reconcile(fetch, log_errors=True)
+        elif blocking is not None:
+            threading.Thread(
+                target=self._reconcile,
+                args=(fetch,),
+                kwargs={"log_errors": True},
+                name="lmnt-usage-reconcile",
+                daemon=True,
+            ).start()
+
+        delay = self._reserve(characters, deadline_at)
+        if delay is None:
+            return False
+        if delay > 0:
+            log.debug("Usage tracker delaying request by %f seconds", delay)
+            time.sleep(delay)
+        return True
+
+    async def async_acquire(
+        self, characters: int, *, fetch: Optional[_AsyncFetch] = None, deadline_at: Optional[float] = None
+    ) -> bool:
+        """Counts the characters of a request that is about to be sent, waiting while it is throttled.
+
+        Must be followed by a call to `commit()` once the characters were sent, or `release()` if they weren't.
+        The usage is reconciled through `fetch` when it is due, if given. Returns `False` straight away,
+        without counting the characters, if the request would still be throttled at `deadline_at`, a
+        `time.monotonic()` timestamp.
+        """
+        blocking = self._start_reconcile() if fetch is not None else None
+        if blocking is not None:
+            assert fetch is not None
+            if blocking or get_async_library() != "asyncio":
+                # without asyncio, e.g. with trio, there is nowhere to run the reconciliation but here
+                await self._async_reconcile(fetch, log_errors=True)
+            else:
+                task = asyncio.get_running_loop().create_task(self._async_reconcile(fetch, log_errors=True))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+
+        delay = self._reserve(characters, deadline_at)
+        if delay is None:
+            return False
+        if delay > 0:
+            log.debug("Usage tracker delaying request by %f seconds", delay)
+            await anyio.sleep(delay)
+        return True
+
+    def commit(self, characters: int) -> None:
+        """Records that the characters of an acquired request were used."""
+        now = time.monotonic()
+        with self._lock:
+            self._reserved -= characters
+            self._used_since_reconcile += characters
+            self._used += characters
+            self._samples.append((now, characters))
+            self._samples_total += characters
+            self._prune(now)
+
+    def release(self, characters: int) -> None:
+        """Releases the characters of an acquired request that failed, and so didn't use them."""
+        with self._lock:
+            self._reserved -= characters
+
+    def _remaining(self) -> Optional[int]:
+        if self._remaining_at_reconcile is None:
+            return None
+        return self._remaining_at_reconcile - self._used_since_reconcile - self._reserved
+
+    def _prune(self, now: float) -> None:
+        while self._samples and self._samples[0][0] < now - self.rate_window:
+            self._samples_total -= self._samples.popleft()[1]
+
+    def _start_reconcile(self) -> Optional[bool]:
+        """Returns whether a reconciliation is due, and if so whether it has to finish before the request is let through.
+
+        `None` if none is due, otherwise the caller must make one, which has to finish first if the
+        usage isn't known yet but is needed to throttle or reject the request.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if self._reconciling or now < self._next_reconcile_at:
+                return None
+            self._reconciling = True
+            self._next_reconcile_at = now + self.reconcile_interval
+            enforcing = self.throttle_at is not None or self.reject_at is not None
+            return enforcing and self._remaining_at_reconcile is None
+
+    def _reconcile(self, fetch: _Fetch, *, log_errors: bool = False) -> None:
+        with self._lock:
+            used_before = self._used
+        try:
+            account = fetch()
+        except Exception:
+            if not log_errors:
+                raise
+            log.warning("Failed to reconcile the character usage with the account", exc_info=True)
+            return
+        finally:
+            self._finish_reconcile()
+        self._apply(account, used_before)
+
+    async def _async_reconcile(self, fetch: _AsyncFetch, *, log_errors: bool = False) -> None:
+        with self._lock:
+            used_before = self._used
+        try:
+            account = await fetch()
+        except Exception:
+            if not log_errors:
+                raise
+            log.warning("Failed to reconcile the character usage with the account", exc_info=True)
+            return
+        finally:
+            self._finish_reconcile()
+        self._apply(account, used_before)
+
+    def _finish_reconcile(self) -> None:
+        with self._lock:
+            self._reconciling = False
+
+    def _apply(self, account: AccountRetrieveResponse, used_before: int) -> None:
+        with self._lock:
+            # an explicit reconciliation also counts towards the interval
+            self._next_reconcile_at = max(self._next_reconcile_at, time.monotonic() + self.reconcile_interval)
+            self._character_limit = account.plan.character_limit
+            self._remaining_at_reconcile = account.usage.characters
+            # the characters used while the account was being retrieved may not have been counted by it yet
+            self._used_since_reconcile = self._used - used_before
+        log.debug(
+            "Reconciled the character usage, %d of %d characters remaining",
+            account.usage.characters,
+            account.plan.character_limit,
+        )
+
+    def _reserve(self, characters: int, deadline_at: Optional[float] = None) -> Optional[float]:
+        """Reserves the characters of a request, returning how long it has to wait or raising if it is rejected.
+
+        Nothing is reserved, and `None` is returned, if the wait would go past `deadline_at`.
+        """
+        with self._lock:
+            now = time.monotonic()
+            remaining = self._remaining()
+            limit = self._character_limit
+            delay = 0.0
+            if remaining is not None and limit is not None:
+                used = limit - remaining + characters
+                if self.reject_at is not None and used > self.reject_at * limit:
+                    raise QuotaExceededError(
+                        characters=characters, characters_remaining=max(remaining, 0), character_limit=limit
+                    )
+
+                throttled = self.throttle_at is not None and used > self.throttle_at * limit
+                if throttled and not self._throttled:
+                    log.warning(
+                        "Throttling requests to %g characters per second, %d of %d characters remain",
+                        self._throttle.rate,
+                        max(remaining, 0),
+                        limit,
+                    )
+                self._throttled = throttled
+                if throttled:
+                    delay = self._throttle.reserve(characters, now)
+                    if deadline_at is not None and now + delay > deadline_at:
+                        self._throttle.release(characters)
+                        return None
+
+            self._reserved += characters
+            return delay
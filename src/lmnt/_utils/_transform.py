@@ -3,7 +3,7 @@ from __future__ import annotations
 import io
 import base64
 import pathlib
-from typing import Any, Mapping, TypeVar, cast
+from typing import Any, Tuple, Mapping, TypeVar, Callable, Optional, cast
 from datetime import date, datetime
 from typing_extensions import Literal, get_args, override, get_type_hints as _get_type_hints
 
@@ -151,6 +151,155 @@ def _no_transform_needed(annotation: type) -> bool:
     return annotation == float or annotation == int
 
 
+_ValueTransformer = Callable[[object], object]
+_TypedDictTransformer = Callable[[Mapping[str, object]], "dict[str, object]"]
+
+
+@lru_cache(maxsize=8096)
+def _compile_typeddict(expected_type: type) -> Tuple[_TypedDictTransformer, bool]:
+    """Compiles the transformation for a `TypedDict` into a closure.
+
+    The type hints are only resolved once per type, along with which keys need to be aliased,
+    formatted or recursed into; the returned closure copies over every other value as-is.
+
+    Also returns whether any value in the `TypedDict` could need to be read from disk, as the
+    async variant has to fall back to `_async_transform_recursive()` for those.
+    """
+    annotations = get_type_hints(expected_type, include_extras=True)
+    fields: dict[str, Tuple[str, Optional[_ValueTransformer]]] = {
+        key: (_maybe_transform_key(key, type_), _compile_value(type_)) for key, type_ in annotations.items()
+    }
+    needs_io = any(_has_io_format(type_, set()) for type_ in annotations.values())
+
+    from .._compat import model_dump
+
+    def transform_typeddict(data: Mapping[str, object]) -> dict[str, object]:
+        result: dict[str, object] = {}
+        for key, value in data.items():
+            if not is_given(value):
+                # we don't need to include omitted values here as they'll
+                # be stripped out before the request is sent anyway
+                continue
+
+            field = fields.get(key)
+            if field is None:
+                # we do not have a type annotation for this field, leave it as is
+                result[key] = value
+                continue
+
+            alias, transform_value = field
+            if transform_value is not None:
+                result[alias] = transform_value(value)
+            elif isinstance(value, pydantic.BaseModel):
+                result[alias] = model_dump(value, exclude_unset=True, mode="json")
+            else:
+                result[alias] = value
+        return result
+
+    return transform_typeddict, needs_io
+
+
+def clear_compiled_typeddicts() -> None:
+    """Forgets every compiled `TypedDict` transformation, so that the next call compiles it again."""
+    cast(Any, _compile_typeddict).cache_clear()
+
+
+def _compile_value(annotation: type) -> Optional[_ValueTransformer]:
+    """Returns how a value of the given type has to be transformed, or `None` if it can be passed through.
+
+    Scalar types (and unions of them) and lists of them are compiled, anything else goes through
+    `_transform_recursive()` as what it needs depends on the data it's given.
+    """
+    from .._compat import model_dump
+
+    stripped_type = strip_annotated_type(annotation)
+    if _is_scalar_type(stripped_type):
+        return _compile_scalar(annotation)
+
+    if is_list_type(stripped_type) and get_args(stripped_type):
+        inner_type = extract_type_arg(stripped_type, 0)
+        if _is_scalar_type(strip_annotated_type(inner_type)):
+            # the format of the list entries is given by the annotation on the list itself
+            transform_entry = _compile_scalar(annotation)
+
+            def transform_list(value: object) -> object:
+                if not is_list(value):
+                    return _transform_recursive(value, annotation=annotation)
+                if _no_transform_needed(inner_type):
+                    return value
+                if transform_entry is not None:
+                    return [transform_entry(entry) for entry in value]
+                return [
+                    model_dump(entry, exclude_unset=True, mode="json")
+                    if isinstance(entry, pydantic.BaseModel)
+                    else entry
+                    for entry in value
+                ]
+
+            return transform_list
+
+    return lambda value: _transform_recursive(value, annotation=annotation)
+
+
+def _compile_scalar(annotation: type) -> Optional[_ValueTransformer]:
+    property_info = _get_format_property_info(annotation)
+    if property_info is None:
+        return None
+
+    from .._compat import model_dump
+
+    format_ = cast(PropertyFormat, property_info.format)
+    format_template = property_info.format_template
+
+    def format_value(value: object) -> object:
+        if isinstance(value, pydantic.BaseModel):
+            return model_dump(value, exclude_unset=True, mode="json")
+        return _format_data(value, format_, format_template)
+
+    return format_value
+
+
+def _is_scalar_type(type_: type) -> bool:
+    if is_typeddict(type_) or get_origin(type_) == dict:
+        return False
+    if is_list_type(type_) or is_iterable_type(type_) or is_sequence_type(type_):
+        return False
+    if is_union_type(type_):
+        return all(_is_scalar_type(strip_annotated_type(subtype)) for subtype in get_args(type_))
+    return True
+
+
+def _get_format_property_info(annotation: type) -> PropertyInfo | None:
+    annotated_type = _get_annotated_type(annotation)
+    if annotated_type is None:
+        return None
+
+    # ignore the first argument as it is the actual type
+    for metadata in get_args(annotated_type)[1:]:
+        if isinstance(metadata, PropertyInfo) and metadata.format is not None:
+            return metadata
+    return None
+
+
+def _has_io_format(type_: Any, seen: set[type]) -> bool:
+    """Whether data of the given type could include a file that has to be read to be base64 encoded."""
+    annotated_type = _get_annotated_type(type_)
+    if annotated_type is not None and any(
+        isinstance(metadata, PropertyInfo) and metadata.format == "base64" for metadata in get_args(annotated_type)[1:]
+    ):
+        return True
+
+    stripped_type = strip_annotated_type(type_)
+    if is_typeddict(stripped_type):
+        if stripped_type in seen:
+            return False
+        seen.add(stripped_type)
+        hints = get_type_hints(stripped_type, include_extras=True)
+        return any(_has_io_format(hint, seen) for hint in hints.values())
+
+    return any(_has_io_format(arg, seen) for arg in get_args(stripped_type))
+
+
 def _transform_recursive(
     data: object,
     *,
@@ -264,21 +413,8 @@ def _transform_typeddict(
     data: Mapping[str, object],
     expected_type: type,
 ) -> Mapping[str, object]:
-    result: dict[str, object] = {}
-    annotations = get_type_hints(expected_type, include_extras=True)
-    for key, value in data.items():
-        if not is_given(value):
-            # we don't need to include omitted values here as they'll
-            # be stripped out before the request is sent anyway
-            continue
-
-        type_ = annotations.get(key)
-        if type_ is None:
-            # we do not have a type annotation for this field, leave it as is
-            result[key] = value
-        else:
-            result[_maybe_transform_key(key, type_)] = _transform_recursive(value, annotation=type_)
-    return result
+    transform_typeddict, _ = _compile_typeddict(expected_type)
+    return transform_typeddict(data)
 
 
 async def async_maybe_transform(
@@ -430,6 +566,11 @@ async def _async_transform_typeddict(
     data: Mapping[str, object],
     expected_type: type,
 ) -> Mapping[str, object]:
+    transform_typeddict, needs_io = _compile_typeddict(expected_type)
+    if not needs_io:
+        # nothing has to be awaited, so the compiled transformation can be used as-is
+        return transform_typeddict(data)
+
     result: dict[str, object] = {}
     annotations = get_type_hints(expected_type, include_extras=True)
     for key, value in data.items():
@@ -0,0 +1,299 @@
+from __future__ import annotations
+
+import time
+import asyncio
+import logging
+import threading
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Set,
+    Dict,
+    Tuple,
+    Union,
+    Generic,
+    TypeVar,
+    Callable,
+    Hashable,
+    Optional,
+    Awaitable,
+    cast,
+)
+from collections import OrderedDict
+from typing_extensions import Literal
+
+from ._utils import get_async_library
+from ._response import APIResponse, AsyncAPIResponse, to_raw_response_wrapper, async_to_raw_response_wrapper
+from ._exceptions import APIStatusError
+
+if TYPE_CHECKING:
+    from ._client import Lmnt, AsyncLmnt
+
+__all__ = ["VoiceCache"]
+
+log: logging.Logger = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+# (scope, "list", owner, starred) or (scope, "voice", voice ID), where the scope keeps clients with different
+# API keys or base URLs apart
+_Key = Tuple[Hashable, ...]
+
+_State = Literal["fresh", "stale", "expired"]
+
+# fetches a response, sending the given conditional request headers
+_Fetch = Callable[[Dict[str, str]], APIResponse[_T]]
+_AsyncFetch = Callable[[Dict[str, str]], Awaitable[AsyncAPIResponse[_T]]]
+
+
+class _Entry(Generic[_T]):
+    def __init__(self, value: _T, *, etag: Optional[str], fetched_at: float) -> None:
+        self.value = value
+        self.etag = etag
+        self.fetched_at = fetched_at
+
+
+class VoiceCache:
+    """Caches the responses of `voices.list()` and `voices.retrieve()`, so that looking up voices doesn't
+    take a round-trip to the API every time.
+
+    A response is served from the cache for `ttl` seconds. For `stale_while_revalidate` seconds
+    after that it is still served, while it is refreshed in the background, and after that the
+    next call waits for the API again. When the API sent an `ETag` the refresh is a conditional
+    request, which doesn't transfer the voices again if they haven't changed.
+
+    Creating, updating or deleting a voice through a client that uses the cache invalidates the
+    affected responses. Changes made elsewhere, e.g. through the LMNT website, are only seen
+    once the cached responses are refreshed, or after calling `invalidate()`.
+
+    The cache is thread-safe and is shared with clients created through `.copy()` /
+    `.with_options()`, with responses kept apart per API key and base URL.
+
+    ```py
+    from lmnt import Lmnt, VoiceCache
+
+    client = Lmnt(voice_cache=VoiceCache(ttl=60))
+    client.voices.retrieve("lily")  # sent to the API
+    client.voices.retrieve("lily")  # served from the cache
+    ```
+
+    Requests made with `extra_headers`, `extra_query` or `extra_body`, including through
+    `.with_raw_response` and `.with_streaming_response`, bypass the cache. The cached
+    responses are returned to every caller as they are, so they must not be modified.
+    """
+
+    def __init__(self, *, ttl: float = 60.0, stale_while_revalidate: float = 300.0, max_entries: int = 1024) -> None:
+        """
+        Args:
+          ttl: The number of seconds for which a cached response is served without checking it with the API.
+
+          stale_while_revalidate: The number of seconds after `ttl` for which a cached response is still
+            served while it is refreshed in the background.
+
+          max_entries: The number of responses to keep, the least recently used are dropped first.
+        """
+        if ttl < 0 or stale_while_revalidate < 0:
+            raise ValueError("`ttl` and `stale_while_revalidate` must not be negative")
+        if max_entries < 1:
+            raise ValueError(f"`max_entries` must be at least 1 but received {max_entries}")
+
+        self.ttl = ttl
+        self.stale_while_revalidate = stale_while_revalidate
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[_Key, _Entry[Any]] = OrderedDict()
+        # the keys that are being refreshed in the background
+        self._refreshing: Set[_Key] = set()
+        # incremented by every invalidation, so that a response that was requested before then isn't cached
+        self._generation = 0
+        # references to the background refreshes of async clients, so that they aren't garbage collected
+        self._tasks: Set[asyncio.Task[Any]] = set()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def invalidate(self, voice_id: str | None = None) -> None:
+        """Drops the cached lists of voices, and the cached details of the given voice."""
+        with self._lock:
+            self._generation += 1
+            for key in list(self._entries):
+                if key[1] == "list" or (voice_id is not None and key[1:] == ("voice", voice_id)):
+                    del self._entries[key]
+
+    def clear(self) -> None:
+        """Drops every cached response."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def get(self, client: Lmnt, key: _Key, method: Callable[..., _T], *args: Any, **kwargs: Any) -> _T:
+        """Returns the response of the client for the key, e.g. `("voice", voice_id)`, calling the resource
+        method with the given arguments to fetch it if needed."""
+        key = (_scope(client), *key)
+        fetch = _raw_fetch(method, args, kwargs)
+        found, generation, state = self._lookup(key)
+        entry = cast("Optional[_Entry[_T]]", found)
+        if entry is not None and state == "fresh":
+            return entry.value
+
+        if entry is not None and state == "stale":
+            threading.Thread(
+                target=self._refresh_in_background,
+                args=(key, entry, fetch, generation),
+                name="lmnt-voice-cache-refresh",
+                daemon=True,
+            ).start()
+            return entry.value
+
+        return self._fetch(key, entry, fetch, generation)
+
+    async def aget(
+        self, client: AsyncLmnt, key: _Key, method: Callable[..., Awaitable[_T]], *args: Any, **kwargs: Any
+    ) -> _T:
+        """Returns the response of the client for the key, e.g. `("voice", voice_id)`, calling the resource
+        method with the given arguments to fetch it if needed."""
+        key = (_scope(client), *key)
+        fetch = _async_raw_fetch(method, args, kwargs)
+        found, generation, state = self._lookup(key)
+        entry = cast("Optional[_Entry[_T]]", found)
+        if entry is not None and state == "fresh":
+            return entry.value
+
+        if entry is not None and state == "stale":
+            if get_async_library() == "asyncio":
+                task = asyncio.get_running_loop().create_task(
+                    self._async_refresh_in_background(key, entry, fetch, generation)
+                )
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+                return entry.value
+
+            # without asyncio, e.g. with trio, there is nowhere to run the refresh but here
+            try:
+                return await self._async_fetch(key, entry, fetch, generation)
+            finally:
+                self._finish_refresh(key)
+
+        return await self._async_fetch(key, entry, fetch, generation)
+
+    def _lookup(self, key: _Key) -> Tuple[Optional[_Entry[Any]], int, _State]:
+        """Returns the cached entry for the key, if any, the current generation and the state of the entry.
+
+        A `stale` entry should be refreshed in the background by the caller, who must then call `_finish_refresh()`.
+        An `expired` entry must not be served before it was revalidated.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None, self._generation, "expired"
+
+            self._entries.move_to_end(key)
+            age = now - entry.fetched_at
+            if age < self.ttl:
+                return entry, self._generation, "fresh"
+
+            if age < self.ttl + self.stale_while_revalidate:
+                if key in self._refreshing:
+                    # it is already being refreshed in the background
+                    return entry, self._generation, "fresh"
+                self._refreshing.add(key)
+                return entry, self._generation, "stale"
+
+            return entry, self._generation, "expired"
+
+    def _finish_refresh(self, key: _Key) -> None:
+        with self._lock:
+            self._refreshing.discard(key)
+
+    def _refresh_in_background(self, key: _Key, entry: _Entry[_T], fetch: _Fetch[_T], generation: int) -> None:
+        try:
+            self._fetch(key, entry, fetch, generation)
+        except Exception:
+            log.warning("Failed to refresh the cached voices", exc_info=True)
+        finally:
+            self._finish_refresh(key)
+
+    async def _async_refresh_in_background(
+        self, key: _Key, entry: _Entry[_T], fetch: _AsyncFetch[_T], generation: int
+    ) -> None:
+        try:
+            await self._async_fetch(key, entry, fetch, generation)
+        except Exception:
+            log.warning("Failed to refresh the cached voices", exc_info=True)
+        finally:
+            self._finish_refresh(key)
+
+    def _fetch(self, key: _Key, entry: Optional[_Entry[_T]], fetch: _Fetch[_T], generation: int) -> _T:
+        try:
+            response = fetch(_conditional_headers(entry))
+        except APIStatusError as err:
+            if entry is None or err.status_code != 304:
+                raise
+            return self._store(key, entry.value, etag=entry.etag, generation=generation)
+
+        return self._store(key, response.parse(), etag=response.headers.get("ETag"), generation=generation)
+
+    async def _async_fetch(self, key: _Key, entry: Optional[_Entry[_T]], fetch: _AsyncFetch[_T], generation: int) -> _T:
+        try:
+            response = await fetch(_conditional_headers(entry))
+        except APIStatusError as err:
+            if entry is None or err.status_code != 304:
+                raise
+            return self._store(key, entry.value, etag=entry.etag, generation=generation)
+
+        return self._store(key, await response.parse(), etag=response.headers.get("ETag"), generation=generation)
+
+    def _store(self, key: _Key, value: _T, *, etag: Optional[str], generation: int) -> _T:
+        with self._lock:
+            if generation != self._generation:
+                # the voices were changed while the response was being fetched, so it may be out of date
+                return value
+
+            self._entries[key] = _Entry(value, etag=etag, fetched_at=time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+
+def voice_cache_for(client: Union[Lmnt, AsyncLmnt], *extra_options: object) -> Optional[VoiceCache]:
+    """Returns the voice cache of the client, unless it has none or the request was given any
+    `extra_headers`, `extra_query` or `extra_body`, which bypass the cache."""
+    if any(option is not None for option in extra_options):
+        return None
+    return client._voice_cache
+
+
+def invalidate_cached_voices(client: Union[Lmnt, AsyncLmnt], voice_id: Optional[str] = None) -> None:
+    """Drops the cached responses affected by a change to the voices made through the client."""
+    if client._voice_cache is not None:
+        client._voice_cache.invalidate(voice_id)
+
+
+def _raw_fetch(method: Callable[..., _T], args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> _Fetch[_T]:
+    def fetch(headers: Dict[str, str]) -> APIResponse[_T]:
+        # the conditional request headers also make the call bypass the cache
+        return to_raw_response_wrapper(method)(*args, extra_headers=headers, **kwargs)
+
+    return fetch
+
+
+def _async_raw_fetch(
+    method: Callable[..., Awaitable[_T]], args: Tuple[Any, ...], kwargs: Dict[str, Any]
+) -> _AsyncFetch[_T]:
+    async def fetch(headers: Dict[str, str]) -> AsyncAPIResponse[_T]:
+        return await async_to_raw_response_wrapper(method)(*args, extra_headers=headers, **kwargs)
+
+    return fetch
+
+
+def _scope(client: Union[Lmnt, AsyncLmnt]) -> Tuple[str, str]:
+    # cached responses are only shared between clients for the same account and API
+    return (str(client.base_url), client.api_key)
+
+
+def _conditional_headers(entry: Optional[_Entry[Any]]) -> Dict[str, str]:
+    if entry is None or entry.etag is None:
+        return {}
+    return {"If-None-Match": entry.etag}
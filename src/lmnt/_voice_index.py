@@ -0,0 +1,281 @@
+from __future__ import annotations
+
+import bisect
+import threading
+from typing import TYPE_CHECKING, Any, Set, Dict, List, Union, Hashable, Iterable, Iterator, Optional
+
+from ._types import PostParser
+from .types.voice import Voice
+from .types.voice_delete_response import VoiceDeleteResponse
+from .types.voice_update_response import VoiceUpdateResponse
+
+if TYPE_CHECKING:
+    from ._client import Lmnt, AsyncLmnt
+
+__all__ = ["VoiceIndex"]
+
+# the fields with an inverted index, which `search()` matches exactly
+_FIELDS = ("tags", "gender", "owner", "state", "starred")
+
+
+class VoiceIndex:
+    """An in-memory index of voices, for looking them up by their attributes without scanning every one.
+
+    Every field that can be searched by has an inverted index, from each value to the IDs of the
+    voices that have it, and the words and trigrams of the names and descriptions are indexed
+    for prefix and substring searches. A search intersects the sets of IDs that match each of
+    its criteria, starting with the smallest.
+
+    ```py
+    from lmnt import Lmnt, VoiceIndex
+
+    client = Lmnt()
+    index = VoiceIndex(client.voices.list(owner="all")).watch(client)
+
+    index.search(tags=["narration"], gender="female", starred=True)
+    index.search(prefix="ama")
+    ```
+
+    The index is thread-safe. It is kept up to date with the voices that are created, updated or
+    deleted through the clients that it `watch()`es, but changes made elsewhere are only seen
+    once it is rebuilt from a new list of voices.
+    """
+
+    def __init__(self, voices: Iterable[Voice] = ()) -> None:
+        self._lock = threading.RLock()
+        self._voices: Dict[str, Voice] = {}
+        # the position of every voice, so that results are in the order in which the voices were added
+        self._positions: Dict[str, int] = {}
+        self._next_position = 0
+        self._postings: Dict[str, Dict[Hashable, Set[str]]] = {field: {} for field in _FIELDS}
+        self._words: Dict[str, Set[str]] = {}
+        # the indexed words in order, for prefix searches
+        self._sorted_words: List[str] = []
+        self._trigrams: Dict[str, Set[str]] = {}
+
+        for voice in voices:
+            self.add(voice)
+
+    def __len__(self) -> int:
+        return len(self._voices)
+
+    def __iter__(self) -> Iterator[Voice]:
+        with self._lock:
+            voices = list(self._voices.values())
+        return iter(voices)
+
+    def __contains__(self, voice_id: object) -> bool:
+        return voice_id in self._voices
+
+    def get(self, voice_id: str) -> Optional[Voice]:
+        return self._voices.get(voice_id)
+
+    def add(self, voice: Voice) -> None:
+        """Adds a voice to the index, replacing the voice with the same ID while keeping its position."""
+        with self._lock:
+            position = self._positions.get(voice.id)
+            if position is not None:
+                self._unindex(self._voices[voice.id])
+            else:
+                position = self._next_position
+                self._next_position += 1
+
+            self._voices[voice.id] = voice
+            self._positions[voice.id] = position
+            self._index(voice)
+
+    def remove(self, voice_id: str) -> bool:
+        """Removes a voice from the index, returning whether it was in the index."""
+        with self._lock:
+            voice = self._voices.pop(voice_id, None)
+            if voice is None:
+                return False
+            del self._positions[voice_id]
+            self._unindex(voice)
+            return True
+
+    def watch(self, client: Union[Lmnt, AsyncLmnt]) -> VoiceIndex:
+        """Keeps the index up to date with the voices created, updated and deleted through the client, and the
+        clients created from it through `.copy()` / `.with_options()`, returning the index.
+
+        The responses of `.with_raw_response` and `.with_streaming_response` are applied once they are parsed.
+        """
+        client._voice_indexes.add(self)
+        return self
+
+    def unwatch(self, client: Union[Lmnt, AsyncLmnt]) -> None:
+        client._voice_indexes.discard(self)
+
+    def search(
+        self,
+        *,
+        tags: Optional[Iterable[str]] = None,
+        any_tags: Optional[Iterable[str]] = None,
+        gender: Optional[str] = None,
+        owner: Optional[str] = None,
+        state: Optional[str] = None,
+        starred: Optional[bool] = None,
+        prefix: Optional[str] = None,
+        text: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Voice]:
+        """Returns the voices that match every given criterion, in the order in which they were added.
+
+        Args:
+          tags: Only voices with all of these tags.
+
+          any_tags: Only voices with at least one of these tags.
+
+          gender: Only voices with this gender, e.g. `female`.
+
+          owner: Only voices with this owner, i.e. `system`, `me` or `other`.
+
+          state: Only voices in this state, e.g. `ready`.
+
+          starred: Only voices that are, or aren't, starred.
+
+          prefix: Only voices with a word in their name or description that starts with this, ignoring case.
+
+          text: Only voices whose name or description contains this, ignoring case.
+
+          limit: The maximum number of voices to return.
+        """
+        with self._lock:
+            candidates: List[Set[str]] = []
+            for tag in tags or ():
+                candidates.append(self._postings["tags"].get(tag, set()))
+            if any_tags is not None:
+                any_of: Set[str] = set()
+                for tag in any_tags:
+                    any_of |= self._postings["tags"].get(tag, set())
+                candidates.append(any_of)
+            for field, value in (("gender", gender), ("owner", owner), ("state", state), ("starred", starred)):
+                if value is not None:
+                    candidates.append(self._postings[field].get(value, set()))
+            if prefix is not None:
+                candidates.append(self._match_prefix(prefix.casefold()))
+            if text is not None:
+                candidates.append(self._match_text(text.casefold()))
+
+            if not candidates:
+                ids: Iterable[str] = self._voices
+            else:
+                candidates.sort(key=len)
+                ids = candidates[0].intersection(*candidates[1:])
+                ids = sorted(ids, key=self._positions.__getitem__)
+
+            voices: List[Voice] = []
+            for voice_id in ids:
+                if limit is not None and len(voices) >= limit:
+                    break
+                voices.append(self._voices[voice_id])
+            return voices
+
+    def _apply_change(self, voice_id: Optional[str], parsed: object) -> None:
+        """Applies the parsed response of a change made through a watched client."""
+        if isinstance(parsed, VoiceUpdateResponse):
+            parsed = parsed.voice
+        if isinstance(parsed, Voice):
+            self.add(parsed)
+        elif isinstance(parsed, VoiceDeleteResponse) and parsed.success and voice_id is not None:
+            self.remove(voice_id)
+
+    def _index(self, voice: Voice) -> None:
+        for field, values in _field_values(voice).items():
+            for value in values:
+                self._postings[field].setdefault(value, set()).add(voice.id)
+
+        for word in _words(voice):
+            ids = self._words.get(word)
+            if ids is None:
+                ids = self._words[word] = set()
+                bisect.insort(self._sorted_words, word)
+            ids.add(voice.id)
+
+        for trigram in _trigrams(_searchable_text(voice)):
+            self._trigrams.setdefault(trigram, set()).add(voice.id)
+
+    def _unindex(self, voice: Voice) -> None:
+        for field, values in _field_values(voice).items():
+            postings = self._postings[field]
+            for value in values:
+                _discard(postings, value, voice.id)
+
+        for word in _words(voice):
+            if _discard(self._words, word, voice.id):
+                del self._sorted_words[bisect.bisect_left(self._sorted_words, word)]
+
+        for trigram in _trigrams(_searchable_text(voice)):
+            _discard(self._trigrams, trigram, voice.id)
+
+    def _match_prefix(self, prefix: str) -> Set[str]:
+        matches: Set[str] = set()
+        start = bisect.bisect_left(self._sorted_words, prefix)
+        for word in self._sorted_words[start:]:
+            if not word.startswith(prefix):
+                break
+            matches |= self._words[word]
+        return matches
+
+    def _match_text(self, text: str) -> Set[str]:
+        trigrams = _trigrams(text)
+        if trigrams:
+            postings = sorted((self._trigrams.get(trigram, set()) for trigram in trigrams), key=len)
+            candidates: Iterable[str] = postings[0].intersection(*postings[1:])
+        else:
+            # too short to have a trigram, so every voice has to be checked
+            candidates = self._voices
+        # the trigrams may all appear without being next to each other
+        return {voice_id for voice_id in candidates if text in _searchable_text(self._voices[voice_id])}
+
+
+def apply_voice_change(client: Union[Lmnt, AsyncLmnt], voice_id: Optional[str], parsed: object) -> None:
+    """Applies the parsed response of a change to the voices made through the client to the indexes watching it."""
+    for index in list(client._voice_indexes):
+        index._apply_change(voice_id, parsed)
+
+
+def voice_change_parser(client: Union[Lmnt, AsyncLmnt], voice_id: Optional[str] = None) -> PostParser:
+    """Returns the post-parser of a request that changes the voices, which applies its response to the indexes
+    watching the client whenever it is parsed, including through `.with_raw_response`."""
+
+    def apply(parsed: Any) -> Any:
+        apply_voice_change(client, voice_id, parsed)
+        return parsed
+
+    return apply
+
+
+def _field_values(voice: Voice) -> Dict[str, List[Hashable]]:
+    return {
+        "tags": list(dict.fromkeys(voice.tags or ())),
+        "gender": [voice.gender] if voice.gender is not None else [],
+        "owner": [voice.owner],
+        "state": [voice.state],
+        "starred": [bool(voice.starred)],
+    }
+
+
+def _searchable_text(voice: Voice) -> str:
+    # the name and description are joined with a character that a search can't match across
+    return f"{voice.name}\n{voice.description or ''}".casefold()
+
+
+def _words(voice: Voice) -> Set[str]:
+    return set(_searchable_text(voice).split())
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+def _discard(postings: Dict[Any, Set[str]], key: Hashable, voice_id: str) -> bool:
+    """Removes the voice from the postings of the key, returning whether the key has no voices left."""
+    ids = postings.get(key)
+    if ids is None:
+        return False
+    ids.discard(voice_id)
+    if ids:
+        return False
+    del postings[key]
+    return True
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import time
+import random
+import logging
+from typing import TYPE_CHECKING, Dict, List, Tuple, Iterable, Iterator, Optional, AsyncIterator
+
+import anyio
+
+from ._exceptions import VoiceNotReadyError
+from .types.voice import Voice
+from ._voice_cache import invalidate_cached_voices
+from ._voice_index import apply_voice_change
+
+if TYPE_CHECKING:
+    from .resources.voices import VoicesResource, AsyncVoicesResource
+
+__all__ = ["ReadinessPoller"]
+
+log: logging.Logger = logging.getLogger(__name__)
+
+DEFAULT_WAIT_TIMEOUT = 600.0
+DEFAULT_POLL_INTERVAL = 1.0
+DEFAULT_MAX_POLL_INTERVAL = 30.0
+# with at least this many voices pending, a tick lists the voices instead of retrieving each one
+DEFAULT_LIST_THRESHOLD = 3
+
+READY_STATE = "ready"
+
+# sent with every poll, which also keeps the requests from being served by the client's `VoiceCache`
+NO_CACHE_HEADERS = {"Cache-Control": "no-cache"}
+
+
+class ReadinessPoller:
+    """Keeps track of the voices that `voices.wait_until_ready()` is waiting for, and of when to poll them next.
+
+    The delay between polls starts at `poll_interval` and doubles after every poll, up to
+    `max_poll_interval`, with jitter so that many waiting clients don't poll in lockstep.
+    """
+
+    def __init__(
+        self,
+        ids: Iterable[str],
+        *,
+        timeout: Optional[float],
+        poll_interval: float,
+        max_poll_interval: float,
+        list_threshold: int,
+    ) -> None:
+        if poll_interval <= 0 or max_poll_interval < poll_interval:
+            raise ValueError("`poll_interval` must be positive and at most `max_poll_interval`")
+        if timeout is not None and timeout < 0:
+            raise ValueError(f"`timeout` must not be negative but received {timeout}")
+
+        # the last seen state of every voice that isn't ready yet, in the order they were given
+        self.pending: Dict[str, Optional[str]] = dict.fromkeys(ids)
+        self._timeout = timeout
+        self._deadline = None if timeout is None else time.monotonic() + timeout
+        self._delay = poll_interval
+        self._max_delay = max_poll_interval
+        self._list_threshold = list_threshold
+
+    @property
+    def done(self) -> bool:
+        return not self.pending
+
+    def should_list(self) -> bool:
+        """Whether the next poll should list the voices, rather than retrieve every pending one."""
+        return len(self.pending) >= self._list_threshold
+
+    def match(self, voices: Iterable[Voice]) -> Tuple[List[Voice], List[str]]:
+        """Returns the listed voices that are pending, and the IDs of the pending voices that weren't listed."""
+        found = [voice for voice in voices if voice.id in self.pending]
+        listed = {voice.id for voice in found}
+        return found, [voice_id for voice_id in self.pending if voice_id not in listed]
+
+    def observe(self, voice: Voice) -> bool:
+        """Records the state of a polled voice, returning whether it just became ready."""
+        if voice.id not in self.pending:
+            return False
+        if voice.state == READY_STATE:
+            del self.pending[voice.id]
+            return True
+        self.pending[voice.id] = voice.state
+        return False
+
+    def next_delay(self) -> float:
+        """Returns the number of seconds to wait before the next poll, raising if the timeout has passed."""
+        delay = self._delay * (1 - 0.25 * random.random())
+        self._delay = min(self._delay * 2, self._max_delay)
+
+        if self._deadline is not None:
+            remaining = self._deadline - time.monotonic()
+            if remaining <= 0:
+                assert self._timeout is not None
+                raise VoiceNotReadyError(states=dict(self.pending), timeout=self._timeout)
+            # poll one last time right at the deadline
+            delay = min(delay, remaining)
+
+        log.debug("Waiting %.2fs before polling %d voice(s) again", delay, len(self.pending))
+        return delay
+
+    def sleep(self) -> None:
+        time.sleep(self.next_delay())
+
+    async def asleep(self) -> None:
+        await anyio.sleep(self.next_delay())
+
+
+def wait_until_ready(
+    voices: VoicesResource,
+    ids: Iterable[str],
+    *,
+    timeout: Optional[float],
+    poll_interval: float,
+    max_poll_interval: float,
+    list_threshold: int,
+) -> Iterator[Voice]:
+    """Polls the voices through the resource, yielding each voice as soon as it is ready."""
+    poller = ReadinessPoller(
+        ids,
+        timeout=timeout,
+        poll_interval=poll_interval,
+        max_poll_interval=max_poll_interval,
+        list_threshold=list_threshold,
+    )
+    while not poller.done:
+        if poller.should_list():
+            polled, unlisted = poller.match(voices.list(owner="me", extra_headers=NO_CACHE_HEADERS))
+            # e.g. voices of other owners, or that were deleted
+            polled += [voices.retrieve(id, extra_headers=NO_CACHE_HEADERS) for id in unlisted]
+        else:
+            polled = [voices.retrieve(id, extra_headers=NO_CACHE_HEADERS) for id in list(poller.pending)]
+
+        for voice in polled:
+            if poller.observe(voice):
+                invalidate_cached_voices(voices._client, voice.id)
+                apply_voice_change(voices._client, voice.id, voice)
+                yield voice
+        if not poller.done:
+            poller.sleep()
+
+
+async def async_wait_until_ready(
+    voices: AsyncVoicesResource,
+    ids: Iterable[str],
+    *,
+    timeout: Optional[float],
+    poll_interval: float,
+    max_poll_interval: float,
+    list_threshold: int,
+) -> AsyncIterator[Voice]:
+    """Polls the voices through the resource, yielding each voice as soon as it is ready."""
+    poller = ReadinessPoller(
+        ids,
+        timeout=timeout,
+        poll_interval=poll_interval,
+        max_poll_interval=max_poll_interval,
+        list_threshold=list_threshold,
+    )
+    while not poller.done:
+        if poller.should_list():
+            polled, unlisted = poller.match(await voices.list(owner="me", extra_headers=NO_CACHE_HEADERS))
+            # e.g. voices of other owners, or that were deleted
+            polled += [await voices.retrieve(id, extra_headers=NO_CACHE_HEADERS) for id in unlisted]
+        else:
+            polled = [await voices.retrieve(id, extra_headers=NO_CACHE_HEADERS) for id in list(poller.pending)]
+
+        for voice in polled:
+            if poller.observe(voice):
+                invalidate_cached_voices(voices._client, voice.id)
+                apply_voice_change(voices._client, voice.id, voice)
+                yield voice
+        if not poller.done:
+            await poller.asleep()
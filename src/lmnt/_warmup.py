@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import time
+import logging
+import threading
+from typing import Any, List, Optional, Sequence
+from typing_extensions import override
+from concurrent.futures import ThreadPoolExecutor
+
+import anyio
+import httpx
+import websockets
+
+__all__ = ["WarmupResult", "WebSocketPool"]
+
+log: logging.Logger = logging.getLogger(__name__)
+
+
+class WarmupResult:
+    """The outcome of `client.warmup()`."""
+
+    duration: float
+    """How long the warmup took, in seconds."""
+
+    connections: int
+    """The number of HTTP connections that were opened and returned to the pool."""
+
+    websockets: int
+    """The number of streaming WebSockets that were pre-opened."""
+
+    errors: List[Exception]
+    """The errors raised by any connections that failed to open."""
+
+    def __init__(self, *, duration: float, connections: int, websockets: int, errors: List[Exception]) -> None:
+        self.duration = duration
+        self.connections = connections
+        self.websockets = websockets
+        self.errors = errors
+
+    @property
+    def ok(self) -> bool:
+        """Whether every requested connection was opened successfully."""
+        return not self.errors
+
+    @override
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__name__} duration={self.duration:.3f}s connections={self.connections} "
+            f"websockets={self.websockets} errors={len(self.errors)}>"
+        )
+
+
+def _warmup_request(client: httpx.Client | httpx.AsyncClient, url: str | httpx.URL, timeout: float) -> httpx.Request:
+    # A bare `HEAD` of the base URL is enough to resolve DNS and complete the TCP + TLS handshakes; the
+    # status code doesn't matter. No credentials are sent as the request doesn't need to be authenticated.
+    return client.build_request("HEAD", url, timeout=timeout)
+
+
+def warmup_connections(
+    client: httpx.Client, urls: Sequence[str | httpx.URL], *, connections: int, timeout: float
+) -> WarmupResult:
+    """Opens `connections` connections to each of the `urls` concurrently and leaves them idle in the pool.
+
+    Every connection is held open until all of them have been established, as otherwise a fast
+    response would let a later request re-use an earlier connection instead of opening its own.
+    """
+    started = time.monotonic()
+    errors: List[Exception] = []
+    opened = 0
+    pending = connections * len(urls)
+    lock = threading.Lock()
+    all_opened = threading.Event()
+
+    def open_connection(url: str | httpx.URL) -> None:
+        nonlocal opened, pending
+
+        response: Optional[httpx.Response] = None
+        try:
+            response = client.send(_warmup_request(client, url, timeout), stream=True)
+        except Exception as err:
+            log.debug("Failed to open a warmup connection", exc_info=True)
+            with lock:
+                errors.append(err)
+        finally:
+            with lock:
+                pending -= 1
+                if pending == 0:
+                    all_opened.set()
+
+        if response is None:
+            return
+
+        try:
+            all_opened.wait(timeout)
+            # the (empty) body has to be consumed for the connection to be returned to the pool instead of closed
+            response.read()
+        except Exception as err:
+            log.debug("Failed to open a warmup connection", exc_info=True)
+            with lock:
+                errors.append(err)
+        else:
+            with lock:
+                opened += 1
+        finally:
+            response.close()
+
+    if pending > 0:
+        with ThreadPoolExecutor(max_workers=pending, thread_name_prefix="lmnt-warmup") as pool:
+            for url in urls:
+                for _ in range(connections):
+                    pool.submit(open_connection, url)
+
+    return WarmupResult(duration=time.monotonic() - started, connections=opened, websockets=0, errors=errors)
+
+
+async def async_warmup_connections(
+    client: httpx.AsyncClient,
+    urls: Sequence[str | httpx.URL],
+    *,
+    connections: int,
+    timeout: float,
+    websocket_pool: WebSocketPool | None = None,
+    websocket_urls: Sequence[str] = (),
+    websockets: int = 0,
+) -> WarmupResult:
+    """The async counterpart to `warmup_connections()`.
+
+    It can also pre-open `websockets` streaming WebSockets to each of the `websocket_urls`.
+    """
+    started = time.monotonic()
+    errors: List[Exception] = []
+    opened = 0
+    opened_websockets = 0
+    pending = connections * len(urls)
+    all_opened = anyio.Event()
+
+    async def open_connection(url: str | httpx.URL) -> None:
+        nonlocal opened, pending
+
+        response: Optional[httpx.Response] = None
+        try:
+            response = await client.send(_warmup_request(client, url, timeout), stream=True)
+        except Exception as err:
+            log.debug("Failed to open a warmup connection", exc_info=True)
+            errors.append(err)
+        finally:
+            pending -= 1
+            if pending == 0:
+                all_opened.set()
+
+        if response is None:
+            return
+
+        try:
+            with anyio.move_on_after(timeout):
+                await all_opened.wait()
+            await response.aread()
+        except Exception as err:
+            log.debug("Failed to open a warmup connection", exc_info=True)
+            errors.append(err)
+        else:
+            opened += 1
+        finally:
+            await response.aclose()
+
+    async def open_websocket(websocket_url: str) -> None:
+        nonlocal opened_websockets
+
+        assert websocket_pool is not None
+        try:
+            with anyio.fail_after(timeout):
+                await websocket_pool.open(websocket_url)
+        except Exception as err:
+            log.debug("Failed to pre-open a WebSocket", exc_info=True)
+            errors.append(err)
+        else:
+            opened_websockets += 1
+
+    async with anyio.create_task_group() as tg:
+        for url in urls:
+            for _ in range(connections):
+                tg.start_soon(open_connection, url)
+        if websocket_pool is not None:
+            for websocket_url in websocket_urls:
+                for _ in range(websockets):
+                    tg.start_soon(open_websocket, websocket_url)
+
+    return WarmupResult(
+        duration=time.monotonic() - started, connections=opened, websockets=opened_websockets, errors=errors
+    )
+
+
+class WebSocketPool:
+    """Pre-opened streaming WebSockets that are handed out to new `SpeechSession`s.
+
+    Connections are only handed out for the URL they were opened for, and ones that the
+    server has closed while they sat idle are discarded.
+    """
+
+    def __init__(self) -> None:
+        self._idle: List[tuple[str, Any]] = []
+
+    @property
+    def idle_count(self) -> int:
+        return len(self._idle)
+
+    async def open(self, url: str) -> None:
+        websocket = await websockets.connect(url)
+        self._idle.append((url, websocket))
+
+    def take(self, url: str) -> Optional[Any]:
+        while True:
+            index = next((i for i, (idle_url, _) in enumerate(self._idle) if idle_url == url), None)
+            if index is None:
+                return None
+
+            _, websocket = self._idle.pop(index)
+            if _is_open(websocket):
+                return websocket
+
+    async def close(self) -> None:
+        idle, self._idle = self._idle, []
+        for _, websocket in idle:
+            try:
+                await websocket.close()
+            except Exception:
+                log.debug("Failed to close a pre-opened WebSocket", exc_info=True)
+
+
+def _is_open(websocket: Any) -> bool:
+    state = getattr(websocket, "state", None)
+    if state is not None:
+        return getattr(state, "name", None) == "OPEN"
+    return not getattr(websocket, "closed", False)
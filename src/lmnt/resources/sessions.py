@@ -4,15 +4,22 @@ from __future__ import annotations
 
 import os
 import json
-from typing import Any, Dict, Final, Union, Literal, Optional
+import time
+import asyncio
+from typing import Any, Dict, List, Final, Union, Literal, Callable, Optional, Awaitable
 
 import websockets
 
+from .._usage import UsageTracker
+from .._warmup import WebSocketPool
+from .._metrics import Metrics
 from .._resource import AsyncAPIResource
+from .._endpoints import Endpoint, EndpointPool
 from .._api_version import LMNT_API_VERSION
 from ..types.speech_session_audio import SpeechSessionAudio as SpeechSessionAudio
 from ..types.speech_session_error import SpeechSessionError as SpeechSessionError
 from ..types.speech_session_ready import SpeechSessionReady as SpeechSessionReady
+from ..types.account_retrieve_response import AccountRetrieveResponse
 from ..types.speech_session_timestamps import SpeechSessionTimestamps as SpeechSessionTimestamps
 from ..types.speech_session_flush_complete import SpeechSessionFlushComplete as SpeechSessionFlushComplete
 from ..types.speech_session_reset_complete import SpeechSessionResetComplete as SpeechSessionResetComplete
@@ -102,6 +109,11 @@ class SpeechSession:
     return_timestamps: Optional[bool] = None,
     sample_rate: Optional[Literal[24000, 16000, 8000]] = None,
     base_url: object = DEFAULT_BASE_URL,
+    websocket_pool: Optional[WebSocketPool] = None,
+    endpoint_pool: Optional[EndpointPool] = None,
+    metrics: Optional[Metrics] = None,
+    usage_tracker: Optional[UsageTracker] = None,
+    retrieve_account: Optional[Callable[[], Awaitable[AccountRetrieveResponse]]] = None,
   ):
     self.api_key = api_key
     self.voice = voice
@@ -113,10 +125,27 @@ class SpeechSession:
     self.websocket: Optional[Any] = None
     self.nonce: int = 0
     self.request_id: Optional[str] = None
+    self._websocket_pool = websocket_pool
+    self._endpoint_pool = endpoint_pool
+    self._metrics = metrics
+    self._usage_tracker = usage_tracker
+    self._retrieve_account = retrieve_account
+    # when the text that hasn't received any audio yet was first sent, for `Metrics`
+    self._text_sent_at: Optional[float] = None
 
   async def connect(self) -> None:
-    """Connect the `SpeechSession`."""
-    self.websocket = await websockets.connect(self.url)
+    """Connect the `SpeechSession`, using a WebSocket pre-opened by `client.warmup()` if one is available.
+
+    With an `EndpointPool` the session connects to the best endpoint, failing over to the
+    next one if it can't be connected to.
+    """
+    started_at = time.monotonic()
+    if self._endpoint_pool is None:
+      self.websocket = await self._open_websocket(self.url)
+    else:
+      self.websocket = await self._connect_to_pool(self._endpoint_pool)
+    if self._metrics is not None:
+      self._metrics._record_session_connect(self.voice, time.monotonic() - started_at)
     init_msg: Dict[str, Any] = {
       "X-API-Key": self.api_key,
       "lmnt-version": LMNT_API_VERSION,
@@ -133,9 +162,54 @@ class SpeechSession:
     if self.websocket is not None:
       await self.websocket.send(json.dumps(init_msg))
 
+  async def _open_websocket(self, url: str) -> Any:
+    websocket = self._websocket_pool.take(url) if self._websocket_pool is not None else None
+    return websocket if websocket is not None else await websockets.connect(url)
+
+  async def _connect_to_pool(self, endpoint_pool: EndpointPool) -> Any:
+    failed: List[Endpoint] = []
+    while True:
+      endpoint = endpoint_pool.pick(exclude=failed)
+      url = _ws_url_from_base(endpoint.url)
+      endpoint_pool.start(endpoint)
+      started_at = time.monotonic()
+      try:
+        websocket = await self._open_websocket(url)
+      except (OSError, asyncio.TimeoutError, websockets.exceptions.InvalidHandshake):
+        endpoint_pool.finish(endpoint, failed=True)
+        failed.append(endpoint)
+        if len(failed) >= len(endpoint_pool.endpoints):
+          raise
+        continue
+      except BaseException:
+        endpoint_pool.finish(endpoint, failed=False)
+        raise
+
+      endpoint_pool.finish(endpoint, failed=False, latency=time.monotonic() - started_at)
+      self.url = url
+      return websocket
+
   async def send_text(self, text: str) -> None:
-    """Send text to the server to append into the text stream."""
-    await self._send_message({"type": "text", "text": text})
+    """Send text to the server to append into the text stream.
+
+    With a `UsageTracker` on the client, the characters of the text are counted, and sending them
+    may be throttled, or rejected with a `QuotaExceededError`.
+    """
+    usage = self._usage_tracker if text else None
+    if usage is not None:
+      await usage.async_acquire(len(text), fetch=self._retrieve_account)
+    try:
+      await self._send_message({"type": "text", "text": text})
+    except BaseException:
+      if usage is not None:
+        usage.release(len(text))
+      raise
+    if usage is not None:
+      usage.commit(len(text))
+    if self._metrics is not None:
+      self._metrics._record_session_text(self.voice, text)
+      if self._text_sent_at is None:
+        self._text_sent_at = time.monotonic()
 
   async def send_flush(self) -> int:
     """Force the server to generate speech for all buffered text in the stream."""
@@ -178,6 +252,8 @@ class SpeechSession:
       if isinstance(message, str):
         return self._parse_text_message(message)
       elif isinstance(message, bytes):
+        if self._metrics is not None:
+          self._record_audio(message)
         return SpeechSessionAudio(type="audio", audio=message)
       else:
         raise UnexpectedMessageError(f"Unexpected message type: {type(message)}")
@@ -185,6 +261,14 @@ class SpeechSession:
     except websockets.exceptions.ConnectionClosed as err:
       raise StopAsyncIteration from err
 
+  def _record_audio(self, audio: bytes) -> None:
+    assert self._metrics is not None
+    time_to_first_audio = None
+    if self._text_sent_at is not None:
+      time_to_first_audio = time.monotonic() - self._text_sent_at
+      self._text_sent_at = None
+    self._metrics._record_session_audio(self.voice, len(audio), time_to_first_audio)
+
   def _parse_text_message(self, text_data: str) -> SpeechSessionResponse:
     """Parse a text message from the server. Dispatches on the `type` discriminator."""
     try:
@@ -282,6 +366,11 @@ class AsyncSessionsResource(AsyncAPIResource):
       return_timestamps=return_timestamps,
       sample_rate=sample_rate,
       base_url=self._client.base_url,
+      websocket_pool=self._client._websocket_pool,
+      endpoint_pool=self._client._endpoint_pool,
+      metrics=self._client._metrics,
+      usage_tracker=self._client._usage_tracker,
+      retrieve_account=self._client._retrieve_account,
     )
     await session.connect()
     return session
@@ -18,15 +18,14 @@ from .._response import (
   StreamedBinaryAPIResponse,
   AsyncStreamedBinaryAPIResponse,
   to_raw_response_wrapper,
-  to_streamed_response_wrapper,
   async_to_raw_response_wrapper,
   to_custom_raw_response_wrapper,
-  async_to_streamed_response_wrapper,
   to_custom_streamed_response_wrapper,
   async_to_custom_raw_response_wrapper,
   async_to_custom_streamed_response_wrapper,
 )
 from .._base_client import make_request_options
+from .._speech_stream import StreamedDetailedSpeechResponse, AsyncStreamedDetailedSpeechResponse
 from ..types.speech_generate_detailed_response import SpeechGenerateDetailedResponse
 
 __all__ = ["SpeechResource", "AsyncSpeechResource"]
@@ -668,8 +667,9 @@ class SpeechResourceWithStreamingResponse:
       speech.generate,
       StreamedBinaryAPIResponse,
     )
-    self.generate_detailed = to_streamed_response_wrapper(
+    self.generate_detailed = to_custom_streamed_response_wrapper(
       speech.generate_detailed,
+      StreamedDetailedSpeechResponse,
     )
 
 
@@ -681,6 +681,7 @@ class AsyncSpeechResourceWithStreamingResponse:
       speech.generate,
       AsyncStreamedBinaryAPIResponse,
     )
-    self.generate_detailed = async_to_streamed_response_wrapper(
+    self.generate_detailed = async_to_custom_streamed_response_wrapper(
       speech.generate_detailed,
+      AsyncStreamedDetailedSpeechResponse,
     )
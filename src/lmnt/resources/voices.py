@@ -2,14 +2,25 @@
 
 from __future__ import annotations
 
-from typing import Mapping, Iterable, cast
+from typing import List, Mapping, Iterable, Iterator, AsyncIterator, cast
 
 import httpx
 
 from ..types import voice_list_params, voice_create_params, voice_update_params
+from .._batch import (
+  DEFAULT_BATCH_CONCURRENCY,
+  BatchResult,
+  BatchProgressHook,
+  run_batch_by_id,
+  async_run_batch_by_id,
+  run_batch_by_id_with_params,
+  async_run_batch_by_id_with_params,
+)
 from .._types import Body, Omit, Query, Headers, NotGiven, FileTypes, omit, not_given
 from .._utils import extract_files, maybe_transform, deepcopy_minimal, async_maybe_transform
 from .._compat import cached_property
+from .._upload import UploadProgressHook
+from .._previews import PreviewCache, VoicePreview, fetch_previews, async_fetch_previews
 from .._resource import SyncAPIResource, AsyncAPIResource
 from .._response import (
   to_raw_response_wrapper,
@@ -17,9 +28,21 @@ from .._response import (
   async_to_raw_response_wrapper,
   async_to_streamed_response_wrapper,
 )
+from .._preprocess import AudioPreprocessing, with_preprocessed_file, async_with_preprocessed_file
+from .._voice_wait import (
+  DEFAULT_WAIT_TIMEOUT,
+  DEFAULT_POLL_INTERVAL,
+  DEFAULT_LIST_THRESHOLD,
+  DEFAULT_MAX_POLL_INTERVAL,
+  wait_until_ready,
+  async_wait_until_ready,
+)
 from ..types.voice import Voice
 from .._base_client import make_request_options
+from .._voice_cache import voice_cache_for, invalidate_cached_voices
+from .._voice_index import voice_change_parser
 from ..types.voice_list_response import VoiceListResponse
+from ..types.voice_update_params import VoiceUpdateParams
 from ..types.voice_delete_response import VoiceDeleteResponse
 from ..types.voice_update_response import VoiceUpdateResponse
 
@@ -46,6 +69,7 @@ class VoicesResource(SyncAPIResource):
     """
     return VoicesResourceWithStreamingResponse(self)
 
+  @with_preprocessed_file
   def create(
     self,
     *,
@@ -54,6 +78,10 @@ class VoicesResource(SyncAPIResource):
     description: str | Omit = omit,
     gender: str | Omit = omit,
     tags: Iterable[str] | Omit = omit,
+    on_progress: UploadProgressHook | None = None,
+    min_upload_rate: float | None = None,
+    spool_upload: bool | None = None,
+    preprocess: AudioPreprocessing | bool = False,  # noqa: ARG002
     # Use the following arguments if you need to pass additional parameters to the API that aren't available via kwargs.
     # The extra values given here take precedence over values defined on the client or passed to this method.
     extra_headers: Headers | None = None,
@@ -79,6 +107,20 @@ class VoicesResource(SyncAPIResource):
 
       tags: A list of tags to attach to this voice.
 
+      on_progress: Called with the `UploadProgress` of the request body as it is sent, with the
+          number of bytes sent, the total and the recent throughput.
+
+      min_upload_rate: The lowest acceptable upload rate in bytes per second, averaged over 5 seconds.
+          A slower upload is aborted with an `UploadStalledError` and retried.
+
+      spool_upload: Encode the request body once into a temporary file so that retries re-send it
+          without reading `file` again. Defaults to spooling only if `file` can't be read again
+          from the start, e.g. a pipe, as retries re-open paths and rewind file objects otherwise.
+
+      preprocess: Shrink a PCM `wav` file before it is uploaded, by mixing it down to mono, resampling
+          it to 24 kHz and trimming silence, or as configured by an `AudioPreprocessing`. Other
+          formats are uploaded unchanged. The sizes before and after are logged at the `INFO` level.
+
       extra_headers: Send extra headers
 
       extra_query: Add additional query parameters to the request
@@ -101,15 +143,24 @@ class VoicesResource(SyncAPIResource):
     # sent to the server will contain a `boundary` parameter, e.g.
     # multipart/form-data; boundary=---abc--
     extra_headers = {"Content-Type": "multipart/form-data", **(extra_headers or {})}
-    return self._post(
+    voice = self._post(
       "/v1/ai/voice",
       body=maybe_transform(body, voice_create_params.VoiceCreateParams),
       files=files,
       options=make_request_options(
-        extra_headers=extra_headers, extra_query=extra_query, extra_body=extra_body, timeout=timeout
+        extra_headers=extra_headers,
+        extra_query=extra_query,
+        extra_body=extra_body,
+        timeout=timeout,
+        on_upload_progress=on_progress,
+        min_upload_rate=min_upload_rate,
+        spool_upload=spool_upload,
+        post_parser=voice_change_parser(self._client),
       ),
       cast_to=Voice,
     )
+    invalidate_cached_voices(self._client)
+    return voice
 
   def retrieve(
     self,
@@ -136,6 +187,9 @@ class VoicesResource(SyncAPIResource):
     """
     if not id:
       raise ValueError(f"Expected a non-empty value for `id` but received {id!r}")
+    cache = voice_cache_for(self._client, extra_headers, extra_query, extra_body)
+    if cache is not None:
+      return cache.get(self._client, ("voice", id), self.retrieve, id, timeout=timeout)
     return self._get(
       f"/v1/ai/voice/{id}",
       options=make_request_options(
@@ -185,7 +239,7 @@ class VoicesResource(SyncAPIResource):
     """
     if not id:
       raise ValueError(f"Expected a non-empty value for `id` but received {id!r}")
-    return self._put(
+    response = self._put(
       f"/v1/ai/voice/{id}",
       body=maybe_transform(
         {
@@ -198,10 +252,16 @@ class VoicesResource(SyncAPIResource):
         voice_update_params.VoiceUpdateParams,
       ),
       options=make_request_options(
-        extra_headers=extra_headers, extra_query=extra_query, extra_body=extra_body, timeout=timeout
+        extra_headers=extra_headers,
+        extra_query=extra_query,
+        extra_body=extra_body,
+        timeout=timeout,
+        post_parser=voice_change_parser(self._client, id),
       ),
       cast_to=VoiceUpdateResponse,
     )
+    invalidate_cached_voices(self._client, id)
+    return response
 
   def delete(
     self,
@@ -229,13 +289,19 @@ class VoicesResource(SyncAPIResource):
     """
     if not id:
       raise ValueError(f"Expected a non-empty value for `id` but received {id!r}")
-    return self._delete(
+    response = self._delete(
       f"/v1/ai/voice/{id}",
       options=make_request_options(
-        extra_headers=extra_headers, extra_query=extra_query, extra_body=extra_body, timeout=timeout
+        extra_headers=extra_headers,
+        extra_query=extra_query,
+        extra_body=extra_body,
+        timeout=timeout,
+        post_parser=voice_change_parser(self._client, id),
       ),
       cast_to=VoiceDeleteResponse,
     )
+    invalidate_cached_voices(self._client, id)
+    return response
 
   def list(
     self,
@@ -265,6 +331,11 @@ class VoicesResource(SyncAPIResource):
 
       timeout: Override the client-level default timeout for this request, in seconds
     """
+    cache = voice_cache_for(self._client, extra_headers, extra_query, extra_body)
+    if cache is not None:
+      return cache.get(
+        self._client, ("list", owner, starred), self.list, owner=owner, starred=starred, timeout=timeout
+      )
     return self._get(
       "/v1/ai/voice/list",
       options=make_request_options(
@@ -283,6 +354,172 @@ class VoicesResource(SyncAPIResource):
       cast_to=VoiceListResponse,
     )
 
+  def retrieve_many(
+    self,
+    ids: Iterable[str],
+    *,
+    concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+    on_progress: BatchProgressHook | None = None,
+    timeout: float | httpx.Timeout | None | NotGiven = not_given,
+  ) -> List[BatchResult[Voice]]:
+    """
+    Retrieves many voices concurrently on a pool of `concurrency` threads.
+
+    Every voice has its own `BatchResult`, in the order they were given, with either the response
+    or the error raised for it, so that one failure doesn't stop the others. The requests are
+    retried like any other, and are throttled by the client's `rate_limiter` if it has one.
+
+    Args:
+      ids: The IDs of the voices to retrieve.
+
+      concurrency: The maximum number of requests in flight at once.
+
+      on_progress: Called with the `BatchProgress` of the batch after every voice.
+
+      timeout: Override the client-level default timeout for each request, in seconds
+    """
+    return run_batch_by_id(self.retrieve, ids, concurrency=concurrency, on_progress=on_progress, timeout=timeout)
+
+  def update_many(
+    self,
+    updates: Mapping[str, VoiceUpdateParams],
+    *,
+    concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+    on_progress: BatchProgressHook | None = None,
+    timeout: float | httpx.Timeout | None | NotGiven = not_given,
+  ) -> List[BatchResult[VoiceUpdateResponse]]:
+    """
+    Updates many voices concurrently on a pool of `concurrency` threads.
+
+    Every voice has its own `BatchResult`, in the order they were given, with either the response
+    or the error raised for it, so that one failure doesn't stop the others. The requests are
+    retried like any other, and are throttled by the client's `rate_limiter` if it has one.
+
+    Args:
+      updates: The fields to update for each voice, by the ID of the voice, e.g.
+          `{"voice-id": {"tags": ["narration"]}}`.
+
+      concurrency: The maximum number of requests in flight at once.
+
+      on_progress: Called with the `BatchProgress` of the batch after every voice.
+
+      timeout: Override the client-level default timeout for each request, in seconds
+    """
+    return run_batch_by_id_with_params(
+      self.update, updates, concurrency=concurrency, on_progress=on_progress, timeout=timeout
+    )
+
+  def delete_many(
+    self,
+    ids: Iterable[str],
+    *,
+    concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+    on_progress: BatchProgressHook | None = None,
+    timeout: float | httpx.Timeout | None | NotGiven = not_given,
+  ) -> List[BatchResult[VoiceDeleteResponse]]:
+    """
+    Deletes many voices concurrently on a pool of `concurrency` threads.
+
+    Every voice has its own `BatchResult`, in the order they were given, with either the response
+    or the error raised for it, so that one failure doesn't stop the others. The requests are
+    retried like any other, and are throttled by the client's `rate_limiter` if it has one.
+
+    Args:
+      ids: The IDs of the voices to delete.
+
+      concurrency: The maximum number of requests in flight at once.
+
+      on_progress: Called with the `BatchProgress` of the batch after every voice.
+
+      timeout: Override the client-level default timeout for each request, in seconds
+    """
+    return run_batch_by_id(self.delete, ids, concurrency=concurrency, on_progress=on_progress, timeout=timeout)
+
+  def wait_until_ready(
+    self,
+    ids: Iterable[str],
+    *,
+    timeout: float | None = DEFAULT_WAIT_TIMEOUT,
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+    max_poll_interval: float = DEFAULT_MAX_POLL_INTERVAL,
+    list_threshold: int = DEFAULT_LIST_THRESHOLD,
+  ) -> Iterator[Voice]:
+    """
+    Waits for voices to finish training, yielding each voice as soon as it is `ready`.
+
+    The voices are polled with exponential backoff and jitter, starting `poll_interval` seconds
+    apart and backing off to `max_poll_interval`. While at least `list_threshold` voices are
+    pending, each poll is a single `voices.list(owner="me")` rather than a request per voice.
+
+    ```py
+    for voice in client.voices.wait_until_ready(ids, timeout=300):
+        print(f"{voice.name} is ready")
+    ```
+
+    Args:
+      ids: The IDs of the voices to wait for.
+
+      timeout: The number of seconds to wait for all of the voices, or `None` to wait indefinitely.
+          `VoiceNotReadyError` is raised if some voices still aren't ready by then.
+
+      poll_interval: The number of seconds between the first polls.
+
+      max_poll_interval: The longest number of seconds between polls.
+
+      list_threshold: The number of pending voices from which they're polled by listing them.
+    """
+    return wait_until_ready(
+      self,
+      ids,
+      timeout=timeout,
+      poll_interval=poll_interval,
+      max_poll_interval=max_poll_interval,
+      list_threshold=list_threshold,
+    )
+
+  def fetch_previews(
+    self,
+    voices: Iterable[Voice],
+    *,
+    cache: PreviewCache | None = None,
+    concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+    on_progress: BatchProgressHook | None = None,
+    timeout: float | httpx.Timeout | None | NotGiven = not_given,
+  ) -> List[BatchResult[VoicePreview]]:
+    """
+    Downloads the `preview_url` clips of many voices concurrently on a pool of `concurrency` threads.
+
+    The previews are requested through the client's connection pool, without the API key or any
+    other of the client's headers, since they are served from other hosts than the API. Every
+    voice has its own `BatchResult`, in the order they were given, with either the `VoicePreview`
+    or the error raised for it.
+
+    With a `cache`, the previews are streamed into files in its directory and the previews that
+    are already cached aren't downloaded again, so warming the cache for a whole catalog of voices
+    only fetches the previews that are new or changed. Without one, they are read into memory.
+
+    ```py
+    cache = PreviewCache("~/.cache/lmnt/previews")
+    for result in client.voices.fetch_previews(client.voices.list(owner="all"), cache=cache):
+        if result.value is not None:
+            print(result.id, result.value.path)
+    ```
+
+    Args:
+      voices: The voices whose previews to fetch, e.g. from `voices.list()`.
+
+      cache: The `PreviewCache` to store the previews in, and to serve them from.
+
+      concurrency: The maximum number of downloads in flight at once.
+
+      on_progress: Called with the `BatchProgress` of the batch after every voice.
+
+      timeout: Override the client-level default timeout for each download, in seconds
+    """
+    return fetch_previews(
+      self._client, voices, cache=cache, concurrency=concurrency, on_progress=on_progress, timeout=timeout
+    )
+
 
 class AsyncVoicesResource(AsyncAPIResource):
   @cached_property
@@ -304,6 +541,7 @@ class AsyncVoicesResource(AsyncAPIResource):
     """
     return AsyncVoicesResourceWithStreamingResponse(self)
 
+  @async_with_preprocessed_file
   async def create(
     self,
     *,
@@ -312,6 +550,10 @@ class AsyncVoicesResource(AsyncAPIResource):
     description: str | Omit = omit,
     gender: str | Omit = omit,
     tags: Iterable[str] | Omit = omit,
+    on_progress: UploadProgressHook | None = None,
+    min_upload_rate: float | None = None,
+    spool_upload: bool | None = None,
+    preprocess: AudioPreprocessing | bool = False,  # noqa: ARG002
     # Use the following arguments if you need to pass additional parameters to the API that aren't available via kwargs.
     # The extra values given here take precedence over values defined on the client or passed to this method.
     extra_headers: Headers | None = None,
@@ -337,6 +579,20 @@ class AsyncVoicesResource(AsyncAPIResource):
 
       tags: A list of tags to attach to this voice.
 
+      on_progress: Called with the `UploadProgress` of the request body as it is sent, with the
+          number of bytes sent, the total and the recent throughput.
+
+      min_upload_rate: The lowest acceptable upload rate in bytes per second, averaged over 5 seconds.
+          A slower upload is aborted with an `UploadStalledError` and retried.
+
+      spool_upload: Encode the request body once into a temporary file so that retries re-send it
+          without reading `file` again. Defaults to spooling only if `file` can't be read again
+          from the start, e.g. a pipe, as retries re-open paths and rewind file objects otherwise.
+
+      preprocess: Shrink a PCM `wav` file before it is uploaded, by mixing it down to mono, resampling
+          it to 24 kHz and trimming silence, or as configured by an `AudioPreprocessing`. Other
+          formats are uploaded unchanged. The sizes before and after are logged at the `INFO` level.
+
       extra_headers: Send extra headers
 
       extra_query: Add additional query parameters to the request
@@ -359,15 +615,24 @@ class AsyncVoicesResource(AsyncAPIResource):
     # sent to the server will contain a `boundary` parameter, e.g.
     # multipart/form-data; boundary=---abc--
     extra_headers = {"Content-Type": "multipart/form-data", **(extra_headers or {})}
-    return await self._post(
+    voice = await self._post(
       "/v1/ai/voice",
       body=await async_maybe_transform(body, voice_create_params.VoiceCreateParams),
       files=files,
       options=make_request_options(
-        extra_headers=extra_headers, extra_query=extra_query, extra_body=extra_body, timeout=timeout
+        extra_headers=extra_headers,
+        extra_query=extra_query,
+        extra_body=extra_body,
+        timeout=timeout,
+        on_upload_progress=on_progress,
+        min_upload_rate=min_upload_rate,
+        spool_upload=spool_upload,
+        post_parser=voice_change_parser(self._client),
       ),
       cast_to=Voice,
     )
+    invalidate_cached_voices(self._client)
+    return voice
 
   async def retrieve(
     self,
@@ -394,6 +659,9 @@ class AsyncVoicesResource(AsyncAPIResource):
     """
     if not id:
       raise ValueError(f"Expected a non-empty value for `id` but received {id!r}")
+    cache = voice_cache_for(self._client, extra_headers, extra_query, extra_body)
+    if cache is not None:
+      return await cache.aget(self._client, ("voice", id), self.retrieve, id, timeout=timeout)
     return await self._get(
       f"/v1/ai/voice/{id}",
       options=make_request_options(
@@ -443,7 +711,7 @@ class AsyncVoicesResource(AsyncAPIResource):
     """
     if not id:
       raise ValueError(f"Expected a non-empty value for `id` but received {id!r}")
-    return await self._put(
+    response = await self._put(
       f"/v1/ai/voice/{id}",
       body=await async_maybe_transform(
         {
@@ -456,10 +724,16 @@ class AsyncVoicesResource(AsyncAPIResource):
         voice_update_params.VoiceUpdateParams,
       ),
       options=make_request_options(
-        extra_headers=extra_headers, extra_query=extra_query, extra_body=extra_body, timeout=timeout
+        extra_headers=extra_headers,
+        extra_query=extra_query,
+        extra_body=extra_body,
+        timeout=timeout,
+        post_parser=voice_change_parser(self._client, id),
       ),
       cast_to=VoiceUpdateResponse,
     )
+    invalidate_cached_voices(self._client, id)
+    return response
 
   async def delete(
     self,
@@ -487,13 +761,19 @@ class AsyncVoicesResource(AsyncAPIResource):
     """
     if not id:
       raise ValueError(f"Expected a non-empty value for `id` but received {id!r}")
-    return await self._delete(
+    response = await self._delete(
       f"/v1/ai/voice/{id}",
       options=make_request_options(
-        extra_headers=extra_headers, extra_query=extra_query, extra_body=extra_body, timeout=timeout
+        extra_headers=extra_headers,
+        extra_query=extra_query,
+        extra_body=extra_body,
+        timeout=timeout,
+        post_parser=voice_change_parser(self._client, id),
       ),
       cast_to=VoiceDeleteResponse,
     )
+    invalidate_cached_voices(self._client, id)
+    return response
 
   async def list(
     self,
@@ -523,6 +803,11 @@ class AsyncVoicesResource(AsyncAPIResource):
 
       timeout: Override the client-level default timeout for this request, in seconds
     """
+    cache = voice_cache_for(self._client, extra_headers, extra_query, extra_body)
+    if cache is not None:
+      return await cache.aget(
+        self._client, ("list", owner, starred), self.list, owner=owner, starred=starred, timeout=timeout
+      )
     return await self._get(
       "/v1/ai/voice/list",
       options=make_request_options(
@@ -541,6 +826,176 @@ class AsyncVoicesResource(AsyncAPIResource):
       cast_to=VoiceListResponse,
     )
 
+  async def retrieve_many(
+    self,
+    ids: Iterable[str],
+    *,
+    concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+    on_progress: BatchProgressHook | None = None,
+    timeout: float | httpx.Timeout | None | NotGiven = not_given,
+  ) -> List[BatchResult[Voice]]:
+    """
+    Retrieves many voices concurrently, at most `concurrency` at a time.
+
+    Every voice has its own `BatchResult`, in the order they were given, with either the response
+    or the error raised for it, so that one failure doesn't stop the others. The requests are
+    retried like any other, and are throttled by the client's `rate_limiter` if it has one.
+
+    Args:
+      ids: The IDs of the voices to retrieve.
+
+      concurrency: The maximum number of requests in flight at once.
+
+      on_progress: Called with the `BatchProgress` of the batch after every voice.
+
+      timeout: Override the client-level default timeout for each request, in seconds
+    """
+    return await async_run_batch_by_id(
+      self.retrieve, ids, concurrency=concurrency, on_progress=on_progress, timeout=timeout
+    )
+
+  async def update_many(
+    self,
+    updates: Mapping[str, VoiceUpdateParams],
+    *,
+    concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+    on_progress: BatchProgressHook | None = None,
+    timeout: float | httpx.Timeout | None | NotGiven = not_given,
+  ) -> List[BatchResult[VoiceUpdateResponse]]:
+    """
+    Updates many voices concurrently, at most `concurrency` at a time.
+
+    Every voice has its own `BatchResult`, in the order they were given, with either the response
+    or the error raised for it, so that one failure doesn't stop the others. The requests are
+    retried like any other, and are throttled by the client's `rate_limiter` if it has one.
+
+    Args:
+      updates: The fields to update for each voice, by the ID of the voice, e.g.
+          `{"voice-id": {"tags": ["narration"]}}`.
+
+      concurrency: The maximum number of requests in flight at once.
+
+      on_progress: Called with the `BatchProgress` of the batch after every voice.
+
+      timeout: Override the client-level default timeout for each request, in seconds
+    """
+    return await async_run_batch_by_id_with_params(
+      self.update, updates, concurrency=concurrency, on_progress=on_progress, timeout=timeout
+    )
+
+  async def delete_many(
+    self,
+    ids: Iterable[str],
+    *,
+    concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+    on_progress: BatchProgressHook | None = None,
+    timeout: float | httpx.Timeout | None | NotGiven = not_given,
+  ) -> List[BatchResult[VoiceDeleteResponse]]:
+    """
+    Deletes many voices concurrently, at most `concurrency` at a time.
+
+    Every voice has its own `BatchResult`, in the order they were given, with either the response
+    or the error raised for it, so that one failure doesn't stop the others. The requests are
+    retried like any other, and are throttled by the client's `rate_limiter` if it has one.
+
+    Args:
+      ids: The IDs of the voices to delete.
+
+      concurrency: The maximum number of requests in flight at once.
+
+      on_progress: Called with the `BatchProgress` of the batch after every voice.
+
+      timeout: Override the client-level default timeout for each request, in seconds
+    """
+    return await async_run_batch_by_id(
+      self.delete, ids, concurrency=concurrency, on_progress=on_progress, timeout=timeout
+    )
+
+  def wait_until_ready(
+    self,
+    ids: Iterable[str],
+    *,
+    timeout: float | None = DEFAULT_WAIT_TIMEOUT,
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+    max_poll_interval: float = DEFAULT_MAX_POLL_INTERVAL,
+    list_threshold: int = DEFAULT_LIST_THRESHOLD,
+  ) -> AsyncIterator[Voice]:
+    """
+    Waits for voices to finish training, yielding each voice as soon as it is `ready`.
+
+    The voices are polled with exponential backoff and jitter, starting `poll_interval` seconds
+    apart and backing off to `max_poll_interval`. While at least `list_threshold` voices are
+    pending, each poll is a single `voices.list(owner="me")` rather than a request per voice.
+
+    ```py
+    async for voice in client.voices.wait_until_ready(ids, timeout=300):
+        print(f"{voice.name} is ready")
+    ```
+
+    Args:
+      ids: The IDs of the voices to wait for.
+
+      timeout: The number of seconds to wait for all of the voices, or `None` to wait indefinitely.
+          `VoiceNotReadyError` is raised if some voices still aren't ready by then.
+
+      poll_interval: The number of seconds between the first polls.
+
+      max_poll_interval: The longest number of seconds between polls.
+
+      list_threshold: The number of pending voices from which they're polled by listing them.
+    """
+    return async_wait_until_ready(
+      self,
+      ids,
+      timeout=timeout,
+      poll_interval=poll_interval,
+      max_poll_interval=max_poll_interval,
+      list_threshold=list_threshold,
+    )
+
+  async def fetch_previews(
+    self,
+    voices: Iterable[Voice],
+    *,
+    cache: PreviewCache | None = None,
+    concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+    on_progress: BatchProgressHook | None = None,
+    timeout: float | httpx.Timeout | None | NotGiven = not_given,
+  ) -> List[BatchResult[VoicePreview]]:
+    """
+    Downloads the `preview_url` clips of many voices concurrently.
+
+    The previews are requested through the client's connection pool, without the API key or any
+    other of the client's headers, since they are served from other hosts than the API. Every
+    voice has its own `BatchResult`, in the order they were given, with either the `VoicePreview`
+    or the error raised for it.
+
+    With a `cache`, the previews are streamed into files in its directory and the previews that
+    are already cached aren't downloaded again, so warming the cache for a whole catalog of voices
+    only fetches the previews that are new or changed. Without one, they are read into memory.
+
+    ```py
+    cache = PreviewCache("~/.cache/lmnt/previews")
+    for result in await client.voices.fetch_previews(await client.voices.list(owner="all"), cache=cache):
+        if result.value is not None:
+            print(result.id, result.value.path)
+    ```
+
+    Args:
+      voices: The voices whose previews to fetch, e.g. from `voices.list()`.
+
+      cache: The `PreviewCache` to store the previews in, and to serve them from.
+
+      concurrency: The maximum number of downloads in flight at once.
+
+      on_progress: Called with the `BatchProgress` of the batch after every voice.
+
+      timeout: Override the client-level default timeout for each download, in seconds
+    """
+    return await async_fetch_previews(
+      self._client, voices, cache=cache, concurrency=concurrency, on_progress=on_progress, timeout=timeout
+    )
+
 
 class VoicesResourceWithRawResponse:
   def __init__(self, voices: VoicesResource) -> None:
@@ -8,7 +8,7 @@ from typing import Any, List, Union, AsyncIterator
 import pytest
 import websockets
 
-from lmnt import AsyncLmnt
+from lmnt import Metrics, AsyncLmnt, EndpointPool
 from lmnt.resources.sessions import (
   SpeechSession,
   SpeechSessionAudio,
@@ -231,3 +231,61 @@ class TestAsyncSessions:
     assert isinstance(only, SpeechSessionError)
     assert only.type == "error"
     assert only.request_id == "request_id-value"
+
+  @pytest.mark.asyncio
+  async def test_endpoint_pool_failover(self, monkeypatch: pytest.MonkeyPatch) -> None:
+    """With an `EndpointPool` a session that can't connect to one endpoint fails over to the next."""
+    fake = _FakeWebSocket([])
+    attempted: List[str] = []
+
+    async def _connect(url: str) -> _FakeWebSocket:
+      attempted.append(url)
+      if url.startswith("wss://eu."):
+        raise ConnectionRefusedError("refused")
+      return fake
+
+    monkeypatch.setattr("lmnt.resources.sessions.websockets.connect", _connect)
+
+    pool = EndpointPool(["https://eu.lmnt.test", "https://us.lmnt.test"])
+    client = AsyncLmnt(api_key="test-api-key", endpoint_pool=pool)
+    for _ in range(2):
+      session = await client.speech.sessions.create(voice="voice-id")
+      assert session.url == "wss://us.lmnt.test/v1/ai/speech/stream"
+
+    # `eu` is only attempted once as it is ejected afterwards
+    assert attempted.count("wss://eu.lmnt.test/v1/ai/speech/stream") <= 1
+    assert attempted.count("wss://us.lmnt.test/v1/ai/speech/stream") == 2
+    assert len(fake.sent) == 2
+
+  @pytest.mark.asyncio
+  async def test_endpoint_pool_all_unreachable(self, monkeypatch: pytest.MonkeyPatch) -> None:
+    async def _connect(_url: str) -> _FakeWebSocket:
+      raise ConnectionRefusedError("refused")
+
+    monkeypatch.setattr("lmnt.resources.sessions.websockets.connect", _connect)
+
+    pool = EndpointPool(["https://eu.lmnt.test", "https://us.lmnt.test"])
+    client = AsyncLmnt(api_key="test-api-key", endpoint_pool=pool)
+    with pytest.raises(ConnectionRefusedError):
+      await client.speech.sessions.create(voice="voice-id")
+
+    assert not any(endpoint.healthy for endpoint in pool.endpoints)
+
+  @pytest.mark.asyncio
+  async def test_metrics(self, fake_connect: Any) -> None:
+    """With `metrics` a session records its connection, the text sent and the audio received."""
+    fake_connect([b"\x00\x01", b"\x02"])
+
+    metrics = Metrics()
+    client = AsyncLmnt(api_key="test-api-key", metrics=metrics)
+    session = await client.speech.sessions.create(voice="voice-id")
+    await session.send_text("hello")
+    await _drain(session)
+
+    endpoint = "WEBSOCKET /v1/ai/speech/stream"
+    assert metrics.sessions.value(voice="voice-id") == 1
+    assert metrics.session_connect_duration.sample(voice="voice-id").count == 1
+    assert metrics.characters.value(endpoint=endpoint, voice="voice-id") == 5
+    assert metrics.bytes_received.value(endpoint=endpoint, voice="voice-id") == 3
+    # only the first audio after the text is timed
+    assert metrics.session_time_to_first_audio.sample(voice="voice-id").count == 1
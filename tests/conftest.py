@@ -10,9 +10,18 @@ import httpx
 import pytest
 from pytest_asyncio import is_async_test
 
+import lmnt._usage
+import lmnt._endpoints
+import lmnt._rate_limit
+import lmnt._voice_wait
+import lmnt._voice_cache
+import lmnt._retry_budget
+import lmnt._circuit_breaker
 from lmnt import Lmnt, AsyncLmnt, DefaultAioHttpClient
 from lmnt._utils import is_dict
 
+from .fakes import FakeTime
+
 if TYPE_CHECKING:
     from _pytest.fixtures import FixtureRequest  # pyright: ignore[reportPrivateImportUsage]
 
@@ -82,3 +91,20 @@ async def async_client(request: FixtureRequest) -> AsyncIterator[AsyncLmnt]:
         base_url=base_url, api_key=api_key, _strict_response_validation=strict, http_client=http_client
     ) as client:
         yield client
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeTime:
+    """Replaces the clock of the client's time-based components, e.g. the rate limiter, with a `FakeTime`."""
+    fake = FakeTime()
+    for module in (
+        lmnt._usage,
+        lmnt._endpoints,
+        lmnt._rate_limit,
+        lmnt._voice_wait,
+        lmnt._voice_cache,
+        lmnt._retry_budget,
+        lmnt._circuit_breaker,
+    ):
+        monkeypatch.setattr(module, "time", fake)
+    return fake
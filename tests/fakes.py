@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import os
+from typing import Any, List, Callable
+
+import httpx
+
+from lmnt import Lmnt, AsyncLmnt
+
+base_url = os.environ.get("TEST_API_BASE_URL", "http://127.0.0.1:4010")
+api_key = "My API Key"
+
+
+class FakeTime:
+    """Stands in for the `time` module of the client's time-based components, see the `clock` fixture.
+
+    The clock only moves when `now` is changed or when `sleep()` is called, which returns straight away.
+    """
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+        self.sleeps: List[float] = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def mock_client(handler: Callable[[httpx.Request], httpx.Response], **options: Any) -> Lmnt:
+    """Returns a client whose requests are answered by `handler`, instead of being sent."""
+    return Lmnt(
+        base_url=base_url, api_key=api_key, http_client=httpx.Client(transport=httpx.MockTransport(handler)), **options
+    )
+
+
+def async_mock_client(handler: Callable[[httpx.Request], httpx.Response], **options: Any) -> AsyncLmnt:
+    """Returns an async client whose requests are answered by `handler`, instead of being sent."""
+    return AsyncLmnt(
+        base_url=base_url,
+        api_key=api_key,
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        **options,
+    )
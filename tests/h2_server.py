@@ -0,0 +1,191 @@
+"""A local stand-in for the speech API that speaks either cleartext HTTP/2 or HTTP/1.1.
+
+Every response streams back the request body repeated `repeat` times, split into `chunks`
+DATA frames / writes, after an artificial time-to-first-byte of `ttfb` seconds. It keeps count
+of the connections it accepted so tests and benchmarks can check how requests were pooled.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Any, Dict, List, Optional
+from typing_extensions import Literal
+
+
+class LocalAudioServer:
+    def __init__(
+        self,
+        *,
+        protocol: Literal["h2", "http/1.1"] = "h2",
+        ttfb: float = 0.0,
+        chunks: int = 4,
+        repeat: int = 1,
+        chunk_delay: float = 0.0,
+    ) -> None:
+        self.protocol = protocol
+        self.ttfb = ttfb
+        self.chunks = chunks
+        self.repeat = repeat
+        self.chunk_delay = chunk_delay
+        self.connections = 0
+        self.max_concurrent_streams = 0
+        self.port = 0
+        self._active_streams = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def __enter__(self) -> LocalAudioServer:
+        started = threading.Event()
+
+        def run() -> None:
+            loop = asyncio.new_event_loop()
+            self._loop = loop
+            handler = self._handle_h2 if self.protocol == "h2" else self._handle_http1
+            self._server = loop.run_until_complete(asyncio.start_server(handler, "127.0.0.1", 0))
+            self.port = self._server.sockets[0].getsockname()[1]
+            started.set()
+            loop.run_forever()
+            loop.close()
+
+        self._thread = threading.Thread(target=run, daemon=True)
+        self._thread.start()
+        started.wait()
+        return self
+
+    def __exit__(self, *_args: Any) -> None:
+        loop = self._loop
+        assert loop is not None and self._server is not None and self._thread is not None
+
+        async def stop() -> None:
+            assert self._server is not None
+            self._server.close()
+            for task in asyncio.all_tasks():
+                if task is not asyncio.current_task():
+                    task.cancel()
+
+        asyncio.run_coroutine_threadsafe(stop(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        self._thread.join()
+
+    def _body_chunks(self, request_body: bytes) -> List[bytes]:
+        body = request_body * self.repeat
+        size = max(1, -(-len(body) // self.chunks))
+        return [body[i : i + size] for i in range(0, len(body), size)]
+
+    def _stream_started(self) -> None:
+        self._active_streams += 1
+        self.max_concurrent_streams = max(self.max_concurrent_streams, self._active_streams)
+
+    async def _handle_http1(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                headers = dict(line.split(": ", 1) for line in head.decode("latin-1").split("\r\n")[1:] if ": " in line)
+                length = int({k.lower(): v for k, v in headers.items()}.get("content-length", "0"))
+                request_body = await reader.readexactly(length)
+
+                self._stream_started()
+                try:
+                    await asyncio.sleep(self.ttfb)
+                    chunks = self._body_chunks(request_body)
+                    writer.write(
+                        b"HTTP/1.1 200 OK\r\ncontent-type: application/octet-stream\r\n"
+                        + f"content-length: {sum(len(c) for c in chunks)}\r\n\r\n".encode()
+                    )
+                    for chunk in chunks:
+                        writer.write(chunk)
+                        await writer.drain()
+                        await asyncio.sleep(self.chunk_delay)
+                finally:
+                    self._active_streams -= 1
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _handle_h2(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        # imported here so that the HTTP/1.1 mode can be used without `h2` installed
+        import h2.config
+        import h2.events
+        import h2.settings
+        import h2.connection
+
+        self.connections += 1
+        conn = h2.connection.H2Connection(config=h2.config.H2Configuration(client_side=False))
+        conn.initiate_connection()
+        conn.update_settings({h2.settings.SettingCodes.MAX_CONCURRENT_STREAMS: 1000})
+        writer.write(conn.data_to_send())
+
+        bodies: Dict[int, bytearray] = {}
+        window_updated = asyncio.Event()
+        tasks: List[asyncio.Task[None]] = []
+
+        async def respond(stream_id: int, request_body: bytes) -> None:
+            self._stream_started()
+            try:
+                await asyncio.sleep(self.ttfb)
+                chunks = self._body_chunks(request_body)
+                conn.send_headers(
+                    stream_id,
+                    [(":status", "200"), ("content-type", "application/octet-stream")],
+                )
+                writer.write(conn.data_to_send())
+                for i, chunk in enumerate(chunks):
+                    await send_data(stream_id, chunk, end_stream=i == len(chunks) - 1)
+                    await asyncio.sleep(self.chunk_delay)
+                if not chunks:
+                    conn.end_stream(stream_id)
+                    writer.write(conn.data_to_send())
+            finally:
+                self._active_streams -= 1
+
+        async def send_data(stream_id: int, data: bytes, *, end_stream: bool) -> None:
+            while True:
+                window = min(conn.local_flow_control_window(stream_id), conn.max_outbound_frame_size)
+                if window >= len(data):
+                    conn.send_data(stream_id, data, end_stream=end_stream)
+                    writer.write(conn.data_to_send())
+                    await writer.drain()
+                    return
+                if window > 0:
+                    conn.send_data(stream_id, data[:window])
+                    writer.write(conn.data_to_send())
+                    data = data[window:]
+                window_updated.clear()
+                await window_updated.wait()
+
+        try:
+            while True:
+                data = await reader.read(65536)
+                if not data:
+                    break
+
+                for event in conn.receive_data(data):
+                    if isinstance(event, h2.events.RequestReceived):
+                        bodies[event.stream_id] = bytearray()
+                    elif isinstance(event, h2.events.DataReceived):
+                        bodies[event.stream_id] += event.data
+                        conn.acknowledge_received_data(event.flow_controlled_length, event.stream_id)
+                    elif isinstance(event, h2.events.StreamEnded):
+                        body = bytes(bodies.pop(event.stream_id, b""))
+                        tasks.append(asyncio.ensure_future(respond(event.stream_id, body)))
+                    elif isinstance(event, h2.events.WindowUpdated):
+                        window_updated.set()
+                    elif isinstance(event, h2.events.ConnectionTerminated):
+                        return
+
+                writer.write(conn.data_to_send())
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            writer.close()
@@ -0,0 +1,134 @@
+import struct
+from typing import List, Iterable
+
+import pytest
+
+from lmnt._audio import AudioAligner, iter_aligned_audio, make_audio_aligner
+
+# MPEG-1 Layer III, 128kbps, 44.1kHz, no padding => 417 byte frames of 1152 samples
+MP3_FRAME_HEADER = b"\xff\xfb\x90\x00"
+MP3_FRAME_LENGTH = 417
+MP3_FRAME = MP3_FRAME_HEADER + b"\x00" * (MP3_FRAME_LENGTH - 4)
+
+
+def wav_header(*, sample_rate: int = 24000, bits_per_sample: int = 16) -> bytes:
+    block_align = bits_per_sample // 8
+    fmt = struct.pack(
+        "<HHIIHH",
+        1 if bits_per_sample == 16 else 7,
+        1,
+        sample_rate,
+        sample_rate * block_align,
+        block_align,
+        bits_per_sample,
+    )
+    return (
+        b"RIFF"
+        + struct.pack("<I", 0xFFFFFFFF)
+        + b"WAVE"
+        + b"fmt "
+        + struct.pack("<I", len(fmt))
+        + fmt
+        + b"data"
+        + struct.pack("<I", 0xFFFFFFFF)
+    )
+
+
+def split(data: bytes, size: int) -> List[bytes]:
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+def run(chunks: Iterable[bytes], aligner: AudioAligner) -> List[bytes]:
+    return list(iter_aligned_audio(chunks, aligner))
+
+
+@pytest.mark.parametrize("format,width", [("pcm_s16le", 2), ("pcm_f32le", 4)])
+def test_pcm_sample_aligned(format: str, width: int) -> None:
+    data = bytes(range(256)) * 4
+    chunks = run(split(data, 7), make_audio_aligner(format=format))
+
+    assert b"".join(chunks) == data
+    assert all(len(chunk) % width == 0 for chunk in chunks)
+
+
+def test_pcm_drops_trailing_partial_sample() -> None:
+    chunks = run([b"\x00" * 5], make_audio_aligner(format="pcm_f32le"))
+    assert chunks == [b"\x00" * 4]
+
+
+def test_pcm_fixed_duration() -> None:
+    # 10ms at 16kHz = 160 samples = 640 bytes
+    data = b"\x01" * (640 * 3 + 100)
+    chunks = run(split(data, 333), make_audio_aligner(format="pcm_f32le", sample_rate=16000, duration=0.01))
+
+    assert [len(chunk) for chunk in chunks] == [640, 640, 640, 100]
+
+
+@pytest.mark.parametrize(
+    "format,bits_per_sample,expected",
+    [
+        # 100ms at 8kHz = 800 samples, with the trailing odd byte dropped for 16-bit audio
+        ("wav", 16, [1600, 400]),
+        ("ulaw", 8, [800, 800, 401]),
+    ],
+)
+def test_wav_header_emitted_separately(format: str, bits_per_sample: int, expected: List[int]) -> None:
+    header = wav_header(sample_rate=8000, bits_per_sample=bits_per_sample)
+    samples = b"\x02" * 2001
+    chunks = run(split(header + samples, 5), make_audio_aligner(format=format, duration=0.1))
+
+    assert chunks[0] == header
+    assert [len(chunk) for chunk in chunks[1:]] == expected
+
+
+def test_wav_skips_extra_chunks_before_data() -> None:
+    header = wav_header()
+    extra = b"LIST" + struct.pack("<I", 3) + b"abc\x00"
+    header = header[:36] + extra + header[36:]
+    chunks = run([header + b"\x00" * 6], make_audio_aligner(format="wav"))
+
+    assert chunks == [header, b"\x00" * 6]
+
+
+def test_wav_invalid_header() -> None:
+    with pytest.raises(ValueError, match="RIFF"):
+        run([b"not a wav file"], make_audio_aligner(format="wav"))
+
+
+def test_mp3_frame_aligned() -> None:
+    data = MP3_FRAME * 5
+    chunks = run(split(data, 100), make_audio_aligner(format="mp3"))
+
+    assert chunks == [MP3_FRAME] * 5
+
+
+def test_mp3_id3_tag_and_padding() -> None:
+    id3 = b"ID3\x04\x00\x00\x00\x00\x00\x05" + b"\x00" * 5
+    padded = b"\xff\xfb\x92\x00" + b"\x00" * (MP3_FRAME_LENGTH + 1 - 4)
+    chunks = run(split(id3 + padded + MP3_FRAME, 64), make_audio_aligner(format="mp3"))
+
+    assert chunks == [id3, padded, MP3_FRAME]
+
+
+def test_mp3_passes_through_junk() -> None:
+    chunks = run([b"junk" + MP3_FRAME + MP3_FRAME[:10]], make_audio_aligner(format="mp3"))
+
+    assert chunks == [b"junk" + MP3_FRAME, MP3_FRAME[:10]]
+
+
+def test_mp3_fixed_duration() -> None:
+    # each frame is ~26.1ms so 3 frames are needed to cover 60ms
+    chunks = run([MP3_FRAME * 7], make_audio_aligner(format="mp3", duration=0.06))
+
+    assert chunks == [MP3_FRAME * 3, MP3_FRAME * 3, MP3_FRAME]
+
+
+@pytest.mark.parametrize("format", ["aac", "webm"])
+def test_unsupported_formats(format: str) -> None:
+    with pytest.raises(ValueError, match=format):
+        make_audio_aligner(format=format)
+
+
+def test_invalid_duration() -> None:
+    with pytest.raises(ValueError, match="duration"):
+        make_audio_aligner(format="mp3", duration=0)
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import time
+import threading
+from typing import Dict, List
+from unittest import mock
+
+import httpx
+import pytest
+
+from lmnt import BatchProgress, NotFoundError
+from lmnt.types import VoiceUpdateParams
+
+from .fakes import mock_client, async_mock_client
+
+
+class VoiceAPI:
+    """Answers after `delay` seconds, with a `404` for voices named `missing-*`, and tracks the requests in flight."""
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            voice_id = request.url.path.rsplit("/", 1)[-1]
+            if voice_id.startswith("missing"):
+                return httpx.Response(404, json={"error": "Voice not found"})
+            voice = {"id": voice_id, "name": voice_id, "owner": "me", "state": "ready"}
+            if request.method == "PUT":
+                return httpx.Response(200, json={"voice": {**voice, "tags": ["migrated"]}})
+            if request.method == "DELETE":
+                return httpx.Response(200, json={"success": True})
+            return httpx.Response(200, json=voice)
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+
+def test_retrieve_many() -> None:
+    client = mock_client(VoiceAPI(), max_retries=0)
+    ids = ["a", "missing-b", "c"]
+
+    results = client.voices.retrieve_many(ids)
+
+    assert [result.id for result in results] == ids
+    assert [result.ok for result in results] == [True, False, True]
+    assert results[0].value is not None and results[0].value.id == "a"
+    assert isinstance(results[1].error, NotFoundError)
+    assert results[1].value is None
+
+
+def test_update_many_is_concurrent() -> None:
+    api = VoiceAPI(delay=0.05)
+    client = mock_client(api, max_retries=0)
+    updates: Dict[str, VoiceUpdateParams] = {f"voice-{i}": {"tags": ["migrated"]} for i in range(12)}
+
+    results = client.voices.update_many(updates, concurrency=4)
+
+    assert all(result.ok for result in results)
+    assert [result.value.voice.tags for result in results if result.value] == [["migrated"]] * 12
+    assert api.max_in_flight == 4
+
+
+def test_delete_many_progress() -> None:
+    client = mock_client(VoiceAPI(), max_retries=0)
+    progress: List[BatchProgress] = []
+
+    client.voices.delete_many(["a", "missing-b", "c", "d"], concurrency=2, on_progress=progress.append)
+
+    assert [p.completed for p in progress] == [1, 2, 3, 4]
+    assert progress[-1].failed == 1
+    assert progress[-1].succeeded == 3
+    assert progress[-1].fraction == 1.0
+
+
+def test_shares_the_rate_limiter() -> None:
+    client = mock_client(VoiceAPI(), max_retries=0)
+
+    with mock.patch.object(client, "_rate_limiter") as limiter:
+        client.voices.retrieve_many(["a", "b", "c"])
+
+    assert limiter.acquire.call_count == 3
+
+
+def test_concurrency_must_be_positive() -> None:
+    client = mock_client(VoiceAPI(), max_retries=0)
+    with pytest.raises(ValueError, match="concurrency"):
+        client.voices.delete_many(["a"], concurrency=0)
+
+
+async def test_async_update_many() -> None:
+    api = VoiceAPI()
+    client = async_mock_client(api, max_retries=0)
+    progress: List[BatchProgress] = []
+
+    results = await client.voices.update_many(
+        {"a": {"name": "A"}, "missing-b": {"name": "B"}}, concurrency=1, on_progress=progress.append
+    )
+
+    assert [result.ok for result in results] == [True, False]
+    assert len(progress) == 2
+
+    retrieved = await client.voices.retrieve_many(["x", "y"])
+    assert [result.value.id for result in retrieved if result.value] == ["x", "y"]
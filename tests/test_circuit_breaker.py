@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+from typing import List, Tuple
+
+import pytest
+
+from lmnt import CircuitBreaker
+from lmnt._circuit_breaker import endpoint_key
+
+from .fakes import FakeTime
+
+ENDPOINT = "POST /v1/ai/speech/bytes"
+
+
+def make_breaker(**kwargs: object) -> Tuple[CircuitBreaker, List[Tuple[str, str, str]]]:
+    changes: List[Tuple[str, str, str]] = []
+    breaker = CircuitBreaker(on_state_change=lambda *change: changes.append(change), **kwargs)  # type: ignore[arg-type]
+    return breaker, changes
+
+
+def call(breaker: CircuitBreaker, *, failed: bool = False, duration: float = 0.1) -> bool:
+    if breaker.acquire(ENDPOINT) is not None:
+        return False
+    breaker.record(ENDPOINT, failed=failed, duration=duration)
+    return True
+
+
+@pytest.mark.usefixtures("clock")
+def test_opens_on_failure_rate() -> None:
+    breaker, changes = make_breaker(minimum_calls=4, failure_rate_threshold=0.5)
+
+    assert call(breaker, failed=True)
+    assert call(breaker)
+    assert call(breaker)
+    assert breaker.state(ENDPOINT) == "closed"
+
+    # 2 out of 4 calls failed
+    assert call(breaker, failed=True)
+    assert breaker.state(ENDPOINT) == "open"
+    assert changes == [(ENDPOINT, "closed", "open")]
+    assert not call(breaker)
+
+
+@pytest.mark.usefixtures("clock")
+def test_opens_on_slow_call_rate() -> None:
+    breaker, _ = make_breaker(minimum_calls=2, slow_call_duration=1.0, slow_call_rate_threshold=1.0)
+
+    assert call(breaker, duration=2.0)
+    assert call(breaker, duration=0.5)
+    assert breaker.state(ENDPOINT) == "closed"
+
+    breaker, _ = make_breaker(minimum_calls=2, slow_call_duration=1.0, slow_call_rate_threshold=1.0)
+    assert call(breaker, duration=2.0)
+    assert call(breaker, duration=1.5)
+    assert breaker.state(ENDPOINT) == "open"
+
+
+def test_window_forgets_old_calls(clock: FakeTime) -> None:
+    breaker, _ = make_breaker(minimum_calls=2, window=10.0)
+
+    assert call(breaker, failed=True)
+    clock.now += 11
+    assert call(breaker, failed=True)
+    assert breaker.state(ENDPOINT) == "closed"
+
+
+def test_half_open_closes_after_successful_trials(clock: FakeTime) -> None:
+    breaker, changes = make_breaker(minimum_calls=1, open_duration=5.0, half_open_max_calls=2)
+    assert call(breaker, failed=True)
+
+    retry_after = breaker.acquire(ENDPOINT)
+    assert retry_after == pytest.approx(5.0)
+
+    clock.now += 5
+    assert breaker.acquire(ENDPOINT) is None
+    assert breaker.acquire(ENDPOINT) is None
+    # only `half_open_max_calls` trials are let through at once
+    assert breaker.acquire(ENDPOINT) is not None
+
+    breaker.record(ENDPOINT, failed=False, duration=0.1)
+    breaker.record(ENDPOINT, failed=False, duration=0.1)
+    assert breaker.state(ENDPOINT) == "closed"
+    assert changes == [
+        (ENDPOINT, "closed", "open"),
+        (ENDPOINT, "open", "half_open"),
+        (ENDPOINT, "half_open", "closed"),
+    ]
+
+
+def test_half_open_reopens_on_failure(clock: FakeTime) -> None:
+    breaker, changes = make_breaker(minimum_calls=1, open_duration=5.0)
+    assert call(breaker, failed=True)
+
+    clock.now += 5
+    assert call(breaker, failed=True)
+    assert breaker.state(ENDPOINT) == "open"
+    assert changes[-1] == (ENDPOINT, "half_open", "open")
+
+    # the open duration starts over
+    clock.now += 4
+    assert breaker.state(ENDPOINT) == "open"
+
+
+def test_lost_trials_expire(clock: FakeTime) -> None:
+    breaker, _ = make_breaker(minimum_calls=1, open_duration=5.0)
+    assert call(breaker, failed=True)
+
+    clock.now += 5
+    # a trial that is let through but never reports back, e.g. because it was cancelled
+    assert breaker.acquire(ENDPOINT) is None
+    assert breaker.acquire(ENDPOINT) is not None
+
+    clock.now += 5
+    assert breaker.acquire(ENDPOINT) is None
+
+
+@pytest.mark.usefixtures("clock")
+def test_reset() -> None:
+    breaker, changes = make_breaker(minimum_calls=1)
+    assert call(breaker, failed=True)
+
+    breaker.reset()
+    assert breaker.states() == {}
+    assert changes[-1] == (ENDPOINT, "open", "closed")
+
+
+@pytest.mark.usefixtures("clock")
+def test_hook_errors_are_logged() -> None:
+    def hook(*_args: object) -> None:
+        raise RuntimeError("boom")
+
+    breaker = CircuitBreaker(minimum_calls=1, on_state_change=hook)
+    assert call(breaker, failed=True)
+    assert breaker.state(ENDPOINT) == "open"
+
+
+def test_endpoint_key() -> None:
+    assert endpoint_key("get", "/v1/ai/voice/list") == "GET /v1/ai/voice/list"
+    assert endpoint_key("delete", "/v1/ai/voice/123e4567-e89b-12d3-a456-426614174000") == "DELETE /v1/ai/voice/{id}"
+    assert endpoint_key("put", "/v1/ai/voice/voice_8f2a?x=1") == "PUT /v1/ai/voice/{id}"
+    # the IDs of the system voices are names
+    assert (
+        endpoint_key("get", "/v1/ai/voice/leah") == endpoint_key("get", "/v1/ai/voice/lily") == "GET /v1/ai/voice/{id}"
+    )
+    assert endpoint_key("post", "/v1/ai/voice") == "POST /v1/ai/voice"
+    # a base URL with a path is kept, and paths that aren't routes of the API are used as they are
+    assert endpoint_key("post", "/lmnt/v1/ai/speech/bytes") == "POST /lmnt/v1/ai/speech/bytes"
+    assert endpoint_key("get", "/v2/ai/voice/leah") == "GET /v2/ai/voice/leah"
+
+    breaker = CircuitBreaker(endpoint_key=lambda method, _url: method)
+    assert breaker.endpoint("GET", "/v1/account") == "GET"
+
+
+@pytest.mark.parametrize("kwargs", [{"failure_rate_threshold": 0}, {"minimum_calls": 0}, {"half_open_max_calls": 0}])
+def test_invalid_options(kwargs: dict[str, float]) -> None:
+    with pytest.raises(ValueError):
+        CircuitBreaker(**kwargs)  # type: ignore[arg-type]
@@ -6,10 +6,11 @@ import gc
 import os
 import sys
 import json
+import time
 import asyncio
 import inspect
 import tracemalloc
-from typing import Any, Union, cast
+from typing import Any, Union, Sequence, cast
 from unittest import mock
 from typing_extensions import Literal
 
@@ -18,11 +19,21 @@ import pytest
 from respx import MockRouter
 from pydantic import ValidationError
 
-from lmnt import Lmnt, AsyncLmnt, APIResponseValidationError
+from lmnt import (
+    Lmnt,
+    AsyncLmnt,
+    RateLimiter,
+    RetryBudget,
+    EndpointPool,
+    CircuitBreaker,
+    TransferMetrics,
+    CircuitOpenError,
+    APIResponseValidationError,
+)
 from lmnt._types import Omit
 from lmnt._utils import asyncify
 from lmnt._models import BaseModel, FinalRequestOptions
-from lmnt._exceptions import APIStatusError, APITimeoutError, APIResponseValidationError
+from lmnt._exceptions import APIStatusError, APITimeoutError, APIConnectionError, APIResponseValidationError
 from lmnt._base_client import (
     DEFAULT_TIMEOUT,
     HTTPX_DEFAULT_TIMEOUT,
@@ -50,6 +61,11 @@ def _low_retry_timeout(*_args: Any, **_kwargs: Any) -> float:
     return 0.1
 
 
+def _first(candidates: Sequence[Any]) -> Any:
+    # makes `EndpointPool.pick()` deterministic, picking the first of equally good endpoints
+    return candidates[0]
+
+
 def _get_open_connections(client: Lmnt | AsyncLmnt) -> int:
     transport = client._client._transport
     assert isinstance(transport, httpx.HTTPTransport) or isinstance(transport, httpx.AsyncHTTPTransport)
@@ -328,6 +344,19 @@ class TestLmnt:
         assert request.headers.get("x-foo") == "stainless"
         assert request.headers.get("x-stainless-lang") == "my-overriding-header"
 
+    def test_prepared_headers_are_not_shared(self) -> None:
+        client = Lmnt(base_url=base_url, api_key=api_key, _strict_response_validation=True)
+        request = client._build_request(FinalRequestOptions(method="get", url="/foo", headers={"X-Foo": "bar"}))
+        request.headers["X-Mutated"] = "true"
+        assert request.headers.get("x-foo") == "bar"
+
+        request = client._build_request(FinalRequestOptions(method="get", url="/foo", headers={"X-Foo": "bar"}))
+        assert "x-mutated" not in request.headers
+
+        client.api_key = "another key"
+        request = client._build_request(FinalRequestOptions(method="get", url="/foo", headers={"X-Foo": "bar"}))
+        assert request.headers.get("x-api-key") == "another key"
+
     def test_default_query_option(self) -> None:
         client = Lmnt(
             base_url=base_url, api_key=api_key, _strict_response_validation=True, default_query={"query_param": "bar"}
@@ -532,10 +561,14 @@ class TestLmnt:
     def test_base_url_setter(self) -> None:
         client = Lmnt(base_url="https://example.com/from_init", api_key=api_key, _strict_response_validation=True)
         assert client.base_url == "https://example.com/from_init/"
+        request = client._build_request(FinalRequestOptions(method="get", url="/foo"))
+        assert request.url == "https://example.com/from_init/foo"
 
         client.base_url = "https://example.com/from_setter"  # type: ignore[assignment]
 
         assert client.base_url == "https://example.com/from_setter/"
+        request = client._build_request(FinalRequestOptions(method="get", url="/foo"))
+        assert request.url == "https://example.com/from_setter/foo"
 
     def test_base_url_env(self) -> None:
         with update_env(LMNT_BASE_URL="http://localhost:5000/from/env"):
@@ -791,6 +824,267 @@ class TestLmnt:
 
         assert response.http_request.headers.get("x-stainless-retry-count") == "42"
 
+    @mock.patch("lmnt._base_client.BaseClient._calculate_retry_timeout", _low_retry_timeout)
+    @pytest.mark.respx(base_url=base_url)
+    def test_transfer_metrics(self, respx_mock: MockRouter) -> None:
+        recorded: list[TransferMetrics] = []
+        client = Lmnt(
+            base_url=base_url,
+            api_key=api_key,
+            _strict_response_validation=True,
+            on_transfer_metrics=recorded.append,
+        )
+
+        nb_retries = 0
+
+        def retry_handler(_request: httpx.Request) -> httpx.Response:
+            nonlocal nb_retries
+            if nb_retries < 1:
+                nb_retries += 1
+                return httpx.Response(500)
+            return httpx.Response(200, content=b"\x00" * 4096)
+
+        respx_mock.post("/v1/ai/speech/bytes").mock(side_effect=retry_handler)
+
+        with client.speech.with_streaming_response.generate(text="hello world.", voice="leah") as response:
+            metrics = response.transfer_metrics
+            assert metrics is not None
+            assert metrics.headers_received_at is not None
+            assert metrics.first_chunk_at is None
+            assert recorded == []
+
+            assert b"".join(response.iter_bytes(1024)) == b"\x00" * 4096
+
+        assert recorded == [metrics]
+        assert metrics.attempts == 2
+        assert metrics.retries_taken == 1
+        assert metrics.status_code == 200
+        assert metrics.bytes_received == 4096
+        assert metrics.time_to_first_byte is not None
+        assert metrics.time_to_first_chunk is not None
+        assert metrics.total_time is not None
+        assert metrics.time_to_first_byte <= metrics.time_to_first_chunk <= metrics.total_time
+
+    @pytest.mark.respx(base_url=base_url)
+    def test_transfer_metrics_non_streaming(self, respx_mock: MockRouter) -> None:
+        recorded: list[TransferMetrics] = []
+        client = Lmnt(
+            base_url=base_url,
+            api_key=api_key,
+            _strict_response_validation=True,
+            on_transfer_metrics=recorded.append,
+        )
+        respx_mock.post("/v1/ai/speech/bytes").mock(return_value=httpx.Response(200, content=b"audio"))
+
+        response = client.speech.with_raw_response.generate(text="hello world.", voice="leah")
+
+        assert response.read() == b"audio"
+        assert len(recorded) == 1
+        assert recorded[0] is response.transfer_metrics
+        assert recorded[0].bytes_received == 5
+        assert recorded[0].is_complete
+
+    @pytest.mark.respx(base_url=base_url)
+    def test_transfer_metrics_not_recorded_without_consumers(self, respx_mock: MockRouter) -> None:
+        client = Lmnt(base_url=base_url, api_key=api_key, _strict_response_validation=True)
+        respx_mock.post("/v1/ai/speech/bytes").mock(return_value=httpx.Response(200, content=b"audio"))
+
+        with mock.patch.object(client._client, "send", wraps=client._client.send) as send:
+            response = client.speech.with_raw_response.generate(text="hello world.", voice="leah")
+
+        assert response.read() == b"audio"
+        assert response.transfer_metrics is None
+        # without metering, httpx reads the body itself
+        assert send.call_args.kwargs["stream"] is False
+
+    @mock.patch("lmnt._base_client.BaseClient._calculate_retry_timeout", _low_retry_timeout)
+    @pytest.mark.respx(base_url=base_url)
+    def test_rate_limiter(self, respx_mock: MockRouter) -> None:
+        rate_limiter = RateLimiter(requests_per_second=100, characters_per_second=10_000)
+        client = Lmnt(base_url=base_url, api_key=api_key, _strict_response_validation=True, rate_limiter=rate_limiter)
+        assert client.with_options(max_retries=1)._rate_limiter is rate_limiter
+
+        respx_mock.post("/v1/ai/speech/bytes").mock(
+            side_effect=[httpx.Response(429, headers={"retry-after-ms": "1"}), httpx.Response(200, content=b"audio")]
+        )
+
+        with mock.patch.object(rate_limiter, "acquire", wraps=rate_limiter.acquire) as acquire:
+            response = client.speech.with_raw_response.generate(text="hello world.", voice="leah")
+
+        assert response.retries_taken == 1
+        assert acquire.call_count == 2
+        acquire.assert_called_with(characters=len("hello world."), deadline_at=None)
+        # halved by the 429, then recovered a step by the successful retry
+        assert rate_limiter.requests_per_second == pytest.approx(55)
+
+    @pytest.mark.respx(base_url=base_url)
+    def test_rate_limiter_deadline(self, respx_mock: MockRouter) -> None:
+        rate_limiter = RateLimiter(requests_per_second=1, request_burst=1)
+        client = Lmnt(
+            base_url=base_url,
+            api_key=api_key,
+            _strict_response_validation=True,
+            rate_limiter=rate_limiter,
+            deadline=0.5,
+        )
+        route = respx_mock.post("/v1/ai/speech/bytes").mock(return_value=httpx.Response(200, content=b"audio"))
+
+        client.speech.with_raw_response.generate(text="hello world.", voice="leah")
+        # the next request would have to wait for a second, past its deadline, so it fails without waiting
+        with pytest.raises(APITimeoutError):
+            client.speech.with_raw_response.generate(text="hello world.", voice="leah")
+
+        assert route.call_count == 1
+
+    def test_deadline_shrinks_retry_timeout(self) -> None:
+        client = Lmnt(base_url=base_url, api_key=api_key, _strict_response_validation=True)
+
+        options = FinalRequestOptions(method="get", url="/foo", max_retries=3)
+        assert 0.375 <= client._calculate_retry_timeout(3, options) <= 0.5
+
+        calculated = client._calculate_retry_timeout(3, options, deadline_at=time.monotonic() + 0.4)
+        assert 0.15 < calculated <= 0.2
+
+        assert client._calculate_retry_timeout(3, options, deadline_at=time.monotonic() - 1) == 0
+
+    def test_deadline_honours_retry_after(self) -> None:
+        client = Lmnt(base_url=base_url, api_key=api_key, _strict_response_validation=True)
+
+        headers = httpx.Headers({"retry-after": "3"})
+        options = FinalRequestOptions(method="get", url="/foo", max_retries=3)
+        # the API's `Retry-After` isn't shortened by the deadline
+        assert client._calculate_retry_timeout(3, options, headers, deadline_at=time.monotonic() + 4) == 3
+        assert client._acquire_retry(time.monotonic() + 4, headers)
+        # but if it is past the deadline the request isn't retried at all
+        assert not client._acquire_retry(time.monotonic() + 2, headers)
+        assert client._acquire_retry(None, headers)
+
+    @pytest.mark.respx(base_url=base_url)
+    def test_deadline(self, respx_mock: MockRouter) -> None:
+        client = Lmnt(base_url=base_url, api_key=api_key, _strict_response_validation=True, timeout=60, deadline=5)
+        assert client.with_options(max_retries=1).deadline == 5
+        assert client.with_options(deadline=None).deadline is None
+
+        timeouts: list[dict[str, float]] = []
+
+        retry_after = ["30"]
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            timeouts.append(request.extensions["timeout"])
+            return httpx.Response(429, headers={"retry-after": retry_after[0]})
+
+        respx_mock.post("/v1/ai/speech/bytes").mock(side_effect=handler)
+
+        # the API asks for a 30s backoff, past the deadline, so the request isn't retried
+        with pytest.raises(APIStatusError):
+            client.with_options(deadline=0.2).speech.generate(text="hello world.", voice="leah")
+        assert len(timeouts) == 1
+
+        # every attempt, and the backoff between them, has to fit in 0.2s
+        timeouts.clear()
+        retry_after[0] = "0"
+        with pytest.raises(APIStatusError):
+            client.with_options(deadline=0.2).speech.generate(text="hello world.", voice="leah")
+
+        assert len(timeouts) == 3
+        assert all(timeout["read"] <= 0.2 for timeout in timeouts)
+        assert timeouts[0]["read"] > timeouts[1]["read"] > timeouts[2]["read"]
+
+        # the per-attempt timeout is used as is if it is shorter
+        timeouts.clear()
+        with pytest.raises(APIStatusError):
+            client.with_options(max_retries=0).speech.generate(text="hello world.", voice="leah")
+        assert 4 < timeouts[0]["read"] <= 5
+
+        timeouts.clear()
+        with pytest.raises(APIStatusError):
+            client.with_options(max_retries=0, deadline=None).speech.generate(text="hello world.", voice="leah")
+        assert timeouts[0]["read"] == 60
+
+    @mock.patch("lmnt._base_client.BaseClient._calculate_retry_timeout", _low_retry_timeout)
+    @pytest.mark.respx(base_url=base_url)
+    def test_retry_budget(self, respx_mock: MockRouter) -> None:
+        budget = RetryBudget(ratio=0.5, min_retries_per_second=0, max_tokens=1)
+        client = Lmnt(base_url=base_url, api_key=api_key, _strict_response_validation=True, retry_budget=budget)
+        assert client.with_options(max_retries=1)._retry_budget is budget
+
+        route = respx_mock.post("/v1/ai/speech/bytes").mock(return_value=httpx.Response(500))
+
+        # the saved up retry is spent on the first request's second attempt
+        with pytest.raises(APIStatusError):
+            client.speech.generate(text="hello world.", voice="leah")
+        assert route.call_count == 2
+        assert budget.retries_allowed == 1
+        assert budget.retries_rejected == 1
+
+        # which leaves only half a retry, so the next request fails after its first attempt
+        with pytest.raises(APIStatusError):
+            client.speech.generate(text="hello world.", voice="leah")
+        assert route.call_count == 3
+        assert budget.retries_rejected == 2
+        assert budget.remaining == pytest.approx(0.5)
+
+    @mock.patch("lmnt._base_client.BaseClient._calculate_retry_timeout", _low_retry_timeout)
+    @pytest.mark.respx(base_url=base_url)
+    def test_circuit_breaker(self, respx_mock: MockRouter) -> None:
+        changes: list[tuple[str, str, str]] = []
+        breaker = CircuitBreaker(
+            minimum_calls=2, on_state_change=lambda endpoint, old, new: changes.append((endpoint, old, new))
+        )
+        client = Lmnt(base_url=base_url, api_key=api_key, _strict_response_validation=True, circuit_breaker=breaker)
+        assert client.with_options(max_retries=1)._circuit_breaker is breaker
+
+        route = respx_mock.post("/v1/ai/speech/bytes").mock(return_value=httpx.Response(500))
+        respx_mock.get("/v1/account").mock(return_value=httpx.Response(200, json={}))
+
+        # the circuit opens after the second failed attempt, so the last retry fails fast
+        with pytest.raises(CircuitOpenError) as exc_info:
+            client.speech.generate(text="hello world.", voice="leah")
+
+        assert route.call_count == 2
+        assert exc_info.value.endpoint == "POST /v1/ai/speech/bytes"
+        assert exc_info.value.retry_after > 0
+        assert changes == [("POST /v1/ai/speech/bytes", "closed", "open")]
+
+        with pytest.raises(CircuitOpenError):
+            client.speech.generate(text="hello world.", voice="leah")
+        assert route.call_count == 2
+
+        # other endpoints have their own circuit
+        client.accounts.with_raw_response.retrieve()
+        assert breaker.states() == {"POST /v1/ai/speech/bytes": "open", "GET /v1/account": "closed"}
+
+    @mock.patch("random.choice", _first)
+    @pytest.mark.respx()
+    def test_endpoint_pool(self, respx_mock: MockRouter) -> None:
+        pool = EndpointPool(["http://eu.lmnt.test/", "http://us.lmnt.test/"], strategy="least_outstanding")
+        client = Lmnt(api_key=api_key, _strict_response_validation=True, endpoint_pool=pool)
+        assert client.base_url == "http://eu.lmnt.test/"
+        assert client.with_options(max_retries=1)._endpoint_pool is pool
+
+        eu = respx_mock.post("http://eu.lmnt.test/v1/ai/speech/bytes").mock(side_effect=httpx.ConnectError("refused"))
+        us = respx_mock.post("http://us.lmnt.test/v1/ai/speech/bytes").mock(return_value=httpx.Response(200))
+
+        # the unreachable endpoint is tried first, and the request fails over to the other one
+        response = client.speech.with_raw_response.generate(text="hello world.", voice="leah")
+        assert response.http_request.url == "http://us.lmnt.test/v1/ai/speech/bytes"
+        assert eu.call_count == 1
+        assert us.call_count == 1
+
+        # the unreachable endpoint is skipped while it is ejected
+        for _ in range(2):
+            response = client.speech.with_raw_response.generate(text="hello world.", voice="leah")
+            assert response.http_request.url == "http://us.lmnt.test/v1/ai/speech/bytes"
+        assert eu.call_count == 1
+        assert us.call_count == 3
+
+        eu_endpoint, us_endpoint = pool.endpoints
+        assert not eu_endpoint.healthy
+        assert eu_endpoint.consecutive_failures == 1
+        assert us_endpoint.healthy
+        assert us_endpoint.latency is not None
+        assert us_endpoint.outstanding == 0
+
     def test_proxy_environment_variables(self, monkeypatch: pytest.MonkeyPatch) -> None:
         # Test that the proxy environment variables are set correctly
         monkeypatch.setenv("HTTPS_PROXY", "https://example.org")
@@ -1121,6 +1415,19 @@ class TestAsyncLmnt:
         assert request.headers.get("x-foo") == "stainless"
         assert request.headers.get("x-stainless-lang") == "my-overriding-header"
 
+    def test_prepared_headers_are_not_shared(self) -> None:
+        client = AsyncLmnt(base_url=base_url, api_key=api_key, _strict_response_validation=True)
+        request = client._build_request(FinalRequestOptions(method="get", url="/foo", headers={"X-Foo": "bar"}))
+        request.headers["X-Mutated"] = "true"
+        assert request.headers.get("x-foo") == "bar"
+
+        request = client._build_request(FinalRequestOptions(method="get", url="/foo", headers={"X-Foo": "bar"}))
+        assert "x-mutated" not in request.headers
+
+        client.api_key = "another key"
+        request = client._build_request(FinalRequestOptions(method="get", url="/foo", headers={"X-Foo": "bar"}))
+        assert request.headers.get("x-api-key") == "another key"
+
     def test_default_query_option(self) -> None:
         client = AsyncLmnt(
             base_url=base_url, api_key=api_key, _strict_response_validation=True, default_query={"query_param": "bar"}
@@ -1325,10 +1632,14 @@ class TestAsyncLmnt:
     def test_base_url_setter(self) -> None:
         client = AsyncLmnt(base_url="https://example.com/from_init", api_key=api_key, _strict_response_validation=True)
         assert client.base_url == "https://example.com/from_init/"
+        request = client._build_request(FinalRequestOptions(method="get", url="/foo"))
+        assert request.url == "https://example.com/from_init/foo"
 
         client.base_url = "https://example.com/from_setter"  # type: ignore[assignment]
 
         assert client.base_url == "https://example.com/from_setter/"
+        request = client._build_request(FinalRequestOptions(method="get", url="/foo"))
+        assert request.url == "https://example.com/from_setter/foo"
 
     def test_base_url_env(self) -> None:
         with update_env(LMNT_BASE_URL="http://localhost:5000/from/env"):
@@ -1593,6 +1904,124 @@ class TestAsyncLmnt:
 
         assert response.http_request.headers.get("x-stainless-retry-count") == "42"
 
+    @mock.patch("lmnt._base_client.BaseClient._calculate_retry_timeout", _low_retry_timeout)
+    @pytest.mark.respx(base_url=base_url)
+    async def test_transfer_metrics(self, respx_mock: MockRouter) -> None:
+        recorded: list[TransferMetrics] = []
+        client = AsyncLmnt(
+            base_url=base_url,
+            api_key=api_key,
+            _strict_response_validation=True,
+            on_transfer_metrics=recorded.append,
+        )
+
+        nb_retries = 0
+
+        def retry_handler(_request: httpx.Request) -> httpx.Response:
+            nonlocal nb_retries
+            if nb_retries < 1:
+                nb_retries += 1
+                return httpx.Response(500)
+            return httpx.Response(200, content=b"\x00" * 4096)
+
+        respx_mock.post("/v1/ai/speech/bytes").mock(side_effect=retry_handler)
+
+        async with client.speech.with_streaming_response.generate(text="hello world.", voice="leah") as response:
+            metrics = response.transfer_metrics
+            assert metrics is not None
+            assert recorded == []
+
+            chunks = [chunk async for chunk in response.iter_bytes(1024)]
+            assert b"".join(chunks) == b"\x00" * 4096
+
+        assert recorded == [metrics]
+        assert metrics.attempts == 2
+        assert metrics.bytes_received == 4096
+        assert metrics.time_to_first_byte is not None
+        assert metrics.time_to_first_chunk is not None
+        assert metrics.transfer_rate is None or metrics.transfer_rate > 0
+
+    @pytest.mark.respx(base_url=base_url)
+    async def test_transfer_metrics_not_recorded_without_consumers(self, respx_mock: MockRouter) -> None:
+        client = AsyncLmnt(base_url=base_url, api_key=api_key, _strict_response_validation=True)
+        respx_mock.post("/v1/ai/speech/bytes").mock(return_value=httpx.Response(200, content=b"audio"))
+
+        with mock.patch.object(client._client, "send", wraps=client._client.send) as send:
+            response = await client.speech.with_raw_response.generate(text="hello world.", voice="leah")
+
+        assert await response.read() == b"audio"
+        assert response.transfer_metrics is None
+        assert send.call_args.kwargs["stream"] is False
+
+    @pytest.mark.respx(base_url=base_url)
+    async def test_deadline(self, respx_mock: MockRouter) -> None:
+        client = AsyncLmnt(base_url=base_url, api_key=api_key, _strict_response_validation=True, deadline=0.2)
+
+        async def handler(_request: httpx.Request) -> httpx.Response:
+            await asyncio.sleep(0.15)
+            return httpx.Response(500)
+
+        route = respx_mock.post("/v1/ai/speech/bytes").mock(side_effect=handler)
+
+        # the deadline passes while the second attempt is in flight so no further retry is made
+        with pytest.raises(APIStatusError):
+            await client.speech.generate(text="hello world.", voice="leah")
+        assert route.call_count == 2
+
+        assert make_request_options(deadline=1.5) == {"deadline": 1.5}
+        options = FinalRequestOptions.construct(method="post", url="/foo", **make_request_options(deadline=None))
+        assert options.get_deadline(client.deadline) is None
+
+    @mock.patch("lmnt._base_client.BaseClient._calculate_retry_timeout", _low_retry_timeout)
+    @pytest.mark.respx(base_url=base_url)
+    async def test_retry_budget(self, respx_mock: MockRouter) -> None:
+        budget = RetryBudget(ratio=0.1, min_retries_per_second=0, max_tokens=1)
+        client = AsyncLmnt(base_url=base_url, api_key=api_key, _strict_response_validation=True, retry_budget=budget)
+
+        route = respx_mock.post("/v1/ai/speech/bytes").mock(side_effect=httpx.ConnectError("refused"))
+
+        with pytest.raises(APIConnectionError):
+            await client.speech.generate(text="hello world.", voice="leah")
+
+        assert route.call_count == 2
+        assert budget.retries_allowed == 1
+        assert budget.remaining == pytest.approx(0)
+
+    @mock.patch("lmnt._base_client.BaseClient._calculate_retry_timeout", _low_retry_timeout)
+    @pytest.mark.respx(base_url=base_url)
+    async def test_circuit_breaker(self, respx_mock: MockRouter) -> None:
+        breaker = CircuitBreaker(minimum_calls=2)
+        client = AsyncLmnt(
+            base_url=base_url, api_key=api_key, _strict_response_validation=True, circuit_breaker=breaker
+        )
+
+        route = respx_mock.post("/v1/ai/speech/bytes").mock(side_effect=httpx.ConnectError("refused"))
+
+        with pytest.raises(CircuitOpenError):
+            await client.speech.generate(text="hello world.", voice="leah")
+
+        assert route.call_count == 2
+        assert breaker.state("POST /v1/ai/speech/bytes") == "open"
+
+    @mock.patch("random.choice", _first)
+    @mock.patch("lmnt._base_client.BaseClient._calculate_retry_timeout", _low_retry_timeout)
+    @pytest.mark.respx()
+    async def test_endpoint_pool(self, respx_mock: MockRouter) -> None:
+        pool = EndpointPool(["http://eu.lmnt.test", "http://us.lmnt.test"])
+        client = AsyncLmnt(api_key=api_key, _strict_response_validation=True, endpoint_pool=pool)
+
+        eu = respx_mock.post("http://eu.lmnt.test/v1/ai/speech/bytes").mock(return_value=httpx.Response(502))
+        us = respx_mock.post("http://us.lmnt.test/v1/ai/speech/bytes").mock(return_value=httpx.Response(200))
+
+        # the first request goes to `eu`, whose gateway error ejects it, so it and the rest go to `us`
+        for _ in range(3):
+            response = await client.speech.with_raw_response.generate(text="hello world.", voice="leah")
+            assert response.http_request.url.host == "us.lmnt.test"
+
+        assert eu.call_count == 1
+        assert us.call_count == 3
+        assert [endpoint.healthy for endpoint in pool.endpoints] == [False, True]
+
     async def test_get_platform(self) -> None:
         platform = await asyncify(get_platform)()
         assert isinstance(platform, (str, OtherPlatform))
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import pytest
+
+from lmnt import EndpointPool
+
+from .fakes import FakeTime
+
+
+def test_normalises_base_urls() -> None:
+    pool = EndpointPool(["https://eu.lmnt.test", "https://us.lmnt.test/proxy"])
+
+    assert [endpoint.url.raw_path for endpoint in pool.endpoints] == [b"/", b"/proxy/"]
+
+
+@pytest.mark.usefixtures("clock")
+def test_ewma_prefers_faster_endpoint() -> None:
+    pool = EndpointPool(["https://a.test", "https://b.test"], latency_smoothing=0.5)
+    a, b = pool.endpoints
+
+    for endpoint, latency in ((a, 0.1), (b, 0.3)):
+        pool.start(endpoint)
+        pool.finish(endpoint, failed=False, latency=latency)
+    assert pool.pick() is a
+
+    # 0.1 * 3 outstanding requests costs more than 0.3 * 1
+    pool.start(a)
+    pool.start(a)
+    assert pool.pick() is b
+
+    pool.finish(a, failed=False, latency=0.5)
+    assert a.latency == pytest.approx(0.3)
+    assert a.outstanding == 1
+
+
+@pytest.mark.usefixtures("clock")
+def test_ewma_tries_endpoints_without_latency_first() -> None:
+    pool = EndpointPool(["https://a.test", "https://b.test"])
+    a, b = pool.endpoints
+
+    pool.start(a)
+    pool.finish(a, failed=False, latency=0.05)
+
+    assert pool.pick() is b
+
+
+@pytest.mark.usefixtures("clock")
+def test_least_outstanding() -> None:
+    pool = EndpointPool(["https://a.test", "https://b.test", "https://c.test"], strategy="least_outstanding")
+    a, b, c = pool.endpoints
+
+    pool.start(a)
+    pool.start(b)
+    assert pool.pick() is c
+
+    pool.start(c)
+    pool.start(c)
+    pool.finish(a, failed=False, latency=10)
+    assert pool.pick() is a
+
+
+def test_ejection(clock: FakeTime) -> None:
+    pool = EndpointPool(["https://a.test", "https://b.test"], ejection_duration=10, max_ejection_duration=30)
+    a, b = pool.endpoints
+
+    pool.start(a)
+    pool.finish(a, failed=True)
+    assert not a.healthy
+    assert pool.pick() is b
+    assert not pool.has_healthy(exclude=[b])
+
+    clock.now += 10
+    assert a.healthy
+
+    # the ejection doubles with every consecutive failure, up to the maximum
+    for expected in (20, 30):
+        pool.start(a)
+        pool.finish(a, failed=True)
+        assert a.ejected_until == clock.now + expected
+
+    # a cancelled attempt doesn't change anything but a successful one does
+    pool.start(a)
+    pool.finish(a, failed=False)
+    assert a.consecutive_failures == 3
+
+    pool.start(a)
+    pool.finish(a, failed=False, latency=0.1)
+    assert a.healthy
+    assert a.consecutive_failures == 0
+
+
+def test_all_endpoints_ejected(clock: FakeTime) -> None:
+    pool = EndpointPool(["https://a.test", "https://b.test"])
+    a, b = pool.endpoints
+
+    pool.finish(b, failed=True)
+    clock.now += 1
+    pool.finish(a, failed=True)
+
+    # the endpoint that recovers first is used rather than failing the request
+    assert pool.pick() is b
+    assert pool.pick(exclude=[b]) is a
+    assert pool.pick(exclude=[a, b]) is b
+
+
+@pytest.mark.usefixtures("clock")
+def test_exclude() -> None:
+    pool = EndpointPool(["https://a.test", "https://b.test"])
+    a, b = pool.endpoints
+
+    assert pool.pick(exclude=[a]) is b
+    assert pool.pick(exclude=[b]) is a
+    assert pool.has_healthy(exclude=[a])
+
+
+def test_invalid_arguments() -> None:
+    with pytest.raises(ValueError, match="base URL"):
+        EndpointPool([])
+    with pytest.raises(ValueError, match="strategy"):
+        EndpointPool(["https://a.test"], strategy="round_robin")  # type: ignore[arg-type]
+    with pytest.raises(ValueError, match="latency_smoothing"):
+        EndpointPool(["https://a.test"], latency_smoothing=0)
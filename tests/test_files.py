@@ -1,10 +1,13 @@
+import os
+from typing import Iterable, cast
 from pathlib import Path
 
 import anyio
+import httpx
 import pytest
-from dirty_equals import IsDict, IsList, IsBytes, IsTuple
+from dirty_equals import IsDict, IsList, IsTuple, IsInstance
 
-from lmnt._files import to_httpx_files, async_to_httpx_files
+from lmnt._files import PathFile, to_httpx_files, async_to_httpx_files
 
 readme_path = Path(__file__).parent.parent.joinpath("README.md")
 
@@ -12,34 +15,34 @@ readme_path = Path(__file__).parent.parent.joinpath("README.md")
 def test_pathlib_includes_file_name() -> None:
     result = to_httpx_files({"file": readme_path})
     print(result)
-    assert result == IsDict({"file": IsTuple("README.md", IsBytes())})
+    assert result == IsDict({"file": IsTuple("README.md", IsInstance(PathFile))})
 
 
 def test_tuple_input() -> None:
     result = to_httpx_files([("file", readme_path)])
     print(result)
-    assert result == IsList(IsTuple("file", IsTuple("README.md", IsBytes())))
+    assert result == IsList(IsTuple("file", IsTuple("README.md", IsInstance(PathFile))))
 
 
 @pytest.mark.asyncio
 async def test_async_pathlib_includes_file_name() -> None:
     result = await async_to_httpx_files({"file": readme_path})
     print(result)
-    assert result == IsDict({"file": IsTuple("README.md", IsBytes())})
+    assert result == IsDict({"file": IsTuple("README.md", IsInstance(PathFile))})
 
 
 @pytest.mark.asyncio
 async def test_async_supports_anyio_path() -> None:
     result = await async_to_httpx_files({"file": anyio.Path(readme_path)})
     print(result)
-    assert result == IsDict({"file": IsTuple("README.md", IsBytes())})
+    assert result == IsDict({"file": IsTuple("README.md", IsInstance(PathFile))})
 
 
 @pytest.mark.asyncio
 async def test_async_tuple_input() -> None:
     result = await async_to_httpx_files([("file", readme_path)])
     print(result)
-    assert result == IsList(IsTuple("file", IsTuple("README.md", IsBytes())))
+    assert result == IsList(IsTuple("file", IsTuple("README.md", IsInstance(PathFile))))
 
 
 def test_string_not_allowed() -> None:
@@ -49,3 +52,40 @@ def test_string_not_allowed() -> None:
                 "file": "foo",  # type: ignore
             }
         )
+
+
+def test_path_file_is_streamed(tmp_path: Path) -> None:
+    path = tmp_path.joinpath("voice.wav")
+    data = os.urandom(200 * 1024)
+    path.write_bytes(data)
+
+    files = to_httpx_files({"file": path})
+    file = files["file"][1]  # type: ignore[index]
+    # nothing is opened until the body is sent
+    assert isinstance(file, PathFile) and file._file is None
+
+    request = httpx.Request("POST", "https://example.com", files=files)
+    assert int(request.headers["Content-Length"]) > len(data)
+    assert "Transfer-Encoding" not in request.headers
+
+    # the body can be sent again, e.g. for a retry, and the file is closed afterwards
+    for _ in range(2):
+        chunks = list(cast(Iterable[bytes], request.stream))
+        assert len(chunks) > 2
+        assert data in b"".join(chunks)
+        assert file._file is None
+
+
+def test_path_file_seek(tmp_path: Path) -> None:
+    path = tmp_path.joinpath("voice.wav")
+    path.write_bytes(b"0123456789")
+
+    with PathFile(path) as file:
+        assert file.seek(0, os.SEEK_END) == 10
+        assert file.seek(4) == 4
+        assert file.read(3) == b"456"
+        assert file.tell() == 7
+        assert file.read() == b"789"
+        assert file.read() == b""
+        file.seek(-2, os.SEEK_END)
+        assert file.read() == b"89"
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import os
+import logging
+from typing import Any, List, Tuple
+from unittest import mock
+
+import httpx
+import pytest
+from respx import MockRouter
+
+from lmnt import Lmnt, AsyncLmnt, HookRegistry, RequestEvent, APIConnectionError
+
+from .h2_server import LocalAudioServer
+
+base_url = os.environ.get("TEST_API_BASE_URL", "http://127.0.0.1:4010")
+api_key = "My API Key"
+
+
+def _low_retry_timeout(*_args: Any, **_kwargs: Any) -> float:
+    return 0.1
+
+
+def record(registry: HookRegistry) -> List[RequestEvent]:
+    events: List[RequestEvent] = []
+    for event in ("request", "attempt", "retry", "response", "complete", "error"):
+        registry.on(event, events.append)  # type: ignore[arg-type]
+    return events
+
+
+def test_phase_timings() -> None:
+    with LocalAudioServer(protocol="http/1.1") as server:
+        with Lmnt(base_url=server.base_url, api_key=api_key) as client:
+            events = record(client.hooks)
+
+            client.speech.generate(text="hello", voice="leah")
+            assert [event.event for event in events] == ["request", "attempt", "response", "complete"]
+
+            timing = events[-1].timing
+            assert events[0].request is None
+            assert events[1].request is not None and events[1].request.url.path == "/v1/ai/speech/bytes"
+            assert events[2].response is not None and events[2].response.status_code == 200
+            assert timing.attempts == 1
+            assert timing.retries_taken == 0
+            assert not timing.connection_reused
+            assert timing.connect_time is not None and timing.connect_time >= 0
+            # plain HTTP so there is no handshake
+            assert timing.tls_time is None
+            assert timing.time_to_headers is not None
+            assert timing.time_to_first_byte is not None and timing.time_to_first_byte >= timing.time_to_headers
+            assert timing.total_time is not None and timing.total_time >= timing.time_to_first_byte
+
+            # the second call re-uses the pooled connection
+            events.clear()
+            client.speech.generate(text="hello", voice="leah")
+            timing = events[-1].timing
+            assert timing.connection_reused
+            assert timing.connect_time is None
+            assert timing.time_to_headers is not None
+
+
+async def test_async_phase_timings() -> None:
+    with LocalAudioServer(protocol="http/1.1") as server:
+        async with AsyncLmnt(base_url=server.base_url, api_key=api_key) as client:
+            events = record(client.hooks)
+
+            await client.speech.generate(text="hello", voice="leah")
+
+            assert [event.event for event in events] == ["request", "attempt", "response", "complete"]
+            timing = events[-1].timing
+            assert timing.connect_time is not None
+            assert timing.time_to_headers is not None
+            assert timing.total_time is not None
+
+
+@mock.patch("lmnt._base_client.BaseClient._calculate_retry_timeout", _low_retry_timeout)
+@pytest.mark.respx(base_url=base_url)
+def test_retry_events(respx_mock: MockRouter) -> None:
+    client = Lmnt(base_url=base_url, api_key=api_key)
+    events = record(client.hooks)
+
+    respx_mock.post("/v1/ai/speech/bytes").mock(side_effect=[httpx.Response(500), httpx.Response(200, content=b"ok")])
+    client.speech.generate(text="hello", voice="leah")
+
+    assert [event.event for event in events] == [
+        "request",
+        "attempt",
+        "response",
+        # the body of the failed attempt is read to check whether it should be retried
+        "complete",
+        "retry",
+        "attempt",
+        "response",
+        "complete",
+    ]
+    retry = events[4]
+    assert isinstance(retry.error, httpx.HTTPStatusError)
+    assert retry.response is not None and retry.response.status_code == 500
+    assert events[-1].retries_taken == 1
+    assert events[-1].response is not None and events[-1].response.status_code == 200
+
+
+@pytest.mark.respx(base_url=base_url)
+async def test_error_event(respx_mock: MockRouter) -> None:
+    client = AsyncLmnt(base_url=base_url, api_key=api_key, max_retries=0)
+    events = record(client.hooks)
+
+    respx_mock.post("/v1/ai/speech/bytes").mock(side_effect=httpx.ConnectError("refused"))
+    with pytest.raises(APIConnectionError):
+        await client.speech.generate(text="hello", voice="leah")
+
+    assert [event.event for event in events] == ["request", "attempt", "error"]
+    assert isinstance(events[-1].error, APIConnectionError)
+
+
+@pytest.mark.respx(base_url=base_url)
+def test_no_tracing_without_hooks(respx_mock: MockRouter) -> None:
+    client = Lmnt(base_url=base_url, api_key=api_key)
+    route = respx_mock.post("/v1/ai/speech/bytes").mock(return_value=httpx.Response(200))
+
+    client.speech.generate(text="hello", voice="leah")
+    assert "trace" not in route.calls.last.request.extensions
+
+    hook = client.hooks.on("complete", lambda _event: None)
+    client.speech.generate(text="hello", voice="leah")
+    assert "trace" in route.calls.last.request.extensions
+
+    client.hooks.off("complete", hook)
+    assert not client.hooks.active
+
+
+@pytest.mark.respx(base_url=base_url)
+def test_hook_errors_are_logged(respx_mock: MockRouter, caplog: pytest.LogCaptureFixture) -> None:
+    client = Lmnt(base_url=base_url, api_key=api_key)
+    respx_mock.post("/v1/ai/speech/bytes").mock(return_value=httpx.Response(200))
+
+    def hook(_event: RequestEvent) -> None:
+        raise RuntimeError("oops")
+
+    client.hooks.on("response", hook)
+    with caplog.at_level(logging.WARNING, logger="lmnt._hooks"):
+        client.speech.generate(text="hello", voice="leah")
+
+    assert "Exception raised in 'response' request hook" in caplog.text
+
+
+def test_registry() -> None:
+    registry = HookRegistry()
+    assert not registry.active
+
+    calls: List[Tuple[str, str]] = []
+    first = registry.on("attempt", lambda event: calls.append(("first", event.event)))
+    registry.on("attempt", lambda event: calls.append(("second", event.event)))
+    assert registry.active
+
+    with pytest.raises(ValueError, match="Unknown hook event"):
+        registry.on("sent", lambda _event: None)  # type: ignore[arg-type]
+
+    registry.off("attempt", first)
+    registry.off("retry", first)
+    assert registry.active
+    registry.clear()
+    assert not registry.active
+
+    # copies share the registry of the client they were created from
+    client = Lmnt(base_url=base_url, api_key=api_key, hooks=registry)
+    assert client.hooks is registry
+    assert client.with_options(timeout=1).hooks is registry
+    assert client.copy(hooks=HookRegistry()).hooks is not registry
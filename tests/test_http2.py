@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import os
+import sys
+import asyncio
+from typing import List
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+
+from lmnt import Lmnt, AsyncLmnt, DefaultHttpxClient, DefaultAsyncHttpxClient
+from lmnt._constants import DEFAULT_HTTP2_CONNECTION_LIMITS
+
+pytest.importorskip("h2")
+
+from .h2_server import LocalAudioServer  # noqa: E402
+
+api_key = "My API Key"
+base_url = os.environ.get("TEST_API_BASE_URL", "http://127.0.0.1:4010")
+
+
+def _pool(client: httpx.Client | httpx.AsyncClient) -> object:
+    return client._transport._pool  # type: ignore[union-attr]
+
+
+def test_http2_option() -> None:
+    client = Lmnt(base_url=base_url, api_key=api_key, http2=True)
+    pool = _pool(client._client)
+
+    assert pool._http2  # type: ignore[attr-defined]
+    assert pool._max_connections == DEFAULT_HTTP2_CONNECTION_LIMITS.max_connections  # type: ignore[attr-defined]
+
+    # copies share the connection pool unless they ask for a different protocol
+    assert client.with_options(timeout=10)._client is client._client
+    http1 = client.with_options(http2=False)
+    assert http1._client is not client._client
+    assert not _pool(http1._client)._http2  # type: ignore[attr-defined]
+
+
+def test_http2_requires_extra(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setitem(sys.modules, "h2", None)
+
+    with pytest.raises(RuntimeError, match="`http2` extra"):
+        Lmnt(base_url=base_url, api_key=api_key, http2=True)
+
+
+def test_streaming_responses_multiplex() -> None:
+    with LocalAudioServer(ttfb=0.2, chunks=8, repeat=50) as server:
+        # the stand-in is cleartext, so HTTP/2 has to be used with prior knowledge
+        client = Lmnt(
+            base_url=server.base_url,
+            api_key=api_key,
+            http_client=DefaultHttpxClient(base_url=server.base_url, http1=False, http2=True),
+        )
+
+        def generate(i: int) -> bytes:
+            with client.speech.with_streaming_response.generate(text=f"request {i}", voice="leah") as response:
+                assert response.http_response.http_version == "HTTP/2"
+                return b"".join(response.iter_bytes())
+
+        with ThreadPoolExecutor(max_workers=20) as pool:
+            results = list(pool.map(generate, range(20)))
+
+        client.close()
+
+    for i, audio in enumerate(results):
+        assert audio.count(f'"request {i}"'.encode()) == 50
+    # requests that start together may race to open the first connections, but most are multiplexed onto them
+    assert server.connections <= 3
+    assert server.max_concurrent_streams > 1
+
+
+async def test_async_streaming_responses_multiplex() -> None:
+    with LocalAudioServer(ttfb=0.2, chunks=8, repeat=50) as server:
+        client = AsyncLmnt(
+            base_url=server.base_url,
+            api_key=api_key,
+            http_client=DefaultAsyncHttpxClient(base_url=server.base_url, http1=False, http2=True),
+        )
+
+        async def generate(i: int) -> bytes:
+            async with client.speech.with_streaming_response.generate(text=f"request {i}", voice="leah") as response:
+                chunks: List[bytes] = [chunk async for chunk in response.iter_bytes()]
+                return b"".join(chunks)
+
+        results = await asyncio.gather(*[generate(i) for i in range(50)])
+        await client.close()
+
+    for i, audio in enumerate(results):
+        assert audio.count(f'"request {i}"'.encode()) == 50
+    # requests that start together may race to open the first connections, but most are multiplexed onto them
+    assert server.connections <= 3
+    assert server.max_concurrent_streams > 1
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import os
+from typing import Any, Dict, List, Tuple
+from unittest import mock
+
+import httpx
+import pytest
+from respx import MockRouter
+
+from lmnt import Lmnt, Counter, Metrics, AsyncLmnt, Histogram, HookRegistry, APIStatusError
+
+base_url = os.environ.get("TEST_API_BASE_URL", "http://127.0.0.1:4010")
+api_key = "My API Key"
+
+SPEECH = "POST /v1/ai/speech/bytes"
+
+
+def _low_retry_timeout(*_args: Any, **_kwargs: Any) -> float:
+    return 0.1
+
+
+def test_counter() -> None:
+    counter = Counter("things_total", "Things.", ["kind"])
+    counter.inc(kind="a")
+    counter.inc(2, kind="a")
+    counter.inc()
+
+    assert counter.value(kind="a") == 3
+    assert counter.value(kind="b") == 0
+    assert counter.samples() == {("a",): 3, ("",): 1}
+
+    with pytest.raises(ValueError, match="Unknown labels"):
+        counter.inc(colour="red")
+    with pytest.raises(ValueError, match="only be increased"):
+        counter.inc(-1)
+
+
+def test_histogram() -> None:
+    histogram = Histogram("latency_seconds", "Latency.", ["kind"], buckets=[0.1, 1.0])
+    for value in (0.05, 0.1, 0.5, 5.0):
+        histogram.observe(value, kind="a")
+
+    sample = histogram.sample(kind="a")
+    # the bounds are inclusive, and the last bucket is `+Inf`
+    assert sample.bucket_counts == [2, 1, 1]
+    assert sample.count == 4
+    assert sample.sum == pytest.approx(5.65)
+    assert histogram.sample(kind="b").count == 0
+
+    with pytest.raises(ValueError, match="ascending"):
+        Histogram("latency_seconds", "Latency.", [], buckets=[1.0, 0.1])
+
+
+def test_to_prometheus() -> None:
+    metrics = Metrics(buckets=[0.5])
+    metrics.requests.inc(endpoint=SPEECH, voice='say "hi"\n')
+    metrics.request_duration.observe(0.25, endpoint=SPEECH, voice="leah")
+    metrics.request_duration.observe(2, endpoint=SPEECH, voice="leah")
+
+    text = metrics.to_prometheus()
+    assert "# HELP lmnt_requests_total API calls made.\n# TYPE lmnt_requests_total counter\n" in text
+    assert 'lmnt_requests_total{endpoint="POST /v1/ai/speech/bytes",voice="say \\"hi\\"\\n"} 1.0\n' in text
+    assert "# TYPE lmnt_request_duration_seconds histogram\n" in text
+    labels = 'endpoint="POST /v1/ai/speech/bytes",voice="leah"'
+    assert f'lmnt_request_duration_seconds_bucket{{{labels},le="0.5"}} 1\n' in text
+    assert f'lmnt_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2\n' in text
+    assert f"lmnt_request_duration_seconds_sum{{{labels}}} 2.25\n" in text
+    assert f"lmnt_request_duration_seconds_count{{{labels}}} 2\n" in text
+
+
+def test_register_prometheus() -> None:
+    prometheus_client = pytest.importorskip("prometheus_client")
+
+    registry = prometheus_client.CollectorRegistry()
+    metrics = Metrics()
+    metrics.register_prometheus(registry)
+    metrics.characters.inc(5, endpoint=SPEECH, voice="leah")
+
+    assert registry.get_sample_value("lmnt_characters_total", {"endpoint": SPEECH, "voice": "leah"}) == 5
+
+
+def test_register_prometheus_not_installed() -> None:
+    with mock.patch.dict("sys.modules", {"prometheus_client": None}):
+        with pytest.raises(RuntimeError, match="prometheus` extra"):
+            Metrics().register_prometheus()
+
+
+class _FakeInstrument:
+    def __init__(self) -> None:
+        self.recorded: List[Tuple[float, Dict[str, str]]] = []
+
+    def add(self, amount: float, attributes: Dict[str, str]) -> None:
+        self.recorded.append((amount, attributes))
+
+    record = add
+
+
+class _FakeMeter:
+    def __init__(self) -> None:
+        self.instruments: Dict[str, _FakeInstrument] = {}
+
+    def create_counter(self, name: str, **_kwargs: str) -> _FakeInstrument:
+        return self.instruments.setdefault(name, _FakeInstrument())
+
+    create_histogram = create_counter
+
+
+def test_bind_opentelemetry() -> None:
+    meter = _FakeMeter()
+    metrics = Metrics()
+    metrics.bind_opentelemetry(meter)
+    assert set(meter.instruments) == {metric.name for metric in metrics}
+
+    metrics.characters.inc(5, endpoint=SPEECH, voice="leah")
+    metrics.session_connect_duration.observe(0.2, voice="leah")
+
+    assert meter.instruments["lmnt_characters_total"].recorded == [(5, {"endpoint": SPEECH, "voice": "leah"})]
+    assert meter.instruments["lmnt_session_connect_seconds"].recorded == [(0.2, {"voice": "leah"})]
+
+
+@mock.patch("lmnt._base_client.BaseClient._calculate_retry_timeout", _low_retry_timeout)
+@pytest.mark.respx(base_url=base_url)
+def test_client_metrics(respx_mock: MockRouter) -> None:
+    respx_mock.post("/v1/ai/speech/bytes").mock(
+        side_effect=[httpx.Response(503), httpx.Response(200, content=b"audio"), httpx.Response(400)]
+    )
+    metrics = Metrics()
+    client = Lmnt(base_url=base_url, api_key=api_key, metrics=metrics)
+
+    client.speech.generate(text="hello", voice="leah")
+    with pytest.raises(APIStatusError):
+        client.with_options(max_retries=0).speech.generate(text="hi", voice="leah")
+
+    labels = {"endpoint": SPEECH, "voice": "leah"}
+    assert metrics.requests.value(**labels) == 2
+    assert metrics.retries.value(**labels) == 1
+    assert metrics.responses.value(**labels, status_code="503") == 1
+    assert metrics.responses.value(**labels, status_code="200") == 1
+    assert metrics.responses.value(**labels, status_code="400") == 1
+    assert metrics.errors.value(**labels, error="BadRequestError") == 1
+    assert metrics.characters.value(**labels) == 7
+    assert metrics.bytes_received.value(**labels) == len(b"audio")
+    # one for the successful call and one for the failed one
+    assert metrics.request_duration.sample(**labels).count == 2
+    assert metrics.time_to_first_byte.sample(**labels).count == 1
+
+
+@pytest.mark.respx(base_url=base_url)
+async def test_async_client_metrics(respx_mock: MockRouter) -> None:
+    respx_mock.get("/v1/ai/voice/list").mock(return_value=httpx.Response(200, json=[]))
+    metrics = Metrics()
+    client = AsyncLmnt(base_url=base_url, api_key=api_key, metrics=metrics)
+
+    await client.voices.list()
+
+    assert metrics.requests.value(endpoint="GET /v1/ai/voice/list") == 1
+    assert metrics.request_duration.sample(endpoint="GET /v1/ai/voice/list").count == 1
+
+
+def test_instrumented_once() -> None:
+    hooks = HookRegistry()
+    metrics = Metrics()
+    client = Lmnt(base_url=base_url, api_key=api_key, hooks=hooks, metrics=metrics)
+    client.copy()
+    client.with_options(timeout=1)
+
+    assert hooks._hooks["request"] == (metrics._on_request,)
@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+import io
+import os
+import math
+import wave
+import array
+import struct
+import logging
+import tempfile
+from typing import IO, List, Tuple, cast
+from pathlib import Path
+
+import httpx
+import pytest
+
+import lmnt._preprocess
+from lmnt import Lmnt, AsyncLmnt, AudioPreprocessing, preprocess_audio
+
+base_url = os.environ.get("TEST_API_BASE_URL", "http://127.0.0.1:4010")
+api_key = "My API Key"
+
+VOICE = {"id": "voice-id", "name": "my voice", "owner": "me", "state": "ready", "starred": False, "type": "instant"}
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Runs a test with NumPy, if it is installed, and with the pure Python fallback."""
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(lmnt._preprocess, "_load_numpy", lambda: None)
+
+
+def _tone(
+    *,
+    sample_rate: int = 48000,
+    channels: int = 2,
+    seconds: float = 2.0,
+    silence: float = 0.5,
+    frequency: float = 440.0,
+) -> List[float]:
+    """A tone with `silence` seconds of silence before and after it, repeated for every channel."""
+    samples: List[float] = []
+    count = round(seconds * sample_rate)
+    silent = round(silence * sample_rate)
+    for i in range(count):
+        value = 0.0 if i < silent or i >= count - silent else 0.5 * math.sin(2 * math.pi * frequency * i / sample_rate)
+        samples.extend([value] * channels)
+    return samples
+
+
+def _wav(samples: List[float], *, sample_rate: int = 48000, channels: int = 2, sample_width: int = 2) -> bytes:
+    if sample_width == 1:
+        frames = bytes(round(sample * 127) + 128 for sample in samples)
+    elif sample_width == 3:
+        frames = b"".join(round(sample * (2**23 - 1)).to_bytes(3, "little", signed=True) for sample in samples)
+    else:
+        frames = array.array("h", [round(sample * 32767) for sample in samples]).tobytes()
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as f:
+        f.setnchannels(channels)
+        f.setsampwidth(sample_width)
+        f.setframerate(sample_rate)
+        f.writeframes(frames)
+    return buffer.getvalue()
+
+
+def _float_wav(samples: List[float], *, sample_rate: int, channels: int) -> bytes:
+    data = struct.pack(f"<{len(samples)}f", *samples)
+    fmt = struct.pack("<HHIIHH", 3, channels, sample_rate, sample_rate * channels * 4, channels * 4, 32)
+    chunks = b"fmt " + struct.pack("<I", len(fmt)) + fmt + b"data" + struct.pack("<I", len(data)) + data
+    return b"RIFF" + struct.pack("<I", 4 + len(chunks)) + b"WAVE" + chunks
+
+
+def _read(data: bytes) -> Tuple[int, int, List[int]]:
+    with wave.open(io.BytesIO(data)) as f:
+        assert f.getsampwidth() == 2
+        return f.getframerate(), f.getnchannels(), list(array.array("h", f.readframes(f.getnframes())))
+
+
+def _cycles(samples: List[int]) -> int:
+    return sum(1 for a, b in zip(samples, samples[1:], strict=False) if a < 0 <= b)
+
+
+@pytest.mark.usefixtures("backend")
+@pytest.mark.parametrize("sample_width", [1, 2, 3])
+def test_downmix_resample_and_trim(sample_width: int) -> None:
+    data = _wav(_tone(), sample_width=sample_width)
+
+    audio = preprocess_audio(data)
+
+    sample_rate, channels, samples = _read(audio.file.read())
+    assert (sample_rate, channels) == (24000, 1)
+    # a second of sound with 100ms of padding on either side
+    assert audio.duration == pytest.approx(1.2)
+    assert len(samples) == round(1.2 * 24000)
+    assert audio.original_size == len(data)
+    assert audio.size == 44 + 2 * len(samples)
+    assert audio.compression_ratio == pytest.approx(len(data) / audio.size)
+    assert audio.size < len(data) / 3
+    # the second of the tone is still at 440 Hz
+    assert _cycles(samples) == pytest.approx(440, abs=2)
+    assert max(samples) == pytest.approx(0.5 * 32767, rel=0.02)
+
+
+@pytest.mark.usefixtures("backend")
+def test_uneven_sample_rate_across_blocks(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(lmnt._preprocess, "_BLOCK_FRAMES", 1000)
+    data = _wav(_tone(sample_rate=44100, channels=1, silence=0), sample_rate=44100, channels=1)
+
+    audio = preprocess_audio(data, AudioPreprocessing(sample_rate=16000, trim_silence=False))
+
+    sample_rate, _, samples = _read(audio.file.read())
+    assert sample_rate == 16000
+    assert len(samples) == pytest.approx(2 * 16000, abs=1)
+    assert _cycles(samples) == pytest.approx(2 * 440, abs=2)
+    # the seams between blocks don't add clicks
+    assert (
+        max(abs(a - b) for a, b in zip(samples, samples[1:], strict=False))
+        < 0.5 * 32767 * 2 * math.pi * 440 / 16000 * 1.1
+    )
+
+
+@pytest.mark.usefixtures("backend")
+def test_float_wav() -> None:
+    data = _float_wav(_tone(sample_rate=24000), sample_rate=24000, channels=2)
+
+    audio = preprocess_audio(data)
+
+    sample_rate, _, samples = _read(audio.file.read())
+    assert sample_rate == 24000
+    assert len(samples) == round(1.2 * 24000)
+
+
+@pytest.mark.usefixtures("backend")
+def test_max_duration() -> None:
+    audio = preprocess_audio(_wav(_tone(seconds=3)), AudioPreprocessing(max_duration=0.5))
+
+    _, _, samples = _read(audio.file.read())
+    assert len(samples) == 12000
+    assert audio.duration == 0.5
+
+
+@pytest.mark.usefixtures("backend")
+def test_long_pauses_are_spilled_to_disk(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(lmnt._preprocess, "_BLOCK_FRAMES", 4000)
+    tone = _tone(sample_rate=24000, channels=1, seconds=1.0, silence=0)
+    pause = [0.0] * 24000
+    data = _wav([*tone, *pause, *tone, *pause], sample_rate=24000, channels=1)
+    in_memory = preprocess_audio(data).file.read()
+
+    spills: List[IO[bytes]] = []
+    create_temporary_file = tempfile.TemporaryFile
+
+    def temporary_file() -> IO[bytes]:
+        spills.append(cast("IO[bytes]", create_temporary_file()))
+        return spills[-1]
+
+    monkeypatch.setattr(lmnt._preprocess, "_MAX_PENDING_SAMPLES", 1000)
+    monkeypatch.setattr(lmnt._preprocess.tempfile, "TemporaryFile", temporary_file)
+    audio = preprocess_audio(data)
+
+    # the pause between the tones is kept, the one after them is trimmed to the padding
+    assert audio.duration == pytest.approx(3.1)
+    assert audio.file.read() == in_memory
+    assert len(spills) == 2
+    assert all(spill.closed for spill in spills)
+
+
+@pytest.mark.usefixtures("backend")
+def test_lower_sample_rate_is_not_upsampled() -> None:
+    data = _wav(_tone(sample_rate=16000, channels=1), sample_rate=16000, channels=1)
+
+    audio = preprocess_audio(data, AudioPreprocessing(trim_silence=False))
+
+    sample_rate, _, samples = _read(audio.file.read())
+    assert sample_rate == 16000
+    assert len(samples) == 2 * 16000
+
+
+def test_backends_agree(monkeypatch: pytest.MonkeyPatch) -> None:
+    pytest.importorskip("numpy")
+    data = _wav(_tone(sample_rate=44100), sample_rate=44100)
+
+    vectorized = _read(preprocess_audio(data).file.read())
+    monkeypatch.setattr(lmnt._preprocess, "_load_numpy", lambda: None)
+    pure = _read(preprocess_audio(data).file.read())
+
+    assert vectorized[:2] == pure[:2]
+    assert len(vectorized[2]) == len(pure[2])
+    assert max(abs(a - b) for a, b in zip(vectorized[2], pure[2], strict=True)) <= 1
+
+
+def test_not_wav() -> None:
+    with pytest.raises(ValueError, match="RIFF/WAVE"):
+        preprocess_audio(b"ID3" + os.urandom(100))
+
+
+def _recording_transport(bodies: List[bytes]) -> httpx.MockTransport:
+    def handler(request: httpx.Request) -> httpx.Response:
+        bodies.append(request.content)
+        return httpx.Response(200, json=VOICE)
+
+    return httpx.MockTransport(handler)
+
+
+def test_create_preprocesses_wav(tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+    path = tmp_path.joinpath("voice.wav")
+    data = _wav(_tone())
+    path.write_bytes(data)
+    bodies: List[bytes] = []
+    client = Lmnt(base_url=base_url, api_key=api_key, http_client=httpx.Client(transport=_recording_transport(bodies)))
+
+    with caplog.at_level(logging.INFO, logger="lmnt._preprocess"):
+        client.voices.create(file=path, name="my voice", preprocess=True)
+
+    assert data not in bodies[0]
+    assert b'filename="voice.wav"' in bodies[0]
+    assert len(bodies[0]) < len(data) / 4
+    assert f"Preprocessed the voice audio from {len(data)} to" in caplog.text
+
+
+def test_create_passes_other_formats_through() -> None:
+    data = b"ID3" + os.urandom(1024)
+    bodies: List[bytes] = []
+    client = Lmnt(base_url=base_url, api_key=api_key, http_client=httpx.Client(transport=_recording_transport(bodies)))
+
+    client.voices.create(file=("voice.mp3", data, "audio/mpeg"), name="my voice", preprocess=AudioPreprocessing())
+
+    assert data in bodies[0]
+    assert b"audio/mpeg" in bodies[0]
+
+
+async def test_async_create_preprocesses_wav() -> None:
+    data = _wav(_tone())
+    bodies: List[bytes] = []
+    client = AsyncLmnt(
+        base_url=base_url,
+        api_key=api_key,
+        http_client=httpx.AsyncClient(transport=_recording_transport(bodies)),
+    )
+
+    await client.voices.create(
+        file=("voice.wav", data, "audio/x-wav"),
+        name="my voice",
+        preprocess=AudioPreprocessing(sample_rate=16000),
+    )
+
+    assert len(bodies[0]) < len(data) / 4
+    assert b"audio/wav" in bodies[0]
+
+
+def test_create_uploads_unsupported_wav_unchanged() -> None:
+    # A-law audio, which isn't PCM
+    data = bytearray(_wav(_tone(seconds=0.1)))
+    data[20:22] = (6).to_bytes(2, "little")
+    bodies: List[bytes] = []
+    client = Lmnt(base_url=base_url, api_key=api_key, http_client=httpx.Client(transport=_recording_transport(bodies)))
+
+    client.voices.create(file=("voice.wav", io.BytesIO(bytes(data))), name="my voice", preprocess=True)
+
+    assert bytes(data) in bodies[0]
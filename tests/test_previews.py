@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+from typing import Dict, List, Iterator, Optional, AsyncIterator
+from pathlib import Path
+from typing_extensions import override
+
+import httpx
+
+from lmnt import Lmnt, PreviewCache, NotFoundError, APIConnectionError
+from lmnt.types import Voice
+
+from .fakes import api_key, base_url, mock_client, async_mock_client
+
+
+def _voice(voice_id: str, preview_url: Optional[str] = "default") -> Voice:
+    if preview_url == "default":
+        preview_url = f"https://previews.example.com/{voice_id}.mp3"
+    return Voice(id=voice_id, name=voice_id, owner="system", state="ready", preview_url=preview_url)
+
+
+class PreviewHost:
+    """Serves a preview of 1000 bytes for every voice, except `missing`, and fails partway through `broken`."""
+
+    def __init__(self) -> None:
+        self.requests: List[httpx.Request] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        name = request.url.path.rsplit("/", 1)[-1].split(".")[0]
+        if name == "missing":
+            return httpx.Response(404, text="Not Found")
+        if name == "broken":
+            return httpx.Response(200, stream=_BrokenStream())
+        return httpx.Response(200, content=name.encode().ljust(1000, b"\0"))
+
+
+class _BrokenStream(httpx.SyncByteStream, httpx.AsyncByteStream):
+    @override
+    def __iter__(self) -> Iterator[bytes]:
+        yield b"\0" * 500
+        raise httpx.ReadError("connection reset")
+
+    @override
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        yield b"\0" * 500
+        raise httpx.ReadError("connection reset")
+
+
+def test_fetch_without_cache() -> None:
+    host = PreviewHost()
+    client = mock_client(host)
+
+    results = client.voices.fetch_previews([_voice("lily"), _voice("missing"), _voice("silent", None)])
+
+    assert [result.id for result in results] == ["lily", "missing", "silent"]
+    assert results[0].value is not None
+    assert results[0].value.read().startswith(b"lily")
+    assert results[0].value.path is None
+    assert isinstance(results[1].error, NotFoundError)
+    assert isinstance(results[2].error, ValueError)
+    assert [str(request.url) for request in host.requests] == [
+        "https://previews.example.com/lily.mp3",
+        "https://previews.example.com/missing.mp3",
+    ]
+
+
+def test_api_key_is_not_sent() -> None:
+    host = PreviewHost()
+    # even when it is set on the client's connection pool
+    client = Lmnt(
+        base_url=base_url,
+        api_key=api_key,
+        http_client=httpx.Client(
+            transport=httpx.MockTransport(host), headers={"X-API-Key": api_key, "Authorization": "Bearer token"}
+        ),
+    )
+
+    client.voices.fetch_previews([_voice("lily")])
+
+    assert "X-API-Key" not in host.requests[0].headers
+    assert "Authorization" not in host.requests[0].headers
+
+
+def test_cache_serves_and_refetches_changed_urls(tmp_path: Path) -> None:
+    host = PreviewHost()
+    client = mock_client(host)
+    cache = PreviewCache(tmp_path)
+    voices = [_voice(f"voice-{i}") for i in range(10)]
+
+    results = client.voices.fetch_previews(voices, cache=cache, concurrency=4)
+
+    paths: Dict[str, Path] = {}
+    for result in results:
+        assert result.value is not None and result.value.path is not None
+        assert not result.value.cached
+        assert result.value.path.suffix == ".mp3"
+        assert result.value.read().startswith(result.id.encode())
+        paths[result.id] = result.value.path
+    assert len(cache) == 10
+    assert cache.size == 10 * 1000
+
+    again = client.voices.fetch_previews(
+        [*voices, _voice("voice-0", "https://previews.example.com/voice-0-v2.mp3")], cache=cache
+    )
+    assert len(host.requests) == 11
+    assert all(result.value is not None and result.value.cached for result in again[:10])
+    assert again[10].value is not None and not again[10].value.cached
+    # a new cache over the same directory picks up the previews
+    assert PreviewCache(tmp_path).size == 11 * 1000
+
+
+def test_cache_is_bounded(tmp_path: Path) -> None:
+    client = mock_client(PreviewHost())
+    cache = PreviewCache(tmp_path, max_bytes=3500)
+
+    client.voices.fetch_previews([_voice(f"voice-{i}") for i in range(3)], cache=cache, concurrency=1)
+    # voice-0 is used again, so voice-1 is the least recently used
+    assert cache.get("voice-0", "https://previews.example.com/voice-0.mp3") is not None
+    client.voices.fetch_previews([_voice("voice-3")], cache=cache)
+
+    assert cache.size == 3000
+    assert sorted(path.name for path in tmp_path.iterdir()) == sorted(
+        cache.path_for(f"voice-{i}", f"https://previews.example.com/voice-{i}.mp3").name for i in (0, 2, 3)
+    )
+
+
+def test_catalog_larger_than_cache(tmp_path: Path) -> None:
+    client = mock_client(PreviewHost())
+    cache = PreviewCache(tmp_path, max_bytes=2500)
+
+    results = client.voices.fetch_previews([_voice(f"voice-{i}") for i in range(5)], cache=cache, concurrency=1)
+
+    # none of the previews are evicted while the batch is running, so every one of them can be read
+    for i, result in enumerate(results):
+        assert result.value is not None
+        assert result.value.read().startswith(f"voice-{i}".encode())
+    # and once it finished, those that had to be evicted were kept in memory
+    assert [result.value is not None and result.value.path is None for result in results] == [True] * 3 + [False] * 2
+    assert cache.size == 2000
+    assert sorted(path.name for path in tmp_path.iterdir()) == sorted(
+        cache.path_for(f"voice-{i}", f"https://previews.example.com/voice-{i}.mp3").name for i in (3, 4)
+    )
+
+
+def test_failed_download_leaves_nothing_behind(tmp_path: Path) -> None:
+    client = mock_client(PreviewHost())
+    cache = PreviewCache(tmp_path)
+
+    results = client.voices.fetch_previews([_voice("broken")], cache=cache)
+
+    assert isinstance(results[0].error, APIConnectionError)
+    assert list(tmp_path.iterdir()) == []
+    assert len(cache) == 0
+
+
+def test_max_age(tmp_path: Path) -> None:
+    host = PreviewHost()
+    client = mock_client(host)
+
+    client.voices.fetch_previews([_voice("lily")], cache=PreviewCache(tmp_path, max_age=0))
+    results = client.voices.fetch_previews([_voice("lily")], cache=PreviewCache(tmp_path, max_age=0))
+
+    assert len(host.requests) == 2
+    assert results[0].value is not None and not results[0].value.cached
+
+
+async def test_async_fetch_previews(tmp_path: Path) -> None:
+    host = PreviewHost()
+    client = async_mock_client(host)
+    cache = PreviewCache(tmp_path)
+
+    results = await client.voices.fetch_previews(
+        [_voice("lily"), _voice("broken"), _voice("missing")], cache=cache, concurrency=2
+    )
+
+    assert results[0].value is not None and results[0].value.path is not None
+    assert results[0].value.path.read_bytes().startswith(b"lily")
+    assert isinstance(results[1].error, APIConnectionError)
+    assert isinstance(results[2].error, NotFoundError)
+    assert [path.name for path in tmp_path.iterdir()] == [results[0].value.path.name]
+    assert all("X-API-Key" not in request.headers for request in host.requests)
+
+    in_memory = await client.voices.fetch_previews([_voice("lily")])
+    assert in_memory[0].value is not None and in_memory[0].value.read().startswith(b"lily")
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+from typing import List
+
+import pytest
+
+import lmnt._rate_limit
+from lmnt import RateLimiter
+from lmnt._rate_limit import request_characters
+
+from .fakes import FakeTime
+
+
+def test_request_bucket(clock: FakeTime) -> None:
+    limiter = RateLimiter(requests_per_second=2, request_burst=2)
+
+    assert limiter._reserve(0) == 0
+    assert limiter._reserve(0) == 0
+    # the burst is used up, so further requests are spaced out at the sustained rate
+    assert limiter._reserve(0) == pytest.approx(0.5)
+    assert limiter._reserve(0) == pytest.approx(1.0)
+
+    clock.now += 10
+    assert limiter._reserve(0) == 0
+
+
+def test_character_bucket(clock: FakeTime) -> None:
+    limiter = RateLimiter(requests_per_second=100, characters_per_second=1000)
+
+    assert limiter._reserve(1000) == 0
+    assert limiter._reserve(500) == pytest.approx(0.5)
+
+    clock.now += 0.5
+    # requests without text aren't held back by the character bucket
+    assert limiter._reserve(0) == 0
+
+
+def test_acquire_sleeps(clock: FakeTime) -> None:
+    limiter = RateLimiter(requests_per_second=1, request_burst=1)
+
+    limiter.acquire()
+    limiter.acquire()
+    assert clock.sleeps == [pytest.approx(1.0)]
+
+
+def test_429_reduces_rate_and_pauses(clock: FakeTime) -> None:
+    limiter = RateLimiter(requests_per_second=10, characters_per_second=1000, request_burst=100)
+
+    limiter.record_response(429, retry_after=2)
+    assert limiter.requests_per_second == 5
+    assert limiter.characters_per_second == 500
+    assert limiter._reserve(0) == pytest.approx(2)
+
+    for _ in range(5):
+        clock.now += 2
+        limiter.record_response(429)
+    # never reduced below the minimum fraction of the maximum rate
+    assert limiter.requests_per_second == pytest.approx(0.5)
+
+
+def test_burst_of_429s_reduces_rate_once(clock: FakeTime) -> None:
+    limiter = RateLimiter(requests_per_second=100, request_burst=100, decrease_cooldown=1)
+
+    # the responses of many requests that were in flight together
+    for _ in range(200):
+        limiter.record_response(429)
+    assert limiter.requests_per_second == 50
+
+    clock.now += 0.5
+    limiter.record_response(429)
+    assert limiter.requests_per_second == 50
+
+    # a longer `Retry-After` extends the cooldown to the end of the pause
+    clock.now += 0.5
+    limiter.record_response(429, retry_after=5)
+    assert limiter.requests_per_second == 25
+    clock.now += 4
+    limiter.record_response(429)
+    assert limiter.requests_per_second == 25
+
+    clock.now += 1
+    limiter.record_response(429)
+    assert limiter.requests_per_second == 12.5
+
+
+@pytest.mark.usefixtures("clock")
+def test_success_recovers_additively() -> None:
+    limiter = RateLimiter(requests_per_second=10, increase_fraction=0.1)
+
+    limiter.record_response(429)
+    assert limiter.requests_per_second == 5
+
+    limiter.record_response(200)
+    assert limiter.requests_per_second == pytest.approx(6)
+    limiter.record_response(500)
+    assert limiter.requests_per_second == pytest.approx(6)
+
+    for _ in range(10):
+        limiter.record_response(200)
+    assert limiter.requests_per_second == 10
+
+
+def test_acquire_respects_deadline(clock: FakeTime) -> None:
+    limiter = RateLimiter(requests_per_second=1, request_burst=1, characters_per_second=100)
+
+    assert limiter.acquire(characters=100, deadline_at=clock.now)
+    # the next request would have to wait for a second
+    assert not limiter.acquire(characters=100, deadline_at=clock.now + 0.5)
+    assert clock.sleeps == []
+
+    # and the one that gave up didn't use up any of the rate
+    assert limiter.acquire(characters=100, deadline_at=clock.now + 1)
+    assert clock.sleeps == [pytest.approx(1.0)]
+
+
+@pytest.mark.usefixtures("clock")
+async def test_async_acquire(monkeypatch: pytest.MonkeyPatch) -> None:
+    slept: List[float] = []
+
+    async def sleep(seconds: float) -> None:
+        slept.append(seconds)
+
+    monkeypatch.setattr(lmnt._rate_limit.anyio, "sleep", sleep)
+    limiter = RateLimiter(requests_per_second=4, request_burst=1)
+
+    await limiter.async_acquire()
+    await limiter.async_acquire()
+    assert slept == [pytest.approx(0.25)]
+
+
+def test_request_characters() -> None:
+    assert request_characters({"text": "hello", "voice": "leah"}) == 5
+    assert request_characters({"name": "voice"}) == 0
+    assert request_characters(None) == 0
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [{"requests_per_second": 0}, {"characters_per_second": -1}, {"decrease_factor": 1}, {"decrease_cooldown": -1}],
+)
+def test_invalid_options(kwargs: dict[str, float]) -> None:
+    with pytest.raises(ValueError):
+        RateLimiter(**kwargs)
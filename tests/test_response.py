@@ -1,5 +1,5 @@
 import json
-from typing import Any, List, Union, cast
+from typing import Any, List, Union, AsyncIterator, cast
 from typing_extensions import Annotated
 
 import httpx
@@ -275,3 +275,39 @@ async def test_async_response_parse_expect_model_union_non_json_content(async_cl
     obj = await response.parse(to=cast(Any, Union[CustomModel, OtherModel]))
     assert isinstance(obj, str)
     assert obj == "foo"
+
+
+def test_binary_response_iter_audio_uses_request_format(client: Lmnt) -> None:
+    response = BinaryAPIResponse(
+        raw=httpx.Response(200, content=iter([b"\x00" * 6, b"\x00" * 7, b"\x00" * 3])),
+        client=client,
+        stream=True,
+        stream_cls=None,
+        cast_to=bytes,
+        options=FinalRequestOptions.construct(
+            method="post", url="/v1/ai/speech/bytes", json_data={"format": "pcm_f32le", "sample_rate": 8000}
+        ),
+    )
+
+    assert [len(chunk) for chunk in response.iter_audio()] == [4, 8, 4]
+
+
+@pytest.mark.asyncio
+async def test_async_binary_response_iter_audio_fixed_duration(async_client: AsyncLmnt) -> None:
+    async def content() -> AsyncIterator[bytes]:
+        for chunk in [b"\x00" * 10, b"\x00" * 25, b"\x00" * 5]:
+            yield chunk
+
+    response = AsyncBinaryAPIResponse(
+        raw=httpx.Response(200, content=content()),
+        client=async_client,
+        stream=True,
+        stream_cls=None,
+        cast_to=bytes,
+        options=FinalRequestOptions.construct(
+            method="post", url="/v1/ai/speech/bytes", json_data={"format": "pcm_s16le", "sample_rate": 8000}
+        ),
+    )
+
+    # 1ms at 8kHz = 8 samples = 16 bytes
+    assert [len(chunk) async for chunk in response.iter_audio(duration=0.001)] == [16, 16, 8]
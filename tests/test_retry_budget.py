@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import pytest
+
+from lmnt import RetryBudget
+
+from .fakes import FakeTime
+
+
+@pytest.mark.usefixtures("clock")
+def test_starts_with_max_tokens() -> None:
+    budget = RetryBudget(min_retries_per_second=0, max_tokens=3)
+
+    assert budget.remaining == 3
+    assert budget.try_acquire_retry()
+    assert budget.try_acquire_retry()
+    assert budget.try_acquire_retry()
+    assert not budget.try_acquire_retry()
+
+    assert budget.remaining == 0
+    assert budget.retries_allowed == 3
+    assert budget.retries_rejected == 1
+
+
+@pytest.mark.usefixtures("clock")
+def test_requests_earn_retries() -> None:
+    budget = RetryBudget(ratio=0.1, min_retries_per_second=0, max_tokens=5)
+    while budget.try_acquire_retry():
+        pass
+
+    # at most one retry for every ten requests
+    for _ in range(9):
+        budget.record_request()
+    assert not budget.try_acquire_retry()
+
+    budget.record_request()
+    assert budget.try_acquire_retry()
+    assert not budget.try_acquire_retry()
+
+
+@pytest.mark.usefixtures("clock")
+def test_balance_is_capped() -> None:
+    budget = RetryBudget(ratio=1, min_retries_per_second=0, max_tokens=2)
+
+    for _ in range(100):
+        budget.record_request()
+
+    assert budget.remaining == 2
+
+
+def test_minimum_rate(clock: FakeTime) -> None:
+    budget = RetryBudget(ratio=0, min_retries_per_second=0.5, max_tokens=1)
+    assert budget.try_acquire_retry()
+    assert not budget.try_acquire_retry()
+
+    clock.now += 1
+    assert budget.remaining == pytest.approx(0.5)
+    assert not budget.try_acquire_retry()
+
+    clock.now += 1
+    assert budget.try_acquire_retry()
+
+    # a quiet period doesn't save up more than `max_tokens`
+    clock.now += 60
+    assert budget.remaining == 1
+
+
+def test_invalid_arguments() -> None:
+    with pytest.raises(ValueError, match="ratio"):
+        RetryBudget(ratio=-1)
+    with pytest.raises(ValueError, match="min_retries_per_second"):
+        RetryBudget(min_retries_per_second=-1)
+    with pytest.raises(ValueError, match="max_tokens"):
+        RetryBudget(max_tokens=0.5)
@@ -0,0 +1,149 @@
+import os
+import json
+import base64
+from typing import List, Tuple
+from pathlib import Path
+
+import httpx
+import pytest
+from respx import MockRouter
+
+from lmnt import Lmnt, AsyncLmnt, DecodedDetailedSpeech
+from lmnt.types import SpeechGenerateDetailedResponse
+from lmnt._speech_stream import DetailedSpeechEvent, DetailedSpeechDecoder
+from lmnt.types.speech_generate_detailed_response import Timestamp
+
+base_url = os.environ.get("TEST_API_BASE_URL", "http://127.0.0.1:4010")
+
+AUDIO = bytes(range(256)) * 40
+TIMESTAMPS = [
+    {"text": "", "start": 0.0, "duration": 0.1},
+    {"text": "hello", "start": 0.1, "duration": 0.4},
+    {"text": '"quoted" [text]', "start": 0.5, "duration": 0.3},
+]
+
+
+def body(*, timestamps_first: bool = False, escape_slashes: bool = False) -> bytes:
+    audio = base64.b64encode(AUDIO).decode()
+    data = (
+        {"timestamps": TIMESTAMPS, "audio": audio} if timestamps_first else {"audio": audio, "timestamps": TIMESTAMPS}
+    )
+    raw = json.dumps(data, indent=1)
+    if escape_slashes:
+        raw = raw.replace("/", "\\/")
+    return raw.encode()
+
+
+def decode(content: bytes, chunk_size: int) -> Tuple[bytes, List[Timestamp], List[DetailedSpeechEvent]]:
+    decoder = DetailedSpeechDecoder()
+    events: List[DetailedSpeechEvent] = []
+    for i in range(0, len(content), chunk_size):
+        events.extend(decoder.feed(content[i : i + chunk_size]))
+    decoder.close()
+
+    audio = b"".join(event for event in events if isinstance(event, bytes))
+    timestamps = [event for event in events if isinstance(event, Timestamp)]
+    return audio, timestamps, events
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 64, 1 << 20])
+@pytest.mark.parametrize("timestamps_first", [True, False])
+@pytest.mark.parametrize("escape_slashes", [True, False])
+def test_decoder(chunk_size: int, timestamps_first: bool, escape_slashes: bool) -> None:
+    audio, timestamps, events = decode(
+        body(timestamps_first=timestamps_first, escape_slashes=escape_slashes), chunk_size
+    )
+
+    assert audio == AUDIO
+    assert [t.to_dict() for t in timestamps] == TIMESTAMPS
+    if timestamps_first:
+        assert isinstance(events[0], Timestamp)
+
+
+def test_decoder_bounded_buffer() -> None:
+    decoder = DetailedSpeechDecoder()
+    content = body()
+    for i in range(0, len(content), 100):
+        decoder.feed(content[i : i + 100])
+        assert len(decoder._buffer) < 100
+
+
+def test_decoder_skips_unknown_fields() -> None:
+    content = json.dumps({"extra": {"nested": ["}", 1, None]}, "n": 1.5, "audio": "AAEC", "timestamps": None})
+    audio, timestamps, _ = decode(content.encode(), 2)
+
+    assert audio == b"\x00\x01\x02"
+    assert timestamps == []
+
+
+def test_decoder_truncated_body() -> None:
+    decoder = DetailedSpeechDecoder()
+    decoder.feed(body()[:-10])
+    with pytest.raises(ValueError, match="ended unexpectedly"):
+        decoder.close()
+
+
+class TestStreamedDetailedSpeechResponse:
+    @pytest.mark.respx(base_url=base_url)
+    def test_iter_events(self, client: Lmnt, respx_mock: MockRouter) -> None:
+        respx_mock.post("/v1/ai/speech").mock(return_value=httpx.Response(200, content=body(timestamps_first=True)))
+
+        with client.speech.with_streaming_response.generate_detailed(text="hello", voice="leah") as response:
+            events = list(response.iter_events(chunk_size=50))
+
+        assert isinstance(events[0], Timestamp)
+        assert b"".join(event for event in events if isinstance(event, bytes)) == AUDIO
+        assert [t.to_dict() for t in response.timestamps] == TIMESTAMPS
+
+    @pytest.mark.respx(base_url=base_url)
+    def test_stream_to_file(self, client: Lmnt, respx_mock: MockRouter, tmp_path: Path) -> None:
+        respx_mock.post("/v1/ai/speech").mock(return_value=httpx.Response(200, content=body()))
+        file = tmp_path / "audio.mp3"
+
+        with client.speech.with_streaming_response.generate_detailed(text="hello", voice="leah") as response:
+            timestamps = response.stream_to_file(file)
+
+        with open(file, "rb") as f:
+            assert f.read() == AUDIO
+        assert len(timestamps) == len(TIMESTAMPS)
+
+    @pytest.mark.respx(base_url=base_url)
+    def test_parse_still_supported(self, client: Lmnt, respx_mock: MockRouter) -> None:
+        respx_mock.post("/v1/ai/speech").mock(return_value=httpx.Response(200, content=body()))
+
+        with client.speech.with_streaming_response.generate_detailed(text="hello", voice="leah") as response:
+            speech = response.parse()
+
+        assert isinstance(speech, SpeechGenerateDetailedResponse)
+        assert base64.b64decode(speech.audio) == AUDIO
+
+
+class TestAsyncStreamedDetailedSpeechResponse:
+    @pytest.mark.respx(base_url=base_url)
+    async def test_iter_audio(self, async_client: AsyncLmnt, respx_mock: MockRouter) -> None:
+        respx_mock.post("/v1/ai/speech").mock(return_value=httpx.Response(200, content=body(escape_slashes=True)))
+
+        async with async_client.speech.with_streaming_response.generate_detailed(
+            text="hello", voice="leah"
+        ) as response:
+            audio = b"".join([chunk async for chunk in response.iter_audio(chunk_size=50)])
+
+        assert audio == AUDIO
+        assert [t.to_dict() for t in response.timestamps] == TIMESTAMPS
+
+
+def test_decoded_detailed_speech() -> None:
+    response = SpeechGenerateDetailedResponse.construct(**json.loads(body(escape_slashes=True)))
+    speech = DecodedDetailedSpeech(response)
+
+    assert speech.audio_bytes == AUDIO
+    assert speech.audio_bytes is speech.audio_bytes
+    # only the decoded audio is kept once it was decoded
+    assert speech._encoded is None
+    assert speech.audio_view.readonly
+    assert speech.audio_view[10:20] == AUDIO[10:20]
+
+    starts, durations = speech.timestamps_array
+    assert starts.typecode == "d"
+    assert list(starts) == [t["start"] for t in TIMESTAMPS]
+    assert list(durations) == [t["duration"] for t in TIMESTAMPS]
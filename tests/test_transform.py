@@ -458,3 +458,36 @@ async def test_strips_notgiven(use_async: bool) -> None:
 async def test_strips_omit(use_async: bool) -> None:
     assert await transform({"foo_bar": "bar"}, Foo1, use_async) == {"fooBar": "bar"}
     assert await transform({"foo_bar": omit}, Foo1, use_async) == {}
+
+
+class TypedDictListFormat(TypedDict, total=False):
+    dates: Annotated[List[date], PropertyInfo(format="iso8601")]
+    scores: List[int]
+    tags: List[str]
+
+
+@parametrize
+@pytest.mark.asyncio
+async def test_list_of_scalars(use_async: bool) -> None:
+    scores = [1, 2]
+    assert await transform(
+        {"dates": [date(2023, 2, 23)], "scores": scores, "tags": ["a", MyModel(foo="b")]},  # type: ignore[list-item]
+        TypedDictListFormat,
+        use_async,
+    ) == {"dates": ["2023-02-23"], "scores": [1, 2], "tags": ["a", {"foo": "b"}]}
+    assert (await transform({"scores": scores}, TypedDictListFormat, use_async))["scores"] is scores
+
+    # data that doesn't match the annotation is left as-is
+    assert await transform({"tags": "a"}, TypedDictListFormat, use_async) == {"tags": "a"}
+
+
+def test_typeddict_transform_is_compiled_once() -> None:
+    from lmnt._utils._transform import _compile_typeddict
+
+    assert _compile_typeddict(Foo1) is _compile_typeddict(Foo1)
+
+    _, needs_io = _compile_typeddict(Foo1)
+    assert not needs_io
+
+    _, needs_io = _compile_typeddict(TypedDictBase64Input)
+    assert needs_io
@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import io
+import os
+from typing import Any, List, Callable
+from pathlib import Path
+from unittest import mock
+from typing_extensions import override
+
+import httpx
+import pytest
+
+import lmnt._upload
+from lmnt import Lmnt, AsyncLmnt, UploadProgress, UploadStalledError
+from lmnt._upload import SpooledBody
+
+base_url = os.environ.get("TEST_API_BASE_URL", "http://127.0.0.1:4010")
+api_key = "My API Key"
+
+VOICE = {"id": "voice-id", "name": "my voice", "owner": "me", "state": "ready", "starred": False, "type": "instant"}
+
+
+def _low_retry_timeout(*_args: Any, **_kwargs: Any) -> float:
+    return 0.1
+
+
+class FakeTime:
+    """A clock that moves forward by `step` seconds every time it is read."""
+
+    def __init__(self, step: float) -> None:
+        self.now = 1000.0
+        self.step = step
+
+    def monotonic(self) -> float:
+        self.now += self.step
+        return self.now
+
+
+def _voice_transport() -> httpx.MockTransport:
+    # `MockTransport` reads the whole request body before calling the handler
+    return httpx.MockTransport(lambda _request: httpx.Response(200, json=VOICE))
+
+
+class _RawPipe(io.RawIOBase):
+    """A raw stream that can only be read once, like a pipe."""
+
+    def __init__(self, data: bytes) -> None:
+        super().__init__()
+        self._data = io.BytesIO(data)
+
+    @override
+    def readable(self) -> bool:
+        return True
+
+    @override
+    def readinto(self, buffer: Any) -> int:
+        return self._data.readinto(buffer)
+
+
+def _pipe(data: bytes) -> io.BufferedReader:
+    """Returns a file that can only be read once, like a pipe opened in binary mode."""
+    return io.BufferedReader(_RawPipe(data))
+
+
+def _flaky_transport(bodies: List[bytes]) -> Callable[[httpx.Request], httpx.Response]:
+    """Fails the first attempt after its body was sent, recording the body of every attempt."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        bodies.append(request.content)
+        if len(bodies) == 1:
+            raise httpx.RemoteProtocolError("Server disconnected without sending a response.")
+        return httpx.Response(200, json=VOICE)
+
+    return handler
+
+
+@pytest.fixture
+def audio_file(tmp_path: Path) -> Path:
+    path = tmp_path.joinpath("voice.wav")
+    path.write_bytes(os.urandom(512 * 1024))
+    return path
+
+
+def test_progress(audio_file: Path) -> None:
+    client = Lmnt(base_url=base_url, api_key=api_key, http_client=httpx.Client(transport=_voice_transport()))
+    progress: List[UploadProgress] = []
+
+    client.voices.create(file=audio_file, name="my voice", on_progress=progress.append)
+
+    assert len(progress) > 2
+    total = progress[-1].total_bytes
+    assert total is not None and total > audio_file.stat().st_size
+    assert [p.bytes_sent for p in progress] == sorted(p.bytes_sent for p in progress)
+    assert progress[-1].bytes_sent == total
+    assert progress[-1].fraction == 1.0
+    assert all(p.retries_taken == 0 for p in progress)
+
+
+def test_throughput(monkeypatch: pytest.MonkeyPatch, audio_file: Path) -> None:
+    monkeypatch.setattr(lmnt._upload, "time", FakeTime(step=0.25))
+    client = Lmnt(base_url=base_url, api_key=api_key, http_client=httpx.Client(transport=_voice_transport()))
+    progress: List[UploadProgress] = []
+
+    client.voices.create(file=audio_file, name="my voice", on_progress=progress.append)
+
+    # every chunk takes a quarter of a second, so the throughput covers the last four
+    assert [p.elapsed for p in progress[:3]] == [0.25, 0.5, 0.75]
+    assert progress[8].throughput == pytest.approx(progress[8].bytes_sent - progress[4].bytes_sent)
+
+
+@mock.patch("lmnt._base_client.BaseClient._calculate_retry_timeout", _low_retry_timeout)
+def test_stalled_upload_is_retried(monkeypatch: pytest.MonkeyPatch, audio_file: Path) -> None:
+    monkeypatch.setattr(lmnt._upload, "time", FakeTime(step=2))
+    client = Lmnt(
+        base_url=base_url,
+        api_key=api_key,
+        max_retries=1,
+        http_client=httpx.Client(transport=_voice_transport()),
+    )
+    progress: List[UploadProgress] = []
+
+    with pytest.raises(UploadStalledError) as exc_info:
+        client.voices.create(file=audio_file, name="my voice", on_progress=progress.append, min_upload_rate=1e6)
+
+    # a chunk of 64 KiB every 2 seconds is far below 1 MB/s
+    assert exc_info.value.rate < 1e6
+    assert exc_info.value.min_rate == 1e6
+    assert {p.retries_taken for p in progress} == {0, 1}
+
+
+def test_fast_upload_does_not_stall(monkeypatch: pytest.MonkeyPatch, audio_file: Path) -> None:
+    monkeypatch.setattr(lmnt._upload, "time", FakeTime(step=0.5))
+    client = Lmnt(base_url=base_url, api_key=api_key, http_client=httpx.Client(transport=_voice_transport()))
+
+    voice = client.voices.create(file=audio_file, name="my voice", min_upload_rate=1024)
+    assert voice.id == "voice-id"
+
+
+def test_progress_callback_errors_are_logged(audio_file: Path, caplog: pytest.LogCaptureFixture) -> None:
+    client = Lmnt(base_url=base_url, api_key=api_key, http_client=httpx.Client(transport=_voice_transport()))
+
+    def on_progress(_progress: UploadProgress) -> None:
+        raise RuntimeError("boom")
+
+    client.voices.create(file=audio_file, name="my voice", on_progress=on_progress)
+    assert "Exception raised in `on_progress` callback" in caplog.text
+
+
+async def test_async_progress(audio_file: Path) -> None:
+    client = AsyncLmnt(base_url=base_url, api_key=api_key, http_client=httpx.AsyncClient(transport=_voice_transport()))
+    progress: List[UploadProgress] = []
+
+    await client.voices.create(file=audio_file, name="my voice", on_progress=progress.append)
+
+    assert len(progress) > 2
+    assert progress[-1].bytes_sent == progress[-1].total_bytes
+
+
+@mock.patch("lmnt._base_client.BaseClient._calculate_retry_timeout", _low_retry_timeout)
+def test_retry_re_streams_file(audio_file: Path) -> None:
+    bodies: List[bytes] = []
+    client = Lmnt(
+        base_url=base_url,
+        api_key=api_key,
+        http_client=httpx.Client(transport=httpx.MockTransport(_flaky_transport(bodies))),
+    )
+
+    with mock.patch.object(SpooledBody, "from_request") as spool:
+        client.voices.create(file=audio_file, name="my voice")
+    spool.assert_not_called()
+
+    data = audio_file.read_bytes()
+    assert len(bodies) == 2
+    assert all(data in body for body in bodies)
+
+
+@mock.patch("lmnt._base_client.BaseClient._calculate_retry_timeout", _low_retry_timeout)
+def test_unrewindable_file_is_spooled() -> None:
+    bodies: List[bytes] = []
+    client = Lmnt(
+        base_url=base_url,
+        api_key=api_key,
+        http_client=httpx.Client(transport=httpx.MockTransport(_flaky_transport(bodies))),
+    )
+    data = os.urandom(300 * 1024)
+
+    client.voices.create(file=("voice.wav", _pipe(data)), name="my voice")
+
+    assert len(bodies) == 2
+    # the retry sends exactly the same body rather than the rest of the pipe, which is empty
+    assert bodies[0] == bodies[1]
+    assert data in bodies[1]
+
+
+@mock.patch("lmnt._base_client.BaseClient._calculate_retry_timeout", _low_retry_timeout)
+def test_spool_upload(audio_file: Path) -> None:
+    bodies: List[bytes] = []
+    requests: List[httpx.Request] = []
+    handler = _flaky_transport(bodies)
+
+    def record(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return handler(request)
+
+    client = Lmnt(base_url=base_url, api_key=api_key, http_client=httpx.Client(transport=httpx.MockTransport(record)))
+    progress: List[UploadProgress] = []
+    spools: List[SpooledBody] = []
+    from_request = SpooledBody.from_request
+
+    def spy(request: httpx.Request) -> SpooledBody:
+        spools.append(from_request(request))
+        return spools[-1]
+
+    with mock.patch.object(SpooledBody, "from_request", spy):
+        client.voices.create(file=audio_file, name="my voice", on_progress=progress.append, spool_upload=True)
+
+    # the body is encoded once, and is sent with a length
+    assert len(spools) == 1
+    assert spools[0]._file.closed
+    assert bodies[0] == bodies[1]
+    assert all(request.headers["Content-Length"] == str(spools[0].content_length) for request in requests)
+    assert requests[0].headers["Content-Type"] == requests[1].headers["Content-Type"]
+    # progress is reported for both attempts, but not for spooling the body
+    assert [p.bytes_sent for p in progress if p.bytes_sent == spools[0].content_length] == [
+        spools[0].content_length
+    ] * 2
+
+
+@mock.patch("lmnt._base_client.BaseClient._calculate_retry_timeout", _low_retry_timeout)
+async def test_async_unrewindable_file_is_spooled() -> None:
+    bodies: List[bytes] = []
+    client = AsyncLmnt(
+        base_url=base_url,
+        api_key=api_key,
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(_flaky_transport(bodies))),
+    )
+    data = os.urandom(300 * 1024)
+
+    await client.voices.create(file=("voice.wav", _pipe(data)), name="my voice")
+
+    assert len(bodies) == 2
+    assert bodies[0] == bodies[1]
+    assert data in bodies[1]
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import json
+import threading
+from typing import Any, List
+
+import httpx
+import pytest
+
+from lmnt import UsageTracker, QuotaExceededError, InternalServerError
+from lmnt.resources.sessions import SpeechSession
+
+from .fakes import FakeTime, api_key, mock_client, async_mock_client
+
+
+class AccountAPI:
+    """Synthesizes speech, counting the characters against the account's remaining characters."""
+
+    def __init__(self, *, remaining: int, limit: int = 10_000) -> None:
+        self.remaining = remaining
+        self.limit = limit
+        self.fail_speech = False
+        self.requests: List[str] = []
+        self.lock = threading.Lock()
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        with self.lock:
+            self.requests.append(request.url.path)
+        if request.url.path == "/v1/account":
+            return httpx.Response(
+                200,
+                json={
+                    "plan": {"character_limit": self.limit, "commercial_use_allowed": True, "type": "pro"},
+                    "usage": {"characters": self.remaining},
+                },
+            )
+        if request.url.path == "/v1/ai/voice/list":
+            return httpx.Response(200, json=[])
+        if self.fail_speech:
+            return httpx.Response(500, json={"error": "Internal error"})
+        with self.lock:
+            self.remaining -= len(json.loads(request.content)["text"])
+        return httpx.Response(200, content=b"audio", headers={"Content-Type": "audio/mpeg"})
+
+    def speech_requests(self) -> int:
+        return sum(1 for path in self.requests if path.startswith("/v1/ai/speech"))
+
+
+def _join_reconciliations() -> None:
+    for thread in threading.enumerate():
+        if thread.name == "lmnt-usage-reconcile":
+            thread.join()
+
+
+def test_counts_successful_requests() -> None:
+    api = AccountAPI(remaining=1000)
+    tracker = UsageTracker()
+    client = mock_client(api, max_retries=0, usage_tracker=tracker)
+    tracker.reconcile(client)
+
+    client.speech.generate(text="hello", voice="lily")
+    client.speech.generate_detailed(text="hello world", voice="lily")
+    client.voices.list()
+
+    assert tracker.characters_used == 16
+    assert tracker.character_limit == 10_000
+    assert tracker.characters_remaining == 1000 - 16
+
+    api.fail_speech = True
+    with pytest.raises(InternalServerError):
+        client.speech.generate(text="not counted", voice="lily")
+    assert tracker.characters_used == 16
+    assert tracker.characters_remaining == 1000 - 16
+
+
+def test_reconciles_in_the_background(clock: FakeTime) -> None:
+    api = AccountAPI(remaining=1000)
+    tracker = UsageTracker(reconcile_interval=60)
+    client = mock_client(api, max_retries=0, usage_tracker=tracker)
+
+    client.speech.generate(text="hello", voice="lily")
+    _join_reconciliations()
+    assert api.requests.count("/v1/account") == 1
+
+    # characters used elsewhere are picked up by the next reconciliation, once it is due
+    api.remaining -= 500
+    client.speech.generate(text="hello", voice="lily")
+    assert api.requests.count("/v1/account") == 1
+    clock.now += 60
+    client.speech.generate(text="hello", voice="lily")
+    _join_reconciliations()
+
+    assert api.requests.count("/v1/account") == 2
+    # the request sent while the account was being retrieved may be counted twice until the next reconciliation
+    assert api.remaining - 5 <= (tracker.characters_remaining or 0) <= api.remaining
+
+
+def test_rejects_requests_over_the_limit() -> None:
+    api = AccountAPI(remaining=100, limit=1000)
+    client = mock_client(api, max_retries=0, usage_tracker=UsageTracker(reject_at=1.0))
+
+    client.speech.generate(text="a" * 60, voice="lily")
+    with pytest.raises(QuotaExceededError) as exc_info:
+        client.speech.generate(text="a" * 60, voice="lily")
+
+    assert exc_info.value.characters_remaining == 40
+    assert exc_info.value.character_limit == 1000
+    # the account was retrieved before the first request, which was the only one sent
+    assert api.requests == ["/v1/account", "/v1/ai/speech/bytes"]
+
+
+def test_throttles_near_the_limit(clock: FakeTime) -> None:
+    api = AccountAPI(remaining=2000, limit=10_000)
+    client = mock_client(
+        api, max_retries=0, usage_tracker=UsageTracker(throttle_at=0.5, throttle_characters_per_second=100)
+    )
+
+    for _ in range(3):
+        client.speech.generate(text="a" * 100, voice="lily")
+
+    # the bucket starts with a second's worth of characters
+    assert clock.sleeps == [pytest.approx(1.0), pytest.approx(1.0)]
+    assert api.speech_requests() == 3
+
+
+def test_throttling_respects_deadlines(clock: FakeTime) -> None:
+    api = AccountAPI(remaining=2000, limit=10_000)
+    tracker = UsageTracker(throttle_at=0.5, throttle_characters_per_second=100)
+    client = mock_client(api, max_retries=0, usage_tracker=tracker)
+    client.speech.generate(text="a" * 100, voice="lily")
+
+    # the next 100 characters would be held back for a second
+    assert not tracker.acquire(100, deadline_at=clock.now + 0.5)
+    assert clock.sleeps == []
+    assert tracker.characters_remaining == 1900
+
+    assert tracker.acquire(100, deadline_at=clock.now + 1)
+    assert clock.sleeps == [pytest.approx(1.0)]
+    assert tracker.characters_remaining == 1800
+
+
+def test_projects_exhaustion(clock: FakeTime) -> None:
+    api = AccountAPI(remaining=10_000)
+    tracker = UsageTracker(rate_window=100)
+    client = mock_client(api, max_retries=0, usage_tracker=tracker)
+    tracker.reconcile(client)
+    assert tracker.exhausted_in is None
+
+    for _ in range(10):
+        clock.now += 10
+        client.speech.generate(text="a" * 100, voice="lily")
+
+    assert tracker.characters_per_second == pytest.approx(10)
+    assert tracker.exhausted_in == pytest.approx(900)
+
+
+class FakeWebSocket:
+    def __init__(self) -> None:
+        self.sent: List[Any] = []
+
+    async def send(self, message: str) -> None:
+        self.sent.append(json.loads(message))
+
+
+async def test_async_client_and_speech_sessions() -> None:
+    api = AccountAPI(remaining=30, limit=1000)
+    tracker = UsageTracker(reject_at=1.0)
+    client = async_mock_client(api, usage_tracker=tracker)
+
+    await client.speech.generate(text="hello", voice="lily")
+    session = SpeechSession(api_key, voice="lily", usage_tracker=tracker, retrieve_account=client._retrieve_account)
+    websocket = session.websocket = FakeWebSocket()
+    await session.send_text("a" * 20)
+    with pytest.raises(QuotaExceededError):
+        await session.send_text("a" * 10)
+
+    assert tracker.characters_used == 25
+    assert tracker.characters_remaining == 5
+    assert [message["text"] for message in websocket.sent] == ["a" * 20]
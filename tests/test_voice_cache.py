@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import time
+import threading
+from typing import Any, Dict, List, Callable
+
+import httpx
+import pytest
+
+from lmnt import Lmnt, VoiceCache
+
+from .fakes import FakeTime, mock_client, async_mock_client
+
+
+def _voice(name: str = "my voice") -> Dict[str, Any]:
+    return {"id": "voice-id", "name": name, "owner": "me", "state": "ready", "starred": False, "type": "instant"}
+
+
+class VoiceAPI:
+    """Serves a voice whose name can be changed, with an `ETag` for every version of it."""
+
+    def __init__(self) -> None:
+        self.name = "my voice"
+        self.version = 1
+        self.requests: List[httpx.Request] = []
+        self.lock = threading.Lock()
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        with self.lock:
+            self.requests.append(request)
+        etag = f'"v{self.version}"'
+        if request.method == "PUT":
+            self.name, self.version = "renamed", self.version + 1
+            return httpx.Response(200, json={"voice": _voice(self.name)})
+        if request.method == "DELETE":
+            return httpx.Response(200, json={"success": True})
+        if request.method == "POST":
+            return httpx.Response(200, json=_voice())
+        if request.headers.get("If-None-Match") == etag:
+            return httpx.Response(304, headers={"ETag": etag})
+        body: Any = [_voice(self.name)] if request.url.path.endswith("/list") else _voice(self.name)
+        return httpx.Response(200, json=body, headers={"ETag": etag})
+
+    def gets(self) -> List[httpx.Request]:
+        return [request for request in self.requests if request.method == "GET"]
+
+
+def _wait_for(condition: Callable[[], bool]) -> None:
+    deadline = time.monotonic() + 5
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_fresh_responses_are_cached(clock: FakeTime) -> None:
+    api = VoiceAPI()
+    client = mock_client(api, voice_cache=VoiceCache(ttl=60))
+
+    first = client.voices.retrieve("voice-id")
+    clock.now += 59
+    assert client.voices.retrieve("voice-id") is first
+    assert client.voices.list(owner="me") == client.voices.list(owner="me")
+
+    assert [request.url.path for request in api.gets()] == ["/v1/ai/voice/voice-id", "/v1/ai/voice/list"]
+
+
+def test_stale_response_is_refreshed_in_the_background(clock: FakeTime) -> None:
+    api = VoiceAPI()
+    cache = VoiceCache(ttl=60, stale_while_revalidate=60)
+    client = mock_client(api, voice_cache=cache)
+    client.voices.retrieve("voice-id")
+
+    api.name, api.version = "renamed", 2
+    clock.now += 90
+    # the stale response is served straight away
+    assert client.voices.retrieve("voice-id").name == "my voice"
+
+    _wait_for(lambda: not cache._refreshing)
+    assert client.voices.retrieve("voice-id").name == "renamed"
+    assert len(api.gets()) == 2
+
+
+def test_expired_response_is_revalidated(clock: FakeTime) -> None:
+    api = VoiceAPI()
+    client = mock_client(api, voice_cache=VoiceCache(ttl=60, stale_while_revalidate=0))
+    first = client.voices.retrieve("voice-id")
+
+    clock.now += 61
+    assert client.voices.retrieve("voice-id") is first
+
+    # the voice wasn't changed, so the API sent `304 Not Modified`
+    assert api.gets()[1].headers["If-None-Match"] == '"v1"'
+
+    # and the response is fresh again
+    clock.now += 59
+    client.voices.retrieve("voice-id")
+    assert len(api.gets()) == 2
+
+
+def _update(client: Lmnt) -> object:
+    return client.voices.update("voice-id", name="renamed")
+
+
+def _raw_update(client: Lmnt) -> object:
+    return client.voices.with_raw_response.update("voice-id", name="renamed")
+
+
+def _delete(client: Lmnt) -> object:
+    return client.voices.delete("voice-id")
+
+
+def _create(client: Lmnt) -> object:
+    return client.voices.create(file=b"audio", name="another voice")
+
+
+@pytest.mark.parametrize(
+    "mutate, refetched",
+    [
+        (_update, ["/v1/ai/voice/list", "/v1/ai/voice/voice-id"]),
+        (_raw_update, ["/v1/ai/voice/list", "/v1/ai/voice/voice-id"]),
+        (_delete, ["/v1/ai/voice/list", "/v1/ai/voice/voice-id"]),
+        # a new voice doesn't change the other voices
+        (_create, ["/v1/ai/voice/list"]),
+    ],
+    ids=["update", "raw update", "delete", "create"],
+)
+@pytest.mark.usefixtures("clock")
+def test_mutations_invalidate(mutate: Callable[[Lmnt], object], refetched: List[str]) -> None:
+    api = VoiceAPI()
+    client = mock_client(api, voice_cache=VoiceCache(ttl=60))
+    client.voices.retrieve("voice-id")
+    client.voices.list()
+
+    mutate(client)
+    client.voices.list()
+    client.voices.retrieve("voice-id")
+
+    assert [request.url.path for request in api.gets()[2:]] == refetched
+
+
+@pytest.mark.usefixtures("clock")
+def test_raw_responses_and_extra_options_bypass_the_cache() -> None:
+    api = VoiceAPI()
+    client = mock_client(api, voice_cache=VoiceCache(ttl=60))
+    client.voices.retrieve("voice-id")
+
+    response = client.voices.with_raw_response.retrieve("voice-id")
+    assert response.headers["ETag"] == '"v1"'
+    client.voices.retrieve("voice-id", extra_query={"detail": "full"})
+    client.voices.retrieve("voice-id")
+
+    assert len(api.gets()) == 3
+
+
+@pytest.mark.usefixtures("clock")
+def test_shared_with_copies_per_api_key() -> None:
+    api = VoiceAPI()
+    client = mock_client(api, voice_cache=VoiceCache(ttl=60))
+    client.voices.retrieve("voice-id")
+
+    client.with_options(timeout=5).voices.retrieve("voice-id")
+    assert len(api.gets()) == 1
+
+    client.copy(api_key="another key").voices.retrieve("voice-id")
+    assert len(api.gets()) == 2
+
+
+@pytest.mark.usefixtures("clock")
+def test_least_recently_used_are_dropped() -> None:
+    api = VoiceAPI()
+    cache = VoiceCache(ttl=60, max_entries=2)
+    client = mock_client(api, voice_cache=cache)
+
+    client.voices.retrieve("a")
+    client.voices.retrieve("b")
+    client.voices.retrieve("a")
+    client.voices.retrieve("c")
+    assert len(cache) == 2
+
+    client.voices.retrieve("a")
+    client.voices.retrieve("b")
+    assert [request.url.path.rsplit("/", 1)[-1] for request in api.gets()] == ["a", "b", "c", "b"]
+
+
+@pytest.mark.usefixtures("clock")
+def test_concurrent_threads() -> None:
+    api = VoiceAPI()
+    client = mock_client(api, voice_cache=VoiceCache(ttl=60))
+    client.voices.retrieve("voice-id")
+    names: List[str] = []
+
+    def lookup() -> None:
+        for _ in range(50):
+            names.append(client.voices.retrieve("voice-id").name)
+
+    threads = [threading.Thread(target=lookup) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert names == ["my voice"] * 400
+    assert len(api.gets()) == 1
+
+
+async def test_async_stale_response_is_refreshed_in_the_background(clock: FakeTime) -> None:
+    api = VoiceAPI()
+    cache = VoiceCache(ttl=60, stale_while_revalidate=60)
+    client = async_mock_client(api, voice_cache=cache)
+    await client.voices.list()
+
+    api.name, api.version = "renamed", 2
+    clock.now += 90
+    assert (await client.voices.list())[0].name == "my voice"
+
+    for task in list(cache._tasks):
+        await task
+    assert (await client.voices.list())[0].name == "renamed"
+    assert len(api.gets()) == 2
+
+    await client.voices.update("voice-id", name="again")
+    await client.voices.list()
+    assert len(api.gets()) == 3
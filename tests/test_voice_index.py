@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import os
+import time
+from typing import Any, Dict, List
+
+import httpx
+
+from lmnt import Lmnt, AsyncLmnt, VoiceIndex
+from lmnt.types import Voice
+
+base_url = os.environ.get("TEST_API_BASE_URL", "http://127.0.0.1:4010")
+api_key = "My API Key"
+
+
+def _voice(id: str, name: str, **fields: Any) -> Voice:
+    values: Dict[str, Any] = {"id": id, "name": name, "owner": "me", "state": "ready", **fields}
+    return Voice.construct(**values)
+
+
+VOICES = [
+    _voice("amy", "Amy", gender="female", tags=["narration", "calm"], starred=True, description="A warm narrator"),
+    _voice("ben", "Ben", gender="male", tags=["news"], owner="system"),
+    _voice("cat", "Catalina", gender="female", tags=["narration"], description="Energetic and bright"),
+    _voice("dan", "Dan", gender="male", tags=["calm"], state="training", starred=True),
+]
+
+
+def _ids(voices: List[Voice]) -> List[str]:
+    return [voice.id for voice in voices]
+
+
+def test_search_by_fields() -> None:
+    index = VoiceIndex(VOICES)
+
+    assert len(index) == 4
+    assert _ids(index.search(tags=["narration"])) == ["amy", "cat"]
+    assert _ids(index.search(tags=["narration", "calm"])) == ["amy"]
+    assert _ids(index.search(any_tags=["news", "calm"])) == ["amy", "ben", "dan"]
+    assert _ids(index.search(gender="female", starred=True)) == ["amy"]
+    assert _ids(index.search(starred=False)) == ["ben", "cat"]
+    assert _ids(index.search(owner="system")) == ["ben"]
+    assert _ids(index.search(state="training", tags=["calm"])) == ["dan"]
+    assert _ids(index.search(tags=["unknown"])) == []
+    assert _ids(index.search()) == ["amy", "ben", "cat", "dan"]
+    assert _ids(index.search(limit=2)) == ["amy", "ben"]
+
+
+def test_search_by_text() -> None:
+    index = VoiceIndex(VOICES)
+
+    assert _ids(index.search(prefix="ca")) == ["cat"]
+    assert _ids(index.search(prefix="NARR")) == ["amy"]
+    assert _ids(index.search(text="talin")) == ["cat"]
+    assert _ids(index.search(text="na")) == ["amy", "cat"]
+    assert _ids(index.search(text="warm narr", gender="female")) == ["amy"]
+    # the text has to appear as it is, not just its words
+    assert _ids(index.search(text="rator warm")) == []
+
+
+def test_add_and_remove() -> None:
+    index = VoiceIndex(VOICES)
+
+    index.add(_voice("amy", "Amelia", gender="female", tags=["news"]))
+    assert _ids(index.search(tags=["narration"])) == ["cat"]
+    assert _ids(index.search(tags=["news"])) == ["amy", "ben"]
+    assert _ids(index.search(prefix="am")) == ["amy"]
+    assert index.search(prefix="warm") == []
+
+    assert index.remove("ben")
+    assert not index.remove("ben")
+    assert "ben" not in index
+    assert _ids(index.search(tags=["news"])) == ["amy"]
+    assert index.get("amy") is not None and index.get("amy").name == "Amelia"  # type: ignore[union-attr]
+
+
+def _transport(requests: List[httpx.Request]) -> httpx.MockTransport:
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        voice = {"id": "amy", "name": "Amy", "owner": "me", "state": "ready", "gender": "female", "tags": ["news"]}
+        if request.method == "PUT":
+            return httpx.Response(200, json={"voice": voice})
+        if request.method == "POST":
+            return httpx.Response(200, json={**voice, "id": "eve", "name": "Eve"})
+        return httpx.Response(200, json={"success": True})
+
+    return httpx.MockTransport(handler)
+
+
+def test_watch() -> None:
+    requests: List[httpx.Request] = []
+    client = Lmnt(base_url=base_url, api_key=api_key, http_client=httpx.Client(transport=_transport(requests)))
+    index = VoiceIndex(VOICES).watch(client)
+
+    client.voices.update("amy", tags=["news"])
+    assert _ids(index.search(tags=["news"])) == ["amy", "ben"]
+
+    client.with_options(timeout=5).voices.delete("ben")
+    assert _ids(index.search(tags=["news"])) == ["amy"]
+
+    client.voices.create(file=b"audio", name="Eve")
+    assert _ids(index.search(prefix="ev")) == ["eve"]
+
+    # raw responses are applied once they are parsed
+    response = client.voices.with_raw_response.delete("cat")
+    assert "cat" in index
+    response.parse()
+    assert "cat" not in index
+
+    index.unwatch(client)
+    client.voices.delete("amy")
+    assert "amy" in index
+    assert len(requests) == 5
+
+
+async def test_async_watch() -> None:
+    requests: List[httpx.Request] = []
+    client = AsyncLmnt(
+        base_url=base_url, api_key=api_key, http_client=httpx.AsyncClient(transport=_transport(requests))
+    )
+    index = VoiceIndex(VOICES).watch(client)
+
+    await client.voices.update("amy", tags=["news"])
+    await client.voices.delete("dan")
+
+    assert _ids(index.search(tags=["news"])) == ["amy", "ben"]
+    assert _ids(index.search(tags=["calm"])) == []
+
+
+def test_search_is_faster_than_scanning() -> None:
+    voices = [
+        _voice(f"voice-{i}", f"Voice {i}", gender=("female", "male")[i % 2], tags=[f"tag-{i % 50}"], starred=i % 7 == 0)
+        for i in range(5000)
+    ]
+    index = VoiceIndex(voices)
+
+    def scan() -> List[Voice]:
+        return [v for v in voices if "tag-3" in (v.tags or []) and v.gender == "male" and v.starred]
+
+    assert index.search(tags=["tag-3"], gender="male", starred=True) == scan()
+
+    start = time.perf_counter()
+    for _ in range(100):
+        index.search(tags=["tag-3"], gender="male", starred=True)
+    indexed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(100):
+        scan()
+    scanned = time.perf_counter() - start
+
+    assert indexed < scanned
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+import httpx
+import pytest
+
+from lmnt import VoiceCache, VoiceIndex, NotFoundError, VoiceNotReadyError
+
+from .fakes import FakeTime, mock_client, async_mock_client
+
+
+class TrainingAPI:
+    """Serves voices that become ready after they were polled `polls` times, through either endpoint."""
+
+    def __init__(self, polls: Dict[str, int]) -> None:
+        self.remaining = dict(polls)
+        self.requests: List[str] = []
+        self.cache_control: List[str | None] = []
+
+    def _voice(self, voice_id: str) -> Dict[str, Any]:
+        remaining = self.remaining[voice_id]
+        self.remaining[voice_id] = max(remaining - 1, 0)
+        state = "ready" if remaining <= 1 else "training"
+        return {"id": voice_id, "name": voice_id, "owner": "me", "state": state}
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        self.requests.append(path)
+        self.cache_control.append(request.headers.get("Cache-Control"))
+        if path.endswith("/list"):
+            return httpx.Response(200, json=[self._voice(voice_id) for voice_id in self.remaining])
+        voice_id = path.rsplit("/", 1)[-1]
+        if voice_id == "system-voice":
+            return httpx.Response(200, json={"id": voice_id, "name": voice_id, "owner": "system", "state": "ready"})
+        if voice_id not in self.remaining:
+            return httpx.Response(404, json={"error": "Voice not found"})
+        return httpx.Response(200, json=self._voice(voice_id))
+
+
+def test_yields_voices_as_they_become_ready(clock: FakeTime) -> None:
+    api = TrainingAPI({"a": 3, "b": 1})
+    client = mock_client(api)
+
+    ready = [voice.id for voice in client.voices.wait_until_ready(["a", "b"], poll_interval=1, max_poll_interval=3)]
+
+    assert ready == ["b", "a"]
+    # below the list threshold, every pending voice is retrieved on its own
+    assert api.requests == ["/v1/ai/voice/a", "/v1/ai/voice/b", "/v1/ai/voice/a", "/v1/ai/voice/a"]
+    assert len(clock.sleeps) == 2
+    assert 0.75 <= clock.sleeps[0] <= 1
+    assert 1.5 <= clock.sleeps[1] <= 2
+
+
+def test_backoff_is_capped(clock: FakeTime) -> None:
+    client = mock_client(TrainingAPI({"a": 8}))
+
+    list(client.voices.wait_until_ready(["a"], poll_interval=1, max_poll_interval=4))
+
+    assert len(clock.sleeps) == 7
+    assert all(3 <= delay <= 4 for delay in clock.sleeps[2:])
+
+
+@pytest.mark.usefixtures("clock")
+def test_lists_many_pending_voices() -> None:
+    api = TrainingAPI({f"voice-{i}": i % 3 + 1 for i in range(20)})
+    client = mock_client(api)
+
+    ready = list(client.voices.wait_until_ready([*api.remaining, "system-voice"]))
+
+    assert len(ready) == 21
+    # a list per tick, and a retrieve for the voice that isn't listed as one of the account's
+    assert api.requests == ["/v1/ai/voice/list", "/v1/ai/voice/system-voice", "/v1/ai/voice/list", "/v1/ai/voice/list"]
+
+
+def test_timeout(clock: FakeTime) -> None:
+    client = mock_client(TrainingAPI({"a": 100, "b": 1}))
+    ready: List[str] = []
+
+    with pytest.raises(VoiceNotReadyError) as exc_info:
+        for voice in client.voices.wait_until_ready(["a", "b"], timeout=10, poll_interval=1):
+            ready.append(voice.id)
+
+    assert ready == ["b"]
+    assert exc_info.value.states == {"a": "training"}
+    assert isinstance(exc_info.value, TimeoutError)
+    assert clock.now == pytest.approx(1010)
+
+
+@pytest.mark.usefixtures("clock")
+def test_deleted_voice() -> None:
+    client = mock_client(TrainingAPI({}))
+
+    with pytest.raises(NotFoundError):
+        list(client.voices.wait_until_ready(["deleted"]))
+
+
+@pytest.mark.usefixtures("clock")
+def test_bypasses_and_updates_the_cache() -> None:
+    api = TrainingAPI({"a": 3})
+    client = mock_client(api, voice_cache=VoiceCache())
+    index = VoiceIndex().watch(client)
+    assert client.voices.retrieve("a").state == "training"
+
+    list(client.voices.wait_until_ready(["a"]))
+
+    assert api.cache_control == [None, "no-cache", "no-cache"]
+    # the cached voice that was still training was dropped
+    assert client.voices.retrieve("a").state == "ready"
+    assert [voice.id for voice in index.search(state="ready")] == ["a"]
+
+
+async def test_async_wait_until_ready() -> None:
+    api = TrainingAPI({f"voice-{i}": i % 2 + 1 for i in range(4)})
+    client = async_mock_client(api)
+
+    ready = [voice.id async for voice in client.voices.wait_until_ready(api.remaining, poll_interval=0.001)]
+
+    assert sorted(ready) == sorted(api.remaining)
+    # the two voices still training after the first poll are below the list threshold
+    assert api.requests == ["/v1/ai/voice/list", "/v1/ai/voice/voice-1", "/v1/ai/voice/voice-3"]
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import json
+from typing import List
+
+import httpx
+import pytest
+
+from lmnt import Lmnt, AsyncLmnt, EndpointPool, WarmupResult
+
+from .h2_server import LocalAudioServer
+
+api_key = "My API Key"
+
+
+class _FakeWebSocket:
+    def __init__(self, url: str) -> None:
+        self.url = url
+        self.sent: List[str] = []
+        self.closed = False
+
+    async def send(self, message: str) -> None:
+        self.sent.append(message)
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture
+def opened(monkeypatch: pytest.MonkeyPatch) -> List[_FakeWebSocket]:
+    sockets: List[_FakeWebSocket] = []
+
+    async def connect(url: str) -> _FakeWebSocket:
+        sockets.append(_FakeWebSocket(url))
+        return sockets[-1]
+
+    monkeypatch.setattr("lmnt._warmup.websockets.connect", connect)
+    return sockets
+
+
+def test_warmup_opens_pooled_connections() -> None:
+    with LocalAudioServer(protocol="http/1.1") as server:
+        with Lmnt(base_url=server.base_url, api_key=api_key) as client:
+            result = client.warmup(connections=5)
+
+            assert isinstance(result, WarmupResult)
+            assert result.ok
+            assert result.connections == 5
+            assert result.duration > 0
+            assert server.connections == 5
+
+            # the first real request re-uses one of the warm connections
+            client.speech.with_raw_response.generate(text="hello", voice="leah")
+            assert server.connections == 5
+
+
+def test_warmup_opens_connections_to_every_endpoint() -> None:
+    with LocalAudioServer(protocol="http/1.1") as eu, LocalAudioServer(protocol="http/1.1") as us:
+        pool = EndpointPool([eu.base_url, us.base_url])
+        with Lmnt(api_key=api_key, endpoint_pool=pool) as client:
+            result = client.warmup(connections=2)
+
+            assert result.ok
+            assert result.connections == 4
+            assert eu.connections == 2
+            assert us.connections == 2
+
+
+def test_warmup_reports_errors() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("connection refused", request=request)
+
+    http_client = httpx.Client(transport=httpx.MockTransport(handler))
+    with Lmnt(base_url="http://localhost", api_key=api_key, http_client=http_client) as client:
+        result = client.warmup(connections=3)
+
+    assert not result.ok
+    assert result.connections == 0
+    assert len(result.errors) == 3
+
+
+def test_warmup_does_not_send_credentials() -> None:
+    requests: List[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(404)
+
+    http_client = httpx.Client(transport=httpx.MockTransport(handler))
+    with Lmnt(base_url="http://localhost", api_key=api_key, http_client=http_client) as client:
+        assert client.warmup(connections=2).connections == 2
+
+    assert [r.method for r in requests] == ["HEAD", "HEAD"]
+    assert all("X-API-Key" not in r.headers for r in requests)
+
+
+async def test_async_warmup_opens_pooled_connections() -> None:
+    with LocalAudioServer(protocol="http/1.1") as server:
+        async with AsyncLmnt(base_url=server.base_url, api_key=api_key) as client:
+            result = await client.warmup(connections=4)
+
+            assert result.ok
+            assert result.connections == 4
+            assert server.connections == 4
+
+            await client.speech.with_raw_response.generate(text="hello", voice="leah")
+            assert server.connections == 4
+
+
+async def test_async_warmup_websockets(opened: List[_FakeWebSocket]) -> None:
+    requests: List[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200)
+
+    http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    client = AsyncLmnt(base_url="https://staging.lmnt.com", api_key=api_key, http_client=http_client)
+
+    result = await client.warmup(connections=0, websockets=2)
+    assert result.ok
+    assert result.websockets == 2
+    assert requests == []
+    assert [ws.url for ws in opened] == ["wss://staging.lmnt.com/v1/ai/speech/stream"] * 2
+
+    # sessions use the pre-opened sockets, including from clients derived with `with_options()`
+    session = await client.speech.sessions.create(voice="leah")
+    assert session.websocket is opened[0]
+    assert json.loads(opened[0].sent[0])["voice"] == "leah"
+
+    session = await client.with_options(timeout=5).speech.sessions.create(voice="leah")
+    assert session.websocket is opened[1]
+    assert client._websocket_pool.idle_count == 0
+
+    # once the pool is empty, sessions connect on their own
+    session = await client.speech.sessions.create(voice="leah")
+    assert session.websocket is opened[2]
+
+    await client.close()
+
+
+async def test_async_warmup_websockets_to_every_endpoint(opened: List[_FakeWebSocket]) -> None:
+    pool = EndpointPool(["https://eu.lmnt.test", "https://us.lmnt.test/proxy"])
+    client = AsyncLmnt(api_key=api_key, endpoint_pool=pool)
+
+    result = await client.warmup(connections=0, websockets=1)
+    assert result.websockets == 2
+    assert sorted(ws.url for ws in opened) == [
+        "wss://eu.lmnt.test/v1/ai/speech/stream",
+        "wss://us.lmnt.test/proxy/v1/ai/speech/stream",
+    ]
+
+    await client.close()
+
+
+async def test_async_warmup_discards_closed_websockets(opened: List[_FakeWebSocket]) -> None:
+    client = AsyncLmnt(base_url="https://api.lmnt.com", api_key=api_key)
+    await client.warmup(connections=0, websockets=1)
+    opened[0].closed = True
+
+    session = await client.speech.sessions.create(voice="leah")
+    assert session.websocket is opened[1]
+
+    await client.close()
+
+
+async def test_async_warmup_counts_the_websockets_it_opens(opened: List[_FakeWebSocket]) -> None:
+    client = AsyncLmnt(base_url="https://api.lmnt.com", api_key=api_key)
+
+    assert (await client.warmup(connections=0, websockets=2)).websockets == 2
+    # the sockets left idle by the first warmup aren't counted again
+    assert (await client.warmup(connections=0, websockets=1)).websockets == 1
+    assert client._websocket_pool.idle_count == len(opened) == 3
+
+    await client.close()
+
+
+async def test_async_close_closes_idle_websockets(opened: List[_FakeWebSocket]) -> None:
+    client = AsyncLmnt(base_url="https://api.lmnt.com", api_key=api_key)
+    await client.warmup(connections=0, websockets=2)
+
+    await client.close()
+
+    assert all(ws.closed for ws in opened)
+    assert client._websocket_pool.idle_count == 0
+
+
+def test_warmup_result_repr() -> None:
+    result = WarmupResult(duration=0.25, connections=2, websockets=1, errors=[])
+    assert repr(result) == "<WarmupResult duration=0.250s connections=2 websockets=1 errors=0>"
+
+
+@pytest.mark.parametrize("connections", [0, 1])
+def test_warmup_no_connections(connections: int) -> None:
+    http_client = httpx.Client(transport=httpx.MockTransport(lambda _: httpx.Response(200)))
+    with Lmnt(base_url="http://localhost", api_key=api_key, http_client=http_client) as client:
+        assert client.warmup(connections=connections).connections == connections